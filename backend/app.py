@@ -7,6 +7,7 @@ import subprocess
 from dataclasses import dataclass, field
 from typing import Any
 
+import helper
 import uvicorn
 from controller import route_handlers
 from controller import statistics as statistics_controller
@@ -17,10 +18,13 @@ from litestar.config.cors import CORSConfig
 from service.autopilot_memory import AutopilotMemoryService
 from service.config import Config
 from service.database import Database
+from service.exchange_client_manager import get_exchange_client_pool
 from service.green_phase import GreenPhaseService
+from service.history_backfill import get_history_backfill_scheduler
 from service.housekeeper import Housekeeper
 from service.redis import redis_client, start_redis, stop_redis
 from service.signal import Signal
+from service.startup_report import StartupReport, begin_startup_report
 from service.watcher import Watcher
 
 
@@ -40,56 +44,105 @@ class RuntimeState:
 
 
 runtime_state = RuntimeState()
+logging = helper.LoggerFactory.get_logger("logs/monitoring.log", "startup")
 
 
 async def startup() -> None:
-    """Initialize core services and start background tasks before serving."""
-    runtime_state.redis_proc = await asyncio.to_thread(start_redis)
+    """Initialize core services before serving and warm the rest in background.
+
+    Redis and the database start in parallel. Services that only warm caches
+    or start loops are initialized by a background task, so the API and
+    frontend are reachable while they load; callers that need them first
+    initialize them lazily through their ``instance()`` accessors.
+    """
+    report = begin_startup_report()
     runtime_state.watcher_queue = asyncio.Queue()
+    database = Database()
+    runtime_state.database = database
 
-    runtime_state.database = Database()
-    await runtime_state.database.init()
+    async def start_redis_phase() -> None:
+        async with report.phase("redis"):
+            runtime_state.redis_proc = await asyncio.to_thread(start_redis)
 
-    await runtime_state.database.run_with_context(Config.instance)
+    async def init_database_phase() -> None:
+        async with report.phase("database"):
+            await database.init()
 
-    runtime_state.watcher = Watcher()
-    await runtime_state.watcher.init()
+    await asyncio.gather(start_redis_phase(), init_database_phase())
 
-    runtime_state.housekeeper = Housekeeper()
-    await runtime_state.housekeeper.init()
+    async with report.phase("config"):
+        await database.run_with_context(Config.instance)
 
-    runtime_state.green_phase_service = await GreenPhaseService.instance()
-    await runtime_state.green_phase_service.start()
+    async with report.phase("watcher"):
+        runtime_state.watcher = Watcher()
+        await runtime_state.watcher.init()
 
-    runtime_state.autopilot_memory_service = await AutopilotMemoryService.instance()
-    await runtime_state.autopilot_memory_service.start()
+    async with report.phase("housekeeper"):
+        runtime_state.housekeeper = Housekeeper()
+        await runtime_state.housekeeper.init()
 
-    runtime_state.signal_plugin = Signal(runtime_state.watcher_queue)
-    await runtime_state.database.run_with_context(runtime_state.signal_plugin.init)
-    await trades_controller.start_websocket_fanout()
-    await statistics_controller.start_websocket_fanout()
+    async with report.phase("websocket_fanout"):
+        await trades_controller.start_websocket_fanout()
+        await statistics_controller.start_websocket_fanout()
 
     runtime_state.background_tasks = [
+        asyncio.create_task(database.run_with_context(_warm_up_services, report)),
         asyncio.create_task(
-            runtime_state.database.run_with_context(
+            database.run_with_context(
                 runtime_state.watcher.watch_incoming_symbols,
                 runtime_state.watcher_queue,
             )
         ),
         asyncio.create_task(
-            runtime_state.database.run_with_context(
-                runtime_state.housekeeper.cleanup_ticker_database
-            )
+            database.run_with_context(runtime_state.housekeeper.cleanup_ticker_database)
+        ),
+        asyncio.create_task(
+            database.run_with_context(runtime_state.watcher.watch_tickers)
         ),
         asyncio.create_task(
-            runtime_state.database.run_with_context(runtime_state.watcher.watch_tickers)
+            database.run_with_context(database.backfill_trade_replay_candles_if_needed)
         ),
         asyncio.create_task(
-            runtime_state.database.run_with_context(
-                runtime_state.database.backfill_trade_replay_candles_if_needed
+            database.run_with_context(
+                database.backfill_ticker_epoch_timestamps_if_needed
             )
         ),
     ]
+    report.mark_serving()
+
+
+async def _warm_up_services(report: StartupReport) -> None:
+    """Start independent services concurrently after the API is up."""
+
+    async def start_green_phase() -> None:
+        async with report.phase("green_phase", background=True):
+            runtime_state.green_phase_service = await GreenPhaseService.instance()
+            await runtime_state.green_phase_service.start()
+
+    async def start_autopilot_memory() -> None:
+        async with report.phase("autopilot_memory", background=True):
+            runtime_state.autopilot_memory_service = (
+                await AutopilotMemoryService.instance()
+            )
+            await runtime_state.autopilot_memory_service.start()
+
+    async def start_signal_plugin() -> None:
+        async with report.phase("signal_plugin", background=True):
+            runtime_state.signal_plugin = Signal(runtime_state.watcher_queue)
+            await runtime_state.signal_plugin.init()
+
+    results = await asyncio.gather(
+        start_green_phase(),
+        start_autopilot_memory(),
+        start_signal_plugin(),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            logging.error("Background service warmup failed: %s", result)
+    report.mark_warm()
 
 
 async def shutdown() -> None:
@@ -113,6 +166,8 @@ async def shutdown() -> None:
         await runtime_state.green_phase_service.shutdown()
     if runtime_state.autopilot_memory_service is not None:
         await runtime_state.autopilot_memory_service.shutdown()
+    await get_history_backfill_scheduler().shutdown()
+    await get_exchange_client_pool().close_all()
     if runtime_state.database is not None:
         await runtime_state.database.shutdown()
 
@@ -28,7 +28,7 @@ if package:
     for mod in resources.files(package).iterdir():
         if mod.suffix != ".py":
             continue
-        if mod.stem in {"__init__", "responses"}:
+        if mod.stem in {"__init__", "responses", "websocket_streams"}:
             continue
         modules.append(mod.stem)
 
@@ -4,6 +4,7 @@ from typing import Any
 
 import helper
 from litestar.handlers import get
+from litestar.params import FromQuery
 from service.analytics import Analytics
 
 logging = helper.LoggerFactory.get_logger("logs/controller.log", "controller_analytics")
@@ -12,9 +13,9 @@ analytics = Analytics()
 
 
 @get(path="/analytics/overview")
-async def analytics_overview() -> dict[str, Any]:
+async def analytics_overview(rebuild: FromQuery[bool] = False) -> dict[str, Any]:
     """Return aggregated analytics overview for closed trades."""
-    return await analytics.get_overview()
+    return await analytics.get_overview(rebuild=rebuild)
 
 
 route_handlers = [analytics_overview]
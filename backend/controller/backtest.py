@@ -1,12 +1,22 @@
 """Backtest API endpoints."""
 
+import asyncio
+import json
+from collections.abc import AsyncGenerator
 from datetime import UTC, datetime
 from typing import Any
 
 import helper
 from controller.responses import json_response
-from litestar.handlers import post
+from litestar.exceptions import WebSocketDisconnect
+from litestar.handlers import get, post, websocket_stream
+from litestar.params import FromPath
 from service.backtest import Backtest, BacktestValidationError
+from service.backtest_batch import (
+    build_backtest_batch_runs,
+    get_backtest_batch,
+    start_backtest_batch,
+)
 from service.config import Config
 
 logging = helper.LoggerFactory.get_logger("logs/controller.log", "controller_backtest")
@@ -76,6 +86,7 @@ async def _run_backtest(data: dict[str, Any]) -> Any:
             trade_mode=trade_mode,
             sidestep_bearish_strategy=data.get("sidestep_bearish_strategy"),
             sidestep_reentry_strategy=data.get("sidestep_reentry_strategy"),
+            vectorized=data.get("vectorized", True),
         )
         result = await engine.run()
         return json_response(result)
@@ -97,6 +108,68 @@ async def _run_backtest(data: dict[str, Any]) -> Any:
         )
 
 
+@post("/backtest/batch")
+async def run_backtest_batch(data: dict[str, Any]) -> Any:
+    """Queue a multi-symbol or parameter-sweep backtest batch."""
+    return await _run_backtest_batch(data)
+
+
+@get("/backtest/batch/{batch_id:str}")
+async def backtest_batch_status(batch_id: FromPath[str]) -> Any:
+    """Return progress and ranked results of a backtest batch."""
+    batch = get_backtest_batch(batch_id)
+    if batch is None:
+        return json_response(
+            {"error": "Backtest batch not found.", "code": "batch_not_found"},
+            status_code=404,
+        )
+    return json_response(batch.to_dict())
+
+
+@websocket_stream(
+    path="/backtest/batch/{batch_id:str}/progress", warn_on_data_discard=False
+)
+async def backtest_batch_progress(batch_id: FromPath[str]) -> AsyncGenerator[str, None]:
+    """Stream batch progress on every finished run until the batch ends."""
+    batch = get_backtest_batch(batch_id)
+    if batch is None:
+        yield json.dumps({"error": "Backtest batch not found."})
+        return
+    try:
+        async for state in batch.updates():
+            yield json.dumps(state, default=str)
+    except (asyncio.CancelledError, WebSocketDisconnect):
+        logging.info("Client disconnected from backtest batch %s stream", batch_id)
+        return
+
+
+async def _run_backtest_batch(data: dict[str, Any]) -> Any:
+    """Validate a batch request and start it in the background."""
+    if not data.get("start_date"):
+        return json_response(
+            {"error": "Missing required field: start_date"},
+            status_code=400,
+        )
+    try:
+        start_dt = _parse_request_datetime(data.get("start_date"), "start_date")
+        end_dt = (
+            _parse_request_datetime(data.get("end_date"), "end_date")
+            if data.get("end_date")
+            else datetime.now(UTC)
+        )
+        runs = build_backtest_batch_runs(data, start_dt, end_dt)
+        config_service = await Config.instance()
+        batch = start_backtest_batch(
+            config_service.snapshot(), runs, data.get("rank_by")
+        )
+    except BacktestValidationError as exc:
+        return json_response(
+            {"error": str(exc), "code": "invalid_backtest_request"},
+            status_code=400,
+        )
+    return json_response(batch.to_dict(), status_code=202)
+
+
 def _parse_request_datetime(value: Any, field: str) -> datetime:
     """Normalize API date payloads to timezone-aware UTC datetimes."""
     if isinstance(value, datetime):
@@ -124,4 +197,9 @@ def _parse_request_datetime(value: Any, field: str) -> datetime:
     return parsed.astimezone(UTC)
 
 
-route_handlers = [run_backtest]
+route_handlers = [
+    run_backtest,
+    run_backtest_batch,
+    backtest_batch_status,
+    backtest_batch_progress,
+]
@@ -10,9 +10,12 @@ from litestar.exceptions import SerializationException
 from litestar.handlers import get, post
 from litestar.params import FromPath, FromQuery
 from litestar.response import File
+from service.backfill_jobs import backfill_progress
 from service.config import Config
 from service.log_viewer import LogViewerService
 from service.monitoring import MonitoringService
+from service.startup_report import get_startup_report
+from service.watcher_runtime import get_active_runtime_state
 
 logging = helper.LoggerFactory.get_logger(
     "logs/controller.log", "controller_monitoring"
@@ -70,6 +73,31 @@ async def download_monitoring_log_source(source: FromPath[str]) -> Any:
     )
 
 
+@get(path="/monitoring/caches")
+async def get_monitoring_cache_stats() -> Any:
+    """Return hit, miss, and refresh latency counters of async caches."""
+    return {"caches": helper.async_cache_stats()}
+
+
+@get(path="/monitoring/backfills")
+async def get_monitoring_backfills() -> Any:
+    """Return progress of background data backfills started since boot."""
+    return {"backfills": backfill_progress()}
+
+
+@get(path="/monitoring/dca")
+async def get_monitoring_dca_workers() -> Any:
+    """Return queue depth and per-symbol latency of the DCA worker pool."""
+    metrics = get_active_runtime_state().dca_metrics
+    return {"dca": metrics.snapshot() if metrics is not None else None}
+
+
+@get(path="/monitoring/startup")
+async def get_monitoring_startup() -> Any:
+    """Return durations of the startup phases of this process."""
+    return get_startup_report().to_dict()
+
+
 @post(path="/monitoring/test")
 async def test_monitoring_telegram(request: Request[Any, Any, Any]) -> Any:
     """Send a monitoring test message to Telegram."""
@@ -97,5 +125,9 @@ route_handlers = [
     get_monitoring_log_sources,
     get_monitoring_log_source,
     download_monitoring_log_source,
+    get_monitoring_cache_stats,
+    get_monitoring_backfills,
+    get_monitoring_dca_workers,
+    get_monitoring_startup,
     test_monitoring_telegram,
 ]
@@ -6,9 +6,11 @@ from collections.abc import AsyncGenerator
 from typing import Any
 
 import helper
+from controller.websocket_streams import stream_fanout
+from litestar import WebSocket
 from litestar.exceptions import WebSocketDisconnect
 from litestar.handlers import get, websocket_stream
-from litestar.params import FromPath
+from litestar.params import FromPath, FromQuery
 from service.config import Config
 from service.exchange import Exchange
 from service.statistic import Statistic
@@ -77,17 +79,20 @@ async def stop_websocket_fanout() -> None:
     await _profit_fanout.stop()
 
 
-@websocket_stream(path="/statistic/profit", warn_on_data_discard=False)
-async def profit() -> AsyncGenerator[str, None]:
+@websocket_stream(path="/statistic/profit", listen_for_disconnect=False)
+async def profit(
+    socket: WebSocket[Any, Any, Any], protocol: FromQuery[str | None] = None
+) -> AsyncGenerator[str, None]:
     """WebSocket endpoint for streaming profit statistics.
 
-    Sends profit data to connected clients every 5 seconds.
+    Sends profit data to connected clients every 5 seconds, as field patches
+    when the client connects with ``?protocol=delta``.
 
     Raises:
         asyncio.CancelledError: When client disconnects.
     """
     try:
-        async for output in _profit_fanout.subscribe():
+        async for output in stream_fanout(_profit_fanout, socket, protocol=protocol):
             yield output
     except (asyncio.CancelledError, WebSocketDisconnect):
         # Handle disconnection gracefully
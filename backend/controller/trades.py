@@ -2,17 +2,26 @@
 
 import asyncio
 import json
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from typing import Any
 
 import helper
 from controller.responses import json_response
+from controller.websocket_streams import stream_fanout
+from litestar import WebSocket
 from litestar.exceptions import WebSocketDisconnect
 from litestar.handlers import get, post, websocket_stream
 from litestar.params import FromPath, FromQuery
 from service.config import Config
 from service.order_requests import normalize_order_symbol
 from service.spot_sidestep_campaign import SpotSidestepCampaignService
+from service.trade_events import (
+    TRADE_STREAM_CLOSED,
+    TRADE_STREAM_OPEN,
+    TRADE_STREAM_UNSELLABLE,
+    TRADE_STREAM_WAITING,
+    subscribe_trade_state_changes,
+)
 from service.trade_replay_indicators import TradeReplayIndicatorService
 from service.trades import Trades
 from service.trading_controls import TradingControlsService
@@ -23,6 +32,14 @@ trades = Trades()
 trading_controls = TradingControlsService()
 trade_replay_indicators = TradeReplayIndicatorService(trades)
 
+# Trade streams refresh on change notifications; polling is only a safety net
+# for writes that bypass the notification bus and for time-based status fields.
+TRADE_STREAM_FALLBACK_INTERVAL_SECONDS = 15
+TRADE_STREAM_MIN_INTERVAL_SECONDS = 0.5
+# Row identifiers for ``?protocol=delta`` patches.
+OPEN_TRADE_KEY_FIELDS = ("symbol",)
+ARCHIVED_TRADE_KEY_FIELDS = ("id",)
+
 
 def _json_dumps(payload: Any) -> str:
     return json.dumps(payload, default=str)
@@ -74,32 +91,65 @@ async def _build_waiting_campaigns_payload() -> str:
 
 _open_trades_fanout = WebSocketFanout(
     name="open_trades",
-    interval_seconds=5,
+    interval_seconds=TRADE_STREAM_FALLBACK_INTERVAL_SECONDS,
+    min_interval_seconds=TRADE_STREAM_MIN_INTERVAL_SECONDS,
     producer=_build_open_trades_payload,
     logger=logging,
 )
 _closed_trades_fanout = WebSocketFanout(
     name="closed_trades",
-    interval_seconds=5,
+    interval_seconds=TRADE_STREAM_FALLBACK_INTERVAL_SECONDS,
+    min_interval_seconds=TRADE_STREAM_MIN_INTERVAL_SECONDS,
     producer=_build_closed_trades_payload,
     logger=logging,
 )
 _unsellable_trades_fanout = WebSocketFanout(
     name="unsellable_trades",
-    interval_seconds=5,
+    interval_seconds=TRADE_STREAM_FALLBACK_INTERVAL_SECONDS,
+    min_interval_seconds=TRADE_STREAM_MIN_INTERVAL_SECONDS,
     producer=_build_unsellable_trades_payload,
     logger=logging,
 )
 _waiting_campaigns_fanout = WebSocketFanout(
     name="waiting_campaigns",
-    interval_seconds=5,
+    interval_seconds=TRADE_STREAM_FALLBACK_INTERVAL_SECONDS,
+    min_interval_seconds=TRADE_STREAM_MIN_INTERVAL_SECONDS,
     producer=_build_waiting_campaigns_payload,
     logger=logging,
 )
 
+_trade_streams = {
+    TRADE_STREAM_OPEN: (_get_open_trades_cached, _open_trades_fanout),
+    TRADE_STREAM_CLOSED: (_get_closed_trades_cached, _closed_trades_fanout),
+    TRADE_STREAM_UNSELLABLE: (
+        _get_unsellable_trades_cached,
+        _unsellable_trades_fanout,
+    ),
+    TRADE_STREAM_WAITING: (_get_waiting_campaigns_cached, _waiting_campaigns_fanout),
+}
+_unsubscribe_trade_changes: Callable[[], None] | None = None
+
+
+async def _on_trade_state_changed(streams: frozenset[str]) -> None:
+    """Drop the cached lists of the changed streams and wake those streams."""
+    for stream in streams:
+        entry = _trade_streams.get(stream)
+        if entry is None:
+            continue
+        getter, fanout = entry
+        cache_clear = getattr(getter, "cache_clear", None)
+        if cache_clear is not None:
+            await cache_clear()
+        fanout.notify()
+
 
 async def start_websocket_fanout() -> None:
     """Start shared websocket fan-out workers for trades streams."""
+    global _unsubscribe_trade_changes
+    if _unsubscribe_trade_changes is None:
+        _unsubscribe_trade_changes = subscribe_trade_state_changes(
+            _on_trade_state_changed
+        )
     await _open_trades_fanout.start()
     await _closed_trades_fanout.start()
     await _unsellable_trades_fanout.start()
@@ -108,50 +158,82 @@ async def start_websocket_fanout() -> None:
 
 async def stop_websocket_fanout() -> None:
     """Stop shared websocket fan-out workers for trades streams."""
+    global _unsubscribe_trade_changes
+    if _unsubscribe_trade_changes is not None:
+        _unsubscribe_trade_changes()
+        _unsubscribe_trade_changes = None
     await _open_trades_fanout.stop()
     await _closed_trades_fanout.stop()
     await _unsellable_trades_fanout.stop()
     await _waiting_campaigns_fanout.stop()
 
 
-@websocket_stream(path="/trades/open", warn_on_data_discard=False)
-async def open_trades() -> AsyncGenerator[str, None]:
-    """WebSocket endpoint for streaming open trades data every 5 seconds."""
+@websocket_stream(path="/trades/open", listen_for_disconnect=False)
+async def open_trades(
+    socket: WebSocket[Any, Any, Any], protocol: FromQuery[str | None] = None
+) -> AsyncGenerator[str, None]:
+    """WebSocket endpoint for streaming open trades data on change."""
     try:
-        async for output in _open_trades_fanout.subscribe():
+        async for output in stream_fanout(
+            _open_trades_fanout,
+            socket,
+            protocol=protocol,
+            key_fields=OPEN_TRADE_KEY_FIELDS,
+        ):
             yield output
     except (asyncio.CancelledError, WebSocketDisconnect):
         logging.info("Client disconnected from open trades WebSocket")
         return
 
 
-@websocket_stream(path="/trades/closed", warn_on_data_discard=False)
-async def closed_trades() -> AsyncGenerator[str, None]:
-    """WebSocket endpoint for streaming closed trades data every 5 seconds."""
+@websocket_stream(path="/trades/closed", listen_for_disconnect=False)
+async def closed_trades(
+    socket: WebSocket[Any, Any, Any], protocol: FromQuery[str | None] = None
+) -> AsyncGenerator[str, None]:
+    """WebSocket endpoint for streaming closed trades data on change."""
     try:
-        async for output in _closed_trades_fanout.subscribe():
+        async for output in stream_fanout(
+            _closed_trades_fanout,
+            socket,
+            protocol=protocol,
+            key_fields=ARCHIVED_TRADE_KEY_FIELDS,
+        ):
             yield output
     except (asyncio.CancelledError, WebSocketDisconnect):
         logging.info("Client disconnected from closed trades WebSocket")
         return
 
 
-@websocket_stream(path="/trades/unsellable", warn_on_data_discard=False)
-async def unsellable_trades() -> AsyncGenerator[str, None]:
-    """WebSocket endpoint for streaming unsellable trades data every 5 seconds."""
+@websocket_stream(path="/trades/unsellable", listen_for_disconnect=False)
+async def unsellable_trades(
+    socket: WebSocket[Any, Any, Any], protocol: FromQuery[str | None] = None
+) -> AsyncGenerator[str, None]:
+    """WebSocket endpoint for streaming unsellable trades data on change."""
     try:
-        async for output in _unsellable_trades_fanout.subscribe():
+        async for output in stream_fanout(
+            _unsellable_trades_fanout,
+            socket,
+            protocol=protocol,
+            key_fields=ARCHIVED_TRADE_KEY_FIELDS,
+        ):
             yield output
     except (asyncio.CancelledError, WebSocketDisconnect):
         logging.info("Client disconnected from unsellable trades WebSocket")
         return
 
 
-@websocket_stream(path="/trades/waiting", warn_on_data_discard=False)
-async def waiting_campaigns() -> AsyncGenerator[str, None]:
+@websocket_stream(path="/trades/waiting", listen_for_disconnect=False)
+async def waiting_campaigns(
+    socket: WebSocket[Any, Any, Any], protocol: FromQuery[str | None] = None
+) -> AsyncGenerator[str, None]:
     """WebSocket endpoint for streaming waiting-campaign summaries."""
     try:
-        async for output in _waiting_campaigns_fanout.subscribe():
+        async for output in stream_fanout(
+            _waiting_campaigns_fanout,
+            socket,
+            protocol=protocol,
+            key_fields=OPEN_TRADE_KEY_FIELDS,
+        ):
             yield output
     except (asyncio.CancelledError, WebSocketDisconnect):
         logging.info("Client disconnected from waiting campaigns WebSocket")
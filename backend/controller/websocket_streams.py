@@ -0,0 +1,78 @@
+"""Shared streaming helper for fan-out backed WebSocket handlers."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from litestar import WebSocket
+from litestar.exceptions import WebSocketDisconnect
+from service.websocket_delta import DELTA_PROTOCOL, DeltaSession, is_resync_request
+from service.websocket_fanout import WebSocketFanout
+
+
+async def stream_fanout(
+    fanout: WebSocketFanout,
+    socket: WebSocket[Any, Any, Any],
+    *,
+    protocol: str | None = None,
+    key_fields: tuple[str, ...] = (),
+) -> AsyncGenerator[str, None]:
+    """Yield fan-out payloads, delta-encoded when the client asked for it.
+
+    Handlers using this must pass ``listen_for_disconnect=False`` because the
+    socket is read here to notice disconnects and resync requests.
+    """
+    # Accept before reading so the reader cannot consume the connect event.
+    await socket.accept()
+    session = DeltaSession(key_fields) if protocol == DELTA_PROTOCOL else None
+    resync = asyncio.Event()
+    subscription = fanout.subscribe()
+    reader = asyncio.create_task(_read_client_messages(socket, resync))
+    next_payload = asyncio.ensure_future(anext(subscription))
+    latest_payload: str | None = None
+    try:
+        while True:
+            resync_wait = asyncio.ensure_future(resync.wait())
+            done, _ = await asyncio.wait(
+                {next_payload, reader, resync_wait},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            resync_wait.cancel()
+            if reader in done:
+                return
+            should_send = False
+            if next_payload in done:
+                try:
+                    latest_payload = next_payload.result()
+                except StopAsyncIteration:
+                    return
+                next_payload = asyncio.ensure_future(anext(subscription))
+                should_send = True
+            if resync.is_set():
+                resync.clear()
+                if session is not None:
+                    session.request_resync()
+                    should_send = True
+            if not should_send or latest_payload is None:
+                continue
+            yield latest_payload if session is None else session.encode(latest_payload)
+    finally:
+        for task in (reader, next_payload):
+            task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+            await asyncio.gather(reader, next_payload, return_exceptions=True)
+        await subscription.aclose()
+
+
+async def _read_client_messages(
+    socket: WebSocket[Any, Any, Any], resync: asyncio.Event
+) -> None:
+    """Read client messages until disconnect, flagging resync requests."""
+    while True:
+        try:
+            message = await socket.receive_text()
+        except WebSocketDisconnect:
+            return
+        if is_resync_request(message):
+            resync.set()
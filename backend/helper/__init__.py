@@ -1,5 +1,6 @@
 """Helper package exports for logging, utilities, and async cache."""
 
+from .async_cache import async_cache_stats as async_cache_stats
 from .async_cache import async_ttl_cache as async_ttl_cache
 from .datetimes import ensure_utc as ensure_utc
 from .datetimes import parse_datetime as parse_datetime
@@ -11,6 +12,7 @@ from .utils import Utils as Utils
 __all__ = [
     "LoggerFactory",
     "Utils",
+    "async_cache_stats",
     "async_ttl_cache",
     "ensure_utc",
     "parse_datetime",
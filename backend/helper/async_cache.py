@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import inspect
+import time
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any, TypeVar
 
 from cachetools import TTLCache
@@ -12,35 +14,139 @@ from cachetools import TTLCache
 F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
 
 
-def async_ttl_cache(maxsize: int, ttl: int) -> Callable[[F], F]:
+@dataclass
+class AsyncCacheStats:
+    """Hit, miss, and refresh counters for one cached function."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    refresh_seconds_total: float = 0.0
+    refresh_seconds_max: float = 0.0
+
+    def record_refresh(self, seconds: float, *, failed: bool) -> None:
+        """Record one producer run."""
+        self.refreshes += 1
+        if failed:
+            self.refresh_errors += 1
+        self.refresh_seconds_total += seconds
+        self.refresh_seconds_max = max(self.refresh_seconds_max, seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the counters with the mean refresh latency."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "refresh_seconds_avg": (
+                self.refresh_seconds_total / self.refreshes if self.refreshes else 0.0
+            ),
+            "refresh_seconds_max": self.refresh_seconds_max,
+        }
+
+
+_stats_registry: dict[str, AsyncCacheStats] = {}
+
+
+def async_cache_stats() -> dict[str, dict[str, Any]]:
+    """Return counters for every function decorated with async_ttl_cache."""
+    return {name: stats.to_dict() for name, stats in sorted(_stats_registry.items())}
+
+
+def async_ttl_cache(
+    maxsize: int, ttl: float, *, stale_ttl: float = 0.0
+) -> Callable[[F], F]:
     """Cache async function results in a TTL cache.
 
     This is a minimal async wrapper around cachetools TTLCache to avoid
-    depending on asyncache while keeping TTL + LRU behavior.
+    depending on asyncache while keeping TTL + LRU behavior. Concurrent
+    misses for the same key share one call of the wrapped function. With
+    ``stale_ttl`` an expired value is still returned for that many seconds
+    while a single background call refreshes it.
     """
-    cache: TTLCache[Any, Any] = TTLCache(maxsize=maxsize, ttl=ttl)
-    lock = asyncio.Lock()
+    # Entries outlive ``ttl`` by the stale window; freshness is tracked per entry.
+    cache: TTLCache[Any, tuple[float, Any]] = TTLCache(
+        maxsize=maxsize, ttl=ttl + max(0.0, stale_ttl)
+    )
+    inflight: dict[Any, asyncio.Task[Any]] = {}
+    generation = 0
 
     def decorator(func: F) -> F:
         if not inspect.iscoroutinefunction(func):
             raise TypeError("async_ttl_cache can only be used with async functions")
 
+        stats = _stats_registry.setdefault(
+            f"{func.__module__}.{func.__qualname__}", AsyncCacheStats()
+        )
+
+        async def produce(
+            key: Any, args: Any, kwargs: Any, started_generation: int
+        ) -> Any:
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException:
+                stats.record_refresh(time.perf_counter() - started, failed=True)
+                raise
+            finally:
+                if inflight.get(key) is asyncio.current_task():
+                    del inflight[key]
+            stats.record_refresh(time.perf_counter() - started, failed=False)
+            # A cache_clear during the call means the result may be outdated.
+            if started_generation == generation:
+                cache[key] = (time.monotonic() + ttl, result)
+            return result
+
+        def start_refresh(key: Any, args: Any, kwargs: Any) -> asyncio.Task[Any]:
+            task = inflight.get(key)
+            if task is not None and task.get_loop() is asyncio.get_running_loop():
+                return task
+            task = asyncio.create_task(produce(key, args, kwargs, generation))
+            task.add_done_callback(_consume_task_exception)
+            inflight[key] = task
+            return task
+
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             key = (args, tuple(sorted(kwargs.items())))
-            async with lock:
-                if key in cache:
-                    return cache[key]
-            result = await func(*args, **kwargs)
-            async with lock:
-                cache[key] = result
-            return result
+            entry = cache.get(key)
+            if entry is not None:
+                fresh_until, value = entry
+                if time.monotonic() < fresh_until:
+                    stats.hits += 1
+                    return value
+                stats.stale_hits += 1
+                start_refresh(key, args, kwargs)
+                return value
+            task = inflight.get(key)
+            if task is not None and task.get_loop() is asyncio.get_running_loop():
+                stats.coalesced += 1
+            else:
+                stats.misses += 1
+                task = start_refresh(key, args, kwargs)
+            # Shield so a cancelled caller does not cancel the shared call.
+            return await asyncio.shield(task)
 
         async def cache_clear() -> None:
             """Clear cached values for callers that mutate the backing store."""
-            async with lock:
-                cache.clear()
+            nonlocal generation
+            generation += 1
+            cache.clear()
+            inflight.clear()
 
         wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.cache_stats = stats.to_dict  # type: ignore[attr-defined]
         return wrapper  # type: ignore[return-value]
 
     return decorator
+
+
+def _consume_task_exception(task: asyncio.Task[Any]) -> None:
+    """Mark failures of unawaited background refreshes as retrieved."""
+    if not task.cancelled():
+        task.exception()
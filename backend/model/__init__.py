@@ -6,6 +6,8 @@ from .autopilot import Autopilot as Autopilot
 from .autopilotmemoryevent import AutopilotMemoryEvent as AutopilotMemoryEvent
 from .autopilotmemorystate import AutopilotMemoryState as AutopilotMemoryState
 from .autopilotsymbolmemory import AutopilotSymbolMemory as AutopilotSymbolMemory
+from .backfillcheckpoint import BackfillCheckpoint as BackfillCheckpoint
+from .backfillretry import BackfillRetry as BackfillRetry
 from .closedtrades import ClosedTrades as ClosedTrades
 from .listings import Listings as Listings
 from .opentrades import OpenTrades as OpenTrades
@@ -19,6 +21,7 @@ from .tradereplaycandles import TradeReplayCandles as TradeReplayCandles
 from .trades import Trades as Trades
 from .unsellabletrades import UnsellableTrades as UnsellableTrades
 from .upnlhistory import UpnlHistory as UpnlHistory
+from .upnlhistoryrollup import UpnlHistoryRollup as UpnlHistoryRollup
 
 __all__ = [
     "AppConfig",
@@ -27,6 +30,8 @@ __all__ = [
     "AutopilotMemoryEvent",
     "AutopilotMemoryState",
     "AutopilotSymbolMemory",
+    "BackfillCheckpoint",
+    "BackfillRetry",
     "ClosedTrades",
     "Listings",
     "OpenTrades",
@@ -40,6 +45,7 @@ __all__ = [
     "Trades",
     "UnsellableTrades",
     "UpnlHistory",
+    "UpnlHistoryRollup",
 ]
 
 if __name__ == "__main__":
@@ -62,4 +68,7 @@ if __name__ == "__main__":
         "UnsellableTrades",
         "Listings",
         "UpnlHistory",
+        "UpnlHistoryRollup",
+        "BackfillCheckpoint",
+        "BackfillRetry",
     ]
@@ -0,0 +1,16 @@
+"""Background backfill checkpoint model."""
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class BackfillCheckpoint(Model):
+    """Last source row id processed by a resumable background backfill."""
+
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=64, unique=True)
+    last_id = fields.IntField(default=0)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "backfill_checkpoints"
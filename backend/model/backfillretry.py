@@ -0,0 +1,18 @@
+"""Background backfill retry model."""
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class BackfillRetry(Model):
+    """Source row a resumable backfill skipped and retries on later runs."""
+
+    id = fields.IntField(primary_key=True)
+    name = fields.CharField(max_length=64)
+    source_id = fields.IntField()
+    attempts = fields.IntField(default=1)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "backfill_retries"
+        unique_together = (("name", "source_id"),)
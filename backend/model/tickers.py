@@ -14,6 +14,7 @@ class Tickers(Model):
     low = fields.FloatField()
     close = fields.FloatField()
     volume = fields.FloatField()
+    ts = fields.BigIntField(null=True)
 
     class Meta:
         table = "tickers"
@@ -0,0 +1,21 @@
+"""Downsampled uPNL history model."""
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class UpnlHistoryRollup(Model):
+    """Last uPNL snapshot per time bucket for one rollup resolution."""
+
+    id = fields.IntField(primary_key=True)
+    resolution = fields.CharField(max_length=8)
+    bucket_start = fields.DatetimeField()
+    timestamp = fields.DatetimeField()
+    upnl = fields.FloatField(default=0.0)
+    profit_overall = fields.FloatField(default=0.0)
+    funds_locked = fields.FloatField(default=0.0)
+
+    class Meta:
+        table = "upnl_history_rollups"
+        unique_together = (("resolution", "bucket_start"),)
+        indexes = (("resolution", "timestamp"),)
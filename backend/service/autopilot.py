@@ -15,8 +15,8 @@ from service.capital_budget_logic import (
     calculate_effective_capital_limit,
 )
 from service.green_phase import AVAILABLE_QUOTE_UNSET, GreenPhaseService
+from service.profit_ledger import get_closed_profit_ledger
 from tortoise.exceptions import BaseORMException
-from tortoise.functions import Sum
 
 logging = helper.LoggerFactory.get_logger("logs/autopilot.log", "autopilot")
 
@@ -91,15 +91,7 @@ class Autopilot:
         ):
             return 0.0
         try:
-            result = (
-                await model.ClosedTrades.all()
-                .annotate(total=Sum("profit"))
-                .values_list(
-                    "total",
-                    flat=True,
-                )
-            )
-            return float((result[0] if result else 0.0) or 0.0)
+            return await get_closed_profit_ledger().total_profit()
         except BaseORMException as exc:
             logging.warning("Autopilot profit stretch unavailable: %s", exc)
             return 0.0
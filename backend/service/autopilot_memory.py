@@ -251,6 +251,12 @@ class AutopilotMemoryService:
         self._snapshots: list[SymbolMemorySnapshot] = []
         self._snapshot_map: dict[str, SymbolMemorySnapshot] = {}
         self._events: list[dict[str, Any]] = []
+        # Analysed closed-trade window keyed by id (ascending) for incremental
+        # refreshes; unparseable rows are kept as None so the row limit holds.
+        self._window: dict[int, ClosedTradeMemoryRow | None] = {}
+        self._symbol_rows: dict[str, list[tuple[int, ClosedTradeMemoryRow]]] = {}
+        self._last_closed_trade_id: int | None = None
+        self._compute_signature: tuple[float, float, float] | None = None
 
     @classmethod
     async def instance(cls) -> "AutopilotMemoryService":
@@ -575,47 +581,171 @@ class AutopilotMemoryService:
         }
 
     async def refresh_state(self) -> None:
-        """Recompute the persisted symbol-memory state from closed trades."""
+        """Fold newly closed trades into the persisted symbol-memory state.
+
+        Only closed trades above the last processed id are read. Symbols with
+        new or expired trades are recomputed (all symbols when the duration
+        baseline or sizing config moved) and only changed snapshots are
+        rewritten. Trust decay cancels out of every weighted ratio, so
+        untouched symbols keep their snapshot as time passes.
+        """
         try:
-            raw_rows = (
-                await model.ClosedTrades.filter(
-                    Q(close_reason__isnull=True)
-                    | ~Q(close_reason__in=[TradeCloseReason.SIDESTEP_EXIT.value])
-                )
-                .order_by("-id")
-                .limit(self.MAX_ANALYSIS_ROWS)
-                .values(
-                    "symbol",
-                    "close_date",
-                    "duration",
-                    "open_date",
-                    "profit",
-                    "profit_percent",
+            changed_symbols = await self._sync_analysis_window()
+            now = _utc_now()
+            duration_baseline = self._global_duration_baseline()
+            base_order_amount = _safe_float(self.config.get("bo"))
+            signature = (
+                duration_baseline,
+                base_order_amount,
+                _base_order_stretch_multiplier(self.config),
+            )
+            previous_by_symbol = {
+                snapshot.symbol: snapshot for snapshot in self._snapshots
+            }
+            if signature != self._compute_signature:
+                changed_symbols = set(self._symbol_rows) | set(previous_by_symbol)
+
+            next_by_symbol = dict(previous_by_symbol)
+            for symbol in changed_symbols:
+                symbol_rows = self._symbol_rows.get(symbol)
+                snapshot = (
+                    self._compute_symbol_snapshot(
+                        symbol,
+                        [row for _, row in symbol_rows],
+                        now=now,
+                        duration_baseline=duration_baseline,
+                        base_order_amount=base_order_amount,
+                    )
+                    if symbol_rows
+                    else None
                 )
+                if snapshot is None:
+                    next_by_symbol.pop(symbol, None)
+                else:
+                    next_by_symbol[symbol] = snapshot
+
+            snapshots = sorted(
+                next_by_symbol.values(),
+                key=lambda snapshot: (
+                    snapshot.trust_direction != "favored",
+                    -abs(snapshot.trust_score - 50.0),
+                    -snapshot.trust_score,
+                    snapshot.symbol,
+                ),
+            )
+            state = self._build_state(
+                snapshots,
+                total_closes=sum(1 for row in self._window.values() if row),
+                now=now,
             )
-            computation = self._compute_state(raw_rows)
             events = self._build_refresh_events(
                 previous_state=self._state_with_staleness(),
                 previous_snapshots=self._snapshot_map,
-                next_state=computation["state"],
-                next_snapshots=computation["snapshots"],
+                next_state=state,
+                next_snapshots=snapshots,
             )
             await self._persist_snapshot(
-                state_payload=computation["state"],
-                snapshots=computation["snapshots"],
+                state_payload=state,
+                snapshots=[
+                    snapshot
+                    for symbol, snapshot in next_by_symbol.items()
+                    if previous_by_symbol.get(symbol) != snapshot
+                ],
+                removed_symbols=[
+                    symbol
+                    for symbol in previous_by_symbol
+                    if symbol not in next_by_symbol
+                ],
                 events=events,
             )
-            self._state = computation["state"]
-            self._snapshots = computation["snapshots"]
+            self._compute_signature = signature
+            self._state = state
+            self._snapshots = snapshots
             self._snapshot_map = {
                 _normalize_symbol_key(snapshot.symbol): snapshot
                 for snapshot in self._snapshots
             }
-            await self._load_events()
+            if events:
+                await self._load_events()
         except Exception as exc:  # noqa: BLE001 - keep service resilient.
             logging.error("Autopilot memory refresh failed: %s", exc, exc_info=True)
+            self._last_closed_trade_id = None
             await self._mark_stale("refresh_failed")
 
+    async def _sync_analysis_window(self) -> set[str]:
+        """Load closed trades past the last processed id into the window.
+
+        Returns the symbols whose analysed rows changed. Deleted or replaced
+        rows inside the window are detected by count and trigger a reload.
+        """
+        query = model.ClosedTrades.filter(
+            Q(close_reason__isnull=True)
+            | ~Q(close_reason__in=[TradeCloseReason.SIDESTEP_EXIT.value])
+        )
+        last_id = self._last_closed_trade_id
+        if last_id is not None and self._window:
+            present = await query.filter(
+                id__gte=next(iter(self._window)), id__lte=last_id
+            ).count()
+            if present != len(self._window):
+                last_id = None
+        if last_id is None:
+            self._window = {}
+            self._symbol_rows = {}
+            self._compute_signature = None
+            query_new = query
+        else:
+            query_new = query.filter(id__gt=last_id)
+
+        raw_rows = (
+            await query_new.order_by("-id")
+            .limit(self.MAX_ANALYSIS_ROWS)
+            .values(
+                "id",
+                "symbol",
+                "close_date",
+                "duration",
+                "open_date",
+                "profit",
+                "profit_percent",
+            )
+        )
+        changed_symbols: set[str] = set()
+        for raw_row in reversed(raw_rows):
+            row_id = int(raw_row["id"])
+            row = self._parse_memory_row(raw_row)
+            self._window[row_id] = row
+            if row is not None:
+                self._symbol_rows.setdefault(row.symbol, []).append((row_id, row))
+                changed_symbols.add(row.symbol)
+        while len(self._window) > self.MAX_ANALYSIS_ROWS:
+            expired_id = next(iter(self._window))
+            expired = self._window.pop(expired_id)
+            if expired is None:
+                continue
+            symbol_rows = [
+                entry
+                for entry in self._symbol_rows.get(expired.symbol, [])
+                if entry[0] != expired_id
+            ]
+            if symbol_rows:
+                self._symbol_rows[expired.symbol] = symbol_rows
+            else:
+                self._symbol_rows.pop(expired.symbol, None)
+            changed_symbols.add(expired.symbol)
+        for symbol in changed_symbols:
+            if symbol in self._symbol_rows:
+                # Newest first, ties by newest id, as the trust rules expect.
+                self._symbol_rows[symbol].sort(
+                    key=lambda entry: (entry[1].close_date, entry[0]), reverse=True
+                )
+
+        if raw_rows:
+            self._last_closed_trade_id = int(raw_rows[0]["id"])
+        elif last_id is None:
+            self._last_closed_trade_id = 0
+        return changed_symbols
+
     async def _run_loop(self) -> None:
         """Refresh the memory snapshot on a fixed interval."""
         while self._running:
@@ -727,9 +857,14 @@ class AutopilotMemoryService:
         *,
         state_payload: dict[str, Any],
         snapshots: list[SymbolMemorySnapshot],
+        removed_symbols: list[str],
         events: list[MemoryEventCandidate],
     ) -> None:
-        """Persist a successful refresh atomically."""
+        """Persist a successful refresh atomically.
+
+        ``snapshots`` holds only new or changed symbols; unchanged rows are
+        left alone and ``removed_symbols`` are deleted.
+        """
 
         async def _operation() -> None:
             async with in_transaction() as conn:
@@ -741,7 +876,14 @@ class AutopilotMemoryService:
                     using_db=conn,
                     **state_payload,
                 )
-                await model.AutopilotSymbolMemory.all().using_db(conn).delete()
+                stale_symbols = [
+                    *removed_symbols,
+                    *(snapshot.symbol for snapshot in snapshots),
+                ]
+                if stale_symbols:
+                    await model.AutopilotSymbolMemory.filter(
+                        symbol__in=stale_symbols
+                    ).using_db(conn).delete()
                 if snapshots:
                     await model.AutopilotSymbolMemory.bulk_create(
                         [
@@ -849,43 +991,193 @@ class AutopilotMemoryService:
                 state["baseline_mode_active"] = True
         return state
 
-    def _compute_state(self, raw_rows: list[dict[str, Any]]) -> dict[str, Any]:
-        """Build the next global state and symbol snapshots from closed trades."""
-        now = _utc_now()
-        closed_rows: list[ClosedTradeMemoryRow] = []
-        profitable_durations: list[float] = []
-
-        for raw_row in raw_rows:
-            symbol = str(raw_row.get("symbol") or "").strip()
-            close_date = _parse_datetime(raw_row.get("close_date"))
-            if not symbol or close_date is None:
-                continue
-            duration_hours = _parse_duration_hours(
+    def _parse_memory_row(self, raw_row: dict[str, Any]) -> ClosedTradeMemoryRow | None:
+        """Parse one closed-trade row, or return None when it is unusable."""
+        symbol = str(raw_row.get("symbol") or "").strip()
+        close_date = _parse_datetime(raw_row.get("close_date"))
+        if not symbol or close_date is None:
+            return None
+        return ClosedTradeMemoryRow(
+            symbol=symbol,
+            close_date=close_date,
+            duration_hours=_parse_duration_hours(
                 raw_row.get("duration"),
                 open_date=raw_row.get("open_date"),
                 close_date=raw_row.get("close_date"),
+            ),
+            profit=_safe_float(raw_row.get("profit")),
+            profit_percent=_safe_float(raw_row.get("profit_percent")),
+        )
+
+    def _global_duration_baseline(self) -> float:
+        """Return the mean profitable close duration across the window."""
+        profitable_durations = [
+            row.duration_hours
+            for row in self._window.values()
+            if row is not None and row.duration_hours is not None and row.profit >= 0
+        ]
+        if not profitable_durations:
+            return 24.0
+        return sum(profitable_durations) / len(profitable_durations)
+
+    def _compute_symbol_snapshot(
+        self,
+        symbol: str,
+        symbol_rows: list[ClosedTradeMemoryRow],
+        *,
+        now: datetime,
+        duration_baseline: float,
+        base_order_amount: float,
+    ) -> SymbolMemorySnapshot | None:
+        """Score one symbol from its closed trades, newest first."""
+        sample_size = len(symbol_rows)
+        confidence_progress = _clamp(
+            sample_size / float(self.SYMBOL_CONFIDENT_CLOSES),
+            0.0,
+            1.0,
+        )
+        weighted_profit_sum = 0.0
+        weight_total = 0.0
+        weighted_speed_sum = 0.0
+        weighted_duration_sum = 0.0
+        profitable_closes = 0
+        loss_count = 0
+        slow_close_count = 0
+
+        for trade in symbol_rows:
+            age_days = max(
+                (_ensure_utc(now) - _ensure_utc(trade.close_date)).total_seconds()
+                / 86_400,
+                0.0,
             )
-            profit = _safe_float(raw_row.get("profit"))
-            profit_percent = _safe_float(raw_row.get("profit_percent"))
-            closed_rows.append(
-                ClosedTradeMemoryRow(
-                    symbol=symbol,
-                    close_date=close_date,
-                    duration_hours=duration_hours,
-                    profit=profit,
-                    profit_percent=profit_percent,
+            weight = math.exp(-(age_days / self.DECAY_DAYS))
+            normalized_profit = _clamp(trade.profit_percent / 2.0, -1.0, 1.0)
+            weighted_profit_sum += normalized_profit * weight
+            weight_total += weight
+            if trade.profit >= 0:
+                profitable_closes += 1
+            else:
+                loss_count += 1
+            if trade.duration_hours is not None:
+                weighted_duration_sum += trade.duration_hours * weight
+                duration_score = (duration_baseline - trade.duration_hours) / max(
+                    duration_baseline, 0.5
                 )
-            )
-            if duration_hours is not None and profit >= 0:
-                profitable_durations.append(duration_hours)
+                weighted_speed_sum += _clamp(duration_score, -1.0, 1.0) * weight
+                if trade.duration_hours > (duration_baseline * 1.1):
+                    slow_close_count += 1
+
+        if weight_total <= 0:
+            return None
+
+        weighted_profit_signal = weighted_profit_sum / weight_total
+        weighted_close_hours = (
+            weighted_duration_sum / weight_total if weighted_duration_sum else 0.0
+        )
+        win_signal = (
+            ((profitable_closes / sample_size) - 0.5) * 2.0 if sample_size else 0.0
+        )
+        speed_signal = weighted_speed_sum / weight_total if weighted_speed_sum else 0.0
+        recent_losses = sum(
+            1 for trade in symbol_rows[:2] if float(trade.profit or 0.0) < 0
+        )
+        stability_penalty = min(
+            0.25 * recent_losses + 0.15 * max(slow_close_count - 1, 0),
+            0.7,
+        )
+        raw_score = (
+            0.45 * weighted_profit_signal
+            + 0.30 * win_signal
+            + 0.25 * speed_signal
+            - stability_penalty
+        )
+        trust_score = 50.0 + (_clamp(raw_score, -1.0, 1.0) * 30.0 * confidence_progress)
+        trust_score = round(_clamp(trust_score, 0.0, 100.0), 3)
+        tp_delta_ratio = _clamp((trust_score - 50.0) / 20.0, -1.0, 1.0)
+
+        if sample_size < self.MIN_SYMBOL_CLOSES:
+            trust_direction = "neutral"
+        elif trust_score >= 55:
+            trust_direction = "favored"
+        elif trust_score <= 45:
+            trust_direction = "cooling"
+        else:
+            trust_direction = "neutral"
+
+        primary_reason_code: str | None = None
+        primary_reason_value: int | None = None
+        secondary_reason_code: str | None = None
+        secondary_reason_value: int | None = None
+
+        if trust_direction == "favored":
+            if speed_signal >= weighted_profit_signal and profitable_closes > 0:
+                primary_reason_code = "quick_profitable_closes"
+                primary_reason_value = profitable_closes
+            else:
+                primary_reason_code = "strong_profit_quality"
+                primary_reason_value = profitable_closes
+        elif trust_direction == "cooling":
+            if slow_close_count > 0:
+                primary_reason_code = "slow_exits"
+                primary_reason_value = slow_close_count
+            else:
+                primary_reason_code = "recent_losses"
+                primary_reason_value = max(loss_count, recent_losses)
+
+        if sample_size < self.SYMBOL_CONFIDENT_CLOSES:
+            secondary_reason_code = "thin_history"
+            secondary_reason_value = sample_size
+        elif trust_direction == "favored" and slow_close_count > 0:
+            secondary_reason_code = "slow_exits"
+            secondary_reason_value = slow_close_count
+        elif trust_direction == "cooling" and profitable_closes > 0:
+            secondary_reason_code = "quick_profitable_closes"
+            secondary_reason_value = profitable_closes
+
+        max_bo_delta = _base_order_delta_limit(
+            base_order_amount,
+            stretch_multiplier=_base_order_stretch_multiplier(self.config),
+        )
+        suggested_base_order = max(
+            0.0,
+            base_order_amount + tp_delta_ratio * max_bo_delta,
+        )
+
+        return SymbolMemorySnapshot(
+            symbol=symbol,
+            trust_score=trust_score,
+            trust_direction=trust_direction,
+            confidence_bucket=_confidence_bucket(sample_size),
+            confidence_progress=round(confidence_progress, 6),
+            sample_size=sample_size,
+            profitable_closes=profitable_closes,
+            loss_count=loss_count,
+            slow_close_count=slow_close_count,
+            weighted_profit_percent=round(weighted_profit_signal * 2.0, 6),
+            weighted_close_hours=round(weighted_close_hours, 6),
+            tp_delta_ratio=round(tp_delta_ratio, 6),
+            suggested_base_order=round(suggested_base_order, 8),
+            primary_reason_code=primary_reason_code,
+            primary_reason_value=primary_reason_value,
+            secondary_reason_code=secondary_reason_code,
+            secondary_reason_value=secondary_reason_value,
+            last_closed_at=symbol_rows[0].close_date,
+        )
 
+    def _build_state(
+        self,
+        snapshots: list[SymbolMemorySnapshot],
+        *,
+        total_closes: int,
+        now: datetime,
+    ) -> dict[str, Any]:
+        """Build the global state from sorted symbol snapshots."""
         required_closes = self.REQUIRED_CLOSES
         enabled = bool(self.config.get("autopilot", False))
-        total_closes = len(closed_rows)
         baseline_take_profit = _safe_float(self.config.get("tp"))
         base_order_amount = _safe_float(self.config.get("bo"))
 
-        if not closed_rows:
+        if not total_closes:
             empty_state = self._build_default_state()
             empty_state.update(
                 {
@@ -894,168 +1186,7 @@ class AutopilotMemoryService:
                     "last_updated_at": now,
                 }
             )
-            return {"state": empty_state, "snapshots": []}
-
-        global_duration_baseline = (
-            sum(profitable_durations) / len(profitable_durations)
-            if profitable_durations
-            else 24.0
-        )
-        per_symbol_rows: dict[str, list[ClosedTradeMemoryRow]] = {}
-        for row in closed_rows:
-            per_symbol_rows.setdefault(row.symbol, []).append(row)
-
-        snapshots: list[SymbolMemorySnapshot] = []
-        for symbol, symbol_rows in per_symbol_rows.items():
-            symbol_rows.sort(key=lambda row: row.close_date, reverse=True)
-            sample_size = len(symbol_rows)
-            confidence_progress = _clamp(
-                sample_size / float(self.SYMBOL_CONFIDENT_CLOSES),
-                0.0,
-                1.0,
-            )
-            weighted_profit_sum = 0.0
-            weight_total = 0.0
-            weighted_speed_sum = 0.0
-            weighted_duration_sum = 0.0
-            profitable_closes = 0
-            loss_count = 0
-            slow_close_count = 0
-
-            for trade in symbol_rows:
-                age_days = max(
-                    (_ensure_utc(now) - _ensure_utc(trade.close_date)).total_seconds()
-                    / 86_400,
-                    0.0,
-                )
-                weight = math.exp(-(age_days / self.DECAY_DAYS))
-                normalized_profit = _clamp(trade.profit_percent / 2.0, -1.0, 1.0)
-                weighted_profit_sum += normalized_profit * weight
-                weight_total += weight
-                if trade.profit >= 0:
-                    profitable_closes += 1
-                else:
-                    loss_count += 1
-                if trade.duration_hours is not None:
-                    weighted_duration_sum += trade.duration_hours * weight
-                    duration_score = (
-                        global_duration_baseline - trade.duration_hours
-                    ) / max(global_duration_baseline, 0.5)
-                    weighted_speed_sum += _clamp(duration_score, -1.0, 1.0) * weight
-                    if trade.duration_hours > (global_duration_baseline * 1.1):
-                        slow_close_count += 1
-
-            if weight_total <= 0:
-                continue
-
-            weighted_profit_signal = weighted_profit_sum / weight_total
-            weighted_close_hours = (
-                weighted_duration_sum / weight_total if weighted_duration_sum else 0.0
-            )
-            win_signal = (
-                ((profitable_closes / sample_size) - 0.5) * 2.0 if sample_size else 0.0
-            )
-            speed_signal = (
-                weighted_speed_sum / weight_total if weighted_speed_sum else 0.0
-            )
-            recent_losses = sum(
-                1 for trade in symbol_rows[:2] if float(trade.profit or 0.0) < 0
-            )
-            stability_penalty = min(
-                0.25 * recent_losses + 0.15 * max(slow_close_count - 1, 0),
-                0.7,
-            )
-            raw_score = (
-                0.45 * weighted_profit_signal
-                + 0.30 * win_signal
-                + 0.25 * speed_signal
-                - stability_penalty
-            )
-            trust_score = 50.0 + (
-                _clamp(raw_score, -1.0, 1.0) * 30.0 * confidence_progress
-            )
-            trust_score = round(_clamp(trust_score, 0.0, 100.0), 3)
-            tp_delta_ratio = _clamp((trust_score - 50.0) / 20.0, -1.0, 1.0)
-
-            if sample_size < self.MIN_SYMBOL_CLOSES:
-                trust_direction = "neutral"
-            elif trust_score >= 55:
-                trust_direction = "favored"
-            elif trust_score <= 45:
-                trust_direction = "cooling"
-            else:
-                trust_direction = "neutral"
-
-            primary_reason_code: str | None = None
-            primary_reason_value: int | None = None
-            secondary_reason_code: str | None = None
-            secondary_reason_value: int | None = None
-
-            if trust_direction == "favored":
-                if speed_signal >= weighted_profit_signal and profitable_closes > 0:
-                    primary_reason_code = "quick_profitable_closes"
-                    primary_reason_value = profitable_closes
-                else:
-                    primary_reason_code = "strong_profit_quality"
-                    primary_reason_value = profitable_closes
-            elif trust_direction == "cooling":
-                if slow_close_count > 0:
-                    primary_reason_code = "slow_exits"
-                    primary_reason_value = slow_close_count
-                else:
-                    primary_reason_code = "recent_losses"
-                    primary_reason_value = max(loss_count, recent_losses)
-
-            if sample_size < self.SYMBOL_CONFIDENT_CLOSES:
-                secondary_reason_code = "thin_history"
-                secondary_reason_value = sample_size
-            elif trust_direction == "favored" and slow_close_count > 0:
-                secondary_reason_code = "slow_exits"
-                secondary_reason_value = slow_close_count
-            elif trust_direction == "cooling" and profitable_closes > 0:
-                secondary_reason_code = "quick_profitable_closes"
-                secondary_reason_value = profitable_closes
-
-            max_bo_delta = _base_order_delta_limit(
-                base_order_amount,
-                stretch_multiplier=_base_order_stretch_multiplier(self.config),
-            )
-            suggested_base_order = max(
-                0.0,
-                base_order_amount + tp_delta_ratio * max_bo_delta,
-            )
-
-            snapshots.append(
-                SymbolMemorySnapshot(
-                    symbol=symbol,
-                    trust_score=trust_score,
-                    trust_direction=trust_direction,
-                    confidence_bucket=_confidence_bucket(sample_size),
-                    confidence_progress=round(confidence_progress, 6),
-                    sample_size=sample_size,
-                    profitable_closes=profitable_closes,
-                    loss_count=loss_count,
-                    slow_close_count=slow_close_count,
-                    weighted_profit_percent=round(weighted_profit_signal * 2.0, 6),
-                    weighted_close_hours=round(weighted_close_hours, 6),
-                    tp_delta_ratio=round(tp_delta_ratio, 6),
-                    suggested_base_order=round(suggested_base_order, 8),
-                    primary_reason_code=primary_reason_code,
-                    primary_reason_value=primary_reason_value,
-                    secondary_reason_code=secondary_reason_code,
-                    secondary_reason_value=secondary_reason_value,
-                    last_closed_at=symbol_rows[0].close_date,
-                )
-            )
-
-        snapshots.sort(
-            key=lambda snapshot: (
-                snapshot.trust_direction != "favored",
-                -abs(snapshot.trust_score - 50.0),
-                -snapshot.trust_score,
-                snapshot.symbol,
-            )
-        )
+            return empty_state
 
         featured_snapshot = snapshots[0] if snapshots else None
         favored_rows = [
@@ -1139,7 +1270,7 @@ class AutopilotMemoryService:
             "last_success_at": now,
         }
 
-        return {"state": state, "snapshots": snapshots}
+        return state
 
     def _build_refresh_events(
         self,
@@ -0,0 +1,133 @@
+"""Progress tracking and checkpoints for background data backfills.
+
+Long-running migrations run after the API is already serving. Each job
+reports its progress here for ``GET /monitoring/backfills``; jobs that walk a
+table by id also store the last processed id so a restart resumes instead of
+starting over. Rows a job could not finish are recorded as retries with an
+attempt count, so they are picked up again without holding the checkpoint
+back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import helper
+import model
+
+logging = helper.LoggerFactory.get_logger("logs/database.log", "backfill_jobs")
+
+
+@dataclass
+class BackfillProgress:
+    """Live progress of one background backfill run."""
+
+    name: str
+    status: str = "running"
+    processed: int = 0
+    total: int = 0
+    last_id: int | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    def advance(self, processed: int, last_id: int | None = None) -> None:
+        """Record finished work items and the last processed source id."""
+        self.processed += processed
+        if last_id is not None:
+            self.last_id = last_id
+
+    def finish(self, status: str, error: str | None = None) -> None:
+        """Mark the run as completed, failed, or cancelled."""
+        self.status = status
+        self.error = error
+        self.finished_at = helper.utc_now()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the API payload for this run."""
+        return {
+            "name": self.name,
+            "status": self.status,
+            "processed": self.processed,
+            "total": self.total,
+            "last_id": self.last_id,
+            "started_at": _isoformat_or_none(self.started_at),
+            "finished_at": _isoformat_or_none(self.finished_at),
+            "error": self.error,
+        }
+
+
+_jobs: dict[str, BackfillProgress] = {}
+
+
+def _isoformat_or_none(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def backfill_progress() -> list[dict[str, Any]]:
+    """Return the latest run of every backfill started in this process."""
+    return [progress.to_dict() for _, progress in sorted(_jobs.items())]
+
+
+@contextmanager
+def tracked_backfill(name: str) -> Iterator[BackfillProgress]:
+    """Register a backfill run and record how it ended."""
+    progress = BackfillProgress(name=name, started_at=helper.utc_now())
+    _jobs[name] = progress
+    try:
+        yield progress
+    except asyncio.CancelledError:
+        progress.finish("cancelled")
+        raise
+    except Exception as exc:  # noqa: BLE001 - record, then let callers handle it.
+        progress.finish("failed", error=str(exc))
+        raise
+    progress.finish("completed")
+    logging.info(
+        "Backfill %s completed: %s/%s processed.",
+        name,
+        progress.processed,
+        progress.total,
+    )
+
+
+async def load_backfill_checkpoint(name: str) -> int:
+    """Return the last source id processed by ``name``, or 0."""
+    checkpoint = await model.BackfillCheckpoint.filter(name=name).first()
+    return int(checkpoint.last_id) if checkpoint is not None else 0
+
+
+async def save_backfill_checkpoint(name: str, last_id: int) -> None:
+    """Persist the last source id processed by ``name``."""
+    await model.BackfillCheckpoint.update_or_create(
+        defaults={"last_id": last_id}, name=name
+    )
+
+
+async def load_backfill_retries(name: str, max_attempts: int) -> list[int]:
+    """Return the source ids ``name`` should retry, oldest first."""
+    return await (
+        model.BackfillRetry.filter(name=name, attempts__lt=max_attempts)
+        .order_by("source_id")
+        .values_list("source_id", flat=True)
+    )
+
+
+async def record_backfill_retry(name: str, source_id: int) -> None:
+    """Count one more failed attempt of ``name`` on ``source_id``."""
+    retry, created = await model.BackfillRetry.get_or_create(
+        name=name, source_id=source_id
+    )
+    if not created:
+        retry.attempts += 1
+        await retry.save(update_fields=["attempts", "updated_at"])
+
+
+async def clear_backfill_retry(name: str, source_id: int) -> None:
+    """Forget ``source_id`` once ``name`` processed it successfully."""
+    await model.BackfillRetry.filter(name=name, source_id=source_id).delete()
@@ -1,16 +1,24 @@
 """Backtest engine — candle-by-candle replay with DCA simulation.
 
-Fetches historical OHLCV from the exchange, replays a strategy graph
-candle-by-candle, simulates DCA lifecycle (entry, safety orders, TP/SL exits),
-and returns synthetic trade results with chart markers and analytics stats.
+Fetches historical OHLCV through the on-disk candle cache, replays a strategy
+graph candle-by-candle, simulates DCA lifecycle (entry, safety orders, TP/SL
+exits), and returns synthetic trade results with chart markers and analytics
+stats.
+
+Stateless strategy graphs are compiled into one boolean signal array over the
+whole range, so replay only steps the simulator while a trade is open and
+jumps straight to the next candidate entry candle otherwise.
 """
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import UTC, datetime, timezone
 from typing import Any
 
 import helper
+import numpy as np
 import pandas as pd
 from service.analytics import compute_stats_from_trades
 from service.data_ohlcv import resample_ohlcv_data
@@ -27,9 +35,18 @@ from service.dca_math import (
 )
 from service.exchange import Exchange
 from service.indicators import Indicators
+from service.ohlcv_disk_cache import (
+    OhlcvCacheKey,
+    covered_span,
+    get_ohlcv_disk_cache,
+)
 from service.strategy_capability import get_strategy_min_history_candles
 from service.strategy_chart_indicators import StrategyChartIndicatorBuilder
-from service.strategy_runtime import evaluate_strategy_graph
+from service.strategy_runtime import (
+    StrategyEvaluationResult,
+    compile_strategy_signal_mask,
+    evaluate_strategy_graph,
+)
 
 logging = helper.LoggerFactory.get_logger("logs/backtest.log", "backtest")
 
@@ -189,7 +206,11 @@ async def fetch_ohlcv(
     end_date: int | None = None,
     max_candles: int = MAX_CANDLES,
 ) -> list[OhlcvCandle]:
-    """Fetch historical OHLCV from exchange with pagination and rate-limit awareness.
+    """Fetch historical OHLCV, reading closed candles from the disk cache.
+
+    Only spans missing from the cache are requested from the exchange, with
+    pagination and rate-limit awareness. The still-forming candle is fetched
+    live and never persisted.
 
     Args:
         config: Exchange config (exchange name, API keys, etc.)
@@ -201,32 +222,109 @@ async def fetch_ohlcv(
     Returns:
         Sorted list of candles, oldest first.
     """
-    exchange = Exchange()
+    start_ms = max(0, int(start_date))
+    step_ms = TIMEFRAME_TO_MS.get(timeframe)
+    exchange: Exchange | None = None
     try:
-        raw = await exchange.get_history_for_symbol_batched(
-            config,
-            symbol,
-            timeframe,
-            since=start_date if start_date > 0 else 0,
-            until=end_date,
-            page_size=OHLCV_PAGE_SIZE,
-            max_candles=max_candles,
-            page_delay=OHLCV_PAGE_DELAY,
-        )
+        if step_ms is None:
+            exchange = Exchange()
+            return _rows_to_candles(
+                await _fetch_exchange_rows(
+                    exchange, config, symbol, timeframe, start_ms, end_date, max_candles
+                )
+            )
 
-        return [
-            OhlcvCandle(
-                timestamp=int(c[0]),
-                open_price=float(c[1]),
-                high=float(c[2]),
-                low=float(c[3]),
-                close=float(c[4]),
-                volume=float(c[5]),
+        now_ms = _now_ms()
+        upper_ms = now_ms if end_date is None else min(now_ms, int(end_date))
+        closed_end_ms = min(upper_ms, now_ms - step_ms)
+        cache = get_ohlcv_disk_cache()
+        key = OhlcvCacheKey.from_config(config, symbol, timeframe)
+        async with cache.lock(key):
+            for span in cache.missing_spans(key, start_ms, closed_end_ms):
+                cached_before = cache.read(key, start_ms, span[0] - 1, max_candles)
+                if len(cached_before) >= max_candles:
+                    # Candles before this gap already fill the request.
+                    break
+                exchange = exchange or Exchange()
+                span_candles = (span[1] - span[0]) // step_ms + 1
+                rows = await _fetch_exchange_rows(
+                    exchange,
+                    config,
+                    symbol,
+                    timeframe,
+                    span[0],
+                    span[1],
+                    min(max_candles, span_candles),
+                )
+                covered = covered_span(
+                    span,
+                    rows,
+                    step_ms,
+                    cache.first_timestamp_after(key, span[1]),
+                )
+                if covered is not None:
+                    await asyncio.to_thread(cache.store, key, rows, covered)
+            rows = cache.read(key, start_ms, closed_end_ms, max_candles)
+
+        if len(rows) < max_candles and upper_ms > closed_end_ms:
+            exchange = exchange or Exchange()
+            live_rows = await _fetch_exchange_rows(
+                exchange,
+                config,
+                symbol,
+                timeframe,
+                max(start_ms, closed_end_ms + 1),
+                upper_ms,
+                max_candles - len(rows),
             )
-            for c in raw
-        ]
+            rows = np.concatenate((rows, live_rows))
+        return _rows_to_candles(rows)
     finally:
-        await exchange.close()
+        if exchange is not None:
+            await exchange.close()
+
+
+async def _fetch_exchange_rows(
+    exchange: Exchange,
+    config: dict[str, Any],
+    symbol: str,
+    timeframe: str,
+    start_ms: int,
+    end_ms: int | None,
+    max_candles: int,
+) -> np.ndarray:
+    """Fetch one span from the exchange as an ``(n, 6)`` float array."""
+    raw = await exchange.get_history_for_symbol_batched(
+        config,
+        symbol,
+        timeframe,
+        since=start_ms,
+        until=end_ms,
+        page_size=OHLCV_PAGE_SIZE,
+        max_candles=max_candles,
+        page_delay=OHLCV_PAGE_DELAY,
+    )
+    return np.array([c[:6] for c in raw], dtype=float).reshape(-1, 6)
+
+
+def _rows_to_candles(rows: np.ndarray) -> list[OhlcvCandle]:
+    """Convert ``(n, 6)`` OHLCV rows to candles."""
+    return [
+        OhlcvCandle(
+            timestamp=int(row[0]),
+            open_price=row[1],
+            high=row[2],
+            low=row[3],
+            close=row[4],
+            volume=row[5],
+        )
+        for row in rows.tolist()
+    ]
+
+
+def _now_ms() -> int:
+    """Return the current wall-clock time in Unix milliseconds."""
+    return int(time.time() * 1000)
 
 
 # ── Indicator pre-computation ──────────────────────────────────────────────────
@@ -453,6 +551,8 @@ class Backtest:
         trade_mode: str = TRADE_MODE_DYNAMIC_DCA,
         sidestep_bearish_strategy: str | None = None,
         sidestep_reentry_strategy: str | None = None,
+        vectorized: bool = True,
+        candles: list[OhlcvCandle] | None = None,
     ) -> None:
         self.config = config
         self.strategy_slug = strategy_slug
@@ -494,14 +594,16 @@ class Backtest:
             "sidestep_reentry_strategy",
             required=self.trade_mode == TRADE_MODE_SIDESTEP,
         )
-        self._candles: list[OhlcvCandle] | None = None
+        self._candles: list[OhlcvCandle] | None = candles
         self._indicators: Indicators | None = None
         self._open_trade: BacktestTradeState | None = None
         self._closed_trades: list[BacktestTrade] = []
         self._chart_markers: list[dict[str, Any]] = []
         self._still_open_at_end: bool = False
         self._sidestep_waiting_at_end: bool = False
+        self.vectorized = _bool_flag(vectorized, "vectorized")
         self._state_store: dict[tuple[str, str, str, str], Any] = {}
+        self._signal_masks: dict[tuple[str, str], np.ndarray] = {}
         self._chart_indicator_builder = StrategyChartIndicatorBuilder(
             self.symbol,
             self.timeframe,
@@ -569,13 +671,20 @@ class Backtest:
     ) -> None:
         """Replay the default dynamic DCA lifecycle."""
         await self._preload_strategy_snapshots(self.strategy_slug)
-        await self._warm_strategy_state(
+        await self._prepare_strategies(
             ((self.strategy_slug, "buy"),),
             indicators,
+            len(candles),
             replay_start_index,
         )
 
-        for idx in range(replay_start_index, len(candles) - 1):
+        idx = replay_start_index - 1
+        while idx < len(candles) - 2:
+            idx += 1
+            if not self._open_trade:
+                idx = self._next_signal_index(self.strategy_slug, "buy", idx)
+                if idx >= len(candles) - 1:
+                    break
             candle = candles[idx]
             next_candle = candles[idx + 1]
 
@@ -654,13 +763,20 @@ class Backtest:
         bearish_strategy = self.sidestep_bearish_strategy or ""
         reentry_strategy = self.sidestep_reentry_strategy or ""
         await self._preload_strategy_snapshots(bearish_strategy, reentry_strategy)
-        await self._warm_strategy_state(
+        await self._prepare_strategies(
             ((bearish_strategy, "sell"), (reentry_strategy, "buy")),
             indicators,
+            len(candles),
             replay_start_index,
         )
 
-        for idx in range(replay_start_index, len(candles) - 1):
+        idx = replay_start_index - 1
+        while idx < len(candles) - 2:
+            idx += 1
+            if not self._open_trade:
+                idx = self._next_signal_index(reentry_strategy, "buy", idx)
+                if idx >= len(candles) - 1:
+                    break
             candle = candles[idx]
             next_candle = candles[idx + 1]
 
@@ -758,6 +874,43 @@ class Backtest:
             replay_start_index,
         )
 
+    async def _prepare_strategies(
+        self,
+        strategies: tuple[tuple[str, str], ...],
+        indicators: Indicators,
+        candle_count: int,
+        replay_start_index: int,
+    ) -> None:
+        """Compile stateless graphs and warm state for the remaining ones."""
+        stateful: list[tuple[str, str]] = []
+        for slug, side in strategies:
+            mask = None
+            if self.vectorized:
+                mask = await compile_strategy_signal_mask(
+                    slug,
+                    self.timeframe,
+                    self.symbol,
+                    side,
+                    indicators,
+                    candle_count,
+                )
+            if mask is None:
+                stateful.append((slug, side))
+            else:
+                self._signal_masks[(slug, side)] = mask
+        await self._warm_strategy_state(tuple(stateful), indicators, replay_start_index)
+
+    def _next_signal_index(self, strategy_slug: str, side: str, start: int) -> int:
+        """Return the first candidate candle at or after ``start``.
+
+        Graphs without a compiled mask are evaluated on every candle.
+        """
+        mask = self._signal_masks.get((strategy_slug, side))
+        if mask is None:
+            return start
+        candidates = np.flatnonzero(mask[start:])
+        return start + int(candidates[0]) if len(candidates) else len(mask)
+
     async def _evaluate_strategy(
         self,
         strategy_slug: str,
@@ -766,6 +919,12 @@ class Backtest:
         candle_index: int,
     ) -> Any:
         """Evaluate one strategy graph against the current replay candle."""
+        mask = self._signal_masks.get((strategy_slug, side))
+        if mask is not None:
+            matched = bool(mask[candle_index])
+            return StrategyEvaluationResult(
+                matched, None, "matched" if matched else "no_match"
+            )
         return await evaluate_strategy_graph(
             strategy_slug,
             self.timeframe,
@@ -827,16 +986,31 @@ class Backtest:
             }
         )
 
+    def fetch_window(self) -> tuple[str, str, int, int, int]:
+        """Return the OHLCV request of this run, including warmup candles.
+
+        Returns:
+            ``(symbol, timeframe, start_ms, end_ms, max_candles)``.
+        """
+        return (
+            self.symbol,
+            self.timeframe,
+            self._fetch_start_date,
+            self.end_date,
+            MAX_CANDLES + self._warmup_candle_count,
+        )
+
     async def _fetch(self) -> list[OhlcvCandle]:
         """Fetch OHLCV for the configured range."""
         if self._candles is None:
+            symbol, timeframe, start_ms, end_ms, max_candles = self.fetch_window()
             self._candles = await fetch_ohlcv(
                 self.config,
-                self.symbol,
-                self.timeframe,
-                self._fetch_start_date,
-                self.end_date,
-                max_candles=MAX_CANDLES + self._warmup_candle_count,
+                symbol,
+                timeframe,
+                start_ms,
+                end_ms,
+                max_candles=max_candles,
             )
         return self._candles
 
@@ -1046,6 +1220,13 @@ def _trade_mode(value: Any) -> str:
     return normalized
 
 
+def _bool_flag(value: Any, field: str) -> bool:
+    """Return a boolean request flag or raise a validation error."""
+    if not isinstance(value, bool):
+        raise BacktestValidationError(f"{field} must be a boolean")
+    return value
+
+
 def _strategy_slug(value: Any, field: str, *, required: bool) -> str | None:
     """Normalize optional strategy slugs used by sidestep replay."""
     normalized = str(value or "").strip()
@@ -0,0 +1,429 @@
+"""Parallel backtest batches for multi-symbol runs and parameter sweeps.
+
+A batch expands symbols, strategies, and swept DCA settings into individual
+backtest runs. OHLCV is fetched once per distinct candle window in the API
+process and shipped to a process pool together with the strategy snapshots,
+so workers neither touch the exchange nor the database and the API event loop
+stays responsive while runs are replayed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import helper
+import numpy as np
+from service.backtest import (
+    TIMEFRAME_TO_MS,
+    TRADE_MODE_SIDESTEP,
+    Backtest,
+    BacktestValidationError,
+    OhlcvCandle,
+    fetch_ohlcv,
+)
+from service.strategy_runtime import (
+    StrategySnapshot,
+    load_strategy_snapshots,
+    seed_strategy_snapshots,
+)
+
+logging = helper.LoggerFactory.get_logger("logs/backtest.log", "backtest_batch")
+
+MAX_BATCH_RUNS = 500
+MAX_RETAINED_BATCHES = 20
+BATCH_MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# Settings that accept either one value or a list of values to sweep.
+SWEEP_FIELDS: tuple[str, ...] = (
+    "base_order_size",
+    "take_profit_pct",
+    "stop_loss_pct",
+    "max_safety_orders",
+    "safety_order_step_pct",
+    "fee",
+)
+RANKABLE_STATS = frozenset(
+    {
+        "total_profit",
+        "avg_profit",
+        "avg_profit_percent",
+        "win_rate",
+        "total_trades",
+        "profit_trades",
+    }
+)
+DEFAULT_RANK_BY = "total_profit"
+
+BATCH_STATUS_QUEUED = "queued"
+BATCH_STATUS_RUNNING = "running"
+BATCH_STATUS_COMPLETED = "completed"
+BATCH_STATUS_FAILED = "failed"
+FINISHED_BATCH_STATUSES = frozenset({BATCH_STATUS_COMPLETED, BATCH_STATUS_FAILED})
+
+ExecutorFactory = Callable[[int], Executor]
+
+
+@dataclass(frozen=True)
+class BacktestBatchEntry:
+    """Picklable unit of work for one backtest run in a worker process."""
+
+    index: int
+    kwargs: dict[str, Any]
+    candles: np.ndarray
+    snapshots: dict[str, StrategySnapshot]
+
+
+@dataclass
+class BacktestBatch:
+    """Progress and ranked results of one batch."""
+
+    batch_id: str
+    total: int
+    rank_by: str = DEFAULT_RANK_BY
+    status: str = BATCH_STATUS_QUEUED
+    completed: int = 0
+    failed: int = 0
+    error: str | None = None
+    results: list[dict[str, Any]] = field(default_factory=list)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Return True once no further progress will be reported."""
+        return self.status in FINISHED_BATCH_STATUSES
+
+    def record(self, result: dict[str, Any]) -> None:
+        """Store one finished run and wake progress subscribers."""
+        self.results.append(result)
+        self.completed += 1
+        if result.get("error"):
+            self.failed += 1
+        self.notify()
+
+    def notify(self) -> None:
+        """Wake every subscriber waiting for the next progress update."""
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def ranked_results(self) -> list[dict[str, Any]]:
+        """Return successful runs best-first, followed by failed runs."""
+        succeeded = [result for result in self.results if not result.get("error")]
+        failed = [result for result in self.results if result.get("error")]
+        succeeded.sort(
+            key=lambda result: (
+                -float(result["metrics"].get(self.rank_by) or 0.0),
+                result["run"],
+            )
+        )
+        failed.sort(key=lambda result: result["run"])
+        ranked = []
+        for rank, result in enumerate(succeeded, start=1):
+            ranked.append({**result, "rank": rank})
+        ranked.extend({**result, "rank": None} for result in failed)
+        return ranked
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize batch progress and the current ranking."""
+        return {
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rank_by": self.rank_by,
+            "error": self.error,
+            "results": self.ranked_results(),
+        }
+
+    async def updates(self) -> AsyncGenerator[dict[str, Any], None]:
+        """Yield the batch state now and after every change until finished."""
+        while True:
+            changed = self._changed
+            yield self.to_dict()
+            if self.finished:
+                return
+            await changed.wait()
+
+
+_batches: OrderedDict[str, BacktestBatch] = OrderedDict()
+_batch_tasks: set[asyncio.Task[None]] = set()
+_batch_slot = asyncio.Semaphore(1)
+
+
+def build_backtest_batch_runs(
+    data: dict[str, Any],
+    start_date: datetime,
+    end_date: datetime,
+) -> list[dict[str, Any]]:
+    """Expand a batch request into ``Backtest`` keyword arguments per run."""
+    symbols = _string_list(data.get("symbols") or data.get("symbol"), "symbols")
+    trade_mode = str(data.get("trade_mode") or "dynamic_dca").strip().lower()
+    strategy_field = data.get("strategy_slugs") or data.get("strategy_slug")
+    if trade_mode == TRADE_MODE_SIDESTEP and not strategy_field:
+        strategy_field = data.get("sidestep_reentry_strategy")
+    strategies = _string_list(strategy_field, "strategy_slugs")
+    timeframe = str(data.get("timeframe") or "").strip()
+    if not timeframe:
+        raise BacktestValidationError("timeframe is required")
+
+    sweeps = {
+        name: _sweep_values(data[name], name)
+        for name in SWEEP_FIELDS
+        if data.get(name) is not None
+    }
+    run_count = len(symbols) * len(strategies)
+    for values in sweeps.values():
+        run_count *= len(values)
+    if run_count > MAX_BATCH_RUNS:
+        raise BacktestValidationError(
+            f"Batch expands to {run_count} runs; the limit is {MAX_BATCH_RUNS}"
+        )
+
+    runs: list[dict[str, Any]] = []
+    for symbol, strategy_slug in itertools.product(symbols, strategies):
+        for combination in itertools.product(*sweeps.values()):
+            runs.append(
+                {
+                    "symbol": symbol,
+                    "strategy_slug": strategy_slug,
+                    "timeframe": timeframe,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "trade_mode": trade_mode,
+                    "sidestep_bearish_strategy": data.get("sidestep_bearish_strategy"),
+                    "sidestep_reentry_strategy": data.get("sidestep_reentry_strategy"),
+                    "vectorized": data.get("vectorized", True),
+                    **dict(zip(sweeps, combination)),
+                }
+            )
+    return runs
+
+
+def start_backtest_batch(
+    config: dict[str, Any],
+    runs: list[dict[str, Any]],
+    rank_by: str | None = None,
+    *,
+    executor_factory: ExecutorFactory | None = None,
+) -> BacktestBatch:
+    """Validate runs, register a batch, and replay it in the background."""
+    rank_key = str(rank_by or DEFAULT_RANK_BY).strip()
+    if rank_key not in RANKABLE_STATS:
+        raise BacktestValidationError(f"Unsupported rank_by: {rank_by}")
+    if not runs:
+        raise BacktestValidationError("Batch contains no runs")
+    # Constructing the engines validates every run before anything is queued.
+    engines = [Backtest(config=config, **run) for run in runs]
+
+    batch = BacktestBatch(batch_id=uuid.uuid4().hex, total=len(runs), rank_by=rank_key)
+    _batches[batch.batch_id] = batch
+    _trim_finished_batches()
+    task = asyncio.create_task(
+        _run_batch(
+            batch,
+            config,
+            runs,
+            engines,
+            executor_factory or _process_pool,
+        ),
+        name=f"backtest_batch:{batch.batch_id}",
+    )
+    _batch_tasks.add(task)
+    task.add_done_callback(_batch_tasks.discard)
+    return batch
+
+
+def get_backtest_batch(batch_id: str) -> BacktestBatch | None:
+    """Return a running or recently finished batch."""
+    return _batches.get(batch_id)
+
+
+def run_backtest_batch_entry(entry: BacktestBatchEntry) -> dict[str, Any]:
+    """Replay one batch run; executed inside a worker process."""
+    seed_strategy_snapshots(entry.snapshots)
+    candles = [
+        OhlcvCandle(int(row[0]), row[1], row[2], row[3], row[4], row[5])
+        for row in entry.candles.tolist()
+    ]
+    engine = Backtest(config={}, candles=candles, **entry.kwargs)
+    result = asyncio.run(engine.run())
+    stats = result["stats"]
+    return _run_summary(
+        entry.index,
+        entry.kwargs,
+        metrics={
+            **stats["summary"],
+            **stats["drawdown"],
+            "candles_evaluated": stats.get("candles_evaluated"),
+            "still_open_at_end": stats.get("still_open_at_end"),
+        },
+    )
+
+
+async def _run_batch(
+    batch: BacktestBatch,
+    config: dict[str, Any],
+    runs: list[dict[str, Any]],
+    engines: list[Backtest],
+    executor_factory: ExecutorFactory,
+) -> None:
+    """Fetch shared inputs, fan runs out to the executor, and track progress."""
+    async with _batch_slot:
+        batch.status = BATCH_STATUS_RUNNING
+        batch.notify()
+        try:
+            entries = await _build_entries(config, runs, engines)
+            loop = asyncio.get_running_loop()
+            executor = executor_factory(min(len(entries), BATCH_MAX_WORKERS))
+            try:
+                pending = [_replay_entry(loop, executor, entry) for entry in entries]
+                for finished in asyncio.as_completed(pending):
+                    batch.record(await finished)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            batch.status = BATCH_STATUS_COMPLETED
+        except Exception as exc:  # noqa: BLE001 - report failures to pollers.
+            logging.error(
+                "Backtest batch %s failed: %s", batch.batch_id, exc, exc_info=True
+            )
+            batch.status = BATCH_STATUS_FAILED
+            batch.error = "Backtest batch failed. Check server logs for details."
+        finally:
+            batch.notify()
+
+
+async def _replay_entry(
+    loop: asyncio.AbstractEventLoop,
+    executor: Executor,
+    entry: BacktestBatchEntry,
+) -> dict[str, Any]:
+    """Replay one run in the executor; failures become per-run error rows."""
+    try:
+        return await loop.run_in_executor(executor, run_backtest_batch_entry, entry)
+    except Exception as exc:  # noqa: BLE001 - one bad run must not end the batch.
+        logging.error(
+            "Backtest batch run %s (%s/%s) failed: %s",
+            entry.index,
+            entry.kwargs.get("symbol"),
+            entry.kwargs.get("strategy_slug"),
+            exc,
+        )
+        return _run_summary(entry.index, entry.kwargs, error=str(exc))
+
+
+async def _build_entries(
+    config: dict[str, Any],
+    runs: list[dict[str, Any]],
+    engines: list[Backtest],
+) -> list[BacktestBatchEntry]:
+    """Fetch each symbol's OHLCV once and pair each run with its window."""
+    windows = [engine.fetch_window() for engine in engines]
+    series: dict[tuple[str, str, int], np.ndarray] = {}
+    for key, group in itertools.groupby(
+        sorted(windows), key=lambda window: (window[0], window[1], window[3])
+    ):
+        symbol, timeframe, end_ms = key
+        group_windows = list(group)
+        start_ms = group_windows[0][2]
+        step_ms = TIMEFRAME_TO_MS.get(timeframe, 0) or 1
+        # One request covering every run: the earliest start plus the longest
+        # candle budget measured from that start.
+        max_candles = max(
+            window[4] - (-(window[2] - start_ms) // step_ms) for window in group_windows
+        )
+        candles = await fetch_ohlcv(
+            config, symbol, timeframe, start_ms, end_ms, max_candles=max_candles
+        )
+        series[key] = np.array(
+            [(c.timestamp, c.open, c.high, c.low, c.close, c.volume) for c in candles],
+            dtype=float,
+        ).reshape(-1, 6)
+
+    slugs = {
+        slug
+        for run in runs
+        for slug in (
+            run.get("strategy_slug"),
+            run.get("sidestep_bearish_strategy"),
+            run.get("sidestep_reentry_strategy"),
+        )
+        if slug
+    }
+    snapshots = await load_strategy_snapshots(*sorted(slugs))
+    return [
+        BacktestBatchEntry(
+            index=index,
+            kwargs=run,
+            candles=_slice_window(series[(window[0], window[1], window[3])], window),
+            snapshots=snapshots,
+        )
+        for index, (run, window) in enumerate(zip(runs, windows))
+    ]
+
+
+def _slice_window(
+    candles: np.ndarray, window: tuple[str, str, int, int, int]
+) -> np.ndarray:
+    """Return the rows a dedicated fetch of ``window`` would have returned."""
+    first = int(np.searchsorted(candles[:, 0], window[2]))
+    return candles[first : first + window[4]]
+
+
+def _run_summary(
+    index: int,
+    kwargs: dict[str, Any],
+    *,
+    metrics: dict[str, Any] | None = None,
+    error: str | None = None,
+) -> dict[str, Any]:
+    """Return the result-table row of one run."""
+    return {
+        "run": index,
+        "symbol": kwargs.get("symbol"),
+        "strategy": kwargs.get("strategy_slug"),
+        "params": {name: kwargs[name] for name in SWEEP_FIELDS if name in kwargs},
+        "metrics": metrics or {},
+        "error": error,
+    }
+
+
+def _process_pool(max_workers: int) -> Executor:
+    """Create the worker pool; spawn keeps workers free of parent loop state."""
+    return ProcessPoolExecutor(
+        max_workers=max(1, max_workers),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _trim_finished_batches() -> None:
+    """Forget the oldest finished batches beyond the retention limit."""
+    finished = [batch_id for batch_id, batch in _batches.items() if batch.finished]
+    for batch_id in finished[: max(0, len(_batches) - MAX_RETAINED_BATCHES)]:
+        _batches.pop(batch_id, None)
+
+
+def _string_list(value: Any, field_name: str) -> list[str]:
+    """Normalize one string or a list of strings into unique non-empty values."""
+    items = value if isinstance(value, list) else [value]
+    normalized = [str(item).strip() for item in items if str(item or "").strip()]
+    if not normalized:
+        raise BacktestValidationError(f"{field_name} is required")
+    return list(dict.fromkeys(normalized))
+
+
+def _sweep_values(value: Any, field_name: str) -> list[Any]:
+    """Return the values of one swept setting."""
+    values = value if isinstance(value, list) else [value]
+    if not values:
+        raise BacktestValidationError(f"{field_name} must not be an empty list")
+    return list(dict.fromkeys(values))
@@ -8,6 +8,7 @@ from typing import Any
 
 import helper
 import model
+from service.analytics import get_analytics_state
 from service.config import (
     Config,
     build_removed_config_key_message,
@@ -17,10 +18,13 @@ from service.config import (
 )
 from service.data import Data
 from service.database import run_sqlite_write_with_retry
+from service.open_positions import get_open_position_cache
+from service.profit_ledger import get_closed_profit_ledger
 from service.trade_lifecycle_config import (
     build_invalid_backup_shape_error,
     resolve_trade_mode_config,
 )
+from service.watcher_runtime import get_active_candle_store
 from tortoise import fields
 from tortoise.transactions import in_transaction
 
@@ -37,6 +41,7 @@ TRADE_TABLE_MODELS: dict[str, type] = {
     "unsellable_trades": model.UnsellableTrades,
     "autopilot_history": model.Autopilot,
     "upnl_history": model.UpnlHistory,
+    "upnl_history_rollups": model.UpnlHistoryRollup,
 }
 
 
@@ -115,6 +120,7 @@ class BackupService:
 
                 await model.Tickers.all().using_db(conn).delete()
                 await model.UpnlHistory.all().using_db(conn).delete()
+                await model.UpnlHistoryRollup.all().using_db(conn).delete()
                 await model.Autopilot.all().using_db(conn).delete()
                 await model.UnsellableTrades.all().using_db(conn).delete()
                 await model.OpenTrades.all().using_db(conn).delete()
@@ -122,6 +128,8 @@ class BackupService:
                 await model.TradeReplayCandles.all().using_db(conn).delete()
                 await model.TradeExecutions.all().using_db(conn).delete()
                 await model.Trades.all().using_db(conn).delete()
+                # Restored trades must be revisited by background backfills.
+                await model.BackfillCheckpoint.all().using_db(conn).delete()
 
                 for table_name, rows in validated_trade_data.items():
                     model_class = TRADE_TABLE_MODELS[table_name]
@@ -132,6 +140,13 @@ class BackupService:
                         )
 
         await run_sqlite_write_with_retry(_restore, "restoring backup")
+        if validated_trade_data:
+            get_open_position_cache().invalidate()
+            get_closed_profit_ledger().invalidate()
+            get_analytics_state().invalidate()
+        candle_store = get_active_candle_store()
+        if candle_store is not None and validated_trade_data:
+            candle_store.clear()
 
         config = await Config.instance()
         await config.reload()
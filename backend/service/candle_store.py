@@ -0,0 +1,225 @@
+"""In-memory columnar candle buffers fed by the watcher OHLCV writer."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from service.resample_cache import ResampleCache
+from service.sqlite_timestamps import coerce_timestamp_like_to_ms
+
+CANDLE_PRICE_COLUMNS: tuple[str, ...] = ("open", "high", "low", "close", "volume")
+CANDLE_FRAME_COLUMNS: tuple[str, ...] = ("timestamp", "symbol", *CANDLE_PRICE_COLUMNS)
+
+
+class SymbolCandleBuffer:
+    """Append-only OHLCV arrays for one symbol with a bounded capacity.
+
+    The buffer mirrors every stored ticker row with a timestamp greater than
+    ``covered_since``. When capacity is reached the oldest rows are dropped and
+    ``covered_since`` advances so the coverage invariant keeps holding.
+    """
+
+    def __init__(self, symbol: str, covered_since: int, capacity: int) -> None:
+        self.symbol = symbol
+        self.covered_since = int(covered_since)
+        self.capacity = max(1, int(capacity))
+        self._timestamps = np.empty(self.capacity, dtype=np.int64)
+        self._values = np.empty((self.capacity, len(CANDLE_PRICE_COLUMNS)))
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def latest_timestamp(self) -> int | None:
+        """Return the newest buffered candle timestamp."""
+        if self._end == self._start:
+            return None
+        return int(self._timestamps[self._end - 1])
+
+    def append(self, timestamp: int, values: tuple[float, ...]) -> bool:
+        """Append one candle, returning False when it is out of order."""
+        latest = self.latest_timestamp
+        if latest is not None and timestamp < latest:
+            return False
+        if timestamp <= self.covered_since:
+            return False
+
+        if self._end == self.capacity:
+            self._compact()
+        self._timestamps[self._end] = timestamp
+        self._values[self._end] = values
+        self._end += 1
+        return True
+
+    def _compact(self) -> None:
+        """Move live rows to the front, dropping the oldest rows when full."""
+        size = len(self)
+        keep = min(size, self.capacity - max(1, self.capacity // 4))
+        drop = size - keep
+        if drop > 0:
+            self.covered_since = int(self._timestamps[self._start + drop - 1])
+        first = self._end - keep
+        self._timestamps[:keep] = self._timestamps[first : self._end]
+        self._values[:keep] = self._values[first : self._end]
+        self._start = 0
+        self._end = keep
+
+    def covers(self, start_timestamp: int) -> bool:
+        """Return True when rows newer than ``start_timestamp`` are all buffered."""
+        return int(start_timestamp) >= self.covered_since
+
+    def slice_frame(
+        self,
+        start_timestamp: int,
+        end_timestamp: int | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> pd.DataFrame | None:
+        """Return rows with ``start < timestamp <= end`` as a DataFrame."""
+        timestamps = self._timestamps[self._start : self._end]
+        lower = int(np.searchsorted(timestamps, int(start_timestamp), side="right"))
+        upper = (
+            len(timestamps)
+            if end_timestamp is None
+            else int(np.searchsorted(timestamps, int(end_timestamp), side="right"))
+        )
+        if upper <= lower:
+            return None
+
+        offset = self._start
+        values = self._values[offset + lower : offset + upper]
+        columns: dict[str, Any] = {
+            "timestamp": timestamps[lower:upper].copy(),
+            "symbol": self.symbol,
+        }
+        for index, column in enumerate(CANDLE_PRICE_COLUMNS):
+            columns[column] = values[:, index].copy()
+        frame = pd.DataFrame(columns, columns=list(CANDLE_FRAME_COLUMNS))
+        if fields is not None:
+            frame = frame[list(fields)]
+        return frame
+
+
+@dataclass
+class CandleStore:
+    """Per-symbol candle buffers warmed from SQLite and fed by the watcher."""
+
+    capacity: int = 100_000
+    buffers: dict[str, SymbolCandleBuffer] = field(default_factory=dict)
+    write_versions: dict[str, int] = field(default_factory=dict)
+    generation: int = 0
+    resampled: ResampleCache = field(default_factory=ResampleCache)
+
+    def get_write_version(self, symbol: str) -> tuple[int, int]:
+        """Return the mutation marker used to detect writes during warmup."""
+        return self.generation, self.write_versions.get(symbol, 0)
+
+    def _bump_write_version(self, symbol: str) -> None:
+        self.write_versions[symbol] = self.write_versions.get(symbol, 0) + 1
+
+    def can_serve(self, symbol: str, start_timestamp: int | float) -> bool:
+        """Return True when a read from ``start_timestamp`` needs no query."""
+        buffer = self.buffers.get(symbol)
+        return buffer is not None and buffer.covers(int(float(start_timestamp)))
+
+    def read(
+        self,
+        symbol: str,
+        start_timestamp: int | float,
+        end_timestamp: int | float | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> pd.DataFrame | None:
+        """Return buffered rows newer than ``start_timestamp`` for a symbol."""
+        buffer = self.buffers[symbol]
+        return buffer.slice_frame(
+            int(float(start_timestamp)),
+            None if end_timestamp is None else int(float(end_timestamp)),
+            fields,
+        )
+
+    def get_latest_timestamp(self, symbol: str) -> int | None:
+        """Return the newest buffered timestamp for a warmed symbol."""
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            return None
+        return buffer.latest_timestamp
+
+    def build_buffer(
+        self,
+        symbol: str,
+        covered_since: int | float,
+        rows: list[dict[str, Any]],
+    ) -> SymbolCandleBuffer | None:
+        """Build a buffer from queried rows newer than ``covered_since``.
+
+        This does not touch shared state, so callers may run it off the event
+        loop and install the result afterwards.
+        """
+        if not rows or len(rows) > self.capacity:
+            return None
+
+        buffer = SymbolCandleBuffer(symbol, int(float(covered_since)), self.capacity)
+        for row in rows:
+            candle = _normalize_candle_row(row)
+            if candle is None or not buffer.append(*candle):
+                return None
+        return buffer
+
+    def install(
+        self,
+        buffer: SymbolCandleBuffer,
+        write_version: tuple[int, int],
+    ) -> bool:
+        """Install a warmed buffer unless the symbol was written meanwhile."""
+        if write_version != self.get_write_version(buffer.symbol):
+            return False
+        self.buffers[buffer.symbol] = buffer
+        return True
+
+    def extend(self, payloads: Iterable[dict[str, Any]]) -> None:
+        """Append freshly persisted watcher candles to warmed buffers."""
+        for payload in payloads:
+            symbol = payload.get("symbol")
+            if not isinstance(symbol, str):
+                continue
+            self._bump_write_version(symbol)
+            buffer = self.buffers.get(symbol)
+            if buffer is None:
+                continue
+            candle = _normalize_candle_row(payload)
+            if candle is not None and candle[0] == buffer.latest_timestamp:
+                # Already picked up by a warmup query that raced this write.
+                continue
+            if candle is None or not buffer.append(*candle):
+                self.buffers.pop(symbol, None)
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop a symbol buffer after out-of-band ticker writes."""
+        self._bump_write_version(symbol)
+        self.buffers.pop(symbol, None)
+        self.resampled.invalidate(symbol)
+
+    def clear(self) -> None:
+        """Drop every buffer after bulk ticker table changes."""
+        self.generation += 1
+        self.buffers.clear()
+        self.resampled.clear()
+
+
+def _normalize_candle_row(
+    row: dict[str, Any],
+) -> tuple[int, tuple[float, ...]] | None:
+    """Convert a ticker row or watcher payload into buffer values."""
+    try:
+        timestamp = coerce_timestamp_like_to_ms(int(float(row["timestamp"])))
+        values = tuple(float(row[column]) for column in CANDLE_PRICE_COLUMNS)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if timestamp is None:
+        return None
+    return timestamp, values
@@ -17,9 +17,9 @@ from service.capital_budget_logic import (
     has_capital_budget_config,
     resolve_capital_max_fund,
 )
+from service.profit_ledger import get_closed_profit_ledger
 from service.spot_campaign_types import TradeExposureState
 from tortoise.exceptions import BaseORMException
-from tortoise.functions import Sum
 
 logging = helper.LoggerFactory.get_logger("logs/capital_budget.log", "capital_budget")
 
@@ -291,14 +291,7 @@ class CapitalBudgetService:
                 trade_cost = trades_by_symbol.get(symbol, 0.0)
                 funds_locked += open_cost if open_cost > 0 else trade_cost
 
-            closed_profit_rows = (
-                await model.ClosedTrades.all()
-                .annotate(total=Sum("profit"))
-                .values_list("total", flat=True)
-            )
-            closed_profit = float(
-                (closed_profit_rows[0] if closed_profit_rows else 0.0) or 0.0
-            )
+            closed_profit = await get_closed_profit_ledger().total_profit()
             return CapitalBudgetUsage(
                 funds_locked=round(funds_locked, 8),
                 open_trade_reserve=estimate_open_trade_reserve(config, open_trades),
@@ -22,6 +22,9 @@ __all__ = [
     "normalize_trade_mode",
 ]
 
+DEFAULT_DCA_WORKERS = 4
+MAX_DCA_WORKERS = 32
+
 
 def _optional_string(value: Any) -> str | None:
     """Normalize optional config strings with whitespace trimming."""
@@ -159,6 +162,8 @@ class WatcherRuntimeConfigView:
     btc_pulse_enabled: bool
     timeframe: str
     exchange_connection: ExchangeConnectionConfigView
+    dca_workers: int
+    batch_subscriptions: bool
 
     @classmethod
     def from_config(cls, config: dict[str, Any]) -> "WatcherRuntimeConfigView":
@@ -168,6 +173,19 @@ class WatcherRuntimeConfigView:
             btc_pulse_enabled=bool(config.get("btc_pulse", False)),
             timeframe=resolve_timeframe(config),
             exchange_connection=ExchangeConnectionConfigView.from_config(config),
+            dca_workers=min(
+                max(
+                    _int_config_value(
+                        config,
+                        "dca_workers",
+                        default=DEFAULT_DCA_WORKERS,
+                        falsey_fallback=DEFAULT_DCA_WORKERS,
+                    ),
+                    1,
+                ),
+                MAX_DCA_WORKERS,
+            ),
+            batch_subscriptions=bool(config.get("watcher_batch_subscriptions", True)),
         )
 
 
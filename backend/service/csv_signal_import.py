@@ -8,6 +8,7 @@ from typing import Any
 import helper
 import model
 from service.database import run_sqlite_write_with_retry
+from service.open_positions import get_open_position_cache
 from service.trade_math import (
     calculate_order_size,
     calculate_so_percentage,
@@ -146,6 +147,7 @@ class CSVSignalImportService:
         await run_sqlite_write_with_retry(
             _persist_import, "importing csv signal trades"
         )
+        get_open_position_cache().invalidate_symbols(symbols)
         logging.info(
             "Imported CSV signal trades for %s symbols (%s rows).",
             len(symbols),
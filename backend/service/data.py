@@ -10,6 +10,7 @@ import helper
 import model
 import pandas as pd
 from cachetools import TTLCache
+from service.candle_store import CANDLE_FRAME_COLUMNS
 from service.config import resolve_timeframe
 from service.data_history_sync import (
     HistorySyncState,
@@ -20,7 +21,7 @@ from service.data_ohlcv import (
     build_archived_ohlcv_payload,
     build_live_candle_payload,
     build_pair_ohlcv_payload,
-    resample_ohlcv_data,
+    resample_ohlcv_data_cached,
     rows_to_dataframe,
 )
 from service.data_timeframes import (
@@ -29,20 +30,31 @@ from service.data_timeframes import (
 )
 from service.database import run_sqlite_write_with_retry
 from service.exchange import Exchange
-from service.sqlite_timestamps import build_normalized_text_timestamp_sql
-from service.watcher_runtime import get_live_candle_snapshot
+from service.sqlite_timestamps import (
+    TICKER_EPOCH_COLUMN,
+    build_epoch_order_sql,
+    build_epoch_range_clause,
+    build_normalized_text_timestamp_sql,
+)
+from service.ticker_writer import write_ticker_rows
+from service.watcher_runtime import (
+    get_active_candle_store,
+    get_live_candle_snapshot,
+)
 from tortoise import Tortoise
 from tortoise.exceptions import BaseORMException
 
 logging = helper.LoggerFactory.get_logger("logs/data.log", "data")
 
-_TIME_SERIES_QUERY_SPECS: dict[str, tuple[str, tuple[str, ...]]] = {
+_TIME_SERIES_QUERY_SPECS: dict[str, tuple[str, str | None, tuple[str, ...]]] = {
     "tickers": (
         "symbol",
+        TICKER_EPOCH_COLUMN,
         ("id", "timestamp", "symbol", "open", "high", "low", "close", "volume"),
     ),
     "tradereplaycandles": (
         "deal_id",
+        None,
         (
             "id",
             "deal_id",
@@ -57,6 +69,20 @@ _TIME_SERIES_QUERY_SPECS: dict[str, tuple[str, tuple[str, ...]]] = {
     ),
 }
 _NORMALIZED_ROW_TIMESTAMP_SQL = build_normalized_text_timestamp_sql()
+_LATEST_TICKER_TIMESTAMP_SQL = (
+    "SELECT timestamp FROM ("
+    "SELECT timestamp, ts AS sort_ts FROM ("
+    "SELECT timestamp, ts FROM tickers "
+    "WHERE symbol = ? AND ts IS NOT NULL ORDER BY ts DESC LIMIT 1"
+    ") "
+    "UNION ALL "
+    "SELECT timestamp, sort_ts FROM ("
+    f"SELECT timestamp, {_NORMALIZED_ROW_TIMESTAMP_SQL} AS sort_ts FROM tickers "
+    "WHERE symbol = ? AND ts IS NULL "
+    f"ORDER BY {_NORMALIZED_ROW_TIMESTAMP_SQL} DESC, timestamp DESC LIMIT 1"
+    ")"
+    ") ORDER BY sort_ts DESC, timestamp DESC LIMIT 1"
+)
 
 
 class Data:
@@ -142,12 +168,14 @@ class Data:
     async def get_latest_timestamp_for_pair(self, pair: str) -> float | None:
         """Return the latest stored ticker timestamp for a pair."""
         symbol = self.utils.split_symbol(pair)
+        candle_store = get_active_candle_store()
+        if candle_store is not None:
+            buffered_timestamp = candle_store.get_latest_timestamp(symbol)
+            if buffered_timestamp is not None:
+                return float(buffered_timestamp)
         rows = await Tortoise.get_connection("default").execute_query_dict(
-            "SELECT timestamp FROM tickers "
-            "WHERE symbol = ? "
-            f"ORDER BY {_NORMALIZED_ROW_TIMESTAMP_SQL} DESC, timestamp DESC "
-            "LIMIT 1",
-            [symbol],
+            _LATEST_TICKER_TIMESTAMP_SQL,
+            [symbol, symbol],
         )
         if not rows:
             return None
@@ -220,7 +248,9 @@ class Data:
         if start_operator not in {">", ">="}:
             raise ValueError(f"Unsupported start operator: {start_operator}")
 
-        identity_column, allowed_fields = _TIME_SERIES_QUERY_SPECS[table_name]
+        identity_column, epoch_column, allowed_fields = _TIME_SERIES_QUERY_SPECS[
+            table_name
+        ]
         selected_fields = fields or allowed_fields
         invalid_fields = [
             field for field in selected_fields if field not in allowed_fields
@@ -232,18 +262,33 @@ class Data:
 
         where_clauses = [f"{identity_column} = ?"]
         params: list[Any] = [identity_value]
-        if start_timestamp is not None:
-            where_clauses.append(f"{_NORMALIZED_ROW_TIMESTAMP_SQL} {start_operator} ?")
-            params.append(int(float(start_timestamp)))
-        if end_timestamp is not None:
-            where_clauses.append(f"{_NORMALIZED_ROW_TIMESTAMP_SQL} <= ?")
-            params.append(int(float(end_timestamp)))
+        order_sql = _NORMALIZED_ROW_TIMESTAMP_SQL
+        if epoch_column is not None:
+            range_clause, range_params = build_epoch_range_clause(
+                start_timestamp,
+                end_timestamp,
+                start_operator=start_operator,
+                epoch_column=epoch_column,
+            )
+            if range_clause:
+                where_clauses.append(range_clause)
+                params.extend(range_params)
+            order_sql = build_epoch_order_sql(epoch_column)
+        else:
+            if start_timestamp is not None:
+                where_clauses.append(
+                    f"{_NORMALIZED_ROW_TIMESTAMP_SQL} {start_operator} ?"
+                )
+                params.append(int(float(start_timestamp)))
+            if end_timestamp is not None:
+                where_clauses.append(f"{_NORMALIZED_ROW_TIMESTAMP_SQL} <= ?")
+                params.append(int(float(end_timestamp)))
 
         query = (
             f"SELECT {', '.join(selected_fields)} "
             f"FROM {table_name} "
             f"WHERE {' AND '.join(where_clauses)} "
-            f"ORDER BY {_NORMALIZED_ROW_TIMESTAMP_SQL}, timestamp"
+            f"ORDER BY {order_sql}, timestamp"
         )
         return await Tortoise.get_connection("default").execute_query_dict(
             query, params
@@ -277,7 +322,7 @@ class Data:
             return set(), set()
 
         normalized_symbol = self.utils.split_symbol(symbol)
-        rows_to_insert: list[model.Tickers] = []
+        rows_to_insert: list[dict[str, Any]] = []
         fetched_timestamps: set[int] = set()
         inserted_timestamps: set[int] = set()
 
@@ -298,23 +343,23 @@ class Data:
                 continue
 
             rows_to_insert.append(
-                model.Tickers(
-                    timestamp=timestamp,
-                    symbol=normalized_symbol,
-                    open=candle[1],
-                    high=candle[2],
-                    low=candle[3],
-                    close=candle[4],
-                    volume=candle[5],
-                )
+                {
+                    "timestamp": timestamp,
+                    "symbol": normalized_symbol,
+                    "open": candle[1],
+                    "high": candle[2],
+                    "low": candle[3],
+                    "close": candle[4],
+                    "volume": candle[5],
+                }
             )
             inserted_timestamps.add(timestamp)
 
         if rows_to_insert:
-            await run_sqlite_write_with_retry(
-                lambda: model.Tickers.bulk_create(rows_to_insert),
-                f"bulk insert history for {normalized_symbol}",
+            await write_ticker_rows(
+                rows_to_insert, f"bulk insert history for {normalized_symbol}"
             )
+            self.__invalidate_buffered_candles(normalized_symbol)
 
         return fetched_timestamps, inserted_timestamps
 
@@ -326,13 +371,13 @@ class Data:
         candle: list[Any],
     ) -> None:
         """Replace an existing closed history candle with exchange OHLCV values."""
+        refresh_clause, refresh_params = build_epoch_range_clause(timestamp, timestamp)
 
         async def update_existing_candle() -> None:
             await Tortoise.get_connection("default").execute_query(
                 "UPDATE tickers "
                 "SET open = ?, high = ?, low = ?, close = ?, volume = ? "
-                "WHERE symbol = ? "
-                f"AND {_NORMALIZED_ROW_TIMESTAMP_SQL} = ?",
+                f"WHERE symbol = ? AND {refresh_clause}",
                 [
                     float(candle[1]),
                     float(candle[2]),
@@ -340,7 +385,7 @@ class Data:
                     float(candle[4]),
                     float(candle[5]),
                     normalized_symbol,
-                    int(timestamp),
+                    *refresh_params,
                 ],
             )
 
@@ -348,6 +393,14 @@ class Data:
             update_existing_candle,
             f"refresh history candle for {normalized_symbol} at {timestamp}",
         )
+        self.__invalidate_buffered_candles(normalized_symbol)
+
+    @staticmethod
+    def __invalidate_buffered_candles(symbol: str) -> None:
+        """Drop in-memory candles after history writes outside the watcher."""
+        candle_store = get_active_candle_store()
+        if candle_store is not None:
+            candle_store.invalidate(symbol)
 
     async def __refresh_latest_required_history_candle(
         self,
@@ -621,7 +674,22 @@ class Data:
         end_timestamp: int | float | None = None,
         fields: tuple[str, ...] | None = None,
     ) -> pd.DataFrame | None:
-        """Return ticker rows for a symbol since a timestamp as a DataFrame."""
+        """Return ticker rows for a symbol since a timestamp as a DataFrame.
+
+        Reads are served from the watcher-fed candle store when it already
+        covers the window; otherwise the rows are queried and used to warm it.
+        """
+        candle_store = get_active_candle_store()
+        if (
+            candle_store is not None
+            and set(fields or CANDLE_FRAME_COLUMNS) <= set(CANDLE_FRAME_COLUMNS)
+            and candle_store.can_serve(symbol, start_timestamp)
+        ):
+            return candle_store.read(symbol, start_timestamp, end_timestamp, fields)
+
+        write_version = (
+            candle_store.get_write_version(symbol) if candle_store is not None else None
+        )
         rows = await self.__query_rows_with_numeric_timestamp(
             table_name="tickers",
             identity_value=symbol,
@@ -632,6 +700,17 @@ class Data:
         )
         if not rows:
             return None
+        if (
+            candle_store is not None
+            and write_version is not None
+            and end_timestamp is None
+            and set(CANDLE_FRAME_COLUMNS) - {"symbol"} <= set(rows[0])
+        ):
+            buffer = await asyncio.to_thread(
+                candle_store.build_buffer, symbol, start_timestamp, rows
+            )
+            if buffer is not None:
+                candle_store.install(buffer, write_version)
         return await asyncio.to_thread(rows_to_dataframe, rows)
 
     async def __get_dataframe_for_replay_deal(
@@ -678,12 +757,15 @@ class Data:
             start_timestamp,
             end_timestamp=timestamp_end,
         )
+        candle_store = get_active_candle_store()
         return await asyncio.to_thread(
             build_pair_ohlcv_payload,
             df_source,
             timerange,
             offset,
             live_candle=live_candle,
+            symbol=symbol,
+            resample_cache=candle_store.resampled if candle_store else None,
         )
 
     async def get_archived_ohlcv_for_deal(
@@ -758,9 +840,31 @@ class Data:
         )
         return await self.__get_dataframe_for_symbol_since(symbol, start_date)
 
+    @staticmethod
+    def __resolve_frame_symbol(ohlcv: pd.DataFrame) -> str | None:
+        """Return the symbol of a single-symbol ticker frame."""
+        if not isinstance(ohlcv, pd.DataFrame) or "symbol" not in ohlcv.columns:
+            return None
+        if ohlcv.empty:
+            return None
+        first = ohlcv["symbol"].iloc[0]
+        if not isinstance(first, str) or ohlcv["symbol"].iloc[-1] != first:
+            return None
+        return first
+
     def resample_data(self, ohlcv: pd.DataFrame, timerange: str) -> pd.DataFrame | None:
-        """Resample OHLCV data to the requested timerange."""
-        df_resample = resample_ohlcv_data(ohlcv, timerange)
+        """Resample OHLCV data to the requested timerange.
+
+        Ticker frames that carry a single symbol reuse the shared closed-bucket
+        cache of the active candle store.
+        """
+        candle_store = get_active_candle_store()
+        df_resample = resample_ohlcv_data_cached(
+            ohlcv,
+            timerange,
+            symbol=self.__resolve_frame_symbol(ohlcv),
+            resample_cache=candle_store.resampled if candle_store else None,
+        )
         if df_resample is None:
             logging.error("No historic data available yet for symbol")
             return None
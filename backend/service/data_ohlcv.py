@@ -7,6 +7,7 @@ from typing import Any
 
 import pandas as pd
 from service.data_timeframes import timeframe_bucket_origin_milliseconds
+from service.resample_cache import ResampleCache
 
 
 def rows_to_dataframe(rows: list[dict[str, Any]]) -> pd.DataFrame:
@@ -27,12 +28,20 @@ def build_resampled_ohlcv_payload(
     df_source: pd.DataFrame,
     timerange: str,
     offset: float,
+    *,
+    symbol: str | None = None,
+    resample_cache: ResampleCache | None = None,
 ) -> str | dict[str, Any]:
     """Resample and serialize OHLCV rows into the frontend payload shape."""
     if df_source.empty:
         return {}
 
-    resampled = resample_ohlcv_data(df_source, timerange)
+    resampled = resample_ohlcv_data_cached(
+        df_source,
+        timerange,
+        symbol=symbol,
+        resample_cache=resample_cache,
+    )
     if resampled is None or resampled.empty:
         return {}
     return serialize_ohlcv_dataframe(resampled, offset)
@@ -44,12 +53,20 @@ def build_pair_ohlcv_payload(
     offset: float,
     *,
     live_candle: dict[str, float | str] | None = None,
+    symbol: str | None = None,
+    resample_cache: ResampleCache | None = None,
 ) -> str | dict[str, Any]:
     """Build the chart payload for live/stored pair OHLCV data."""
     source = df_source.copy() if df_source is not None else pd.DataFrame()
     if live_candle is not None:
         source = append_live_candle(source, live_candle)
-    return build_resampled_ohlcv_payload(source, timerange, offset)
+    return build_resampled_ohlcv_payload(
+        source,
+        timerange,
+        offset,
+        symbol=symbol,
+        resample_cache=resample_cache,
+    )
 
 
 def build_archived_ohlcv_payload(
@@ -114,6 +131,21 @@ def build_live_candle_payload(
         return None
 
 
+def resample_ohlcv_data_cached(
+    ohlcv: pd.DataFrame,
+    timerange: str,
+    *,
+    symbol: str | None,
+    resample_cache: ResampleCache | None,
+) -> pd.DataFrame | None:
+    """Resample through the shared bucket cache when the input allows it."""
+    if resample_cache is not None and symbol:
+        resampled = resample_cache.resample(symbol, ohlcv, timerange)
+        if resampled is not None:
+            return resampled
+    return resample_ohlcv_data(ohlcv, timerange)
+
+
 def resample_ohlcv_data(ohlcv: pd.DataFrame, timerange: str) -> pd.DataFrame | None:
     """Resample OHLCV data to the requested timerange."""
     df = pd.DataFrame(ohlcv)
@@ -5,22 +5,51 @@ import os
 import random
 import re
 import sqlite3
+import time
 from asyncio import sleep
+from collections import defaultdict
 from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 from uuid import uuid4
 
 import helper
 import model
-from service.replay_candles import archive_replay_candles_for_deal
+from service.backfill_jobs import (
+    clear_backfill_retry,
+    load_backfill_checkpoint,
+    load_backfill_retries,
+    record_backfill_retry,
+    save_backfill_checkpoint,
+    tracked_backfill,
+)
+from service.open_positions import get_open_position_cache
+from service.replay_candles import (
+    archive_replay_candles_for_deal,
+    resolve_replay_archive_window_ms,
+)
+from service.sqlite_health import (
+    SqliteHealthMarker,
+    load_sqlite_health_marker,
+    needs_full_integrity_check,
+    sqlite_fingerprint,
+    write_sqlite_health_marker,
+)
+from service.sqlite_timestamps import build_normalized_text_timestamp_sql
 from tortoise import Tortoise
 from tortoise.context import TortoiseContext
+from tortoise.transactions import in_transaction
 
 logging = helper.LoggerFactory.get_logger("logs/database.log", "database")
 
 SQLITE_LOCK_RETRIES = 5
 SQLITE_RETRY_BASE_DELAY_SECONDS = 0.02
 SQLITE_RETRY_MAX_DELAY_SECONDS = 0.2
+TICKER_EPOCH_BACKFILL_CHUNK_SIZE = 5000
+REPLAY_BACKFILL_CHUNK_SIZE = 100
+REPLAY_BACKFILL_JOB = "trade_replay_candles"
+REPLAY_BACKFILL_MAX_ATTEMPTS = 3
+TICKER_EPOCH_BACKFILL_JOB = "ticker_epoch_timestamps"
 _SQLITE_INDEX_CORRUPTION_PATTERNS = (
     re.compile(r"row \d+ missing from index (?P<index>\S+)"),
     re.compile(r"rowid \d+ missing from index (?P<index>\S+)"),
@@ -206,6 +235,9 @@ class Database:
         self.db_file = "trades.sqlite"
         self.db_url = ""
         self._ctx: TortoiseContext | None = None
+        self._health_marker = SqliteHealthMarker()
+        self._full_integrity_check_required = True
+        self._initialized = False
         logging.info("Database instance initialized")
 
     async def _apply_sqlite_pragmas(self) -> None:
@@ -258,6 +290,7 @@ class Database:
                 ("updated_at",),
             ),
             ("tickers", "idx_tickers_symbol_timestamp", ("symbol", "timestamp")),
+            ("tickers", "idx_tickers_symbol_ts", ("symbol", "ts")),
             ("tickers", "idx_tickers_timestamp", ("timestamp",)),
             ("trades", "idx_trades_symbol", ("symbol",)),
             ("trades", "idx_trades_deal_id_timestamp", ("deal_id", "timestamp")),
@@ -353,6 +386,11 @@ class Database:
                 ("strategy_slug", "state_key", "symbol", "timeframe"),
             ),
             ("upnl_history", "idx_upnl_history_timestamp", ("timestamp",)),
+            (
+                "upnl_history_rollups",
+                "idx_upnl_history_rollups_resolution_time",
+                ("resolution", "timestamp"),
+            ),
             ("token_listings", "idx_token_listings_symbol", ("symbol",)),
         )
         desired_unique_indexes: tuple[tuple[str, str, tuple[str, ...]], ...] = (
@@ -488,7 +526,12 @@ class Database:
         return "buy"
 
     async def _backfill_trade_ledger_rows(self) -> None:
-        """Backfill deal ids and execution rows for currently open deals."""
+        """Backfill deal ids and execution rows for currently open deals.
+
+        Trades and executions of all open deals are read with one query each,
+        only rows that change are updated, and missing executions are written
+        with a single bulk insert, so startup does not pay per-deal round trips.
+        """
         if not self.db_url.startswith("sqlite://"):
             return
 
@@ -498,6 +541,7 @@ class Database:
             "sold_amount",
             "execution_history_complete",
         )
+        deals: list[tuple[str, str, bool, dict[str, Any]]] = []
         for open_row in open_rows:
             symbol = str(open_row.get("symbol") or "").strip()
             if not symbol:
@@ -509,93 +553,193 @@ class Database:
                 bool(open_row.get("execution_history_complete", True))
                 and not has_legacy_partial
             )
+            deals.append((symbol, deal_id, execution_history_complete, open_row))
+        if not deals:
+            return
 
-            await model.OpenTrades.filter(symbol=symbol).update(
-                deal_id=deal_id,
-                execution_history_complete=execution_history_complete,
-            )
-            await model.Trades.filter(symbol=symbol).update(deal_id=deal_id)
-
-            existing_executions = await model.TradeExecutions.filter(
-                deal_id=deal_id,
-            ).values("timestamp", "order_id", "role")
-            existing_signatures = {
+        trade_rows_by_symbol: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for trade_row in (
+            await model.Trades.filter(symbol__in=[deal[0] for deal in deals])
+            .order_by("timestamp", "id")
+            .values()
+        ):
+            trade_rows_by_symbol[str(trade_row.get("symbol") or "")].append(trade_row)
+        existing_signatures: dict[str, set[tuple[str, str, str]]] = defaultdict(set)
+        for execution in await model.TradeExecutions.filter(
+            deal_id__in=[deal[1] for deal in deals]
+        ).values("deal_id", "timestamp", "order_id", "role"):
+            existing_signatures[str(execution.get("deal_id"))].add(
                 (
                     str(execution.get("timestamp") or ""),
                     str(execution.get("order_id") or ""),
                     str(execution.get("role") or ""),
                 )
-                for execution in existing_executions
-            }
-            trade_rows = (
-                await model.Trades.filter(symbol=symbol)
-                .order_by(
-                    "timestamp",
-                    "id",
-                )
-                .values()
             )
-            for trade_row in trade_rows:
-                role = self._resolve_trade_execution_role(trade_row)
-                signature = (
-                    str(trade_row.get("timestamp") or ""),
-                    str(trade_row.get("orderid") or ""),
-                    role,
-                )
-                if signature in existing_signatures:
-                    continue
 
-                await model.TradeExecutions.create(
-                    deal_id=deal_id,
-                    symbol=str(trade_row.get("symbol") or symbol),
-                    side=str(trade_row.get("side") or "buy"),
-                    role=role,
-                    timestamp=str(trade_row.get("timestamp") or ""),
-                    price=float(trade_row.get("price") or 0.0),
-                    amount=float(trade_row.get("amount") or 0.0),
-                    ordersize=float(trade_row.get("ordersize") or 0.0),
-                    fee=float(trade_row.get("fee") or 0.0),
-                    order_id=(
-                        str(trade_row.get("orderid"))
-                        if trade_row.get("orderid") is not None
-                        else None
-                    ),
-                    order_type=(
-                        str(trade_row.get("ordertype"))
-                        if trade_row.get("ordertype") is not None
-                        else None
-                    ),
-                    order_count=trade_row.get("order_count"),
-                    so_percentage=(
-                        float(trade_row["so_percentage"])
-                        if trade_row.get("so_percentage") is not None
-                        else None
-                    ),
+        missing_executions: list[model.TradeExecutions] = []
+        async with in_transaction() as conn:
+            for symbol, deal_id, execution_history_complete, open_row in deals:
+                if open_row.get("deal_id") != deal_id or bool(
+                    open_row.get("execution_history_complete")
+                ) != (execution_history_complete):
+                    await model.OpenTrades.filter(symbol=symbol).using_db(conn).update(
+                        deal_id=deal_id,
+                        execution_history_complete=execution_history_complete,
+                    )
+                trade_rows = trade_rows_by_symbol.get(symbol, [])
+                if any(row.get("deal_id") != deal_id for row in trade_rows):
+                    await model.Trades.filter(symbol=symbol).using_db(conn).update(
+                        deal_id=deal_id
+                    )
+
+                signatures = existing_signatures[deal_id]
+                for trade_row in trade_rows:
+                    role = self._resolve_trade_execution_role(trade_row)
+                    signature = (
+                        str(trade_row.get("timestamp") or ""),
+                        str(trade_row.get("orderid") or ""),
+                        role,
+                    )
+                    if signature in signatures:
+                        continue
+
+                    missing_executions.append(
+                        model.TradeExecutions(
+                            deal_id=deal_id,
+                            symbol=str(trade_row.get("symbol") or symbol),
+                            side=str(trade_row.get("side") or "buy"),
+                            role=role,
+                            timestamp=str(trade_row.get("timestamp") or ""),
+                            price=float(trade_row.get("price") or 0.0),
+                            amount=float(trade_row.get("amount") or 0.0),
+                            ordersize=float(trade_row.get("ordersize") or 0.0),
+                            fee=float(trade_row.get("fee") or 0.0),
+                            order_id=(
+                                str(trade_row.get("orderid"))
+                                if trade_row.get("orderid") is not None
+                                else None
+                            ),
+                            order_type=(
+                                str(trade_row.get("ordertype"))
+                                if trade_row.get("ordertype") is not None
+                                else None
+                            ),
+                            order_count=trade_row.get("order_count"),
+                            so_percentage=(
+                                float(trade_row["so_percentage"])
+                                if trade_row.get("so_percentage") is not None
+                                else None
+                            ),
+                        )
+                    )
+                    signatures.add(signature)
+
+            if missing_executions:
+                await model.TradeExecutions.bulk_create(
+                    missing_executions, batch_size=500, using_db=conn
+                )
+                logging.info(
+                    "Backfilled %s execution rows for open deals.",
+                    len(missing_executions),
                 )
-                existing_signatures.add(signature)
+
+    async def _archive_closed_deal_replay(self, closed_row: dict[str, Any]) -> bool:
+        """Archive one closed deal; return False when its repair found no candles."""
+        deal_id = str(closed_row.get("deal_id") or "").strip()
+        symbol = str(closed_row.get("symbol") or "").strip()
+        if not deal_id or not symbol:
+            return True
+        archived = await archive_replay_candles_for_deal(
+            deal_id,
+            symbol,
+            open_date=closed_row.get("open_date"),
+            close_date=closed_row.get("close_date"),
+            allow_missing_archive_exchange_repair=True,
+        )
+        if archived or await model.TradeReplayCandles.filter(deal_id=deal_id).exists():
+            return True
+        start_ms, _ = await resolve_replay_archive_window_ms(
+            deal_id,
+            open_date=closed_row.get("open_date"),
+            close_date=closed_row.get("close_date"),
+        )
+        # Without a window there is nothing to archive, now or later.
+        return start_ms is None
 
     async def _backfill_trade_replay_candles(self) -> None:
-        """Backfill or repair per-deal replay candles for existing closed trades."""
+        """Backfill or repair per-deal replay candles for existing closed trades.
+
+        Closed trades are walked in id-ordered chunks and the last processed
+        id is checkpointed after each chunk, so an interrupted run resumes and
+        later startups only look at trades closed since. Deals whose exchange
+        repair found no candles are recorded as retries and attempted again
+        on the next few startups.
+        """
         if not self.db_url.startswith("sqlite://"):
             return
 
-        closed_rows = await model.ClosedTrades.exclude(deal_id=None).values(
-            "deal_id",
-            "symbol",
-            "open_date",
-            "close_date",
-        )
+        with tracked_backfill(REPLAY_BACKFILL_JOB) as progress:
+            last_id = await load_backfill_checkpoint(REPLAY_BACKFILL_JOB)
+            retry_ids = await load_backfill_retries(
+                REPLAY_BACKFILL_JOB, REPLAY_BACKFILL_MAX_ATTEMPTS
+            )
+            pending = model.ClosedTrades.exclude(deal_id=None)
+            progress.total = (
+                len(retry_ids) + await pending.filter(id__gt=last_id).count()
+            )
+            progress.last_id = last_id
+            replay_columns = ("id", "deal_id", "symbol", "open_date", "close_date")
+
+            if retry_ids:
+                retry_rows = (
+                    await pending.filter(id__in=retry_ids)
+                    .order_by("id")
+                    .values(*replay_columns)
+                )
+                await self._archive_replay_rows(retry_rows, retrying=True)
+                progress.advance(len(retry_ids))
+
+            while True:
+                closed_rows = (
+                    await pending.filter(id__gt=last_id)
+                    .order_by("id")
+                    .limit(REPLAY_BACKFILL_CHUNK_SIZE)
+                    .values(*replay_columns)
+                )
+                if not closed_rows:
+                    break
+                await self._archive_replay_rows(closed_rows, retrying=False)
+
+                last_id = int(closed_rows[-1]["id"])
+                await run_sqlite_write_with_retry(
+                    partial(save_backfill_checkpoint, REPLAY_BACKFILL_JOB, last_id),
+                    "checkpointing replay archive backfill",
+                )
+                progress.advance(len(closed_rows), last_id)
+                await sleep(0)
+
+    async def _archive_replay_rows(
+        self, closed_rows: list[dict[str, Any]], *, retrying: bool
+    ) -> None:
+        """Archive closed deals and track the ones that need another attempt."""
         for closed_row in closed_rows:
-            deal_id = str(closed_row.get("deal_id") or "").strip()
-            symbol = str(closed_row.get("symbol") or "").strip()
-            if not deal_id or not symbol:
+            row_id = int(closed_row["id"])
+            if await self._archive_closed_deal_replay(closed_row):
+                if not retrying:
+                    continue
+                await run_sqlite_write_with_retry(
+                    partial(clear_backfill_retry, REPLAY_BACKFILL_JOB, row_id),
+                    "clearing replay archive retry",
+                )
                 continue
-            await archive_replay_candles_for_deal(
-                deal_id,
-                symbol,
-                open_date=closed_row.get("open_date"),
-                close_date=closed_row.get("close_date"),
-                allow_missing_archive_exchange_repair=True,
+            logging.warning(
+                "No replay candles found for closed deal %s (%s); retrying later.",
+                closed_row.get("deal_id"),
+                closed_row.get("symbol"),
+            )
+            await run_sqlite_write_with_retry(
+                partial(record_backfill_retry, REPLAY_BACKFILL_JOB, row_id),
+                "recording replay archive retry",
             )
 
     async def _ensure_open_trades_columns(self) -> None:
@@ -678,21 +822,131 @@ class Database:
                 ", ".join(_extract_added_column_names(alter_statements)),
             )
 
+    async def _ensure_ticker_epoch_column(self) -> None:
+        """Ensure tickers carry an integer epoch-ms column kept in sync on insert.
+
+        Writers fill ``ts`` directly. The trigger covers inserts that only set
+        the legacy text timestamp, such as restores or older code paths.
+        """
+        if not self.db_url.startswith("sqlite://"):
+            return
+
+        connection = Tortoise.get_connection("default")
+        _, columns = await connection.execute_query("PRAGMA table_info('tickers')")
+        existing = {row["name"] for row in columns}
+        alter_statements = _plan_additive_column_statements(
+            "tickers",
+            existing,
+            (("ts", "INTEGER NULL"),),
+        )
+        normalized_sql = build_normalized_text_timestamp_sql("NEW.timestamp")
+        await connection.execute_script(
+            "\n".join(
+                [
+                    *alter_statements,
+                    "CREATE TRIGGER IF NOT EXISTS trg_tickers_fill_ts "
+                    "AFTER INSERT ON tickers WHEN NEW.ts IS NULL "
+                    f"BEGIN UPDATE tickers SET ts = {normalized_sql} "
+                    "WHERE id = NEW.id; END;",
+                ]
+            )
+        )
+        if alter_statements:
+            logging.info("Added missing tickers epoch column.")
+
+    async def _backfill_ticker_epoch_timestamps(self) -> int:
+        """Fill ``tickers.ts`` for legacy rows in small id-range chunks.
+
+        Only rows with a NULL epoch value are touched, so an interrupted run
+        simply resumes where it stopped on the next startup. The highest
+        ticker id already checked is checkpointed, so later startups look at
+        rows added since instead of scanning the whole table again.
+        """
+        if not self.db_url.startswith("sqlite://"):
+            return 0
+
+        connection = Tortoise.get_connection("default")
+        checked_id = await load_backfill_checkpoint(TICKER_EPOCH_BACKFILL_JOB)
+        rows = await connection.execute_query_dict(
+            "SELECT MIN(id) AS first_id, MAX(id) AS last_id "
+            "FROM tickers WHERE id > ? AND ts IS NULL",
+            [checked_id],
+        )
+        first_id = rows[0].get("first_id") if rows else None
+        last_id = rows[0].get("last_id") if rows else None
+        if first_id is None or last_id is None:
+            max_rows = await connection.execute_query_dict(
+                "SELECT MAX(id) AS max_id FROM tickers"
+            )
+            max_id = max_rows[0].get("max_id") if max_rows else None
+            if max_id is not None and int(max_id) > checked_id:
+                await run_sqlite_write_with_retry(
+                    partial(
+                        save_backfill_checkpoint,
+                        TICKER_EPOCH_BACKFILL_JOB,
+                        int(max_id),
+                    ),
+                    "checkpointing ticker epoch backfill",
+                )
+            return 0
+
+        logging.info(
+            "Backfilling ticker epoch timestamps for ids %s-%s.", first_id, last_id
+        )
+        normalized_sql = build_normalized_text_timestamp_sql("timestamp")
+        updated = 0
+        chunk_start = int(first_id)
+        # Progress counts ticker ids covered, not rows changed.
+        with tracked_backfill(TICKER_EPOCH_BACKFILL_JOB) as progress:
+            progress.total = int(last_id) - int(first_id) + 1
+            while chunk_start <= int(last_id):
+                chunk_end = min(
+                    chunk_start + TICKER_EPOCH_BACKFILL_CHUNK_SIZE - 1, int(last_id)
+                )
+
+                async def update_chunk(
+                    start: int = chunk_start, end: int = chunk_end
+                ) -> Any:
+                    return await connection.execute_query(
+                        f"UPDATE tickers SET ts = {normalized_sql} "
+                        "WHERE id BETWEEN ? AND ? AND ts IS NULL",
+                        [start, end],
+                    )
+
+                affected, _ = await run_sqlite_write_with_retry(
+                    update_chunk,
+                    "backfill ticker epoch timestamps",
+                )
+                updated += int(affected or 0)
+                await run_sqlite_write_with_retry(
+                    partial(
+                        save_backfill_checkpoint, TICKER_EPOCH_BACKFILL_JOB, chunk_end
+                    ),
+                    "checkpointing ticker epoch backfill",
+                )
+                progress.advance(chunk_end - chunk_start + 1, chunk_end)
+                chunk_start = chunk_end + 1
+                await sleep(0)
+
+        logging.info("Backfilled epoch timestamps for %s ticker rows.", updated)
+        return updated
+
     async def optimize_sqlite(self) -> None:
         """Run SQLite planner/index maintenance."""
         await optimize_sqlite_connection(self.db_url)
 
-    async def _run_sqlite_integrity_check(self) -> list[str]:
-        """Return SQLite integrity_check messages for the active database."""
+    async def _run_sqlite_check_pragma(self, pragma: str) -> list[str]:
+        """Return the messages of an integrity-style PRAGMA for the database."""
         if not self.db_url.startswith("sqlite://"):
             return []
 
         try:
             connection = Tortoise.get_connection("default")
-            _, rows = await connection.execute_query("PRAGMA integrity_check")
+            _, rows = await connection.execute_query(f"PRAGMA {pragma}")
         except Exception as exc:  # noqa: BLE001 - diagnostic only
             logging.warning(
-                "Failed to run SQLite integrity_check during corruption diagnosis: %s",
+                "Failed to run SQLite %s during corruption diagnosis: %s",
+                pragma,
                 exc,
                 exc_info=True,
             )
@@ -700,6 +954,55 @@ class Database:
 
         return [str(row[0]).strip() for row in rows if str(row[0]).strip()]
 
+    async def _run_sqlite_integrity_check(self) -> list[str]:
+        """Return SQLite integrity_check messages for the active database."""
+        return await self._run_sqlite_check_pragma("integrity_check")
+
+    async def _run_sqlite_quick_check(self) -> list[str]:
+        """Return SQLite quick_check messages, which skip index cross-checks."""
+        return await self._run_sqlite_check_pragma("quick_check")
+
+    def _begin_sqlite_health_tracking(self) -> None:
+        """Pick the startup integrity check depth and mark this run unclean.
+
+        The marker is only set back to clean by ``shutdown``, so a crash or
+        kill makes the next startup run the full integrity check.
+        """
+        if not self.db_url.startswith("sqlite://"):
+            return
+        db_path = _resolve_sqlite_db_path(self.db_url)
+        marker = load_sqlite_health_marker(db_path)
+        self._full_integrity_check_required = needs_full_integrity_check(
+            marker, sqlite_fingerprint(db_path), time.time()
+        )
+        self._health_marker = SqliteHealthMarker(last_full_check=marker.last_full_check)
+        write_sqlite_health_marker(db_path, self._health_marker)
+
+    def _record_full_integrity_check(self) -> None:
+        """Remember a passed full integrity check for later startups."""
+        if not self.db_url.startswith("sqlite://"):
+            return
+        self._health_marker.last_full_check = time.time()
+        write_sqlite_health_marker(
+            _resolve_sqlite_db_path(self.db_url), self._health_marker
+        )
+
+    def _record_clean_shutdown(self) -> None:
+        """Store the clean-shutdown marker with the closed file's fingerprint."""
+        if not self._initialized or not self.db_url.startswith("sqlite://"):
+            return
+        db_path = _resolve_sqlite_db_path(self.db_url)
+        fingerprint = sqlite_fingerprint(db_path)
+        if fingerprint is None:
+            return
+        self._health_marker.clean_shutdown = True
+        (
+            self._health_marker.size,
+            self._health_marker.mtime_ns,
+            self._health_marker.wal_size,
+        ) = fingerprint
+        write_sqlite_health_marker(db_path, self._health_marker)
+
     async def _reindex_sqlite_database(self) -> None:
         """Rebuild all indexes for the active SQLite database."""
         if not self.db_url.startswith("sqlite://"):
@@ -709,11 +1012,28 @@ class Database:
         await connection.execute_query("REINDEX")
 
     async def _repair_index_only_corruption_if_needed(self) -> None:
-        """Repair index-only SQLite corruption before runtime services start."""
+        """Repair index-only SQLite corruption before runtime services start.
+
+        After a clean shutdown of an unchanged file, ``quick_check`` replaces
+        the full check until the periodic full check is due again.
+        """
+        if not self._full_integrity_check_required:
+            quick_messages = await self._run_sqlite_quick_check()
+            if _integrity_check_is_clean(quick_messages):
+                logging.info(
+                    "SQLite quick_check passed after clean shutdown; "
+                    "skipping full integrity_check."
+                )
+                return
+            logging.warning(
+                "SQLite quick_check did not pass; running full integrity_check."
+            )
+
         integrity_messages = await self._run_sqlite_integrity_check()
         if not integrity_messages:
             return
         if _integrity_check_is_clean(integrity_messages):
+            self._record_full_integrity_check()
             return
 
         corrupted_index_names = _extract_corrupted_index_names(integrity_messages)
@@ -735,6 +1055,7 @@ class Database:
             logging.warning(
                 "SQLite index corruption repaired successfully via REINDEX."
             )
+            self._record_full_integrity_check()
             return
 
         db_path = _resolve_sqlite_db_path(self.db_url)
@@ -748,10 +1069,15 @@ class Database:
         await self._ensure_spot_campaign_columns()
         await self._ensure_trade_ledger_columns()
         await self._ensure_upnl_history_columns()
+        await self._ensure_ticker_epoch_column()
         await self._ensure_indexes()
 
     async def _run_backfill_init_steps(self) -> None:
-        """Run init-time backfills required before the runtime starts."""
+        """Run init-time backfills required before the runtime starts.
+
+        Only open deals need their ledger rows before trading resumes; bulk
+        history migrations run as background jobs after startup.
+        """
         await self._backfill_trade_ledger_rows()
 
     async def init(self) -> None:
@@ -766,6 +1092,7 @@ class Database:
         try:
             db_url = os.getenv("MOONWALKER_DB_URL", f"sqlite://db/{self.db_file}")
             self.db_url = db_url
+            self._begin_sqlite_health_tracking()
             self._ctx = await Tortoise.init(
                 db_url=db_url,
                 modules={"models": ["model"]},
@@ -777,6 +1104,9 @@ class Database:
             await self._run_schema_init_steps()
             await self._repair_index_only_corruption_if_needed()
             await self._run_backfill_init_steps()
+            # Positions cached before the backfills may carry stale deal ids.
+            get_open_position_cache().invalidate()
+            self._initialized = True
             logging.info("Database initialized successfully")
         except Exception as exc:  # noqa: BLE001 - Catch all exceptions during init
             if _is_sqlite_malformed_error(exc):
@@ -808,6 +1138,23 @@ class Database:
                 exc_info=True,
             )
 
+    async def backfill_ticker_epoch_timestamps_if_needed(self) -> None:
+        """Migrate legacy ticker rows to integer epoch timestamps in the background."""
+        if not self.db_url.startswith("sqlite://"):
+            return
+
+        try:
+            await self._backfill_ticker_epoch_timestamps()
+        except asyncio.CancelledError:
+            logging.info("Background ticker epoch backfill cancelled")
+            raise
+        except Exception as exc:  # noqa: BLE001 - keep startup background-safe.
+            logging.error(
+                "Background ticker epoch backfill failed: %s",
+                exc,
+                exc_info=True,
+            )
+
     async def run_with_context(
         self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
     ) -> Any:
@@ -831,6 +1178,7 @@ class Database:
                 self._ctx = None
             else:
                 await Tortoise.close_connections()
+            self._record_clean_shutdown()
             logging.info("Database connections closed successfully")
         except Exception as exc:  # noqa: BLE001 - Catch all exceptions during shutdown
             logging.error(
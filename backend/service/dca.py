@@ -1151,10 +1151,9 @@ class Dca:
                     return
 
                 # Check Autopilot
-                profit = await self.statistic.get_profit()
                 trading_policy = await self.autopilot.resolve_trading_policy(
                     trades["symbol"],
-                    float(profit.get("funds_locked") or 0.0),
+                    await self.statistic.get_funds_locked(),
                     self.config,
                 )
 
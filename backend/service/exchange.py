@@ -248,6 +248,7 @@ class Exchange:
 
         while since < upper_bound:
             try:
+                await self._client_manager.acquire_history_page()
                 candles = await self.exchange.fetch_ohlcv(
                     symbol=resolved_symbol,
                     timeframe=timeframe,
@@ -295,7 +296,11 @@ class Exchange:
                         consecutive_errors,
                     )
                     break
-                await asyncio.sleep(self.HISTORY_RETRY_SLEEP_SECONDS)
+                # Back off exponentially so rate-limit errors are not retried
+                # at the pace that caused them.
+                await asyncio.sleep(
+                    self.HISTORY_RETRY_SLEEP_SECONDS * 2 ** (consecutive_errors - 1)
+                )
             except (TypeError, ValueError, RuntimeError) as e:
                 logging.error("Fetching historical data failed due to an error: %s", e)
                 consecutive_errors += 1
@@ -1,39 +1,215 @@
-"""Exchange client lifecycle management."""
+"""Exchange client lifecycle management.
+
+CCXT clients are pooled per normalized exchange config. Every service talking
+to the same account shares one HTTP session, one market table refreshed on a
+TTL, and one CCXT request throttler instead of loading markets on its own.
+"""
 
 import asyncio
+import json
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import ccxt.async_support as ccxt
+import helper
 from service.config_views import ExchangeConnectionConfigView
 
+logging = helper.LoggerFactory.get_logger("logs/exchange.log", "exchange_pool")
+
+MARKETS_REFRESH_TTL_SECONDS = 300.0
+# Unknown symbols force a market reload; callers sharing a client would
+# otherwise reload the full market table once per lookup miss.
+MARKETS_FORCE_REFRESH_MIN_SECONDS = 30.0
+# History paging may use this share of the exchange's request rate, leaving
+# the rest of CCXT's throttle budget to orders, balances and tickers.
+HISTORY_RATE_LIMIT_SHARE = 0.75
+HISTORY_PAGE_BURST = 5.0
+DEFAULT_RATE_LIMIT_MS = 100.0
+
+
+class TokenBucket:
+    """Async token bucket handing out ``rate`` tokens per second in FIFO order."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(
+                        self.capacity,
+                        self._tokens + (now - self._updated) * self.rate,
+                    )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+async def _close_client(exchange: Any, logger: Any) -> None:
+    try:
+        await exchange.close()
+    except (ccxt.BaseError, OSError, RuntimeError) as exc:
+        logger.warning("Failed to close exchange client cleanly: %s", exc)
+
+
+class SharedExchangeClient:
+    """One pooled CCXT client with its lease count and market-loading state."""
+
+    def __init__(self, exchange: Any, config: dict[str, Any]) -> None:
+        self.exchange = exchange
+        self.config = config
+        self.leases = 0
+        self.markets_loaded = False
+        self.markets_loaded_ts = 0.0
+        self._markets_lock = asyncio.Lock()
+        self._history_pages: TokenBucket | None = None
+
+    def history_pages(self) -> TokenBucket:
+        """Return the history paging budget matched to the client's rateLimit."""
+        if self._history_pages is None:
+            try:
+                rate_limit_ms = float(getattr(self.exchange, "rateLimit", 0) or 0)
+            except (TypeError, ValueError):
+                rate_limit_ms = 0.0
+            if rate_limit_ms <= 0:
+                rate_limit_ms = DEFAULT_RATE_LIMIT_MS
+            self._history_pages = TokenBucket(
+                rate=HISTORY_RATE_LIMIT_SHARE * 1000.0 / rate_limit_ms,
+                capacity=HISTORY_PAGE_BURST,
+            )
+        return self._history_pages
+
+    def _markets_fresh(self, now: float, force_refresh: bool) -> bool:
+        if not self.markets_loaded:
+            return False
+        age = now - self.markets_loaded_ts
+        if force_refresh:
+            return age < MARKETS_FORCE_REFRESH_MIN_SECONDS
+        return age < MARKETS_REFRESH_TTL_SECONDS
+
+    async def ensure_markets_loaded(self, force_refresh: bool = False) -> None:
+        """Load markets once per TTL for every lease holder of this client."""
+        loop = asyncio.get_running_loop()
+        if self._markets_fresh(loop.time(), force_refresh):
+            return
+        async with self._markets_lock:
+            if self._markets_fresh(loop.time(), force_refresh):
+                return
+            await self.exchange.load_markets(reload=self.markets_loaded)
+            self.markets_loaded = True
+            self.markets_loaded_ts = loop.time()
+
+
+class ExchangeClientPool:
+    """Process-wide CCXT clients keyed by their normalized exchange config."""
+
+    def __init__(self) -> None:
+        self._clients: dict[str, SharedExchangeClient] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _key(config: dict[str, Any]) -> str:
+        return json.dumps(config, sort_keys=True, default=str)
+
+    async def acquire(
+        self,
+        config: dict[str, Any],
+        factory: Callable[[dict[str, Any]], Awaitable[Any]],
+    ) -> SharedExchangeClient:
+        """Lease the client for ``config``, creating it on first use.
+
+        Idle clients of other configs are closed, since a config change
+        leaves them without future users.
+        """
+        key = self._key(config)
+        async with self._lock:
+            shared = self._clients.get(key)
+            if shared is None:
+                await self._close_idle(keep=key)
+                shared = SharedExchangeClient(await factory(config), config)
+                self._clients[key] = shared
+            shared.leases += 1
+            return shared
+
+    async def release(self, shared: SharedExchangeClient) -> None:
+        """Return a lease; the client stays pooled for the next caller."""
+        async with self._lock:
+            shared.leases = max(shared.leases - 1, 0)
+            if self._clients.get(self._key(shared.config)) is not shared:
+                if shared.leases == 0:
+                    await _close_client(shared.exchange, logging)
+
+    async def _close_idle(self, keep: str) -> None:
+        for key, shared in list(self._clients.items()):
+            if key != keep and shared.leases == 0:
+                del self._clients[key]
+                await _close_client(shared.exchange, logging)
+
+    async def close_all(self) -> None:
+        """Close every pooled client, e.g. on application shutdown."""
+        async with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for shared in clients:
+            if shared.exchange is not None:
+                await _close_client(shared.exchange, logging)
+
+
+_pool = ExchangeClientPool()
+
+
+def get_exchange_client_pool() -> ExchangeClientPool:
+    """Return the process-wide exchange client pool."""
+    return _pool
+
+
+def reset_exchange_client_pool() -> None:
+    """Forget pooled clients without closing them (tests and reloads only)."""
+    global _pool
+    _pool = ExchangeClientPool()
+
 
 class ExchangeClientManager:
-    """Own lifecycle and market-loading state for one CCXT client."""
+    """Hold one lease on a pooled CCXT client for an ``Exchange`` wrapper."""
 
-    MARKETS_REFRESH_TTL_SECONDS = 300.0
+    MARKETS_REFRESH_TTL_SECONDS = MARKETS_REFRESH_TTL_SECONDS
 
     def __init__(self, logger: Any):
         self._logger = logger
         self.exchange: Any = None
         self._exchange_config: dict[str, Any] | None = None
-        self._markets_loaded = False
-        self._markets_loaded_ts = 0.0
+        self._shared: SharedExchangeClient | None = None
         self._exchange_lock = asyncio.Lock()
 
     async def close(self) -> None:
-        """Close the underlying exchange client and reset cached state."""
+        """Release the pooled client lease and reset cached state.
+
+        A client that was assigned directly instead of leased from the pool
+        is closed here.
+        """
         if self.exchange is None:
             return
 
+        shared = self._shared
         try:
-            await self.exchange.close()
-        except (ccxt.BaseError, OSError, RuntimeError) as exc:
-            self._logger.warning("Failed to close exchange client cleanly: %s", exc)
+            if shared is not None and shared.exchange is self.exchange:
+                await get_exchange_client_pool().release(shared)
+            else:
+                await _close_client(self.exchange, self._logger)
         finally:
             self.exchange = None
             self._exchange_config = None
-            self._markets_loaded = False
-            self._markets_loaded_ts = 0.0
+            self._shared = None
 
     def build_exchange_config(self, config: dict[str, Any]) -> dict[str, Any]:
         """Normalize runtime config into the fields that require a client rebuild."""
@@ -49,34 +225,27 @@ class ExchangeClientManager:
             if self.exchange is not None:
                 await self.close()
 
-            self.exchange = await self._init_exchange(desired_config)
+            shared = await get_exchange_client_pool().acquire(
+                desired_config, self._init_exchange
+            )
+            self._shared = shared
+            self.exchange = shared.exchange
             self._exchange_config = desired_config
-            self._markets_loaded = False
-            self._markets_loaded_ts = 0.0
             return True
 
     async def ensure_markets_loaded(self, force_refresh: bool = False) -> None:
-        """Ensure exchange markets are loaded and periodically refreshed."""
+        """Ensure the pooled client's markets are loaded and periodically refreshed."""
         if self.exchange is None:
             return
+        if self._shared is None or self._shared.exchange is not self.exchange:
+            self._shared = SharedExchangeClient(self.exchange, {})
+        await self._shared.ensure_markets_loaded(force_refresh=force_refresh)
 
-        now = asyncio.get_running_loop().time()
-        if (
-            not force_refresh
-            and self._markets_loaded
-            and now - self._markets_loaded_ts < self.MARKETS_REFRESH_TTL_SECONDS
-        ):
+    async def acquire_history_page(self) -> None:
+        """Wait for the pooled client's history paging budget."""
+        if self._shared is None or self._shared.exchange is not self.exchange:
             return
-        async with self._exchange_lock:
-            now = asyncio.get_running_loop().time()
-            if self.exchange is not None and (
-                force_refresh
-                or not self._markets_loaded
-                or now - self._markets_loaded_ts >= self.MARKETS_REFRESH_TTL_SECONDS
-            ):
-                await self.exchange.load_markets()
-                self._markets_loaded = True
-                self._markets_loaded_ts = now
+        await self._shared.history_pages().acquire()
 
     def get_exchange_config(self) -> dict[str, Any] | None:
         """Return the normalized config of the active exchange client."""
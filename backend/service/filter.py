@@ -85,10 +85,14 @@ class Filter:
 
         return result
 
-    @helper.async_ttl_cache(maxsize=1024, ttl=86400)
-    async def get_cmc_marketcap_rank(self, api_key: str, symbol: str) -> Any:
-        """Fetch CoinMarketCap market cap rank for the symbol."""
-        marketcap = None
+    @helper.async_ttl_cache(maxsize=16, ttl=86400)
+    async def get_cmc_marketcap_ranks(self, api_key: str) -> dict[str, int]:
+        """Fetch the CoinMarketCap rank of every listed symbol in one request.
+
+        Raises ``ValueError`` for an error status or an unreadable payload so
+        the failure is not cached in place of a real rank map.
+        """
+        ranks: dict[str, int] = {}
         headers = {"X-CMC_PRO_API_KEY": api_key}
         ws_endpoint = "pro-api.coinmarketcap.com"
         ws_context = "v1/cryptocurrency/map"
@@ -103,12 +107,24 @@ class Filter:
 
         try:
             json_data = response.json()
-            if json_data["status"]["error_code"] == 0:
-                for entry in json_data["data"]:
-                    if entry["symbol"] == symbol:
-                        marketcap = entry["rank"]
-                        break
-        except (KeyError, TypeError, ValueError) as e:
-            logging.error("Error getting CMC data. Cause: %s", e)
+            error_code = json_data["status"]["error_code"]
+            if error_code != 0:
+                raise ValueError(f"CMC returned error code {error_code}")
+            for entry in json_data["data"]:
+                # Entries are sorted by rank; keep the best for duplicates.
+                ranks.setdefault(entry["symbol"], entry["rank"])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed CMC payload: {e}") from e
+        if not ranks:
+            raise ValueError("CMC returned no ranks")
+
+        return ranks
 
-        return marketcap
+    async def get_cmc_marketcap_rank(self, api_key: str, symbol: str) -> Any:
+        """Return the CoinMarketCap market cap rank for the symbol."""
+        try:
+            ranks = await self.get_cmc_marketcap_ranks(api_key)
+        except ValueError as e:
+            logging.error("Error getting CMC data. Cause: %s", e)
+            return None
+        return ranks.get(symbol)
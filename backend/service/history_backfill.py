@@ -0,0 +1,232 @@
+"""Shared scheduler for exchange history backfills.
+
+Active-trade warmups, the BTC pulse prefill and signal plugins all need
+history before they can evaluate a symbol. Instead of each paging the exchange
+on its own, they submit backfills here. A priority queue serves active trades
+before BTC pulse and signal candidates, a small worker pool pages several
+symbols at once within the exchange client's history rate budget, and
+overlapping requests for the same symbol share one run. The scheduler pages
+through its own ``Data`` instance, so a merged job never depends on the
+lifetime of whichever caller submitted it first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import helper
+from service.config import resolve_timeframe
+from service.data import Data
+
+logging = helper.LoggerFactory.get_logger("logs/data.log", "history_backfill")
+
+BACKFILL_PRIORITY_ACTIVE_TRADE = 0
+BACKFILL_PRIORITY_BTC_PULSE = 1
+BACKFILL_PRIORITY_SIGNAL = 2
+DEFAULT_HISTORY_BACKFILL_CONCURRENCY = 4
+MAX_HISTORY_BACKFILL_CONCURRENCY = 16
+
+BackfillKey = tuple[str, str, str | None, int]
+
+
+def resolve_history_backfill_concurrency(
+    config: dict[str, Any],
+    default: int = DEFAULT_HISTORY_BACKFILL_CONCURRENCY,
+) -> int:
+    """Parse and clamp how many symbols are backfilled at once."""
+    try:
+        value = int(config.get("history_backfill_concurrency", default))
+    except (TypeError, ValueError):
+        return default
+    return min(max(value, 1), MAX_HISTORY_BACKFILL_CONCURRENCY)
+
+
+def _requested_start_ms(history_days: int, since_ms: int | None) -> int:
+    if since_ms is not None:
+        return int(since_ms)
+    start = datetime.now(timezone.utc) - timedelta(days=history_days)
+    return int(start.timestamp() * 1000)
+
+
+@dataclass
+class _BackfillJob:
+    """One queued history sync; later overlapping requests merge into it."""
+
+    key: BackfillKey
+    config: dict[str, Any]
+    history_days: int
+    since_ms: int | None
+    start_ms: int
+    priority: int
+    future: asyncio.Future[bool]
+    started: bool = False
+
+    @property
+    def symbol(self) -> str:
+        return self.key[0]
+
+    def merge(
+        self, history_days: int, since_ms: int | None, start_ms: int, priority: int
+    ) -> bool:
+        """Widen the window to the earlier start; return True if priority rose."""
+        if start_ms < self.start_ms:
+            self.history_days = history_days
+            self.since_ms = since_ms
+            self.start_ms = start_ms
+        if priority < self.priority:
+            self.priority = priority
+            return True
+        return False
+
+
+def _create_backfill_data() -> Data:
+    return Data(persist_exchange=True)
+
+
+class HistoryBackfillScheduler:
+    """Run history backfills by priority on a bounded worker pool."""
+
+    def __init__(self, data_factory: Callable[[], Any] | None = None) -> None:
+        self._data_factory = data_factory or _create_backfill_data
+        self._data: Any | None = None
+        self._queue: asyncio.PriorityQueue[tuple[int, int, _BackfillJob]] = (
+            asyncio.PriorityQueue()
+        )
+        self._sequence = itertools.count()
+        self._pending: dict[BackfillKey, _BackfillJob] = {}
+        self._running: dict[BackfillKey, _BackfillJob] = {}
+        self._symbol_locks: dict[str, asyncio.Lock] = {}
+        self._workers: list[asyncio.Task[None]] = []
+
+    async def submit(
+        self,
+        symbol: str,
+        history_days: int,
+        config: dict[str, Any],
+        *,
+        priority: int,
+        since_ms: int | None = None,
+        success_timeframe: str | None = None,
+        success_minimum_candles: int = 0,
+    ) -> bool:
+        """Queue ``Data.add_history_data_for_symbol`` and return its result.
+
+        A request whose window is already covered by a running or queued job
+        for the same symbol and success criteria waits for that job instead.
+        """
+        key: BackfillKey = (
+            symbol,
+            resolve_timeframe(config),
+            success_timeframe,
+            int(success_minimum_candles),
+        )
+        start_ms = _requested_start_ms(history_days, since_ms)
+        running = self._running.get(key)
+        if running is not None and running.start_ms <= start_ms:
+            return await asyncio.shield(running.future)
+
+        job = self._pending.get(key)
+        if job is None:
+            job = _BackfillJob(
+                key=key,
+                config=config,
+                history_days=history_days,
+                since_ms=since_ms,
+                start_ms=start_ms,
+                priority=priority,
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self._pending[key] = job
+            self._enqueue(job)
+        elif job.merge(history_days, since_ms, start_ms, priority):
+            self._enqueue(job)
+        self._ensure_workers(config)
+        return await asyncio.shield(job.future)
+
+    def _get_data(self) -> Any:
+        if self._data is None:
+            self._data = self._data_factory()
+        return self._data
+
+    def _enqueue(self, job: _BackfillJob) -> None:
+        self._queue.put_nowait((job.priority, next(self._sequence), job))
+
+    def _ensure_workers(self, config: dict[str, Any]) -> None:
+        self._workers = [task for task in self._workers if not task.done()]
+        target = resolve_history_backfill_concurrency(config)
+        while len(self._workers) < target:
+            self._workers.append(
+                asyncio.create_task(
+                    self._work(),
+                    name=f"history_backfill:worker:{len(self._workers)}",
+                )
+            )
+
+    async def _work(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            if job.started:
+                # Superseded entry of a job whose priority was raised.
+                continue
+            job.started = True
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+            self._running[job.key] = job
+            try:
+                lock = self._symbol_locks.setdefault(job.symbol, asyncio.Lock())
+                async with lock:
+                    result = await self._get_data().add_history_data_for_symbol(
+                        symbol=job.symbol,
+                        history_data=job.history_days,
+                        config=job.config,
+                        since_ms=job.since_ms,
+                        success_timeframe=job.key[2],
+                        success_minimum_candles=job.key[3],
+                    )
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as exc:  # noqa: BLE001 - report False to every waiter.
+                logging.error("History backfill for %s failed: %s", job.symbol, exc)
+                if not job.future.done():
+                    job.future.set_result(False)
+            else:
+                if not job.future.done():
+                    job.future.set_result(bool(result))
+            finally:
+                if self._running.get(job.key) is job:
+                    del self._running[job.key]
+
+    async def shutdown(self) -> None:
+        """Stop workers and cancel every queued or running backfill."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        for job in list(self._pending.values()):
+            job.future.cancel()
+        self._pending.clear()
+        self._running.clear()
+        data, self._data = self._data, None
+        if data is not None:
+            await data.close()
+
+
+_scheduler = HistoryBackfillScheduler()
+
+
+def get_history_backfill_scheduler() -> HistoryBackfillScheduler:
+    """Return the process-wide history backfill scheduler."""
+    return _scheduler
+
+
+def reset_history_backfill_scheduler() -> None:
+    """Drop queued backfills without awaiting them (tests only)."""
+    global _scheduler
+    _scheduler = HistoryBackfillScheduler()
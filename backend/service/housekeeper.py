@@ -6,18 +6,18 @@ from datetime import datetime, timedelta
 from typing import Any
 
 import helper
-import model
 from service.config import Config, resolve_history_lookback_days, resolve_timeframe
 from service.data import Data
 from service.database import optimize_sqlite_connection, run_sqlite_write_with_retry
-from service.sqlite_timestamps import build_normalized_text_timestamp_sql
+from service.sqlite_timestamps import build_epoch_range_clause
 from service.trades import Trades
+from service.upnl_history import compact_upnl_history
+from service.watcher_runtime import get_active_candle_store
 from tortoise import Tortoise
 from tortoise.exceptions import BaseORMException
 
 logging = helper.LoggerFactory.get_logger("logs/housekeeper.log", "housekeeper")
 
-NORMALIZED_TICKER_TIMESTAMP_SQL = build_normalized_text_timestamp_sql()
 
 RECOVERABLE_HOUSEKEEPER_EXCEPTIONS = (
     BaseORMException,
@@ -107,12 +107,16 @@ class Housekeeper:
             return 0
 
         placeholders = ", ".join("?" for _ in inactive_symbols)
+        range_clause, range_params = build_epoch_range_clause(
+            end_timestamp=cleanup_timestamp_ms,
+            end_operator="<",
+        )
         delete_query = (
             "DELETE FROM tickers "
             f"WHERE symbol IN ({placeholders}) "
-            f"AND {NORMALIZED_TICKER_TIMESTAMP_SQL} < ?"
+            f"AND {range_clause}"
         )
-        delete_values = [*inactive_symbols, cleanup_timestamp_ms]
+        delete_values = [*inactive_symbols, *range_params]
 
         deleted = await run_sqlite_write_with_retry(
             lambda: Tortoise.get_connection("default").execute_query(
@@ -122,6 +126,10 @@ class Housekeeper:
             "housekeeping ticker cleanup",
         )
         deleted_count = int(deleted[0] if isinstance(deleted, tuple) else deleted or 0)
+        candle_store = get_active_candle_store()
+        if candle_store is not None:
+            for symbol in inactive_symbols:
+                candle_store.invalidate(symbol)
         logging.info(
             "Housekeeping deleted %s ticker entries older than %s for %s inactive symbols "
             "(retention_days=%s)",
@@ -133,23 +141,14 @@ class Housekeeper:
         return deleted_count
 
     async def _cleanup_upnl_history(self, actual_timestamp: datetime) -> None:
-        """Remove old uPNL snapshots based on retention policy."""
+        """Compact uPNL snapshots into rollups and apply the retention policy."""
         retention_days = self._get_upnl_retention_days()
-        if retention_days == 0:
-            return
-
-        retention_timestamp = actual_timestamp - timedelta(days=retention_days)
-        deleted = await run_sqlite_write_with_retry(
-            lambda: model.UpnlHistory.filter(
-                timestamp__lt=retention_timestamp
-            ).delete(),
-            "cleanup upnl history",
-        )
-        if deleted:
+        deleted = await compact_upnl_history(actual_timestamp, retention_days)
+        if any(deleted.values()):
             logging.info(
-                "Deleted %s uPNL history entries older than %s",
-                deleted,
-                retention_timestamp,
+                "Compacted uPNL history (retention_days=%s): %s",
+                retention_days,
+                ", ".join(f"{tier}={count}" for tier, count in deleted.items()),
             )
 
     async def shutdown(self) -> None:
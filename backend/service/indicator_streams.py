@@ -0,0 +1,307 @@
+"""Incremental indicator state for EMA, RSI, MACD, and Bollinger Band series.
+
+Each stream keeps the recursion state after the last closed candle of one
+(symbol, timeframe, parameters) combination. The newest candle of a resampled
+frame is always treated as provisional: it is evaluated from the closed state
+without being folded into it. New closed candles advance the state in O(1);
+gaps, revised candles, or unseeded state fall back to a full TA-Lib rebuild.
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import talib
+
+StreamOutputs = dict[str, np.ndarray]
+
+
+def frame_timestamps(df: pd.DataFrame) -> np.ndarray | None:
+    """Return resampled bucket timestamps as ``datetime64[ns]`` values."""
+    if "timestamp" not in df.columns:
+        return None
+    try:
+        return pd.to_datetime(df["timestamp"], utc=True).to_numpy(
+            dtype="datetime64[ns]"
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+class IndicatorStream(ABC):
+    """Base class holding closed-candle outputs and recursion state."""
+
+    components: tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.timestamps: np.ndarray = np.empty(0, dtype="datetime64[ns]")
+        self.last_close = math.nan
+        self.seeded = False
+        self.outputs: StreamOutputs = {
+            component: np.empty(0) for component in self.components
+        }
+
+    @classmethod
+    def build(
+        cls,
+        timestamps: np.ndarray | None,
+        closes: np.ndarray,
+        **params: Any,
+    ) -> tuple[IndicatorStream, StreamOutputs]:
+        """Run a full TA-Lib pass and seed a stream from the closed candles."""
+        stream = cls(**params)
+        outputs = stream._full_outputs(closes)
+        if timestamps is not None and len(closes) > 1:
+            closed = closes[:-1]
+            stream.timestamps = timestamps[:-1].copy()
+            stream.last_close = float(closed[-1])
+            stream.outputs = {
+                component: values[:-1].copy() for component, values in outputs.items()
+            }
+            stream.seeded = stream._seed(closed)
+        return stream, outputs
+
+    def can_extend(self, timestamps: np.ndarray | None, closes: np.ndarray) -> bool:
+        """Return True when the frame continues the closed-candle state."""
+        if timestamps is None or not self.seeded or len(self.timestamps) == 0:
+            return False
+        if len(closes) < 2:
+            return False
+        position = int(np.searchsorted(timestamps, self.timestamps[-1]))
+        if position >= len(timestamps) - 1:
+            return False
+        if timestamps[position] != self.timestamps[-1]:
+            return False
+        if float(closes[position]) != self.last_close:
+            return False
+        first = int(np.searchsorted(self.timestamps, timestamps[0]))
+        return np.array_equal(self.timestamps[first:], timestamps[: position + 1])
+
+    def extend(self, timestamps: np.ndarray, closes: np.ndarray) -> StreamOutputs:
+        """Fold new closed candles into state and evaluate the provisional one."""
+        position = int(np.searchsorted(timestamps, self.timestamps[-1]))
+        new_closed = closes[position + 1 : -1]
+        if len(new_closed):
+            stepped = [self._step(float(close)) for close in new_closed]
+            for index, component in enumerate(self.components):
+                self.outputs[component] = np.concatenate(
+                    (self.outputs[component], [row[index] for row in stepped])
+                )
+            self.last_close = float(new_closed[-1])
+
+        first = int(np.searchsorted(self.timestamps, timestamps[0]))
+        self.timestamps = np.concatenate(
+            (self.timestamps[first:], timestamps[position + 1 : -1])
+        )
+        provisional = self._peek(float(closes[-1]))
+        outputs: StreamOutputs = {}
+        for index, component in enumerate(self.components):
+            self.outputs[component] = self.outputs[component][first:]
+            outputs[component] = np.append(self.outputs[component], provisional[index])
+        return outputs
+
+    @abstractmethod
+    def _full_outputs(self, closes: np.ndarray) -> StreamOutputs:
+        """Compute every output series from scratch with TA-Lib."""
+
+    @abstractmethod
+    def _seed(self, closed: np.ndarray) -> bool:
+        """Derive recursion state from closed candles and their outputs."""
+
+    @abstractmethod
+    def _step(self, close: float) -> tuple[float, ...]:
+        """Fold one closed candle into state and return its outputs."""
+
+    @abstractmethod
+    def _peek(self, close: float) -> tuple[float, ...]:
+        """Return outputs for a provisional candle without changing state."""
+
+
+class EmaStream(IndicatorStream):
+    """Exponential moving average with TA-Lib's smoothing factor."""
+
+    components = ("ema",)
+
+    def __init__(self, length: int) -> None:
+        self.length = int(length)
+        self.alpha = 2.0 / (self.length + 1)
+        self.ema = math.nan
+        super().__init__()
+
+    def _full_outputs(self, closes: np.ndarray) -> StreamOutputs:
+        return {"ema": talib.EMA(closes, timeperiod=self.length)}
+
+    def _seed(self, closed: np.ndarray) -> bool:
+        self.ema = float(self.outputs["ema"][-1])
+        return math.isfinite(self.ema)
+
+    def _step(self, close: float) -> tuple[float, ...]:
+        self.ema = self._peek(close)[0]
+        return (self.ema,)
+
+    def _peek(self, close: float) -> tuple[float, ...]:
+        return (self.ema + self.alpha * (close - self.ema),)
+
+
+class RsiStream(IndicatorStream):
+    """Wilder RSI matching TA-Lib's seeding and smoothing."""
+
+    components = ("rsi",)
+
+    def __init__(self, length: int) -> None:
+        self.length = int(length)
+        self.avg_gain = math.nan
+        self.avg_loss = math.nan
+        super().__init__()
+
+    def _full_outputs(self, closes: np.ndarray) -> StreamOutputs:
+        return {"rsi": talib.RSI(closes, timeperiod=self.length)}
+
+    def _seed(self, closed: np.ndarray) -> bool:
+        if len(closed) <= self.length:
+            return False
+        deltas = np.diff(closed)
+        gains = np.clip(deltas, 0.0, None)
+        losses = np.clip(-deltas, 0.0, None)
+        avg_gain = float(gains[: self.length].sum() / self.length)
+        avg_loss = float(losses[: self.length].sum() / self.length)
+        for gain, loss in zip(gains[self.length :], losses[self.length :]):
+            avg_gain = (avg_gain * (self.length - 1) + float(gain)) / self.length
+            avg_loss = (avg_loss * (self.length - 1) + float(loss)) / self.length
+        self.avg_gain = avg_gain
+        self.avg_loss = avg_loss
+        return True
+
+    def _averages(self, close: float) -> tuple[float, float]:
+        delta = close - self.last_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        return (
+            (self.avg_gain * (self.length - 1) + gain) / self.length,
+            (self.avg_loss * (self.length - 1) + loss) / self.length,
+        )
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        total = avg_gain + avg_loss
+        return 100.0 * avg_gain / total if total else 0.0
+
+    def _step(self, close: float) -> tuple[float, ...]:
+        self.avg_gain, self.avg_loss = self._averages(close)
+        self.last_close = close
+        return (self._rsi(self.avg_gain, self.avg_loss),)
+
+    def _peek(self, close: float) -> tuple[float, ...]:
+        return (self._rsi(*self._averages(close)),)
+
+
+class MacdStream(IndicatorStream):
+    """MACD line, signal, and histogram driven by three EMA recursions."""
+
+    components = ("macd", "signal", "histogram")
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int) -> None:
+        self.fast_period = int(fast_period)
+        self.slow_period = int(slow_period)
+        self.signal_period = int(signal_period)
+        self.fast_alpha = 2.0 / (self.fast_period + 1)
+        self.slow_alpha = 2.0 / (self.slow_period + 1)
+        self.signal_alpha = 2.0 / (self.signal_period + 1)
+        self.fast_ema = math.nan
+        self.slow_ema = math.nan
+        self.signal = math.nan
+        super().__init__()
+
+    def _macd(self, closes: np.ndarray) -> tuple[np.ndarray, ...]:
+        return talib.MACD(
+            closes,
+            fastperiod=self.fast_period,
+            slowperiod=self.slow_period,
+            signalperiod=self.signal_period,
+        )
+
+    def _full_outputs(self, closes: np.ndarray) -> StreamOutputs:
+        return dict(zip(self.components, self._macd(closes)))
+
+    def _seed(self, closed: np.ndarray) -> bool:
+        slow = talib.EMA(closed, timeperiod=self.slow_period)
+        self.slow_ema = float(slow[-1])
+        self.fast_ema = float(self.outputs["macd"][-1]) + self.slow_ema
+        self.signal = float(self.outputs["signal"][-1])
+        return all(
+            math.isfinite(value)
+            for value in (self.fast_ema, self.slow_ema, self.signal)
+        )
+
+    def _next(self, close: float) -> tuple[float, float, float]:
+        fast = self.fast_ema + self.fast_alpha * (close - self.fast_ema)
+        slow = self.slow_ema + self.slow_alpha * (close - self.slow_ema)
+        signal = self.signal + self.signal_alpha * ((fast - slow) - self.signal)
+        return fast, slow, signal
+
+    def _step(self, close: float) -> tuple[float, ...]:
+        self.fast_ema, self.slow_ema, self.signal = self._next(close)
+        macd = self.fast_ema - self.slow_ema
+        return macd, self.signal, macd - self.signal
+
+    def _peek(self, close: float) -> tuple[float, ...]:
+        fast, slow, signal = self._next(close)
+        macd = fast - slow
+        return macd, signal, macd - signal
+
+
+class BollingerStream(IndicatorStream):
+    """Bollinger Bands over a rolling window of closed candles."""
+
+    components = ("upper", "middle", "lower", "bandwidth")
+
+    def __init__(self, length: int, standard_deviations: float) -> None:
+        self.length = int(length)
+        self.standard_deviations = float(standard_deviations)
+        self.window: deque[float] = deque(maxlen=self.length)
+        super().__init__()
+
+    def _full_outputs(self, closes: np.ndarray) -> StreamOutputs:
+        upper, middle, lower = talib.BBANDS(
+            closes,
+            timeperiod=self.length,
+            nbdevup=self.standard_deviations,
+            nbdevdn=self.standard_deviations,
+            matype=0,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bandwidth = ((upper - lower) / middle) * 100
+        return {
+            "upper": upper,
+            "middle": middle,
+            "lower": lower,
+            "bandwidth": bandwidth,
+        }
+
+    def _seed(self, closed: np.ndarray) -> bool:
+        self.window.extend(float(close) for close in closed[-self.length :])
+        return len(self.window) >= self.length - 1
+
+    def _bands(self, values: list[float]) -> tuple[float, ...]:
+        if len(values) < self.length:
+            return (math.nan,) * len(self.components)
+        window = np.asarray(values)
+        middle = float(window.mean())
+        deviation = float(window.std()) * self.standard_deviations
+        upper = middle + deviation
+        lower = middle - deviation
+        bandwidth = ((upper - lower) / middle) * 100 if middle else math.nan
+        return upper, middle, lower, bandwidth
+
+    def _step(self, close: float) -> tuple[float, ...]:
+        self.window.append(close)
+        return self._bands(list(self.window))
+
+    def _peek(self, close: float) -> tuple[float, ...]:
+        previous = list(self.window)[len(self.window) - self.length + 1 :]
+        return self._bands([*previous, close])
@@ -4,9 +4,18 @@ import asyncio
 from typing import Any
 
 import helper
+import pandas as pd
 import talib
 from service.config import resolve_history_lookback_days
 from service.data import Data
+from service.indicator_streams import (
+    BollingerStream,
+    EmaStream,
+    IndicatorStream,
+    MacdStream,
+    RsiStream,
+    frame_timestamps,
+)
 from tortoise.exceptions import BaseORMException
 
 logging = helper.LoggerFactory.get_logger("logs/indicators.log", "indicators")
@@ -51,22 +60,40 @@ class Indicators:
         self._close_cache: dict[tuple[str, str, int], tuple[float | None, Any]] = {}
         self._low_cache: dict[tuple[str, str, int], tuple[float | None, Any]] = {}
         self._high_cache: dict[tuple[str, str, int], tuple[float | None, Any]] = {}
+        self._streams: dict[tuple[Any, ...], IndicatorStream] = {}
 
     @staticmethod
     def _log_indicator_error(name: str, symbol: str, exc: Exception) -> None:
         """Log indicator calculation failures consistently."""
         logging.error("%s cannot be calculated for %s. Cause: %s", name, symbol, exc)
 
-    @staticmethod
-    def _calculate_ema_sync(df: Any, lengths: list[int]) -> dict[str, Any]:
-        """Compute EMA values synchronously from a candle DataFrame."""
-        ema: dict[str, Any] = {}
-        for length in lengths:
-            length_key = f"ema_{str(length)}"
-            ema[length_key] = (
-                talib.EMA(df["close"], timeperiod=length).dropna().iloc[-1]
+    async def _stream_series(
+        self,
+        key: tuple[Any, ...],
+        stream_class: type[IndicatorStream],
+        df: Any,
+        **params: Any,
+    ) -> dict[str, Any]:
+        """Advance an incremental indicator stream and return aligned series.
+
+        Closed candles are folded into the stored state; a full TA-Lib rebuild
+        only runs for new keys, gaps, or revised candles.
+        """
+        close = df["close"].dropna()
+        closes = close.to_numpy(dtype=float)
+        timestamps = frame_timestamps(df.loc[close.index])
+        stream = self._streams.get(key)
+        if stream is not None and stream.can_extend(timestamps, closes):
+            outputs = stream.extend(timestamps, closes)
+        else:
+            stream, outputs = await asyncio.to_thread(
+                stream_class.build, timestamps, closes, **params
             )
-        return ema
+            self._streams[key] = stream
+        return {
+            component: pd.Series(values, index=close.index)
+            for component, values in outputs.items()
+        }
 
     @staticmethod
     def _calculate_btc_pulse_sync(df: Any) -> bool:
@@ -243,7 +270,14 @@ class Indicators:
                 symbol, timerange, max(max_length * 2, 200)
             )
             df = await asyncio.to_thread(self.data.resample_data, df_raw, timerange)
-            ema = await asyncio.to_thread(self._calculate_ema_sync, df, lengths)
+            for length in lengths:
+                series = await self._stream_series(
+                    ("ema", symbol, timerange, int(length)),
+                    EmaStream,
+                    df,
+                    length=int(length),
+                )
+                ema[f"ema_{str(length)}"] = series["ema"].dropna().iloc[-1]
             self._ema_cache[cache_key] = (latest_timestamp, ema)
         except INDICATOR_CALCULATION_EXCEPTIONS as e:
             self._log_indicator_error("EMA", symbol, e)
@@ -266,9 +300,10 @@ class Indicators:
                 symbol, timerange, max(length * 2, 200)
             )
             df = await asyncio.to_thread(self.data.resample_data, df_raw, timerange)
-            series = await asyncio.to_thread(
-                lambda: talib.EMA(df["close"].dropna(), timeperiod=length)
+            streamed = await self._stream_series(
+                ("ema", *cache_key), EmaStream, df, length=int(length)
             )
+            series = streamed["ema"]
             self._ema_series_cache[cache_key] = (latest_timestamp, series)
             return series
         except INDICATOR_CALCULATION_EXCEPTIONS as e:
@@ -390,9 +425,10 @@ class Indicators:
                 symbol, timerange, max(length * 3, 50)
             )
             df = await asyncio.to_thread(self.data.resample_data, df_raw, timerange)
-            series = await asyncio.to_thread(
-                lambda: talib.RSI(df["close"].dropna(), timeperiod=length)
+            streamed = await self._stream_series(
+                ("rsi", *cache_key), RsiStream, df, length=int(length)
             )
+            series = streamed["rsi"]
             self._rsi_series_cache[cache_key] = (latest_timestamp, series)
             return series
         except INDICATOR_CALCULATION_EXCEPTIONS as e:
@@ -452,24 +488,13 @@ class Indicators:
                 symbol, timerange, max(length * 3, 50)
             )
             df = await asyncio.to_thread(self.data.resample_data, df_raw, timerange)
-
-            def _build_series() -> dict[str, Any]:
-                upper, middle, lower = talib.BBANDS(
-                    df["close"].dropna(),
-                    timeperiod=length,
-                    nbdevup=standard_deviations,
-                    nbdevdn=standard_deviations,
-                    matype=0,
-                )
-                bandwidth = ((upper - lower) / middle) * 100
-                return {
-                    "upper": upper,
-                    "middle": middle,
-                    "lower": lower,
-                    "bandwidth": bandwidth,
-                }
-
-            series = await asyncio.to_thread(_build_series)
+            series = await self._stream_series(
+                ("bollinger", *cache_key),
+                BollingerStream,
+                df,
+                length=int(length),
+                standard_deviations=float(standard_deviations),
+            )
             self._bollinger_series_cache[cache_key] = (latest_timestamp, series)
             return series
         except INDICATOR_CALCULATION_EXCEPTIONS as e:
@@ -529,17 +554,14 @@ class Indicators:
                 symbol, timerange, max(slow_period * 3, 100)
             )
             df = await asyncio.to_thread(self.data.resample_data, df_raw, timerange)
-
-            def _build_series() -> dict[str, Any]:
-                macd, signal, histogram = talib.MACD(
-                    df["close"].dropna(),
-                    fastperiod=fast_period,
-                    slowperiod=slow_period,
-                    signalperiod=signal_period,
-                )
-                return {"macd": macd, "signal": signal, "histogram": histogram}
-
-            series = await asyncio.to_thread(_build_series)
+            series = await self._stream_series(
+                ("macd", *cache_key),
+                MacdStream,
+                df,
+                fast_period=int(fast_period),
+                slow_period=int(slow_period),
+                signal_period=int(signal_period),
+            )
             self._macd_series_cache[cache_key] = (latest_timestamp, series)
             return series
         except INDICATOR_CALCULATION_EXCEPTIONS as e:
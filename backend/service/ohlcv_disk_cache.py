@@ -0,0 +1,199 @@
+"""On-disk OHLCV history cache for backtests.
+
+Closed candles are stored per exchange, market, symbol, and timeframe as one
+sorted ``(timestamp, open, high, low, close, volume)`` ``.npy`` array next to
+a JSON list of the millisecond spans already fetched from the exchange. Reads
+are memory-mapped, and only spans outside the recorded coverage are requested
+from the exchange again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import helper
+import numpy as np
+
+logging = helper.LoggerFactory.get_logger("logs/backtest.log", "ohlcv_disk_cache")
+
+OHLCV_CACHE_DIR = os.getenv(
+    "MOONWALKER_OHLCV_CACHE_DIR", os.path.join("db", "ohlcv_cache")
+)
+CANDLE_FIELDS = 6
+
+Span = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class OhlcvCacheKey:
+    """Identity of one cached candle series."""
+
+    exchange: str
+    market: str
+    symbol: str
+    timeframe: str
+
+    @classmethod
+    def from_config(
+        cls, config: dict[str, Any], symbol: str, timeframe: str
+    ) -> OhlcvCacheKey:
+        """Build the key for the exchange configured in ``config``."""
+        return cls(
+            exchange=str(config.get("exchange") or "unknown"),
+            market=str(config.get("market") or "spot"),
+            symbol=symbol,
+            timeframe=timeframe,
+        )
+
+    def relative_stem(self) -> Path:
+        """Return the file stem below the cache root."""
+        safe_symbol = re.sub(r"[^A-Za-z0-9._-]", "_", self.symbol)
+        return Path(f"{self.exchange}-{self.market}") / safe_symbol / self.timeframe
+
+
+class OhlcvDiskCache:
+    """Columnar candle files with per-series span coverage."""
+
+    def __init__(self, root: str | os.PathLike[str] = OHLCV_CACHE_DIR) -> None:
+        self.root = Path(root)
+        self._locks: dict[OhlcvCacheKey, asyncio.Lock] = {}
+
+    def lock(self, key: OhlcvCacheKey) -> asyncio.Lock:
+        """Return the lock serializing gap fills of one series."""
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def coverage(self, key: OhlcvCacheKey) -> list[Span]:
+        """Return the merged spans already fetched for a series."""
+        try:
+            raw = json.loads(self._coverage_path(key).read_text(encoding="utf-8"))
+            return _merge_spans([(int(start), int(end)) for start, end in raw])
+        except FileNotFoundError:
+            return []
+        except (OSError, TypeError, ValueError) as exc:
+            logging.warning("Ignoring unreadable OHLCV coverage for %s: %s", key, exc)
+            return []
+
+    def missing_spans(self, key: OhlcvCacheKey, start: int, end: int) -> list[Span]:
+        """Return the parts of ``[start, end]`` not covered yet."""
+        missing: list[Span] = []
+        cursor = start
+        for covered_start, covered_end in self.coverage(key):
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start - 1))
+            cursor = max(cursor, covered_end + 1)
+        if cursor <= end:
+            missing.append((cursor, end))
+        return missing
+
+    def read(
+        self, key: OhlcvCacheKey, start: int, end: int, max_candles: int
+    ) -> np.ndarray:
+        """Return up to ``max_candles`` cached rows with ``start <= ts <= end``."""
+        rows = self._load_rows(key)
+        first = int(np.searchsorted(rows[:, 0], start, side="left"))
+        last = int(np.searchsorted(rows[:, 0], end, side="right"))
+        return np.array(rows[first : min(last, first + max_candles)])
+
+    def first_timestamp_after(self, key: OhlcvCacheKey, timestamp: int) -> int | None:
+        """Return the first cached candle timestamp later than ``timestamp``."""
+        rows = self._load_rows(key)
+        position = int(np.searchsorted(rows[:, 0], timestamp, side="right"))
+        return int(rows[position, 0]) if position < len(rows) else None
+
+    def store(self, key: OhlcvCacheKey, rows: np.ndarray, span: Span) -> None:
+        """Merge fetched rows and mark ``span`` as covered."""
+        existing = np.array(self._load_rows(key))
+        merged = np.concatenate((rows.reshape(-1, CANDLE_FIELDS), existing))
+        # Fresh rows come first so they win when timestamps repeat.
+        _, unique = np.unique(merged[:, 0], return_index=True)
+        merged = merged[unique]
+
+        data_path = self._data_path(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        # Data before coverage: coverage must never claim rows not on disk.
+        _atomic_write(data_path, lambda handle: np.save(handle, merged))
+        coverage = _merge_spans([*self.coverage(key), span])
+        _atomic_write(
+            self._coverage_path(key),
+            lambda handle: handle.write(json.dumps(coverage).encode("utf-8")),
+        )
+
+    def _load_rows(self, key: OhlcvCacheKey) -> np.ndarray:
+        try:
+            rows = np.load(self._data_path(key), mmap_mode="r")
+        except FileNotFoundError:
+            return np.empty((0, CANDLE_FIELDS))
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable OHLCV cache for %s: %s", key, exc)
+            return np.empty((0, CANDLE_FIELDS))
+        if rows.ndim != 2 or rows.shape[1] != CANDLE_FIELDS:
+            return np.empty((0, CANDLE_FIELDS))
+        return rows
+
+    def _data_path(self, key: OhlcvCacheKey) -> Path:
+        return self.root / key.relative_stem().with_suffix(".npy")
+
+    def _coverage_path(self, key: OhlcvCacheKey) -> Path:
+        return self.root / key.relative_stem().with_suffix(".coverage.json")
+
+
+_disk_cache: OhlcvDiskCache | None = None
+
+
+def get_ohlcv_disk_cache() -> OhlcvDiskCache:
+    """Return the process-wide OHLCV disk cache."""
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = OhlcvDiskCache()
+    return _disk_cache
+
+
+def covered_span(
+    span: Span,
+    rows: np.ndarray,
+    step_ms: int,
+    next_cached_timestamp: int | None,
+) -> Span | None:
+    """Return the part of a fetched span that is known to be complete.
+
+    Fetches page forward from ``span[0]``, so everything up to the last
+    returned candle is complete; the tail only counts when no further candle
+    fits before ``span[1]``. Empty results are not trusted unless the next
+    cached candle proves the span is shorter than one candle.
+    """
+    start, end = span
+    if len(rows):
+        last = int(rows[-1, 0])
+        return (start, end if last + step_ms > end else last)
+    if next_cached_timestamp is not None and next_cached_timestamp - step_ms < start:
+        return span
+    return None
+
+
+def _merge_spans(spans: list[Span]) -> list[Span]:
+    """Merge overlapping or adjacent inclusive spans."""
+    merged: list[Span] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _atomic_write(path: Path, write: Any) -> None:
+    """Write through a temporary file so readers never see partial files."""
+    temporary = path.with_name(f".{path.name}.tmp")
+    with temporary.open("wb") as handle:
+        write(handle)
+    os.replace(temporary, path)
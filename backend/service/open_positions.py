@@ -0,0 +1,131 @@
+"""Process-local model of open positions for the per-tick DCA decision path.
+
+Positions are loaded from the database once per symbol and afterwards kept
+current by the trade write paths: order persistence and structural trade
+mutations invalidate the affected symbol, while per-tick statistic updates of
+the open trade row are applied in place. Reading a cached position therefore
+never touches SQL.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+# Open trade columns feeding process-wide aggregates such as funds locked.
+AGGREGATE_OPEN_TRADE_FIELDS = frozenset(
+    {
+        "campaign_id",
+        "cost",
+        "exposure_state",
+        "reserved_reentry_quote",
+        "waiting_reference_quote",
+    }
+)
+
+
+@dataclass
+class OpenPosition:
+    """Persisted rows describing the position of one symbol."""
+
+    symbol: str
+    trades: list[dict[str, Any]] = field(default_factory=list)
+    open_trade: dict[str, Any] | None = None
+    campaign: dict[str, Any] | None = None
+
+
+PositionLoader = Callable[[str], Awaitable[OpenPosition]]
+
+
+class OpenPositionCache:
+    """Write-maintained per-symbol positions and derived aggregates."""
+
+    def __init__(self) -> None:
+        self._positions: dict[str, OpenPosition] = {}
+        self._aggregates: dict[str, Any] = {}
+        self._symbol_generations: dict[str, int] = {}
+        self._epoch = 0
+        self._aggregate_generation = 0
+
+    def peek(self, symbol: str) -> OpenPosition | None:
+        """Return the cached position for a symbol without loading it."""
+        return self._positions.get(symbol)
+
+    async def get_position(self, symbol: str, loader: PositionLoader) -> OpenPosition:
+        """Return the position for a symbol, loading it on first use."""
+        position = self._positions.get(symbol)
+        if position is not None:
+            return position
+        generation = (self._epoch, self._symbol_generations.get(symbol, 0))
+        position = await loader(symbol)
+        # A write during the load may have made the loaded rows stale.
+        if generation == (self._epoch, self._symbol_generations.get(symbol, 0)):
+            self._positions[symbol] = position
+        return position
+
+    async def get_aggregate(
+        self, name: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return a cached aggregate over all positions, loading it when stale."""
+        if name in self._aggregates:
+            return self._aggregates[name]
+        generation = self._aggregate_generation
+        value = await loader()
+        if generation == self._aggregate_generation:
+            self._aggregates[name] = value
+        return value
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Drop one symbol (or every symbol) after its rows were rewritten."""
+        if symbol is None:
+            self._positions.clear()
+            self._epoch += 1
+        else:
+            self._positions.pop(symbol, None)
+            self._symbol_generations[symbol] = (
+                self._symbol_generations.get(symbol, 0) + 1
+            )
+        self.invalidate_aggregates()
+
+    def invalidate_symbols(self, symbols: Iterable[str]) -> None:
+        """Drop several symbols after a bulk write."""
+        for symbol in symbols:
+            self.invalidate(symbol)
+
+    def apply_open_trade_update(self, symbol: str, payload: dict[str, Any]) -> None:
+        """Apply a persisted open trade column update to the cached row."""
+        self._symbol_generations[symbol] = self._symbol_generations.get(symbol, 0) + 1
+        position = self._positions.get(symbol)
+        open_trade = position.open_trade if position is not None else None
+        aggregate_fields = AGGREGATE_OPEN_TRADE_FIELDS.intersection(payload)
+        if open_trade is None:
+            if position is not None:
+                # The row appeared behind the cache's back; reload it.
+                self._positions.pop(symbol, None)
+            if aggregate_fields:
+                self.invalidate_aggregates()
+            return
+        if any(open_trade.get(name) != payload[name] for name in aggregate_fields):
+            self.invalidate_aggregates()
+        position.open_trade = {**open_trade, **payload}
+
+    def has_open_trade(self, symbol: str) -> bool | None:
+        """Return whether a symbol has an open trade row, or None when unknown."""
+        position = self._positions.get(symbol)
+        if position is None:
+            return None
+        return position.open_trade is not None
+
+    def invalidate_aggregates(self) -> None:
+        """Drop aggregates after rows outside the open positions changed."""
+        self._aggregates.clear()
+        self._aggregate_generation += 1
+
+
+_open_position_cache = OpenPositionCache()
+
+
+def get_open_position_cache() -> OpenPositionCache:
+    """Return the process-wide open position cache."""
+    return _open_position_cache
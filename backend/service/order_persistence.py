@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 from uuid import uuid4
 
 import model
+from service.analytics import get_analytics_state
 from service.database import run_sqlite_write_with_retry
+from service.open_positions import get_open_position_cache
 from service.order_payloads import format_trade_datetime, trade_datetime_from_ms
+from service.profit_ledger import get_closed_profit_ledger
 from service.replay_candles import archive_replay_candles_for_deal
 from service.spot_campaign_types import TradeExposureState, TradeLifecycleMode
+from service.trade_events import publish_trade_state_changed
 from service.trade_math import parse_date_to_ms
 from tortoise.expressions import F
 from tortoise.transactions import in_transaction
@@ -34,6 +38,18 @@ SUMMARY_TRADE_KEYS = {
 }
 
 
+async def _run_trade_write(
+    operation: Callable[[], Awaitable[None]], description: str, *, symbol: str
+) -> None:
+    """Run one trade write and announce the changed state to subscribers."""
+    try:
+        await run_sqlite_write_with_retry(operation, description)
+    finally:
+        # Failed writes may have partially applied outside a transaction.
+        get_open_position_cache().invalidate(symbol)
+    await publish_trade_state_changed()
+
+
 def _create_deal_id() -> str:
     """Return a fresh stable deal identifier."""
     return str(uuid4())
@@ -405,8 +421,8 @@ async def persist_buy_trade(
                     campaign_id=campaign_id,
                 )
 
-    await run_sqlite_write_with_retry(
-        _persist_buy, f"persisting buy order for {symbol}"
+    await _run_trade_write(
+        _persist_buy, f"persisting buy order for {symbol}", symbol=symbol
     )
 
 
@@ -418,33 +434,32 @@ async def persist_closed_trade(
 ) -> None:
     """Persist a closed trade and remove its open-trade rows."""
 
+    summary_payload = {
+        key: value for key, value in payload.items() if key in SUMMARY_TRADE_KEYS
+    }
+    summary_payload["campaign_id"] = (
+        campaign_context.get("campaign_id")
+        if campaign_context
+        else payload.get("campaign_id")
+    )
+    summary_payload["close_reason"] = (
+        campaign_context.get("close_reason")
+        if campaign_context
+        else payload.get("close_reason")
+    )
+    summary_overrides = (
+        campaign_context.get("summary_overrides") if campaign_context else None
+    )
+    if isinstance(summary_overrides, dict):
+        for key, value in summary_overrides.items():
+            if key in SUMMARY_TRADE_KEYS:
+                summary_payload[key] = value
+
     async def _persist_sell() -> None:
         async with in_transaction() as conn:
             deal_id, history_complete = await _resolve_open_deal_state(symbol, conn)
-            summary_payload = {
-                key: value
-                for key, value in payload.items()
-                if key in SUMMARY_TRADE_KEYS
-            }
             summary_payload["deal_id"] = deal_id
             summary_payload["execution_history_complete"] = history_complete
-            summary_payload["campaign_id"] = (
-                campaign_context.get("campaign_id")
-                if campaign_context
-                else payload.get("campaign_id")
-            )
-            summary_payload["close_reason"] = (
-                campaign_context.get("close_reason")
-                if campaign_context
-                else payload.get("close_reason")
-            )
-            summary_overrides = (
-                campaign_context.get("summary_overrides") if campaign_context else None
-            )
-            if isinstance(summary_overrides, dict):
-                for key, value in summary_overrides.items():
-                    if key in SUMMARY_TRADE_KEYS:
-                        summary_payload[key] = value
             await model.ClosedTrades.create(**summary_payload, using_db=conn)
 
             for sell_execution in payload.get("sell_executions") or []:
@@ -479,9 +494,11 @@ async def persist_closed_trade(
                 context=campaign_context,
             )
 
-    await run_sqlite_write_with_retry(
-        _persist_sell, f"persisting sell order for {symbol}"
+    await _run_trade_write(
+        _persist_sell, f"persisting sell order for {symbol}", symbol=symbol
     )
+    get_closed_profit_ledger().record_closed_trade(summary_payload)
+    get_analytics_state().record_closed_trade(summary_payload)
 
 
 async def persist_sidestep_transition(
@@ -563,8 +580,10 @@ async def persist_sidestep_transition(
                 context=campaign_context,
             )
 
-    await run_sqlite_write_with_retry(
-        _persist_sidestep, f"persisting sidestep transition for {symbol}"
+    await _run_trade_write(
+        _persist_sidestep,
+        f"persisting sidestep transition for {symbol}",
+        symbol=symbol,
     )
 
 
@@ -608,8 +627,10 @@ async def persist_manual_buy_add(
             if updated == 0:
                 raise ValueError(f"No open trade found for {symbol}.")
 
-    await run_sqlite_write_with_retry(
-        _persist_manual_buy, f"persisting manual buy add for {symbol}"
+    await _run_trade_write(
+        _persist_manual_buy,
+        f"persisting manual buy add for {symbol}",
+        symbol=symbol,
     )
 
 
@@ -679,9 +700,10 @@ async def persist_partial_sell_execution(
                     using_db=conn,
                 )
 
-    await run_sqlite_write_with_retry(
+    await _run_trade_write(
         _persist_partial_sell_execution,
         f"updating partial sell execution for {symbol}",
+        symbol=symbol,
     )
 
 
@@ -693,10 +715,13 @@ async def persist_closed_trade_summary(payload: dict[str, Any]) -> None:
             await model.ClosedTrades.create(**payload, using_db=conn)
 
     symbol = str(payload.get("symbol") or "").strip() or "unknown"
-    await run_sqlite_write_with_retry(
+    await _run_trade_write(
         _persist_closed_trade_summary,
         f"persisting detached closed trade summary for {symbol}",
+        symbol=symbol,
     )
+    get_closed_profit_ledger().record_closed_trade(payload)
+    get_analytics_state().record_closed_trade(payload)
 
 
 async def persist_unsellable_remainder(
@@ -715,9 +740,10 @@ async def persist_unsellable_remainder(
             await model.Trades.filter(symbol=symbol).using_db(conn).delete()
             await model.OpenTrades.filter(symbol=symbol).using_db(conn).delete()
 
-    await run_sqlite_write_with_retry(
+    await _run_trade_write(
         _persist_unsellable_remainder,
         f"persisting unsellable remainder for {symbol}",
+        symbol=symbol,
     )
 
 
@@ -729,9 +755,10 @@ async def persist_unsellable_remainder_archive(payload: dict[str, Any]) -> None:
             await model.UnsellableTrades.create(**payload, using_db=conn)
 
     symbol = str(payload.get("symbol") or "").strip() or "unknown"
-    await run_sqlite_write_with_retry(
+    await _run_trade_write(
         _persist_unsellable_archive,
         f"persisting unsellable remainder archive for {symbol}",
+        symbol=symbol,
     )
 
 
@@ -763,4 +790,4 @@ async def persist_stopped_trade(
                     deal_id=open_trade.deal_id,
                 ).using_db(conn).delete()
 
-    await run_sqlite_write_with_retry(_persist_stop, f"stopping symbol {symbol}")
+    await _run_trade_write(_persist_stop, f"stopping symbol {symbol}", symbol=symbol)
@@ -0,0 +1,108 @@
+"""Running closed-trade profit rollups kept current by trade write paths.
+
+The ledger reads every closed trade once and afterwards only applies the
+summaries written by order persistence, so profit endpoints and the profit
+stream work on one bucket per day instead of the whole closed-trade table.
+Rare bulk mutations (deletions, restores, manual campaign stops) invalidate
+it and the next reader rebuilds it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+from typing import Any
+
+import model
+
+
+def profit_date_key(timestamp: Any) -> str | None:
+    """Normalize timestamp-like values into a YYYY-MM-DD grouping key."""
+    if isinstance(timestamp, datetime):
+        return timestamp.date().isoformat()
+    if isinstance(timestamp, str):
+        normalized = timestamp.strip()
+        if not normalized:
+            return None
+        try:
+            return (
+                datetime.fromisoformat(normalized.replace("Z", "+00:00"))
+                .date()
+                .isoformat()
+            )
+        except ValueError:
+            pass
+        if len(normalized) >= 10:
+            try:
+                return datetime.strptime(normalized[:10], "%Y-%m-%d").date().isoformat()
+            except ValueError:
+                return None
+    return None
+
+
+class ClosedProfitLedger:
+    """Closed-trade profit totals per calendar day plus the overall sum."""
+
+    def __init__(self) -> None:
+        self._daily: dict[str, float] | None = None
+        self._total = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    async def total_profit(self) -> float:
+        """Return the summed profit of all closed trades."""
+        _, total = await self._ensure_loaded()
+        return total
+
+    async def daily_profit_since(self, begin: date) -> dict[str, float]:
+        """Return per-day profit for close dates on or after ``begin``."""
+        daily, _ = await self._ensure_loaded()
+        begin_key = begin.isoformat()
+        return {day: value for day, value in sorted(daily.items()) if day >= begin_key}
+
+    def record_closed_trade(self, summary: dict[str, Any]) -> None:
+        """Apply one persisted closed-trade summary row."""
+        self._generation += 1
+        if self._daily is None:
+            return
+        profit = float(summary.get("profit") or 0.0)
+        self._total += profit
+        day = profit_date_key(summary.get("close_date"))
+        if day is not None:
+            self._daily[day] = self._daily.get(day, 0.0) + profit
+
+    def invalidate(self) -> None:
+        """Rebuild the rollups on next use after closed trades were rewritten."""
+        self._generation += 1
+        self._daily = None
+        self._total = 0.0
+
+    async def _ensure_loaded(self) -> tuple[dict[str, float], float]:
+        if self._daily is not None:
+            return self._daily, self._total
+        async with self._lock:
+            if self._daily is not None:
+                return self._daily, self._total
+            generation = self._generation
+            rows = await model.ClosedTrades.all().values_list("close_date", "profit")
+            daily: dict[str, float] = {}
+            total = 0.0
+            for close_date, profit in rows:
+                value = float(profit or 0.0)
+                total += value
+                day = profit_date_key(close_date)
+                if day is not None:
+                    daily[day] = daily.get(day, 0.0) + value
+            # A write during the scan may or may not be in the rows; rescan later.
+            if generation == self._generation:
+                self._daily = daily
+                self._total = total
+            return daily, total
+
+
+_ledger = ClosedProfitLedger()
+
+
+def get_closed_profit_ledger() -> ClosedProfitLedger:
+    """Return the process-wide closed profit ledger."""
+    return _ledger
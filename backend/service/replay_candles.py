@@ -11,7 +11,8 @@ from service.config import Config, resolve_timeframe
 from service.data_timeframes import timeframe_to_milliseconds
 from service.exchange import Exchange
 from service.sqlite_timestamps import (
-    build_normalized_text_timestamp_sql,
+    build_epoch_order_sql,
+    build_epoch_range_clause,
     coerce_timestamp_like_to_ms,
 )
 from service.watcher_runtime import get_live_candle_snapshot
@@ -21,7 +22,7 @@ logging = helper.LoggerFactory.get_logger("logs/replay_candles.log", "replay_can
 
 REPLAY_ARCHIVE_PRE_ROLL_MS = 2 * 24 * 60 * 60 * 1000
 REPLAY_ARCHIVE_POST_ROLL_MS = 4 * 24 * 60 * 60 * 1000
-NORMALIZED_TICKER_TIMESTAMP_SQL = build_normalized_text_timestamp_sql()
+TICKER_EPOCH_ORDER_SQL = build_epoch_order_sql()
 
 
 def _parse_optional_ms(value: Any) -> int | None:
@@ -303,14 +304,13 @@ async def archive_replay_candles_for_deal(
         conn=conn,
     )
 
+    range_clause, range_params = build_epoch_range_clause(start_ms, end_ms)
     ticker_rows = await connection.execute_query_dict(
         "SELECT timestamp, open, high, low, close, volume "
         "FROM tickers "
-        "WHERE symbol = ? "
-        f"AND {NORMALIZED_TICKER_TIMESTAMP_SQL} >= ? "
-        f"AND {NORMALIZED_TICKER_TIMESTAMP_SQL} <= ? "
-        f"ORDER BY {NORMALIZED_TICKER_TIMESTAMP_SQL}, timestamp",
-        [normalized_symbol, start_ms, end_ms],
+        f"WHERE symbol = ? AND {range_clause} "
+        f"ORDER BY {TICKER_EPOCH_ORDER_SQL}, timestamp",
+        [normalized_symbol, *range_params],
     )
     source_rows = _merge_archive_source_rows(
         ticker_rows,
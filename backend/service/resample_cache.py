@@ -0,0 +1,209 @@
+"""Materialized higher-timeframe OHLCV buckets shared by resampling consumers."""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from service.data_timeframes import (
+    timeframe_bucket_origin_milliseconds,
+    timeframe_to_milliseconds,
+)
+
+# Column order produced by ``resample_ohlcv_data``.
+RESAMPLED_VALUE_COLUMNS: tuple[str, ...] = ("open", "high", "close", "low", "volume")
+_SOURCE_COLUMNS: tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+
+def resolve_bucket_rule(timerange: str) -> tuple[int, int] | None:
+    """Return ``(bucket_ms, origin_ms)`` for fixed-duration timeframes."""
+    normalized = str(timerange or "").strip().lower().replace("min", "m")
+    if not re.fullmatch(r"(\d+)\s*([mhdw])", normalized):
+        return None
+    return (
+        timeframe_to_milliseconds(normalized),
+        timeframe_bucket_origin_milliseconds(normalized),
+    )
+
+
+@dataclass
+class ResampledBuckets:
+    """Closed buckets of one (symbol, timeframe) pair, ordered by bucket id."""
+
+    bucket_ids: np.ndarray
+    row_counts: np.ndarray
+    values: np.ndarray
+
+
+@dataclass
+class ResampleCache:
+    """Per-(symbol, timeframe) closed-bucket aggregates.
+
+    Each call still derives bucket boundaries from the supplied minute rows,
+    but only buckets that are new, partially covered by the input window, or
+    whose source row count changed are re-aggregated. The first and last
+    bucket of every input are never stored because the window may cut them.
+    """
+
+    max_buckets: int = 20_000
+    entries: dict[tuple[str, str], ResampledBuckets] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def resample(
+        self, symbol: str, ohlcv: pd.DataFrame, timerange: str
+    ) -> pd.DataFrame | None:
+        """Return the resampled frame, or None when the input is not cacheable."""
+        rule = resolve_bucket_rule(timerange)
+        if rule is None or ohlcv.empty:
+            return None
+        source = _extract_source_arrays(ohlcv)
+        if source is None:
+            return None
+        timestamps, values = source
+        bucket_ms, origin_ms = rule
+
+        row_buckets = (timestamps - origin_ms) // bucket_ms
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(row_buckets)) + 1))
+        ends = np.append(starts[1:], len(row_buckets))
+        bucket_ids = row_buckets[starts]
+        row_counts = ends - starts
+
+        key = (symbol, timerange)
+        with self._lock:
+            cached = self.entries.get(key)
+            reusable = _match_cached_buckets(cached, bucket_ids, row_counts)
+            aggregates = np.empty((len(bucket_ids), len(RESAMPLED_VALUE_COLUMNS)))
+            if cached is not None and reusable.any():
+                positions = np.searchsorted(cached.bucket_ids, bucket_ids[reusable])
+                aggregates[reusable] = cached.values[positions]
+            pending = ~reusable
+            if pending.any():
+                aggregates[pending] = _aggregate_buckets(
+                    values, starts[pending], ends[pending]
+                )
+            if len(bucket_ids) > 2:
+                self._store(
+                    key,
+                    ResampledBuckets(
+                        bucket_ids[1:-1], row_counts[1:-1], aggregates[1:-1]
+                    ),
+                )
+
+        frame = pd.DataFrame(
+            aggregates, columns=list(RESAMPLED_VALUE_COLUMNS), copy=False
+        )
+        frame.insert(
+            0,
+            "timestamp",
+            pd.to_datetime(
+                (bucket_ids * bucket_ms + origin_ms).astype(float),
+                utc=True,
+                origin="unix",
+                unit="ms",
+            ),
+        )
+        return frame
+
+    def _store(self, key: tuple[str, str], fresh: ResampledBuckets) -> None:
+        """Merge freshly computed interior buckets into the cached entry."""
+        cached = self.entries.get(key)
+        if cached is not None and len(cached.bucket_ids):
+            first, last = fresh.bucket_ids[0], fresh.bucket_ids[-1]
+            before = cached.bucket_ids < first
+            after = cached.bucket_ids > last
+            fresh = ResampledBuckets(
+                np.concatenate(
+                    (
+                        cached.bucket_ids[before],
+                        fresh.bucket_ids,
+                        cached.bucket_ids[after],
+                    )
+                ),
+                np.concatenate(
+                    (
+                        cached.row_counts[before],
+                        fresh.row_counts,
+                        cached.row_counts[after],
+                    )
+                ),
+                np.concatenate(
+                    (cached.values[before], fresh.values, cached.values[after])
+                ),
+            )
+        if len(fresh.bucket_ids) > self.max_buckets:
+            fresh = ResampledBuckets(
+                fresh.bucket_ids[-self.max_buckets :],
+                fresh.row_counts[-self.max_buckets :],
+                fresh.values[-self.max_buckets :],
+            )
+        self.entries[key] = fresh
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop every timeframe entry of a symbol."""
+        with self._lock:
+            for key in [key for key in self.entries if key[0] == symbol]:
+                self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self.entries.clear()
+
+
+def _extract_source_arrays(
+    ohlcv: pd.DataFrame,
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """Return ordered integer timestamps and OHLCV values, or None."""
+    try:
+        raw_timestamps = ohlcv["timestamp"].astype(float).to_numpy()
+        values = ohlcv[list(_SOURCE_COLUMNS)].to_numpy(dtype=float)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not np.isfinite(raw_timestamps).all() or np.isnan(values).any():
+        return None
+    timestamps = raw_timestamps.astype(np.int64)
+    if (timestamps != raw_timestamps).any() or (np.diff(timestamps) < 0).any():
+        return None
+    return timestamps, values
+
+
+def _match_cached_buckets(
+    cached: ResampledBuckets | None,
+    bucket_ids: np.ndarray,
+    row_counts: np.ndarray,
+) -> np.ndarray:
+    """Return a mask of interior buckets whose cached aggregate is current."""
+    reusable = np.zeros(len(bucket_ids), dtype=bool)
+    if cached is None or not len(cached.bucket_ids) or len(bucket_ids) <= 2:
+        return reusable
+    positions = np.searchsorted(cached.bucket_ids, bucket_ids)
+    in_range = positions < len(cached.bucket_ids)
+    clipped = np.minimum(positions, len(cached.bucket_ids) - 1)
+    reusable = (
+        in_range
+        & (cached.bucket_ids[clipped] == bucket_ids)
+        & (cached.row_counts[clipped] == row_counts)
+    )
+    reusable[0] = False
+    reusable[-1] = False
+    return reusable
+
+
+def _aggregate_buckets(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """Aggregate the given row ranges into open/high/close/low/volume rows."""
+    # Interleave range bounds so reduceat only combines rows of each range;
+    # the padding row keeps an end bound equal to len(values) addressable.
+    padded = np.vstack((values, np.zeros((1, values.shape[1]))))
+    bounds = np.column_stack((starts, ends)).ravel()
+    result = np.empty((len(starts), len(RESAMPLED_VALUE_COLUMNS)))
+    result[:, 0] = values[starts, 0]
+    result[:, 1] = np.maximum.reduceat(padded[:, 1], bounds)[::2]
+    result[:, 2] = values[ends - 1, 3]
+    result[:, 3] = np.minimum.reduceat(padded[:, 2], bounds)[::2]
+    result[:, 4] = np.add.reduceat(padded[:, 4], bounds)[::2]
+    return result
@@ -17,6 +17,8 @@ from service.trading_controls import is_global_trading_paused
 
 logging = helper.LoggerFactory.get_logger("logs/signal.log", "signal_runtime")
 
+DEFAULT_SIGNAL_SCAN_CONCURRENCY = 8
+MAX_SIGNAL_SCAN_CONCURRENCY = 32
 _PENDING_ADMISSION_SYMBOLS: set[str] = set()
 _PENDING_ADMISSION_LOCK = asyncio.Lock()
 
@@ -216,6 +218,18 @@ def resolve_max_bots_log_interval(
         return default_seconds
 
 
+def resolve_signal_scan_concurrency(
+    config: dict[str, Any],
+    default: int = DEFAULT_SIGNAL_SCAN_CONCURRENCY,
+) -> int:
+    """Parse and clamp how many symbols an entry-point scan checks at once."""
+    try:
+        value = int(config.get("signal_scan_concurrency", default))
+    except (TypeError, ValueError):
+        return default
+    return min(max(value, 1), MAX_SIGNAL_SCAN_CONCURRENCY)
+
+
 def update_waiting_log_state(
     blocked: bool, last_log: float, interval_seconds: float
 ) -> tuple[bool, float, bool]:
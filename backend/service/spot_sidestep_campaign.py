@@ -11,10 +11,13 @@ from uuid import uuid4
 
 import helper
 import model
+from service.analytics import get_analytics_state
 from service.config import Config, resolve_timeframe
 from service.config_views import SidestepCampaignConfigView, TradeLifecycleConfigView
 from service.data_timeframes import timeframe_to_seconds
 from service.database import run_sqlite_write_with_retry
+from service.open_positions import get_open_position_cache
+from service.profit_ledger import get_closed_profit_ledger
 from service.spot_campaign_types import (
     SpotCampaignState,
     TradeCloseReason,
@@ -481,6 +484,10 @@ class SpotSidestepCampaignService:
         if not symbol:
             return None
 
+        cached_campaign_id = self._cached_consistent_campaign_id(symbol)
+        if cached_campaign_id is not None:
+            return cached_campaign_id
+
         existing_open_trade_rows = (
             await model.OpenTrades.filter(symbol=symbol)
             .limit(1)
@@ -515,6 +522,7 @@ class SpotSidestepCampaignService:
                     ),
                     f"repairing sidestep runtime state for {symbol}",
                 )
+                get_open_position_cache().invalidate(symbol)
             if (
                 existing_campaign
                 and str(existing_campaign.get("lifecycle_mode") or "")
@@ -526,6 +534,7 @@ class SpotSidestepCampaignService:
                     ).update(lifecycle_mode=expected_lifecycle_mode),
                     f"repairing sidestep campaign lifecycle for {symbol}",
                 )
+                get_open_position_cache().invalidate(symbol)
             return existing_campaign_id
 
         campaign = await self._find_symbol_campaign(
@@ -597,10 +606,34 @@ class SpotSidestepCampaignService:
                         conn
                     ).update(campaign_id=campaign_id)
 
-        await run_sqlite_write_with_retry(
-            _attach_campaign,
-            f"attaching sidestep campaign for {symbol}",
-        )
+        try:
+            await run_sqlite_write_with_retry(
+                _attach_campaign,
+                f"attaching sidestep campaign for {symbol}",
+            )
+        finally:
+            get_open_position_cache().invalidate(symbol)
+        return campaign_id
+
+    @staticmethod
+    def _cached_consistent_campaign_id(symbol: str) -> str | None:
+        """Return the attached campaign when the cached rows need no repair."""
+        position = get_open_position_cache().peek(symbol)
+        if position is None or position.open_trade is None:
+            return None
+        open_trade = position.open_trade
+        campaign_id = str(open_trade.get("campaign_id") or "").strip()
+        if not campaign_id or position.campaign is None:
+            return None
+        expected_lifecycle_mode = TradeLifecycleMode.SIDESTEP_REENTRY.value
+        if (
+            str(open_trade.get("lifecycle_mode") or "") != expected_lifecycle_mode
+            or str(position.campaign.get("lifecycle_mode") or "")
+            != expected_lifecycle_mode
+            or str(open_trade.get("exposure_state") or "")
+            != _exposure_state_for_campaign_state(position.campaign.get("state"))
+        ):
+            return None
         return campaign_id
 
     async def record_long_signal(
@@ -639,6 +672,7 @@ class SpotSidestepCampaignService:
                 campaign.get("last_transition_at") or signal_timestamp
             ),
         )
+        get_open_position_cache().invalidate(normalized_symbol)
 
     async def get_admission_blocks(
         self,
@@ -760,10 +794,15 @@ class SpotSidestepCampaignService:
                 ).delete()
                 return True
 
-        return await run_sqlite_write_with_retry(
-            _stop_campaign,
-            f"stopping sidestep campaign {normalized_campaign_id}",
-        )
+        try:
+            return await run_sqlite_write_with_retry(
+                _stop_campaign,
+                f"stopping sidestep campaign {normalized_campaign_id}",
+            )
+        finally:
+            get_open_position_cache().invalidate()
+            get_closed_profit_ledger().invalidate()
+            get_analytics_state().invalidate()
 
     async def activate_campaign(self, campaign_id: str) -> bool:
         """Re-enter a waiting sidestep campaign immediately by manual override."""
@@ -0,0 +1,103 @@
+"""Clean-shutdown marker and file fingerprint for the SQLite database.
+
+A full ``PRAGMA integrity_check`` reads every page and index, so boot time
+grows with ticker history. Moonwalker writes a small JSON marker next to the
+database on clean shutdown, recording the file size and mtime plus the size of
+any leftover write-ahead log. At startup, the cheaper ``PRAGMA quick_check`` is
+enough when the last run shut down cleanly, the file still matches that
+fingerprint, and the last full check is recent.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+
+import helper
+
+logging = helper.LoggerFactory.get_logger("logs/database.log", "sqlite_health")
+
+FULL_INTEGRITY_CHECK_INTERVAL_SECONDS = 7 * 24 * 60 * 60
+HEALTH_MARKER_SUFFIX = ".health.json"
+
+
+@dataclass
+class SqliteHealthMarker:
+    """State persisted between runs to decide how thoroughly to check the DB."""
+
+    clean_shutdown: bool = False
+    size: int | None = None
+    mtime_ns: int | None = None
+    wal_size: int | None = None
+    last_full_check: float | None = None
+
+
+def sqlite_health_marker_path(db_path: str) -> str:
+    """Return the marker file path that belongs to ``db_path``."""
+    return f"{db_path}{HEALTH_MARKER_SUFFIX}"
+
+
+def sqlite_fingerprint(db_path: str) -> tuple[int, int, int] | None:
+    """Return ``(size, mtime_ns, wal_size)`` of the database, or None if missing.
+
+    Writes that were never checkpointed live in the ``-wal`` file and leave
+    the main file untouched, so its size is part of the fingerprint.
+    """
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    try:
+        wal_size = os.stat(f"{db_path}-wal").st_size
+    except OSError:
+        wal_size = 0
+    return stat.st_size, stat.st_mtime_ns, wal_size
+
+
+def load_sqlite_health_marker(db_path: str) -> SqliteHealthMarker:
+    """Read the marker; a missing or unreadable one counts as unclean."""
+    try:
+        with open(sqlite_health_marker_path(db_path), encoding="utf-8") as handle:
+            payload = json.load(handle)
+        return SqliteHealthMarker(
+            clean_shutdown=bool(payload.get("clean_shutdown")),
+            size=payload.get("size"),
+            mtime_ns=payload.get("mtime_ns"),
+            wal_size=payload.get("wal_size"),
+            last_full_check=payload.get("last_full_check"),
+        )
+    except FileNotFoundError:
+        return SqliteHealthMarker()
+    except (OSError, ValueError, AttributeError) as exc:
+        logging.warning("Ignoring unreadable SQLite health marker: %s", exc)
+        return SqliteHealthMarker()
+
+
+def write_sqlite_health_marker(db_path: str, marker: SqliteHealthMarker) -> None:
+    """Atomically replace the marker next to an existing database file."""
+    if not os.path.isfile(db_path):
+        return
+    path = sqlite_health_marker_path(db_path)
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(asdict(marker), handle)
+        os.replace(temp_path, path)
+    except OSError as exc:
+        logging.warning("Failed to write SQLite health marker: %s", exc)
+
+
+def needs_full_integrity_check(
+    marker: SqliteHealthMarker,
+    fingerprint: tuple[int, int, int] | None,
+    now: float,
+) -> bool:
+    """Return True unless a clean, unchanged, recently verified file is found."""
+    if not marker.clean_shutdown or fingerprint is None:
+        return True
+    if (marker.size, marker.mtime_ns, marker.wal_size) != fingerprint:
+        return True
+    if marker.last_full_check is None:
+        return True
+    return now - marker.last_full_check >= FULL_INTEGRITY_CHECK_INTERVAL_SECONDS
@@ -38,3 +38,63 @@ def coerce_timestamp_like_to_ms(value: Any) -> int | None:
         return numeric
 
     return parse_date_to_ms(normalized_value)
+
+
+TICKER_EPOCH_COLUMN = "ts"
+
+
+def ticker_epoch_ms(value: Any) -> int | None:
+    """Return the integer epoch-ms value stored alongside a ticker timestamp."""
+    try:
+        return coerce_timestamp_like_to_ms(int(float(value)))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def build_epoch_range_clause(
+    start_timestamp: int | float | None = None,
+    end_timestamp: int | float | None = None,
+    *,
+    start_operator: str = ">=",
+    end_operator: str = "<=",
+    epoch_column: str = TICKER_EPOCH_COLUMN,
+    text_column: str = "timestamp",
+) -> tuple[str, list[int]]:
+    """Return a range predicate that prefers the indexed integer epoch column.
+
+    Rows the background migration has not reached yet still carry a NULL epoch
+    value and are matched through the normalized text expression instead.
+    """
+    if start_operator not in {">", ">="}:
+        raise ValueError(f"Unsupported start operator: {start_operator}")
+    if end_operator not in {"<", "<="}:
+        raise ValueError(f"Unsupported end operator: {end_operator}")
+
+    normalized_sql = build_normalized_text_timestamp_sql(text_column)
+    epoch_terms: list[str] = []
+    text_terms: list[str] = [f"{epoch_column} IS NULL"]
+    bounds: list[int] = []
+    if start_timestamp is not None:
+        epoch_terms.append(f"{epoch_column} {start_operator} ?")
+        text_terms.append(f"{normalized_sql} {start_operator} ?")
+        bounds.append(int(float(start_timestamp)))
+    if end_timestamp is not None:
+        epoch_terms.append(f"{epoch_column} {end_operator} ?")
+        text_terms.append(f"{normalized_sql} {end_operator} ?")
+        bounds.append(int(float(end_timestamp)))
+    if not bounds:
+        return "", []
+
+    clause = f"(({' AND '.join(epoch_terms)}) OR ({' AND '.join(text_terms)}))"
+    return clause, [*bounds, *bounds]
+
+
+def build_epoch_order_sql(
+    epoch_column: str = TICKER_EPOCH_COLUMN,
+    text_column: str = "timestamp",
+) -> str:
+    """Return an ORDER BY expression covering migrated and legacy rows."""
+    return (
+        f"COALESCE({epoch_column}, "
+        f"{build_normalized_text_timestamp_sql(text_column)})"
+    )
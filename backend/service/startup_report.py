@@ -0,0 +1,108 @@
+"""Startup phase timing for the application lifecycle."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import helper
+
+logging = helper.LoggerFactory.get_logger("logs/monitoring.log", "startup")
+
+
+@dataclass
+class StartupPhase:
+    """Timing of one named startup phase."""
+
+    name: str
+    started_at: float
+    duration: float | None = None
+    status: str = "running"
+    background: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the API payload with offsets relative to boot in seconds."""
+        return {
+            "name": self.name,
+            "status": self.status,
+            "background": self.background,
+            "started_after_seconds": round(self.started_at, 3),
+            "duration_seconds": (
+                round(self.duration, 3) if self.duration is not None else None
+            ),
+        }
+
+
+class StartupReport:
+    """Collect phase durations until the API serves and warmups finish."""
+
+    def __init__(self) -> None:
+        self._boot = time.perf_counter()
+        self.phases: list[StartupPhase] = []
+        self.serving_after: float | None = None
+        self.warm_after: float | None = None
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self._boot
+
+    @asynccontextmanager
+    async def phase(
+        self, name: str, *, background: bool = False
+    ) -> AsyncIterator[StartupPhase]:
+        """Time one phase; failures are recorded and re-raised."""
+        phase = StartupPhase(
+            name=name, started_at=self._elapsed(), background=background
+        )
+        self.phases.append(phase)
+        try:
+            yield phase
+        except BaseException:
+            phase.status = "failed"
+            raise
+        else:
+            phase.status = "completed"
+        finally:
+            phase.duration = self._elapsed() - phase.started_at
+            logging.info(
+                "Startup phase %s %s in %.3fs", name, phase.status, phase.duration
+            )
+
+    def mark_serving(self) -> None:
+        """Record when blocking startup finished and requests can be served."""
+        self.serving_after = self._elapsed()
+        logging.info("Serving requests %.3fs after boot", self.serving_after)
+
+    def mark_warm(self) -> None:
+        """Record when background warmups finished."""
+        self.warm_after = self._elapsed()
+        logging.info("Background warmup finished %.3fs after boot", self.warm_after)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the startup timing report."""
+        return {
+            "serving_after_seconds": (
+                round(self.serving_after, 3) if self.serving_after is not None else None
+            ),
+            "warm_after_seconds": (
+                round(self.warm_after, 3) if self.warm_after is not None else None
+            ),
+            "phases": [phase.to_dict() for phase in self.phases],
+        }
+
+
+_report = StartupReport()
+
+
+def begin_startup_report() -> StartupReport:
+    """Start a fresh report for the current application startup."""
+    global _report
+    _report = StartupReport()
+    return _report
+
+
+def get_startup_report() -> StartupReport:
+    """Return the report of the latest application startup."""
+    return _report
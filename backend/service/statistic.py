@@ -2,7 +2,7 @@
 
 import asyncio
 import copy
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 import helper
@@ -11,13 +11,19 @@ import pandas as pd
 from service.autopilot import Autopilot
 from service.capital_budget import CapitalBudgetService
 from service.config import Config
-from service.database import run_sqlite_write_with_retry
 from service.green_phase import AVAILABLE_QUOTE_UNSET
+from service.open_positions import get_open_position_cache
 from service.order_payloads import format_trade_datetime, trade_datetime_from_ms
+from service.profit_ledger import get_closed_profit_ledger
 from service.spot_campaign_types import TradeExposureState, TradeLifecycleMode
 from service.trades import Trades
+from service.upnl_history import (
+    RAW_RESOLUTION,
+    ensure_upnl_rollups,
+    load_upnl_rows,
+    record_upnl_snapshot,
+)
 from tortoise.exceptions import BaseORMException
-from tortoise.functions import Sum
 
 logging = helper.LoggerFactory.get_logger("logs/statistics.log", "statistic")
 
@@ -26,6 +32,8 @@ class Statistic:
     """Compute and persist trading statistics."""
 
     PROFIT_CACHE_TTL_SECONDS = 2
+    # Expired profit snapshots are served while one refresh runs in the background.
+    PROFIT_CACHE_STALE_SECONDS = 5
 
     def __init__(self) -> None:
         self.trades = Trades()
@@ -44,76 +52,19 @@ class Statistic:
         """Log ORM failures with traceback while preserving caller fallbacks."""
         logging.error("%s", message, exc_info=True)
 
-    @staticmethod
-    def _extract_date_key(timestamp: Any) -> str | None:
-        """Normalize timestamp-like values into a YYYY-MM-DD grouping key."""
-        if isinstance(timestamp, datetime):
-            return timestamp.date().isoformat()
-        if isinstance(timestamp, str):
-            normalized = timestamp.strip()
-            if not normalized:
-                return None
-            try:
-                return (
-                    datetime.fromisoformat(normalized.replace("Z", "+00:00"))
-                    .date()
-                    .isoformat()
-                )
-            except ValueError:
-                pass
-            if len(normalized) >= 10:
-                try:
-                    return (
-                        datetime.strptime(normalized[:10], "%Y-%m-%d")
-                        .date()
-                        .isoformat()
-                    )
-                except ValueError:
-                    return None
-        return None
-
-    @classmethod
-    def _group_profit_rows_by_date(
-        cls, rows: list[tuple[Any, Any]]
-    ) -> dict[str, float]:
-        """Aggregate profit rows by date without reparsing full timestamps repeatedly."""
-        grouped: dict[str, float] = {}
-        for timestamp, profit_value in rows:
-            date_key = cls._extract_date_key(timestamp)
-            if not date_key:
-                continue
-            grouped[date_key] = grouped.get(date_key, 0.0) + float(profit_value or 0.0)
-        return grouped
-
-    async def _get_sum_value(
-        self,
-        queryset,
-        field_name: str,
-        error_message: str,
-    ) -> float:
-        """Return a scalar SUM aggregate with a stable 0.0 fallback."""
+    async def _get_closed_profit_rollups(
+        self, begin_date: date, error_message: str
+    ) -> tuple[float, dict[str, float]]:
+        """Return total closed profit and per-day profit since a date boundary."""
+        ledger = get_closed_profit_ledger()
         try:
-            result = await queryset.annotate(total=Sum(field_name)).values_list(
-                "total", flat=True
+            return (
+                await ledger.total_profit(),
+                await ledger.daily_profit_since(begin_date),
             )
-            return float(result[0] or 0.0)
-        except BaseORMException:
-            self._log_orm_error(error_message)
-            return 0.0
-
-    async def _get_profit_rows_since(
-        self,
-        begin_datetime: datetime | Any,
-        error_message: str,
-    ) -> list[tuple[Any, Any]]:
-        """Return closed-trade profit rows since the given date boundary."""
-        try:
-            return await model.ClosedTrades.filter(
-                close_date__gt=begin_datetime
-            ).values_list("close_date", "profit")
         except BaseORMException:
             self._log_orm_error(error_message)
-            return []
+            return 0.0, {}
 
     async def _get_open_trade_profit_snapshot(self) -> tuple[float, float, float]:
         """Return sidestep-aware open-mission totals.
@@ -122,75 +73,80 @@ class Statistic:
             A tuple of `(upnl, sidestep_realized_profit, funds_locked)`.
         """
         try:
-            open_trade_rows = await model.OpenTrades.all().values(
+            return await self._load_open_trade_profit_snapshot()
+        except BaseORMException as exc:
+            logging.error("Error getting sidestep-aware open-trade snapshot: %s", exc)
+            return 0.0, 0.0, 0.0
+
+    @staticmethod
+    async def _load_open_trade_profit_snapshot() -> tuple[float, float, float]:
+        """Query sidestep-aware open-mission totals, raising ORM errors."""
+        open_trade_rows = await model.OpenTrades.all().values(
+            "campaign_id",
+            "exposure_state",
+            "profit",
+            "cost",
+            "virtual_waiting_profit",
+            "waiting_reference_quote",
+            "reserved_reentry_quote",
+        )
+        if not open_trade_rows:
+            return 0.0, 0.0, 0.0
+
+        campaign_ids = [
+            str(row.get("campaign_id") or "").strip()
+            for row in open_trade_rows
+            if str(row.get("campaign_id") or "").strip()
+        ]
+        campaign_metrics: dict[str, dict[str, float]] = {}
+        if campaign_ids:
+            campaign_rows = await model.SpotCampaigns.filter(
+                campaign_id__in=campaign_ids
+            ).values(
                 "campaign_id",
-                "exposure_state",
-                "profit",
-                "cost",
-                "virtual_waiting_profit",
-                "waiting_reference_quote",
-                "reserved_reentry_quote",
+                "cumulative_realized_quote",
             )
-            if not open_trade_rows:
-                return 0.0, 0.0, 0.0
-
-            campaign_ids = [
-                str(row.get("campaign_id") or "").strip()
-                for row in open_trade_rows
-                if str(row.get("campaign_id") or "").strip()
-            ]
-            campaign_metrics: dict[str, dict[str, float]] = {}
-            if campaign_ids:
-                campaign_rows = await model.SpotCampaigns.filter(
-                    campaign_id__in=campaign_ids
-                ).values(
-                    "campaign_id",
-                    "cumulative_realized_quote",
-                )
-                campaign_metrics = {
-                    str(row.get("campaign_id") or "").strip(): {
-                        "realized_profit": float(
-                            row.get("cumulative_realized_quote") or 0.0
-                        ),
-                    }
-                    for row in campaign_rows
-                    if str(row.get("campaign_id") or "").strip()
+            campaign_metrics = {
+                str(row.get("campaign_id") or "").strip(): {
+                    "realized_profit": float(
+                        row.get("cumulative_realized_quote") or 0.0
+                    ),
                 }
+                for row in campaign_rows
+                if str(row.get("campaign_id") or "").strip()
+            }
 
-            upnl_value = 0.0
-            funds_locked = 0.0
-            sidestep_realized_profit = 0.0
-            counted_campaigns: set[str] = set()
-            for row in open_trade_rows:
-                campaign_id = str(row.get("campaign_id") or "").strip()
-                campaign_metric = campaign_metrics.get(campaign_id, {})
-                realized_profit = float(campaign_metric.get("realized_profit") or 0.0)
-                exposure_state = str(row.get("exposure_state") or "").strip()
-                if exposure_state == TradeExposureState.FLAT_WAITING_REENTRY.value:
-                    upnl_value += float(row.get("virtual_waiting_profit") or 0.0)
-                    committed_quote = max(
-                        0.0,
-                        float(row.get("reserved_reentry_quote") or 0.0)
-                        or float(row.get("waiting_reference_quote") or 0.0),
-                    )
-                    funds_locked += max(0.0, committed_quote - realized_profit)
-                else:
-                    upnl_value += float(row.get("profit") or 0.0)
-                    committed_quote = float(row.get("cost") or 0.0)
-                    funds_locked += max(0.0, committed_quote - realized_profit)
-
-                if campaign_id and campaign_id not in counted_campaigns:
-                    sidestep_realized_profit += realized_profit
-                    counted_campaigns.add(campaign_id)
-
-            return (
-                float(upnl_value),
-                float(sidestep_realized_profit),
-                float(funds_locked),
-            )
-        except BaseORMException as exc:
-            logging.error("Error getting sidestep-aware open-trade snapshot: %s", exc)
-            return 0.0, 0.0, 0.0
+        upnl_value = 0.0
+        funds_locked = 0.0
+        sidestep_realized_profit = 0.0
+        counted_campaigns: set[str] = set()
+        for row in open_trade_rows:
+            campaign_id = str(row.get("campaign_id") or "").strip()
+            campaign_metric = campaign_metrics.get(campaign_id, {})
+            realized_profit = float(campaign_metric.get("realized_profit") or 0.0)
+            exposure_state = str(row.get("exposure_state") or "").strip()
+            if exposure_state == TradeExposureState.FLAT_WAITING_REENTRY.value:
+                upnl_value += float(row.get("virtual_waiting_profit") or 0.0)
+                committed_quote = max(
+                    0.0,
+                    float(row.get("reserved_reentry_quote") or 0.0)
+                    or float(row.get("waiting_reference_quote") or 0.0),
+                )
+                funds_locked += max(0.0, committed_quote - realized_profit)
+            else:
+                upnl_value += float(row.get("profit") or 0.0)
+                committed_quote = float(row.get("cost") or 0.0)
+                funds_locked += max(0.0, committed_quote - realized_profit)
+
+            if campaign_id and campaign_id not in counted_campaigns:
+                sidestep_realized_profit += realized_profit
+                counted_campaigns.add(campaign_id)
+
+        return (
+            float(upnl_value),
+            float(sidestep_realized_profit),
+            float(funds_locked),
+        )
 
     @staticmethod
     def _resample_profit_data_sync(
@@ -217,7 +173,7 @@ class Statistic:
         now: datetime,
         timeline_horizons: dict[str, timedelta],
     ) -> list[dict[str, Any]]:
-        """Build resampled profit timeline synchronously from raw rows."""
+        """Build resampled profit timeline synchronously from snapshot rows."""
         df = pd.DataFrame(
             rows,
             columns=["timestamp", "profit_overall", "funds_locked"],
@@ -271,24 +227,23 @@ class Statistic:
     ) -> dict[str, Any] | None:
         """Return aggregated profits for the given time period."""
         profit_data = {}
-        date = datetime.now()
+        reference = datetime.now()
         if timestamp:
-            date = datetime.fromtimestamp(int(timestamp))
+            reference = datetime.fromtimestamp(int(timestamp))
         match period:
             case "daily":
-                begin_datetime = (date.replace(day=1)).date()
+                begin_datetime = (reference.replace(day=1)).date()
             case "monthly":
-                begin_datetime = (date.replace(month=1)).date()
+                begin_datetime = (reference.replace(month=1)).date()
             case "yearly":
-                begin_datetime = (date.replace(year=1)).date()
+                begin_datetime = (reference.replace(year=1)).date()
             case _:
                 return None
         try:
-            data = await self._get_profit_rows_since(
+            _, profit_data = await self._get_closed_profit_rollups(
                 begin_datetime,
-                f"Error getting profits for {period} data: %s",
+                f"Error getting profits for {period} data.",
             )
-            profit_data = self._group_profit_rows_by_date(data)
             profit_data = await asyncio.to_thread(
                 self._resample_profit_data_sync, profit_data, period
             )
@@ -302,6 +257,27 @@ class Statistic:
         """Return profit, uPNL, and autopilot summaries."""
         return copy.deepcopy(await self._get_profit_cached())
 
+    async def get_funds_locked(self) -> float:
+        """Return quote committed to open missions for per-tick decisions.
+
+        The value lives in the open position cache and is only recomputed
+        after a trade write changed the committed quote.
+        """
+        try:
+            return float(
+                await get_open_position_cache().get_aggregate(
+                    "funds_locked", self._load_funds_locked
+                )
+            )
+        except BaseORMException as exc:
+            logging.error("Error getting funds locked: %s", exc)
+            return 0.0
+
+    async def _load_funds_locked(self) -> float:
+        """Query the funds locked total from the open mission snapshot."""
+        _, _, funds_locked = await self._load_open_trade_profit_snapshot()
+        return funds_locked
+
     async def get_profit_for_dashboard(
         self, available_quote: float | None
     ) -> dict[str, Any]:
@@ -318,7 +294,11 @@ class Statistic:
         )
         return profit_data
 
-    @helper.async_ttl_cache(maxsize=1, ttl=PROFIT_CACHE_TTL_SECONDS)
+    @helper.async_ttl_cache(
+        maxsize=1,
+        ttl=PROFIT_CACHE_TTL_SECONDS,
+        stale_ttl=PROFIT_CACHE_STALE_SECONDS,
+    )
     async def _get_profit_base_cached(self) -> dict[str, Any]:
         """Compute and cache DB-backed profit aggregates."""
         profit_data = {}
@@ -326,25 +306,12 @@ class Statistic:
             datetime.now() + timedelta(days=(0 - datetime.now().weekday()))
         ).date()
 
-        open_trade_snapshot_task = self._get_open_trade_profit_snapshot()
-        closed_profit_task = self._get_sum_value(
-            model.ClosedTrades,
-            "profit",
-            "Error getting profit: %s",
-        )
-        profit_week_task = self._get_profit_rows_since(
-            begin_week,
-            "Error getting profits for the week: %s",
-        )
-
-        (
-            open_trade_snapshot,
-            closed_profit,
-            profit_week_rows,
-        ) = await asyncio.gather(
-            open_trade_snapshot_task,
-            closed_profit_task,
-            profit_week_task,
+        open_trade_snapshot, (closed_profit, profit_week) = await asyncio.gather(
+            self._get_open_trade_profit_snapshot(),
+            self._get_closed_profit_rollups(
+                begin_week,
+                "Error getting closed profit rollups.",
+            ),
         )
         upnl_value, sidestep_realized_profit, funds_locked = open_trade_snapshot
 
@@ -353,7 +320,7 @@ class Statistic:
             closed_profit + sidestep_realized_profit + float(profit_data["upnl"] or 0.0)
         )
         profit_data["funds_locked"] = funds_locked
-        profit_data["profit_week"] = self._group_profit_rows_by_date(profit_week_rows)
+        profit_data["profit_week"] = profit_week
         profit_data["profit_overall_timestamp"] = datetime.now(timezone.utc).strftime(
             "%Y-%m-%d %H:%M:%S"
         )
@@ -451,7 +418,11 @@ class Statistic:
             8,
         )
 
-    @helper.async_ttl_cache(maxsize=1, ttl=PROFIT_CACHE_TTL_SECONDS)
+    @helper.async_ttl_cache(
+        maxsize=1,
+        ttl=PROFIT_CACHE_TTL_SECONDS,
+        stale_ttl=PROFIT_CACHE_STALE_SECONDS,
+    )
     async def _get_profit_cached(self) -> dict[str, Any]:
         """Compute and cache profit, uPNL, and autopilot summaries."""
         profit_data = copy.deepcopy(await self._get_profit_base_cached())
@@ -473,27 +444,35 @@ class Statistic:
                 if elapsed < self.snapshot_interval_seconds:
                     return
 
-            await run_sqlite_write_with_retry(
-                lambda: model.UpnlHistory.create(
-                    timestamp=now,
-                    upnl=float(profit_data.get("upnl") or 0.0),
-                    profit_overall=float(profit_data.get("profit_overall") or 0.0),
-                    funds_locked=float(profit_data.get("funds_locked") or 0.0),
-                ),
-                "storing upnl snapshot",
+            await record_upnl_snapshot(
+                now,
+                upnl=float(profit_data.get("upnl") or 0.0),
+                profit_overall=float(profit_data.get("profit_overall") or 0.0),
+                funds_locked=float(profit_data.get("funds_locked") or 0.0),
             )
         except BaseORMException as e:
             # Broad catch to avoid stats persistence failures affecting websocket data.
             logging.error("Error storing uPNL snapshot: %s", e)
 
     async def get_upnl_history_all(self) -> list[dict[str, Any]]:
-        """Return overall profit snapshots from the beginning, ordered by timestamp."""
+        """Return overall profit history from the beginning, ordered by timestamp.
+
+        Older history comes from the rollup tiers: one point per day before
+        the last week, per 4 hours within it, and raw snapshots for the last
+        day.
+        """
         upnl_data: list[dict[str, Any]] = []
+        now = datetime.now(timezone.utc)
+        week_start = now - self.timeline_horizons["week"]
+        day_start = now - self.timeline_horizons["day"]
         try:
-            rows = (
-                await model.UpnlHistory.all()
-                .order_by("timestamp")
-                .values_list("timestamp", "profit_overall", "funds_locked")
+            await ensure_upnl_rollups()
+            rows = await load_upnl_rows(
+                (
+                    ("1d", None, week_start),
+                    ("4h", week_start, day_start),
+                    (RAW_RESOLUTION, day_start, None),
+                )
             )
             for timestamp, profit_overall, funds_locked in rows:
                 upnl_data.append(
@@ -517,14 +496,22 @@ class Statistic:
         - week: 4h
         - month: 1d
         - year: 1w
+
+        Rows are read from the matching rollup tier, so the resampling below
+        only sees a few hundred pre-bucketed points.
         """
         now = datetime.now(timezone.utc)
         year_start = now - self.timeline_horizons["year"]
+        week_start = now - self.timeline_horizons["week"]
+        day_start = now - self.timeline_horizons["day"]
         try:
-            rows = (
-                await model.UpnlHistory.filter(timestamp__gte=year_start)
-                .order_by("timestamp")
-                .values_list("timestamp", "profit_overall", "funds_locked")
+            await ensure_upnl_rollups()
+            rows = await load_upnl_rows(
+                (
+                    ("1d", year_start, week_start),
+                    ("4h", week_start, day_start),
+                    ("15m", day_start, None),
+                )
             )
             if not rows:
                 return []
@@ -9,6 +9,8 @@ from typing import Any
 
 import helper
 import model
+import numpy as np
+import pandas as pd
 import service.strategy_builder as strategy_builder
 import talib
 from service.database import run_sqlite_write_with_retry
@@ -19,6 +21,8 @@ logging = helper.LoggerFactory.get_logger("logs/strategies.log", "strategy_runti
 
 EMA20_LOOKBACK_LENGTH = 50
 EMA20_REQUIRED_CLOSED_CANDLES = 22
+STATEFUL_NODE_TYPES = frozenset({"fresh_signal_state", "swing_low_state"})
+_SAMPLE_OFFSETS = {"current": -1, "previous": -2, "two_back": -3}
 STRATEGY_LOG_HEARTBEAT_SECONDS = 30 * 60
 
 
@@ -307,6 +311,20 @@ async def _load_strategy_snapshot(slug: str) -> StrategySnapshot:
     return snapshot
 
 
+async def load_strategy_snapshots(*slugs: str) -> dict[str, StrategySnapshot]:
+    """Load active snapshots so they can be shipped to worker processes."""
+    return {
+        slug: await _load_strategy_snapshot(slug)
+        for slug in dict.fromkeys(slugs)
+        if slug
+    }
+
+
+def seed_strategy_snapshots(snapshots: dict[str, StrategySnapshot]) -> None:
+    """Install snapshots loaded by another process into the local cache."""
+    _SNAPSHOT_CACHE.update(snapshots)
+
+
 async def _evaluate_root(ir: dict[str, Any], context: EvaluationContext) -> bool:
     """Evaluate the configured root node."""
     root_id = str(ir.get("root") or "")
@@ -392,7 +410,7 @@ def _input_nodes_for(
 
 def _state_node_sort_key(node: dict[str, Any]) -> bool:
     """Return True for stateful nodes that should run after pure conditions."""
-    return str(node.get("type") or "") in {"fresh_signal_state", "swing_low_state"}
+    return str(node.get("type") or "") in STATEFUL_NODE_TYPES
 
 
 async def _evaluate_comparison_node(
@@ -1046,3 +1064,258 @@ def _missing_indicator_methods(validation: dict[str, Any]) -> list[str]:
         if name and not callable(getattr(Indicators, name, None)):
             missing.append(name)
     return missing
+
+
+# ── Vectorized whole-range evaluation ─────────────────────────────────────────
+
+
+class _NotVectorizable(Exception):
+    """Raised when a graph needs candle-by-candle evaluation."""
+
+
+SampledValues = tuple[np.ndarray, np.ndarray]
+
+
+async def compile_strategy_signal_mask(
+    slug: str,
+    timeframe: str,
+    symbol: str,
+    side: str,
+    indicators: Any,
+    candle_count: int,
+) -> np.ndarray | None:
+    """Evaluate a stateless graph for every replay candle at once.
+
+    ``mask[index]`` equals ``evaluate_strategy_graph(..., candle_index=index)``
+    for each candle. Returns None when the graph holds state or anything the
+    scalar evaluator would treat differently, so callers replay per candle.
+    """
+    try:
+        snapshot = await _load_strategy_snapshot(slug)
+        validation = strategy_builder.validate_strategy_ir(snapshot.ir)
+        if validation["status"] != "valid" or _missing_indicator_methods(validation):
+            return np.zeros(candle_count, dtype=bool)
+        nodes = [
+            node for node in snapshot.ir.get("nodes", []) if isinstance(node, dict)
+        ]
+        node_by_id = {str(node.get("id")): node for node in nodes}
+        root_node = node_by_id.get(str(snapshot.ir.get("root") or ""))
+        if root_node is None:
+            return np.zeros(candle_count, dtype=bool)
+        compiler = _VectorizedGraphCompiler(
+            symbol,
+            timeframe,
+            indicators,
+            node_by_id,
+            snapshot.ir.get("connections", []),
+            candle_count,
+        )
+        return await compiler.condition(root_node)
+    except Exception as exc:  # noqa: BLE001 - fall back to per-candle replay.
+        if not isinstance(exc, _NotVectorizable):
+            logging.debug("Strategy %s is not vectorizable: %s", slug, exc)
+        return None
+
+
+class _VectorizedGraphCompiler:
+    """Compile graph nodes into per-candle boolean and value arrays."""
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        indicators: Any,
+        node_by_id: dict[str, dict[str, Any]],
+        connections: Any,
+        candle_count: int,
+    ) -> None:
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.indicators = indicators
+        self.node_by_id = node_by_id
+        self.connections = connections
+        self.candle_count = candle_count
+        self.memo: dict[tuple[Any, ...], Any] = {}
+
+    def _false(self) -> np.ndarray:
+        return np.zeros(self.candle_count, dtype=bool)
+
+    async def condition(self, node: dict[str, Any]) -> np.ndarray:
+        """Return the per-candle result of one boolean graph node."""
+        node_type = str(node.get("type") or "")
+        params = node.get("params") if isinstance(node.get("params"), dict) else {}
+        if node_type in STATEFUL_NODE_TYPES:
+            raise _NotVectorizable(node_type)
+        if node_type in {"all", "any"}:
+            input_nodes = _input_nodes_for(node, self.node_by_id, self.connections)
+            if not input_nodes:
+                return self._false()
+            results = [await self.condition(input_node) for input_node in input_nodes]
+            reducer = np.logical_and if node_type == "all" else np.logical_or
+            return reducer.reduce(results)
+        if node_type == "comparison":
+            return await self._comparison(node, params)
+        if node_type == "ema_trend":
+            length = int(params.get("length") or 20)
+            latest, latest_valid = self._sample(await self._ema(length), -1)
+            previous, previous_valid = self._sample(await self._ema(length), -2)
+            if str(params.get("operator") or "greater_than") == "less_than":
+                matched = latest < previous
+            else:
+                matched = latest > previous
+            return matched & latest_valid & previous_valid
+        if node_type == "price_indicator_relation":
+            if str(params.get("indicator") or "ema") != "ema":
+                return self._false()
+            length = int(params.get("length") or 20)
+            lookback = max(length + 2, EMA20_LOOKBACK_LENGTH)
+            close, close_valid = self._sample(
+                await self._price("close", lookback), -1, True
+            )
+            ema, ema_valid = self._sample(await self._ema(length), -1)
+            if str(params.get("operator") or "greater_than") == "less_than":
+                matched = close < ema
+            else:
+                matched = close > ema
+            return matched & close_valid & ema_valid
+        return self._false()
+
+    async def _comparison(
+        self, node: dict[str, Any], params: dict[str, Any]
+    ) -> np.ndarray:
+        value1_node = _input_node_for_port(
+            node, self.node_by_id, self.connections, "value1", 0
+        )
+        value2_node = _input_node_for_port(
+            node, self.node_by_id, self.connections, "value2", 1
+        )
+        if value1_node is None or value2_node is None:
+            return self._false()
+        left, left_valid = await self._value(value1_node)
+        right, right_valid = await self._value(value2_node)
+        comparison = str(params.get("comparison") or "")
+        with np.errstate(invalid="ignore"):
+            if comparison == "less_than":
+                matched = left < right
+            elif comparison == "greater_or_equal":
+                matched = left >= right
+            elif comparison == "less_or_equal":
+                matched = left <= right
+            elif comparison == "not_equals":
+                matched = left != right
+            elif comparison == "equals":
+                matched = left == right
+            else:
+                matched = left > right
+        return matched & left_valid & right_valid
+
+    async def _value(self, node: dict[str, Any]) -> SampledValues:
+        """Return per-candle values and validity for one value node."""
+        node_type = str(node.get("type") or "")
+        params = node.get("params") if isinstance(node.get("params"), dict) else {}
+        offset = _SAMPLE_OFFSETS.get(str(params.get("sample") or "current"), -1)
+        if node_type == "constant_value":
+            value = params.get("value")
+            if value is None:
+                return self._constant(np.nan, valid=False)
+            if not isinstance(value, (int, float)):
+                # Mixed-type comparisons raise in the scalar evaluator.
+                raise _NotVectorizable("non-numeric constant")
+            return self._constant(float(value))
+        if node_type in {"close_price", "low_price", "high_price"}:
+            lookback = int(params.get("lookback") or EMA20_LOOKBACK_LENGTH)
+            series = await self._price(node_type.removesuffix("_price"), lookback)
+            return self._sample(series, offset, True)
+        if node_type != "indicator":
+            return self._constant(np.nan, valid=False)
+
+        indicator = str(params.get("indicator") or "")
+        if indicator == "ema":
+            series = await self._ema(int(params.get("length") or 20))
+        elif indicator == "rsi":
+            series = await self._memo(
+                ("rsi", int(params.get("length") or 14)),
+                lambda: self.indicators.calculate_rsi_series(
+                    self.symbol, self.timeframe, int(params.get("length") or 14)
+                ),
+            )
+        elif indicator.startswith("bollinger_"):
+            component = indicator.removeprefix("bollinger_")
+            if component not in {"upper", "middle", "lower", "bandwidth"}:
+                return self._constant(np.nan, valid=False)
+            length = int(params.get("length") or 20)
+            deviations = float(params.get("standard_deviations") or 2.0)
+            bands = await self._memo(
+                ("bollinger", length, deviations),
+                lambda: self.indicators.calculate_bollinger_bands_series(
+                    self.symbol, self.timeframe, length, deviations
+                ),
+            )
+            series = bands.get(component) if isinstance(bands, dict) else None
+        elif indicator.startswith("macd_"):
+            component = indicator.removeprefix("macd_")
+            if component not in {"line", "signal", "histogram"}:
+                return self._constant(np.nan, valid=False)
+            periods = (
+                int(params.get("fast_period") or 12),
+                int(params.get("slow_period") or 26),
+                int(params.get("signal_period") or 9),
+            )
+            macd = await self._memo(
+                ("macd", *periods),
+                lambda: self.indicators.calculate_macd_series(
+                    self.symbol, self.timeframe, *periods
+                ),
+            )
+            key = "macd" if component == "line" else component
+            series = macd.get(key) if isinstance(macd, dict) else None
+        else:
+            return self._constant(np.nan, valid=False)
+        return self._sample(series, offset)
+
+    def _constant(self, value: float, valid: bool = True) -> SampledValues:
+        return (
+            np.full(self.candle_count, value, dtype=float),
+            np.full(self.candle_count, valid, dtype=bool),
+        )
+
+    async def _memo(self, key: tuple[Any, ...], factory: Any) -> Any:
+        if key not in self.memo:
+            self.memo[key] = await factory()
+        return self.memo[key]
+
+    async def _ema(self, length: int) -> Any:
+        return await self._memo(
+            ("ema", length),
+            lambda: self.indicators.calculate_ema_series(
+                self.symbol, self.timeframe, length
+            ),
+        )
+
+    async def _price(self, column: str, lookback: int) -> Any:
+        method = getattr(self.indicators, f"get_{column}_price")
+        return await self._memo(
+            (column, lookback),
+            lambda: method(self.symbol, self.timeframe, lookback),
+        )
+
+    def _sample(self, series: Any, offset: int, dropna: bool = False) -> SampledValues:
+        """Vectorize ``series.iloc[:index + 1][.dropna()].iloc[offset]``."""
+        if series is None:
+            return self._constant(np.nan, valid=False)
+        if not isinstance(series, pd.Series):
+            raise _NotVectorizable("indicator output is not a Series")
+        raw = series.to_numpy(dtype=float)
+        slice_lengths = np.minimum(np.arange(self.candle_count) + 1, len(raw))
+        if dropna:
+            kept = np.flatnonzero(~np.isnan(raw))
+            positions = np.searchsorted(kept, slice_lengths) + offset
+            valid = positions >= 0
+            values = np.full(self.candle_count, np.nan)
+            values[valid] = raw[kept[positions[valid]]]
+            return values, valid
+        positions = slice_lengths + offset
+        valid = positions >= 0
+        values = np.full(self.candle_count, np.nan)
+        values[valid] = raw[positions[valid]]
+        return values, valid & ~np.isnan(values)
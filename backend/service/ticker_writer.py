@@ -0,0 +1,113 @@
+"""Low-level bulk writer for OHLCV ticker rows.
+
+Watcher flushes and history syncs insert hundreds of candles at once. Building
+a ``model.Tickers`` instance per candle costs more than the insert itself, so
+this writer turns payloads into plain tuples and hands them to SQLite as one
+prepared ``executemany`` statement inside a single transaction.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import helper
+from service.database import run_sqlite_write_with_retry
+from service.sqlite_timestamps import ticker_epoch_ms
+from tortoise.transactions import in_transaction
+
+logging = helper.LoggerFactory.get_logger("logs/data.log", "ticker_writer")
+
+TICKER_COLUMNS = ("timestamp", "symbol", "open", "high", "low", "close", "volume", "ts")
+
+_COLUMN_SQL = ", ".join(TICKER_COLUMNS)
+_PLACEHOLDER_SQL = ", ".join("?" for _ in TICKER_COLUMNS)
+INSERT_TICKER_SQL = f"INSERT INTO tickers ({_COLUMN_SQL}) VALUES ({_PLACEHOLDER_SQL})"
+# Keeps each stored-row lookup below SQLite's default host parameter limit.
+_EXISTING_LOOKUP_CHUNK_SIZE = 400
+
+TickerRow = tuple[str, str, float, float, float, float, float, int | None]
+
+
+def ticker_row(payload: Mapping[str, Any]) -> TickerRow:
+    """Return the column values for one OHLCV payload in ``TICKER_COLUMNS`` order."""
+    timestamp = payload["timestamp"]
+    return (
+        str(timestamp),
+        str(payload["symbol"]),
+        float(payload["open"]),
+        float(payload["high"]),
+        float(payload["low"]),
+        float(payload["close"]),
+        float(payload["volume"]),
+        ticker_epoch_ms(timestamp),
+    )
+
+
+async def _stored_ticker_keys(
+    connection: Any, symbols: list[str], timestamps: list[int]
+) -> set[tuple[str, int]]:
+    """Return the (symbol, ts) pairs of the batch that are already stored."""
+    stored: set[tuple[str, int]] = set()
+    ts_sql = ", ".join("?" for _ in timestamps)
+    for index in range(0, len(symbols), _EXISTING_LOOKUP_CHUNK_SIZE):
+        chunk = symbols[index : index + _EXISTING_LOOKUP_CHUNK_SIZE]
+        symbol_sql = ", ".join("?" for _ in chunk)
+        _, rows = await connection.execute_query(
+            f"SELECT symbol, ts FROM tickers WHERE symbol IN ({symbol_sql}) "
+            f"AND ts IN ({ts_sql})",
+            [*chunk, *timestamps],
+        )
+        stored.update((str(row["symbol"]), int(row["ts"])) for row in rows)
+    return stored
+
+
+async def write_ticker_rows(
+    payloads: Iterable[Mapping[str, Any]],
+    operation_name: str,
+    *,
+    skip_duplicates: bool = False,
+) -> list[Mapping[str, Any]]:
+    """Insert OHLCV payloads with one executemany call and return those written.
+
+    Payloads whose timestamp has no epoch value are dropped, since the
+    ``(symbol, ts)`` lookups used for ranges and duplicates cannot match
+    them. With ``skip_duplicates`` a candle whose symbol and epoch timestamp
+    are already stored, or repeated within the batch, is not written again.
+    """
+    pending: list[tuple[Mapping[str, Any], TickerRow]] = []
+    for payload in payloads:
+        row = ticker_row(payload)
+        if row[7] is None:
+            logging.warning(
+                "Dropping %s candle with unparsable timestamp %r.", row[1], row[0]
+            )
+            continue
+        pending.append((payload, row))
+    if not pending:
+        return []
+
+    written: list[Mapping[str, Any]] = []
+
+    async def _write() -> None:
+        written.clear()
+        async with in_transaction() as connection:
+            selected = pending
+            if skip_duplicates:
+                symbols = sorted({row[1] for _, row in pending})
+                timestamps = sorted({int(row[7] or 0) for _, row in pending})
+                seen = await _stored_ticker_keys(connection, symbols, timestamps)
+                selected = []
+                for payload, row in pending:
+                    key = (row[1], int(row[7] or 0))
+                    if key not in seen:
+                        seen.add(key)
+                        selected.append((payload, row))
+            if selected:
+                await connection.execute_many(
+                    INSERT_TICKER_SQL, [list(row) for _, row in selected]
+                )
+            written.extend(payload for payload, _ in selected)
+
+    await run_sqlite_write_with_retry(_write, f"{operation_name} ({len(pending)} rows)")
+    return written
@@ -0,0 +1,85 @@
+"""In-process change notifications for persisted trade state.
+
+Writers call :func:`publish_trade_state_changed` with the affected trade
+streams after open, closed, unsellable, or waiting trade rows were created,
+closed, or deleted. Subscribers (for example the trade WebSocket streams)
+refresh only those streams instead of polling. Price-only open-trade updates
+use :func:`notify_open_trade_prices_changed`, which never blocks the writer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+
+import helper
+
+logging = helper.LoggerFactory.get_logger("logs/trades.log", "trade_events")
+
+TRADE_STREAM_OPEN = "open"
+TRADE_STREAM_CLOSED = "closed"
+TRADE_STREAM_UNSELLABLE = "unsellable"
+TRADE_STREAM_WAITING = "waiting"
+ALL_TRADE_STREAMS = frozenset(
+    {
+        TRADE_STREAM_OPEN,
+        TRADE_STREAM_CLOSED,
+        TRADE_STREAM_UNSELLABLE,
+        TRADE_STREAM_WAITING,
+    }
+)
+# Price-only open-trade updates arrive on every DCA tick and statistic pass;
+# they refresh the open stream at most this often, like the old poll did.
+OPEN_TRADE_PRICE_NOTIFY_INTERVAL_SECONDS = 5.0
+
+TradeChangeListener = Callable[[frozenset[str]], Awaitable[None]]
+
+_listeners: list[TradeChangeListener] = []
+_price_update_pending = False
+_price_update_task: asyncio.Task[None] | None = None
+
+
+def subscribe_trade_state_changes(
+    listener: TradeChangeListener,
+) -> Callable[[], None]:
+    """Register a trade-change listener and return its unsubscribe callback."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+    def unsubscribe() -> None:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+    return unsubscribe
+
+
+async def publish_trade_state_changed(
+    streams: Iterable[str] = ALL_TRADE_STREAMS,
+) -> None:
+    """Notify listeners that the trade lists behind ``streams`` have changed."""
+    changed = frozenset(streams)
+    for listener in tuple(_listeners):
+        try:
+            await listener(changed)
+        except Exception as exc:  # noqa: BLE001 - Listeners must not break writers.
+            logging.error("Trade change listener failed: %s", exc, exc_info=True)
+
+
+def notify_open_trade_prices_changed() -> None:
+    """Schedule a throttled open-stream refresh without blocking the caller."""
+    global _price_update_pending, _price_update_task
+    if not _listeners:
+        return
+    _price_update_pending = True
+    if _price_update_task is None or _price_update_task.done():
+        _price_update_task = asyncio.get_running_loop().create_task(
+            _publish_open_trade_prices()
+        )
+
+
+async def _publish_open_trade_prices() -> None:
+    global _price_update_pending
+    while _price_update_pending and _listeners:
+        _price_update_pending = False
+        await publish_trade_state_changed((TRADE_STREAM_OPEN,))
+        await asyncio.sleep(OPEN_TRADE_PRICE_NOTIFY_INTERVAL_SECONDS)
@@ -14,7 +14,11 @@ from service.config import Config
 from service.data_ohlcv import resample_ohlcv_data, rows_to_dataframe
 from service.data_timeframes import timeframe_to_milliseconds
 from service.indicators import Indicators
-from service.sqlite_timestamps import build_normalized_text_timestamp_sql
+from service.sqlite_timestamps import (
+    build_epoch_order_sql,
+    build_epoch_range_clause,
+    build_normalized_text_timestamp_sql,
+)
 from service.strategy_chart_indicators import StrategyChartIndicatorBuilder
 from service.trades import Trades
 from tortoise import Tortoise
@@ -26,6 +30,7 @@ logging = helper.LoggerFactory.get_logger(
 )
 
 NORMALIZED_TIMESTAMP_SQL = build_normalized_text_timestamp_sql()
+TICKER_EPOCH_ORDER_SQL = build_epoch_order_sql()
 
 
 @dataclass(frozen=True)
@@ -289,15 +294,27 @@ class TradeReplayIndicatorService:
             return []
         if identity_column not in {"symbol", "deal_id"}:
             return []
+        if table_name == "tickers":
+            range_clause, params = build_epoch_range_clause(
+                start_ms,
+                end_ms,
+                start_operator=start_operator,
+            )
+            order_sql = TICKER_EPOCH_ORDER_SQL
+        else:
+            range_clause = (
+                f"{NORMALIZED_TIMESTAMP_SQL} {start_operator} ? "
+                f"AND {NORMALIZED_TIMESTAMP_SQL} <= ?"
+            )
+            params = [start_ms, end_ms]
+            order_sql = NORMALIZED_TIMESTAMP_SQL
         try:
             return await Tortoise.get_connection("default").execute_query_dict(
                 "SELECT timestamp, open, high, low, close, volume "
                 f"FROM {table_name} "
-                f"WHERE {identity_column} = ? "
-                f"AND {NORMALIZED_TIMESTAMP_SQL} {start_operator} ? "
-                f"AND {NORMALIZED_TIMESTAMP_SQL} <= ? "
-                f"ORDER BY {NORMALIZED_TIMESTAMP_SQL}, timestamp",
-                [identity_value, start_ms, end_ms],
+                f"WHERE {identity_column} = ? AND {range_clause} "
+                f"ORDER BY {order_sql}, timestamp",
+                [identity_value, *params],
             )
         except BaseORMException as exc:
             logging.warning(
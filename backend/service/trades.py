@@ -9,18 +9,29 @@ from uuid import UUID
 
 import helper
 import model
+from service.analytics import get_analytics_state
 from service.database import run_sqlite_write_with_retry
+from service.open_positions import OpenPosition, get_open_position_cache
 from service.order_payloads import format_trade_datetime, trade_datetime_from_ms
 from service.order_persistence import (
     persist_closed_trade_summary,
     persist_partial_sell_execution,
 )
+from service.profit_ledger import get_closed_profit_ledger
 from service.spot_campaign_types import (
     NON_TERMINAL_CLOSE_REASON_VALUES,
     SpotCampaignState,
     TradeExposureState,
     TradeLifecycleMode,
 )
+from service.trade_events import (
+    TRADE_STREAM_CLOSED,
+    TRADE_STREAM_OPEN,
+    TRADE_STREAM_UNSELLABLE,
+    TRADE_STREAM_WAITING,
+    notify_open_trade_prices_changed,
+    publish_trade_state_changed,
+)
 from service.trade_math import parse_date_to_ms
 from service.trading_controls import resolve_mission_pause_fields
 from tortoise.exceptions import BaseORMException
@@ -375,11 +386,10 @@ class Trades:
             self._log_db_error(error_message, exc)
             return False
 
-    async def _clear_order_cache(self) -> None:
+    async def _clear_order_cache(self, symbol: str | None = None) -> None:
         """Clear cached trade aggregates after open-position mutations."""
-        cache_clear = getattr(self.get_trades_for_orders, "cache_clear", None)
-        if cache_clear is not None:
-            await cache_clear()
+        get_open_position_cache().invalidate(symbol)
+        await publish_trade_state_changed((TRADE_STREAM_OPEN, TRADE_STREAM_WAITING))
 
     async def invalidate_trade_caches(self) -> None:
         """Public cache invalidation seam for open-position mutations."""
@@ -820,25 +830,38 @@ class Trades:
                 return deleted_count
 
         try:
-            return await run_sqlite_write_with_retry(
+            deleted_count = await run_sqlite_write_with_retry(
                 _delete_all_summaries,
                 "deleting all unsellable trades",
             )
         except BaseORMException as exc:
             self._log_db_error("Error deleting all unsellable trades.", exc)
             return None
+        if deleted_count:
+            await publish_trade_state_changed((TRADE_STREAM_UNSELLABLE,))
+        return deleted_count
 
     async def update_open_trades(self, payload: dict[str, Any], symbol: str) -> None:
         """Update open trades for a symbol."""
-        if await self.get_open_trades_by_symbol(symbol):
-            await self._write_db(
-                model.OpenTrades.update_or_create(
-                    defaults=payload,
-                    symbol=symbol,
-                ),
-                f"Error updating SO count for {symbol}.",
-            )
-            await self._clear_order_cache()
+        position_cache = get_open_position_cache()
+        has_open_trade = position_cache.has_open_trade(symbol)
+        if has_open_trade is None:
+            has_open_trade = bool(await self.get_open_trades_by_symbol(symbol))
+        if not has_open_trade:
+            return
+        updated = await self._write_db(
+            model.OpenTrades.update_or_create(
+                defaults=payload,
+                symbol=symbol,
+            ),
+            f"Error updating SO count for {symbol}.",
+        )
+        if updated:
+            # Column updates keep the cached position instead of reloading it.
+            position_cache.apply_open_trade_update(symbol, payload)
+            notify_open_trade_prices_changed()
+        else:
+            await self._clear_order_cache(symbol)
 
     async def set_tp_limit_order(
         self,
@@ -868,7 +891,7 @@ class Trades:
                 symbol,
             )
             return False
-        await self._clear_order_cache()
+        await self._clear_order_cache(symbol)
         return True
 
     async def clear_tp_limit_order(self, symbol: str) -> bool:
@@ -883,7 +906,7 @@ class Trades:
             f"Error clearing proactive TP limit order for {symbol}.",
         )
         if updated:
-            await self._clear_order_cache()
+            await self._clear_order_cache(symbol)
         return updated
 
     async def add_partial_sell_execution(
@@ -936,6 +959,8 @@ class Trades:
             logging.debug("Deleted open trade for %s.", symbol)
         except BaseORMException as exc:
             self._log_db_error(f"Error deleting open trades for {symbol}.", exc)
+            return
+        await self._clear_order_cache(symbol)
 
     async def create_closed_trades(self, payload: dict[str, Any]) -> None:
         """Delegate detached closed-trade summary persistence to the write layer."""
@@ -943,10 +968,11 @@ class Trades:
 
     async def create_unsellable_trade(self, payload: dict[str, Any]) -> None:
         """Create an archived unsellable trade entry."""
-        await self._write_db(
+        if await self._write_db(
             model.UnsellableTrades.create(**payload),
             "Error creating unsellable trade.",
-        )
+        ):
+            await publish_trade_state_changed((TRADE_STREAM_UNSELLABLE,))
 
     async def delete_closed_trade(self, trade_id: int) -> bool:
         """Delete a closed trade by its identifier."""
@@ -996,13 +1022,21 @@ class Trades:
                 return deleted_count
 
         try:
-            return await run_sqlite_write_with_retry(
+            deleted_count = await run_sqlite_write_with_retry(
                 _delete_summary,
                 f"deleting summary trade {trade_id}",
             )
         except BaseORMException as exc:
             self._log_db_error(error_message, exc)
             return 0
+        if deleted_count:
+            if summary_model is model.ClosedTrades:
+                get_closed_profit_ledger().invalidate()
+                get_analytics_state().invalidate()
+                await publish_trade_state_changed((TRADE_STREAM_CLOSED,))
+            else:
+                await publish_trade_state_changed((TRADE_STREAM_UNSELLABLE,))
+        return deleted_count
 
     async def get_token_amount_from_trades(self, symbol: str) -> float:
         """Return the net remaining token amount for a symbol."""
@@ -1033,185 +1067,205 @@ class Trades:
             logging.error("Error getting total amount from %s. Cause %s", symbol, e)
             return 0.0
 
-    @helper.async_ttl_cache(maxsize=2048, ttl=2)
     async def get_trades_for_orders(self, symbol: str) -> dict[str, Any] | None:
-        """Return aggregated trade data for order processing."""
-        trade_data = []
-        total_cost = 0
-        total_amount = 0
-        current_price = 0
-        safetyorders = []
+        """Return aggregated trade data for order processing.
 
+        Served from the open position cache, so repeated ticks for the same
+        symbol only query the database after a write invalidated it.
+        """
         try:
-            trades = await self.get_trades_by_symbol(symbol)
-            opentrades = await self.get_open_trades_by_symbol(symbol)
-            open_trade = opentrades[0] if opentrades else None
-            if opentrades:
-                current_price = opentrades[0]["current_price"]
-            campaign = None
-            if open_trade and str(open_trade.get("campaign_id") or "").strip():
-                campaign_rows = (
-                    await model.SpotCampaigns.filter(
-                        campaign_id=str(open_trade.get("campaign_id") or "").strip()
-                    )
-                    .limit(1)
-                    .values(
-                        "campaign_id",
-                        "lifecycle_mode",
-                        "state",
-                        "last_exit_reason",
-                        "cooldown_until",
-                        "automation_paused",
-                        "automation_paused_at",
-                        "metadata_json",
-                    )
+            position = await get_open_position_cache().get_position(
+                symbol, self._load_open_position
+            )
+        except BaseORMException:
+            # Broad catch to return None when trade aggregation fails.
+            return None
+        return self._build_trades_for_orders(position)
+
+    @staticmethod
+    async def _load_open_position(symbol: str) -> OpenPosition:
+        """Load the persisted rows describing one symbol's position."""
+        trades = await model.Trades.filter(symbol=symbol).values()
+        open_trade_rows = await model.OpenTrades.filter(symbol=symbol).values()
+        open_trade = open_trade_rows[0] if open_trade_rows else None
+        campaign = None
+        if open_trade and str(open_trade.get("campaign_id") or "").strip():
+            campaign_rows = (
+                await model.SpotCampaigns.filter(
+                    campaign_id=str(open_trade.get("campaign_id") or "").strip()
+                )
+                .limit(1)
+                .values(
+                    "campaign_id",
+                    "lifecycle_mode",
+                    "state",
+                    "last_exit_reason",
+                    "cooldown_until",
+                    "automation_paused",
+                    "automation_paused_at",
+                    "metadata_json",
                 )
-                campaign = campaign_rows[0] if campaign_rows else None
-            lifecycle_mode, exposure_state = self._derive_campaign_runtime_state(
-                open_trade,
-                campaign,
             )
+            campaign = campaign_rows[0] if campaign_rows else None
+        return OpenPosition(
+            symbol=symbol,
+            trades=trades,
+            open_trade=open_trade,
+            campaign=campaign,
+        )
 
-            baseorder = None
-            latest_order = None
-            for order in trades:
-                amount = float(order["amount"])
-                total_cost += float(order["ordersize"])
-                total_amount += amount
-                latest_order = order
-
-                if bool(order.get("baseorder")):
-                    if baseorder is None or float(order["timestamp"]) < float(
-                        baseorder["timestamp"]
-                    ):
-                        baseorder = order
-
-                # Safetyorder data
-                if bool(order.get("safetyorder")) and not bool(order.get("baseorder")):
-                    safetyorder = {
-                        "price": order["price"],
-                        "so_percentage": order["so_percentage"],
-                        "ordersize": order["ordersize"],
-                    }
-                    safetyorders.append(safetyorder)
-
-            if not latest_order:
-                if (
-                    open_trade
-                    and str(exposure_state or "")
-                    == TradeExposureState.FLAT_WAITING_REENTRY.value
-                ):
-                    return self._build_flat_waiting_trade_data(
-                        symbol,
-                        {
-                            **open_trade,
-                            "lifecycle_mode": lifecycle_mode,
-                            "exposure_state": exposure_state,
-                        },
-                        campaign,
-                    )
-                return None
-            if not baseorder:
-                baseorder = min(trades, key=lambda trade: float(trade["timestamp"]))
+    def _build_trades_for_orders(self, position: OpenPosition) -> dict[str, Any] | None:
+        """Aggregate one symbol's persisted rows into order-processing data."""
+        symbol = position.symbol
+        trades = position.trades
+        open_trade = position.open_trade
+        campaign = position.campaign
+        total_cost = 0.0
+        total_amount = 0.0
+        current_price = open_trade["current_price"] if open_trade else 0
+        safetyorders = []
+        lifecycle_mode, exposure_state = self._derive_campaign_runtime_state(
+            open_trade,
+            campaign,
+        )
 
-            safetyorders_count = len(safetyorders)
-            unsellable_state = self._extract_unsellable_state(open_trade)
-            sellable_amount = self._calculate_sellable_amount(
-                total_amount=total_amount,
-                open_trade=open_trade,
-            )
+        baseorder = None
+        latest_order = None
+        for order in trades:
+            amount = float(order["amount"])
+            total_cost += float(order["ordersize"])
+            total_amount += amount
+            latest_order = order
+
+            if bool(order.get("baseorder")):
+                if baseorder is None or float(order["timestamp"]) < float(
+                    baseorder["timestamp"]
+                ):
+                    baseorder = order
+
+            # Safetyorder data
+            if bool(order.get("safetyorder")) and not bool(order.get("baseorder")):
+                safetyorder = {
+                    "price": order["price"],
+                    "so_percentage": order["so_percentage"],
+                    "ordersize": order["ordersize"],
+                }
+                safetyorders.append(safetyorder)
 
-            # For unsellable remnants, OpenTrades carries the authoritative
-            # remaining amount/cost after partial close bookkeeping.
-            if unsellable_state["is_unsellable"] and open_trade:
-                total_amount = float(open_trade.get("amount") or total_amount)
-                total_cost = float(open_trade.get("cost") or total_cost)
-                sellable_amount = total_amount
-
-            trade_data = {
-                "timestamp": latest_order["timestamp"],
-                "fee": latest_order["fee"],
-                "total_cost": total_cost,
-                "total_amount": total_amount,
-                "sellable_amount": sellable_amount,
-                "symbol": latest_order["symbol"],
-                "deal_id": latest_order.get("deal_id"),
-                "campaign_id": (
-                    open_trade.get("campaign_id")
-                    if open_trade and open_trade.get("campaign_id") is not None
-                    else latest_order.get("campaign_id")
-                ),
-                "lifecycle_mode": lifecycle_mode,
-                "exposure_state": exposure_state,
-                "direction": latest_order["direction"],
-                "side": latest_order["side"],
-                "bot": latest_order["bot"],
-                "bo_price": baseorder["price"],
-                "current_price": current_price,
-                "safetyorders": safetyorders,
-                "safetyorders_count": safetyorders_count,
-                "ordertype": baseorder["ordertype"],
-                "open_date": open_trade.get("open_date") if open_trade else None,
-                "tp_limit_order_id": (
-                    open_trade.get("tp_limit_order_id") if open_trade else None
-                ),
-                "tp_limit_order_price": (
-                    open_trade.get("tp_limit_order_price") if open_trade else None
-                ),
-                "tp_limit_order_amount": (
-                    open_trade.get("tp_limit_order_amount") if open_trade else None
-                ),
-                "tp_limit_order_armed_at": (
-                    open_trade.get("tp_limit_order_armed_at") if open_trade else None
-                ),
-                "last_transition_at": (
-                    open_trade.get("last_transition_at") if open_trade else None
-                ),
-                "reserved_reentry_quote": (
-                    float(open_trade.get("reserved_reentry_quote") or 0.0)
-                    if open_trade
-                    else 0.0
-                ),
-                "waiting_reference_price": (
-                    float(open_trade.get("waiting_reference_price") or 0.0)
-                    if open_trade
-                    else 0.0
-                ),
-                "waiting_reference_amount": (
-                    float(open_trade.get("waiting_reference_amount") or 0.0)
-                    if open_trade
-                    else 0.0
-                ),
-                "waiting_reference_quote": (
-                    float(open_trade.get("waiting_reference_quote") or 0.0)
-                    if open_trade
-                    else 0.0
-                ),
-                "virtual_waiting_profit": (
-                    float(open_trade.get("virtual_waiting_profit") or 0.0)
-                    if open_trade
-                    else 0.0
-                ),
-                "virtual_waiting_profit_percent": (
-                    float(open_trade.get("virtual_waiting_profit_percent") or 0.0)
-                    if open_trade
-                    else 0.0
-                ),
-                **resolve_mission_pause_fields(
-                    open_trade=open_trade,
-                    campaign=campaign,
-                ),
-                **unsellable_state,
-            }
+        if not latest_order:
             if (
-                str(trade_data.get("exposure_state") or "")
+                open_trade
+                and str(exposure_state or "")
                 == TradeExposureState.FLAT_WAITING_REENTRY.value
             ):
-                self._apply_waiting_campaign_status_fields(trade_data, campaign)
-            return trade_data
-        except BaseORMException:
-            # Broad catch to return None when trade aggregation fails.
+                return self._build_flat_waiting_trade_data(
+                    symbol,
+                    {
+                        **open_trade,
+                        "lifecycle_mode": lifecycle_mode,
+                        "exposure_state": exposure_state,
+                    },
+                    campaign,
+                )
             return None
+        if not baseorder:
+            baseorder = min(trades, key=lambda trade: float(trade["timestamp"]))
+
+        safetyorders_count = len(safetyorders)
+        unsellable_state = self._extract_unsellable_state(open_trade)
+        sellable_amount = self._calculate_sellable_amount(
+            total_amount=total_amount,
+            open_trade=open_trade,
+        )
+
+        # For unsellable remnants, OpenTrades carries the authoritative
+        # remaining amount/cost after partial close bookkeeping.
+        if unsellable_state["is_unsellable"] and open_trade:
+            total_amount = float(open_trade.get("amount") or total_amount)
+            total_cost = float(open_trade.get("cost") or total_cost)
+            sellable_amount = total_amount
+
+        trade_data = {
+            "timestamp": latest_order["timestamp"],
+            "fee": latest_order["fee"],
+            "total_cost": total_cost,
+            "total_amount": total_amount,
+            "sellable_amount": sellable_amount,
+            "symbol": latest_order["symbol"],
+            "deal_id": latest_order.get("deal_id"),
+            "campaign_id": (
+                open_trade.get("campaign_id")
+                if open_trade and open_trade.get("campaign_id") is not None
+                else latest_order.get("campaign_id")
+            ),
+            "lifecycle_mode": lifecycle_mode,
+            "exposure_state": exposure_state,
+            "direction": latest_order["direction"],
+            "side": latest_order["side"],
+            "bot": latest_order["bot"],
+            "bo_price": baseorder["price"],
+            "current_price": current_price,
+            "safetyorders": safetyorders,
+            "safetyorders_count": safetyorders_count,
+            "ordertype": baseorder["ordertype"],
+            "open_date": open_trade.get("open_date") if open_trade else None,
+            "tp_limit_order_id": (
+                open_trade.get("tp_limit_order_id") if open_trade else None
+            ),
+            "tp_limit_order_price": (
+                open_trade.get("tp_limit_order_price") if open_trade else None
+            ),
+            "tp_limit_order_amount": (
+                open_trade.get("tp_limit_order_amount") if open_trade else None
+            ),
+            "tp_limit_order_armed_at": (
+                open_trade.get("tp_limit_order_armed_at") if open_trade else None
+            ),
+            "last_transition_at": (
+                open_trade.get("last_transition_at") if open_trade else None
+            ),
+            "reserved_reentry_quote": (
+                float(open_trade.get("reserved_reentry_quote") or 0.0)
+                if open_trade
+                else 0.0
+            ),
+            "waiting_reference_price": (
+                float(open_trade.get("waiting_reference_price") or 0.0)
+                if open_trade
+                else 0.0
+            ),
+            "waiting_reference_amount": (
+                float(open_trade.get("waiting_reference_amount") or 0.0)
+                if open_trade
+                else 0.0
+            ),
+            "waiting_reference_quote": (
+                float(open_trade.get("waiting_reference_quote") or 0.0)
+                if open_trade
+                else 0.0
+            ),
+            "virtual_waiting_profit": (
+                float(open_trade.get("virtual_waiting_profit") or 0.0)
+                if open_trade
+                else 0.0
+            ),
+            "virtual_waiting_profit_percent": (
+                float(open_trade.get("virtual_waiting_profit_percent") or 0.0)
+                if open_trade
+                else 0.0
+            ),
+            **resolve_mission_pause_fields(
+                open_trade=open_trade,
+                campaign=campaign,
+            ),
+            **unsellable_state,
+        }
+        if (
+            str(trade_data.get("exposure_state") or "")
+            == TradeExposureState.FLAT_WAITING_REENTRY.value
+        ):
+            self._apply_waiting_campaign_status_fields(trade_data, campaign)
+        return trade_data
 
     async def get_symbols(self) -> list[str]:
         """Return distinct trade symbols."""
@@ -0,0 +1,208 @@
+"""Tiered uPNL history storage: raw snapshots plus 15m/4h/1d rollups.
+
+Every stored snapshot also updates the bucket it falls into for each rollup
+resolution, keeping only the last snapshot per bucket. Timeline reads then
+scan a few hundred rollup rows instead of a year of raw snapshots, and the
+housekeeper can drop raw and fine-grained rows once coarser tiers cover them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import helper
+import model
+from service.database import run_sqlite_write_with_retry
+from tortoise.transactions import in_transaction
+
+logging = helper.LoggerFactory.get_logger("logs/statistics.log", "upnl_history")
+
+RAW_RESOLUTION = "raw"
+UPNL_ROLLUP_RESOLUTIONS: dict[str, timedelta] = {
+    "15m": timedelta(minutes=15),
+    "4h": timedelta(hours=4),
+    "1d": timedelta(days=1),
+}
+# Compaction keeps each tier slightly longer than the timeline window it serves
+# (raw and 15m: last day, 4h: last week); daily rollups are kept indefinitely.
+UPNL_TIER_RETENTION: dict[str, timedelta] = {
+    RAW_RESOLUTION: timedelta(days=2),
+    "15m": timedelta(days=2),
+    "4h": timedelta(days=8),
+}
+
+UpnlRow = tuple[datetime, float, float]
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    """Treat naive timestamps as UTC, matching how snapshots are written."""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def upnl_bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Return the UTC start of the rollup bucket containing ``timestamp``."""
+    seconds = int(UPNL_ROLLUP_RESOLUTIONS[resolution].total_seconds())
+    epoch = int(_as_utc(timestamp).timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=timezone.utc)
+
+
+async def record_upnl_snapshot(
+    timestamp: datetime, upnl: float, profit_overall: float, funds_locked: float
+) -> None:
+    """Store one raw snapshot and fold it into every rollup tier."""
+    values = {
+        "upnl": float(upnl),
+        "profit_overall": float(profit_overall),
+        "funds_locked": float(funds_locked),
+    }
+
+    async def _write() -> None:
+        async with in_transaction() as conn:
+            await model.UpnlHistory.create(using_db=conn, timestamp=timestamp, **values)
+            for resolution in UPNL_ROLLUP_RESOLUTIONS:
+                bucket_start = upnl_bucket_start(timestamp, resolution)
+                existing = (
+                    await model.UpnlHistoryRollup.filter(
+                        resolution=resolution, bucket_start=bucket_start
+                    )
+                    .using_db(conn)
+                    .first()
+                )
+                if existing is None:
+                    await model.UpnlHistoryRollup.create(
+                        using_db=conn,
+                        resolution=resolution,
+                        bucket_start=bucket_start,
+                        timestamp=timestamp,
+                        **values,
+                    )
+                elif _as_utc(existing.timestamp) <= _as_utc(timestamp):
+                    await model.UpnlHistoryRollup.filter(id=existing.id).using_db(
+                        conn
+                    ).update(timestamp=timestamp, **values)
+
+    await run_sqlite_write_with_retry(_write, "storing upnl snapshot")
+
+
+async def ensure_upnl_rollups() -> None:
+    """Fold raw snapshots older than every rollup into the rollup tiers.
+
+    This covers snapshots written before rollups existed and restores from
+    backups without rollup rows; afterwards it is two indexed lookups.
+    """
+    oldest_rollup = await model.UpnlHistoryRollup.all().order_by("timestamp").first()
+    legacy_query = model.UpnlHistory.all()
+    if oldest_rollup is not None:
+        legacy_query = legacy_query.filter(timestamp__lt=oldest_rollup.timestamp)
+    if not await legacy_query.exists():
+        return
+
+    rows = await legacy_query.order_by("timestamp", "id").values_list(
+        "timestamp", "upnl", "profit_overall", "funds_locked"
+    )
+    buckets: dict[tuple[str, datetime], tuple[Any, ...]] = {}
+    for row in rows:
+        for resolution in UPNL_ROLLUP_RESOLUTIONS:
+            buckets[(resolution, upnl_bucket_start(row[0], resolution))] = row
+    # Existing buckets only hold newer snapshots than any legacy row.
+    latest_bucket = max(bucket_start for _, bucket_start in buckets)
+    existing = {
+        (resolution, _as_utc(bucket_start))
+        for resolution, bucket_start in await model.UpnlHistoryRollup.filter(
+            bucket_start__lte=latest_bucket
+        ).values_list("resolution", "bucket_start")
+    }
+    rollups = [
+        model.UpnlHistoryRollup(
+            resolution=resolution,
+            bucket_start=bucket_start,
+            timestamp=timestamp,
+            upnl=float(upnl or 0.0),
+            profit_overall=float(profit_overall or 0.0),
+            funds_locked=float(funds_locked or 0.0),
+        )
+        for (resolution, bucket_start), (
+            timestamp,
+            upnl,
+            profit_overall,
+            funds_locked,
+        ) in buckets.items()
+        if (resolution, bucket_start) not in existing
+    ]
+    await run_sqlite_write_with_retry(
+        lambda: model.UpnlHistoryRollup.bulk_create(rollups, batch_size=500),
+        "folding legacy upnl history into rollups",
+    )
+    logging.info("Rolled up %s legacy uPNL snapshots", len(rows))
+
+
+async def load_upnl_rows(
+    spans: Iterable[tuple[str, datetime | None, datetime | None]],
+) -> list[UpnlRow]:
+    """Return ``(timestamp, profit_overall, funds_locked)`` rows for each span.
+
+    Each span is ``(resolution, start, end)`` with an inclusive start and an
+    exclusive end on the snapshot timestamp; ``None`` leaves a side open.
+    Resolution ``"raw"`` reads the unaggregated snapshots.
+    """
+    rows: list[UpnlRow] = []
+    for resolution, start, end in spans:
+        if resolution == RAW_RESOLUTION:
+            query = model.UpnlHistory.all()
+        else:
+            query = model.UpnlHistoryRollup.filter(resolution=resolution)
+        if start is not None:
+            query = query.filter(timestamp__gte=start)
+        if end is not None:
+            query = query.filter(timestamp__lt=end)
+        rows.extend(
+            await query.order_by("timestamp").values_list(
+                "timestamp", "profit_overall", "funds_locked"
+            )
+        )
+    rows.sort(key=lambda row: _as_utc(row[0]))
+    return rows
+
+
+async def compact_upnl_history(now: datetime, retention_days: int) -> dict[str, int]:
+    """Drop raw and fine-grained rows that coarser rollups already cover.
+
+    ``retention_days`` greater than 0 additionally removes every tier older
+    than the configured uPNL retention window.
+    """
+    now = now.astimezone(timezone.utc)
+    await ensure_upnl_rollups()
+    deleted: dict[str, int] = {}
+
+    raw_cutoff = now - UPNL_TIER_RETENTION[RAW_RESOLUTION]
+    if retention_days > 0:
+        raw_cutoff = max(raw_cutoff, now - timedelta(days=retention_days))
+    deleted[RAW_RESOLUTION] = await run_sqlite_write_with_retry(
+        lambda: model.UpnlHistory.filter(timestamp__lt=raw_cutoff).delete(),
+        "compacting raw upnl history",
+    )
+
+    for resolution in UPNL_ROLLUP_RESOLUTIONS:
+        keep = UPNL_TIER_RETENTION.get(resolution)
+        cutoff = now - keep if keep is not None else None
+        if retention_days > 0:
+            retention_cutoff = now - timedelta(days=retention_days)
+            cutoff = max(cutoff, retention_cutoff) if cutoff else retention_cutoff
+        if cutoff is None:
+            continue
+        deleted[resolution] = await _delete_rollups_before(resolution, cutoff)
+    return deleted
+
+
+async def _delete_rollups_before(resolution: str, cutoff: datetime) -> int:
+    """Delete one tier's rollups whose last snapshot is older than ``cutoff``."""
+    return await run_sqlite_write_with_retry(
+        lambda: model.UpnlHistoryRollup.filter(
+            resolution=resolution, timestamp__lt=cutoff
+        ).delete(),
+        f"compacting {resolution} upnl rollups",
+    )
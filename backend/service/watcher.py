@@ -1,11 +1,14 @@
 """Exchange watcher and ticker event processing."""
 
 import asyncio
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import ccxt.pro as ccxtpro
 import helper
 import model
+from service.candle_store import CandleStore
 from service.config import Config, resolve_history_lookback_days, resolve_timeframe
 from service.config_views import (
     DcaRuntimeConfigView,
@@ -13,15 +16,22 @@ from service.config_views import (
     WatcherRuntimeConfigView,
 )
 from service.data import Data
-from service.database import run_sqlite_write_with_retry
 from service.dca import Dca
+from service.history_backfill import (
+    BACKFILL_PRIORITY_ACTIVE_TRADE,
+    BACKFILL_PRIORITY_BTC_PULSE,
+    get_history_backfill_scheduler,
+)
 from service.strategy_capability import (
     get_configured_strategy_history_lookback_days,
     get_configured_strategy_min_history_candles,
 )
 from service.strategy_runtime import run_strategy_health_check
+from service.ticker_writer import write_ticker_rows
 from service.trades import Trades
 from service.watcher_queue import (
+    DcaQueueMetrics,
+    dca_shard_for_symbol,
     pop_pending_dca_payload,
     queue_bounded_payload,
     queue_dca_payload,
@@ -64,6 +74,8 @@ class Watcher:
     DCA_QUEUE_MAXSIZE = 1000
     OHLCV_QUEUE_MAXSIZE = 5000
     BTC_HISTORY_MIN_ROWS = 120
+    WATCH_BATCH_SIZE = 50
+    WATCH_BATCH_TASK_PREFIX = "batch:"
     DCA_WORKER_TASK_NAME = "watcher:dca_worker"
     OHLCV_WORKER_TASK_NAME = "watcher:ohlcv_worker"
     _runtime_state: WatcherRuntimeState | None = None
@@ -88,7 +100,11 @@ class Watcher:
         return self._get_runtime_state()
 
     def __init__(self) -> None:
-        Watcher._runtime_state = WatcherRuntimeState()
+        self.dca_queues: list[asyncio.Queue[str]] = [self._new_dca_queue()]
+        self.dca_metrics = DcaQueueMetrics(queues=self.dca_queues)
+        Watcher._runtime_state = WatcherRuntimeState(
+            candle_store=CandleStore(), dca_metrics=self.dca_metrics
+        )
         set_active_runtime_state(Watcher._runtime_state)
         self.trades = Trades()
         self.dca = Dca()
@@ -96,10 +112,10 @@ class Watcher:
         self.exchange = None
         self.status = True
         self.symbol_tasks: dict[str, asyncio.Task] = {}
+        self._symbol_batches: dict[str, int] = {}
+        self._batched_watch_enabled = True
+        self._batched_watch_unsupported = False
         self.event_queue = asyncio.Queue()
-        self.dca_queue: asyncio.Queue[str] = asyncio.Queue(
-            maxsize=self.DCA_QUEUE_MAXSIZE
-        )
         self.ohlcv_queue = asyncio.Queue(maxsize=self.OHLCV_QUEUE_MAXSIZE)
         self.last_price = {}
         self._pending_dca_payloads: dict[str, dict[str, Any]] = {}
@@ -132,6 +148,7 @@ class Watcher:
 
         runtime_state.exchange_watcher_ohlcv = watcher_config.watcher_ohlcv
         runtime_state.timeframe = watcher_config.timeframe
+        self._batched_watch_enabled = watcher_config.batch_subscriptions
         runtime_state.mandatory_symbols = self.__get_mandatory_symbols(config)
         self._refresh_symbol_targets_from_current_state()
         self._schedule_btc_pulse_history_warmup(config, watcher_config)
@@ -268,6 +285,7 @@ class Watcher:
             elif exchange_config.sandbox:
                 new_exchange.set_sandbox_mode(True)
             self.exchange = new_exchange
+            self._batched_watch_unsupported = False
 
     def _schedule_btc_pulse_history_warmup(
         self,
@@ -313,7 +331,7 @@ class Watcher:
 
     async def _warmup_btc_pulse_history(self, symbol: str, history_days: int) -> None:
         """Backfill BTC history once when required for BTC pulse."""
-        data = Data()
+        data = Data(persist_exchange=True)
         try:
             count = await data.count_history_data_for_symbol(symbol)
             history_rows = 0 if count is False else int(count)
@@ -325,8 +343,11 @@ class Watcher:
                 )
                 return
 
-            success = await data.add_history_data_for_symbol(
-                symbol, history_days, self.config
+            success = await get_history_backfill_scheduler().submit(
+                symbol,
+                history_days,
+                self.config or {},
+                priority=BACKFILL_PRIORITY_BTC_PULSE,
             )
             if success:
                 logging.info(
@@ -424,7 +445,7 @@ class Watcher:
         required_history_days: int,
     ) -> None:
         """Ensure active-trade symbols have enough history for strategy evaluation."""
-        data = Data()
+        data = Data(persist_exchange=True)
         try:
             trade_symbols = await self.trades.get_symbols()
             if not trade_symbols:
@@ -434,33 +455,28 @@ class Watcher:
             refreshed_symbols = 0
             strategy_ready_symbols: list[str] = []
             still_short_symbols: list[str] = []
-            for symbol in trade_symbols:
-                had_history = await data.has_sufficient_resampled_history(
-                    symbol,
-                    timeframe,
-                    required_candles,
-                )
-
-                success = await data.add_history_data_for_symbol(
-                    symbol,
-                    required_history_days,
-                    config,
-                    success_timeframe=timeframe,
-                    success_minimum_candles=required_candles,
+            results = await asyncio.gather(
+                *(
+                    self._warmup_active_trade_symbol_history(
+                        data,
+                        symbol,
+                        config,
+                        timeframe=timeframe,
+                        required_candles=required_candles,
+                        required_history_days=required_history_days,
+                    )
+                    for symbol in trade_symbols
                 )
-                if success and await data.has_sufficient_resampled_history(
-                    symbol,
-                    timeframe,
-                    required_candles,
-                ):
-                    if had_history:
-                        refreshed_symbols += 1
-                    else:
-                        warmed_symbols += 1
-                    strategy_ready_symbols.append(symbol)
+            )
+            for symbol, (had_history, ready) in zip(trade_symbols, results):
+                if not ready:
+                    still_short_symbols.append(symbol)
                     continue
-
-                still_short_symbols.append(symbol)
+                if had_history:
+                    refreshed_symbols += 1
+                else:
+                    warmed_symbols += 1
+                strategy_ready_symbols.append(symbol)
 
             if warmed_symbols:
                 logging.info(
@@ -503,6 +519,37 @@ class Watcher:
         finally:
             await data.close()
 
+    async def _warmup_active_trade_symbol_history(
+        self,
+        data: Data,
+        symbol: str,
+        config: dict[str, Any],
+        *,
+        timeframe: str,
+        required_candles: int,
+        required_history_days: int,
+    ) -> tuple[bool, bool]:
+        """Backfill one active-trade symbol; return (had_history, ready)."""
+        had_history = await data.has_sufficient_resampled_history(
+            symbol,
+            timeframe,
+            required_candles,
+        )
+        success = await get_history_backfill_scheduler().submit(
+            symbol,
+            required_history_days,
+            config,
+            priority=BACKFILL_PRIORITY_ACTIVE_TRADE,
+            success_timeframe=timeframe,
+            success_minimum_candles=required_candles,
+        )
+        ready = success and await data.has_sufficient_resampled_history(
+            symbol,
+            timeframe,
+            required_candles,
+        )
+        return had_history, ready
+
     async def _run_active_trade_strategy_health_check(
         self,
         config: dict[str, Any],
@@ -674,11 +721,35 @@ class Watcher:
             await self._cancel_worker_tasks()
             await self._close_exchange()
 
+    def _new_dca_queue(self) -> asyncio.Queue[str]:
+        return asyncio.Queue(maxsize=self.DCA_QUEUE_MAXSIZE)
+
+    def _dca_worker_task_name(self, shard: int) -> str:
+        return f"{self.DCA_WORKER_TASK_NAME}:{shard}"
+
+    def _configure_dca_shards(self) -> None:
+        """Size the DCA shard queues from config before the workers start."""
+        worker_count = WatcherRuntimeConfigView.from_config(
+            self.config or {}
+        ).dca_workers
+        if worker_count == len(self.dca_queues):
+            return
+        queued_symbols: list[str] = []
+        for queue in self.dca_queues:
+            while not queue.empty():
+                queued_symbols.append(queue.get_nowait())
+        self.dca_queues = [self._new_dca_queue() for _ in range(worker_count)]
+        self.dca_metrics.queues = self.dca_queues
+        for symbol in queued_symbols:
+            shard = dca_shard_for_symbol(symbol, worker_count)
+            self.dca_queues[shard].put_nowait(symbol)
+        logging.info("Running %s DCA workers", worker_count)
+
     def _create_worker_task(self, task_name: str) -> asyncio.Task | None:
-        if task_name == self.DCA_WORKER_TASK_NAME:
-            return asyncio.create_task(
-                self._process_dca_queue(), name=self.DCA_WORKER_TASK_NAME
-            )
+        dca_prefix = f"{self.DCA_WORKER_TASK_NAME}:"
+        if task_name.startswith(dca_prefix):
+            shard = int(task_name.removeprefix(dca_prefix))
+            return asyncio.create_task(self._process_dca_queue(shard), name=task_name)
         if task_name == self.OHLCV_WORKER_TASK_NAME:
             return asyncio.create_task(
                 self._process_ohlcv_queue(), name=self.OHLCV_WORKER_TASK_NAME
@@ -687,7 +758,13 @@ class Watcher:
 
     def _start_worker_tasks(self) -> None:
         self._worker_tasks = start_worker_tasks(
-            [self.DCA_WORKER_TASK_NAME, self.OHLCV_WORKER_TASK_NAME],
+            [
+                *(
+                    self._dca_worker_task_name(shard)
+                    for shard in range(len(self.dca_queues))
+                ),
+                self.OHLCV_WORKER_TASK_NAME,
+            ],
             self._create_worker_task,
         )
 
@@ -702,6 +779,7 @@ class Watcher:
 
         await self._refresh_symbol_targets_from_trades(notify=False)
 
+        self._configure_dca_shards()
         self._consumer_task = asyncio.create_task(
             self.process_events(), name="watcher:event_consumer"
         )
@@ -740,6 +818,20 @@ class Watcher:
         runtime_state = self.runtime_state
         flat_symbols = self.__normalize_symbols(runtime_state.ticker_symbols)
         runtime_state.ticker_symbols = flat_symbols
+        if self._use_batched_watch():
+            removed = self._assign_symbol_batches(flat_symbols)
+            await sync_symbol_tasks(
+                self.symbol_tasks,
+                {
+                    self._batch_task_key(index)
+                    for index in set(self._symbol_batches.values())
+                },
+                self._create_batch_task,
+                logging,
+            )
+            await self._unwatch_symbols(removed)
+            return
+        self._symbol_batches = {}
         await sync_symbol_tasks(
             self.symbol_tasks,
             set(flat_symbols),
@@ -749,6 +841,86 @@ class Watcher:
             logging,
         )
 
+    def _use_batched_watch(self) -> bool:
+        """Return True when the exchange can multiplex symbols per stream."""
+        if not self._batched_watch_enabled or self._batched_watch_unsupported:
+            return False
+        has = getattr(self.exchange, "has", None)
+        if not isinstance(has, dict):
+            return False
+        if self.runtime_state.exchange_watcher_ohlcv:
+            return bool(has.get("watchOHLCVForSymbols"))
+        return bool(has.get("watchTradesForSymbols"))
+
+    def _batch_task_key(self, batch_index: int) -> str:
+        return f"{self.WATCH_BATCH_TASK_PREFIX}{batch_index}"
+
+    def _create_batch_task(self, task_key: str) -> asyncio.Task:
+        batch_index = int(task_key.removeprefix(self.WATCH_BATCH_TASK_PREFIX))
+        return asyncio.create_task(
+            self.watch_symbol_batch_with_reconnect(batch_index),
+            name=f"watch:{task_key}",
+        )
+
+    def _assign_symbol_batches(self, symbols: list[str]) -> list[str]:
+        """Place symbols in multiplexed batches and return the ones removed.
+
+        Symbols keep their batch for as long as they are watched, so adding
+        or removing one symbol never reshuffles the other streams. New
+        symbols fill the lowest batch that has room.
+        """
+        wanted = set(symbols)
+        removed = [symbol for symbol in self._symbol_batches if symbol not in wanted]
+        for symbol in removed:
+            del self._symbol_batches[symbol]
+        batch_sizes: dict[int, int] = {}
+        for batch_index in self._symbol_batches.values():
+            batch_sizes[batch_index] = batch_sizes.get(batch_index, 0) + 1
+        batch_index = 0
+        for symbol in symbols:
+            if symbol in self._symbol_batches:
+                continue
+            while batch_sizes.get(batch_index, 0) >= self.WATCH_BATCH_SIZE:
+                batch_index += 1
+            self._symbol_batches[symbol] = batch_index
+            batch_sizes[batch_index] = batch_sizes.get(batch_index, 0) + 1
+        return removed
+
+    def _symbol_batch(self, batch_index: int) -> list[str]:
+        """Return the symbols currently assigned to one multiplexed stream."""
+        return [
+            symbol
+            for symbol, index in self._symbol_batches.items()
+            if index == batch_index
+        ]
+
+    async def _unwatch_symbols(self, symbols: list[str]) -> None:
+        """Drop the exchange subscriptions of symbols that left their batch."""
+        exchange = self.exchange
+        if not symbols or exchange is None:
+            return
+        try:
+            if self.runtime_state.exchange_watcher_ohlcv:
+                timeframe = self.runtime_state.timeframe
+                await exchange.un_watch_ohlcv_for_symbols(
+                    [[symbol, timeframe] for symbol in symbols]
+                )
+            else:
+                await exchange.un_watch_trades_for_symbols(symbols)
+        except (AttributeError, ccxtpro.BaseError) as e:
+            # The stream keeps delivering these symbols; reads filter them out.
+            logging.warning("Could not unsubscribe %s: %s", ", ".join(symbols), e)
+
+    def _fall_back_to_symbol_watch(self, error: Exception) -> None:
+        """Switch to one stream per symbol after the exchange rejected batching."""
+        logging.warning(
+            "Multiplexed websocket streams are not supported (%s); "
+            "falling back to one stream per symbol.",
+            error,
+        )
+        self._batched_watch_unsupported = True
+        self.runtime_state.notify_symbol_update()
+
     # ------------------------------------------------------------------- #
     #                    Symbol watcher with reconnection                 #
     # ------------------------------------------------------------------- #
@@ -782,25 +954,46 @@ class Watcher:
 
     async def watch_symbol_with_reconnect(self, symbol: str) -> None:
         """Wrapper that restarts the watcher on connection failures."""
-        logging.info("Started websocket stream for %s", symbol)
+        await self._watch_with_reconnect(symbol, lambda: self.watch_symbol(symbol))
+
+    async def watch_symbol_batch_with_reconnect(self, batch_index: int) -> None:
+        """Run one multiplexed stream until its batch empties or batching stops."""
+        await self._watch_with_reconnect(
+            self._batch_task_key(batch_index),
+            lambda: self.watch_symbol_batch(batch_index),
+            keep_running=lambda: (
+                not self._batched_watch_unsupported
+                and bool(self._symbol_batch(batch_index))
+            ),
+        )
+
+    async def _watch_with_reconnect(
+        self,
+        label: str,
+        read_once: Callable[[], Awaitable[None]],
+        *,
+        keep_running: Callable[[], bool] | None = None,
+    ) -> None:
+        """Repeat ``read_once`` and back off on connection failures."""
+        logging.info("Started websocket stream for %s", label)
         delay = self.RECONNECT_DELAY
         had_failure = False
-        while self.status:
+        while self.status and (keep_running is None or keep_running()):
             try:
-                await self.watch_symbol(symbol)
+                await read_once()
                 if not self.status:
                     break
                 if had_failure:
-                    logging.info("Recovered websocket stream for %s", symbol)
+                    logging.info("Recovered websocket stream for %s", label)
                     had_failure = False
                 delay = self.RECONNECT_DELAY
             except asyncio.CancelledError:
-                logging.info("Watcher cancelled for %s", symbol)
+                logging.info("Watcher cancelled for %s", label)
                 break
             except ccxtpro.NetworkError as e:
                 had_failure = True
                 delay = await self._wait_for_symbol_retry(
-                    symbol,
+                    label,
                     "network error",
                     e,
                     delay,
@@ -808,7 +1001,7 @@ class Watcher:
             except ccxtpro.ExchangeError as e:
                 had_failure = True
                 delay = await self._wait_for_symbol_retry(
-                    symbol,
+                    label,
                     "exchange error",
                     e,
                     delay,
@@ -816,7 +1009,7 @@ class Watcher:
             except asyncio.TimeoutError as e:
                 had_failure = True
                 delay = await self._wait_for_symbol_retry(
-                    symbol,
+                    label,
                     "timeout error",
                     e,
                     delay,
@@ -832,7 +1025,7 @@ class Watcher:
                 # Broad catch to keep reconnection loop alive.
                 had_failure = True
                 delay = await self._wait_for_symbol_retry(
-                    symbol,
+                    label,
                     "unexpected error",
                     e,
                     delay,
@@ -850,6 +1043,52 @@ class Watcher:
         ohlcvc = exchange.build_ohlcvc([trade], self.runtime_state.timeframe)
         await self.push_event(symbol, price, ohlcvc)
 
+    async def watch_symbol_batch(self, batch_index: int) -> None:
+        """Process one multiplexed websocket read cycle for a symbol batch."""
+        exchange = self.exchange
+        if exchange is None:
+            raise RuntimeError(
+                "No exchange has been configured yet. Please finalize your configuration."
+            )
+        symbols = self._symbol_batch(batch_index)
+        if not symbols:
+            return
+        requested = set(symbols)
+        timeframe = self.runtime_state.timeframe
+
+        try:
+            if self.runtime_state.exchange_watcher_ohlcv:
+                candles_by_symbol = await exchange.watch_ohlcv_for_symbols(
+                    [[symbol, timeframe] for symbol in symbols]
+                )
+            else:
+                trades = await exchange.watch_trades_for_symbols(symbols)
+        except ccxtpro.NotSupported as exc:
+            self._fall_back_to_symbol_watch(exc)
+            return
+        except ccxtpro.UnsubscribeError:
+            # A symbol left this batch mid-read; re-read with the new members.
+            return
+
+        if self.runtime_state.exchange_watcher_ohlcv:
+            for symbol, candles_by_timeframe in (candles_by_symbol or {}).items():
+                if symbol not in requested or not isinstance(
+                    candles_by_timeframe, dict
+                ):
+                    continue
+                ohlcv = candles_by_timeframe.get(timeframe)
+                if ohlcv:
+                    await self.__process_ohlcv_data(symbol, ohlcv)
+            return
+
+        latest_trades: dict[str, dict[str, Any]] = {}
+        for trade in trades or []:
+            symbol = trade.get("symbol")
+            if symbol in requested:
+                latest_trades[symbol] = trade
+        for symbol, trade in latest_trades.items():
+            await self.__process_trade_data(symbol, [trade], exchange)
+
     async def watch_symbol(self, symbol: str) -> None:
         """Process exactly one websocket read cycle for a symbol."""
         exchange = self.exchange
@@ -904,11 +1143,12 @@ class Watcher:
         """Keep at most one queued DCA job per symbol and overwrite stale payloads."""
         queue_dca_payload(
             payload,
-            queue=self.dca_queue,
+            queues=self.dca_queues,
             pending_payloads=self._pending_dca_payloads,
             queued_symbols=self._queued_dca_symbols,
             worker_tasks=self._worker_tasks,
             logger=logging,
+            metrics=self.dca_metrics,
         )
 
     def _queue_put(self, queue: asyncio.Queue, payload: Any, name: str) -> None:
@@ -920,11 +1160,12 @@ class Watcher:
             logger=logging,
         )
 
-    async def _process_dca_queue(self) -> None:
+    async def _process_dca_queue(self, shard: int = 0) -> None:
+        queue = self.dca_queues[shard]
         while self.status:
             symbol = None
             try:
-                symbol = await self.dca_queue.get()
+                symbol = await queue.get()
                 ticker_price = pop_pending_dca_payload(
                     symbol,
                     pending_payloads=self._pending_dca_payloads,
@@ -932,7 +1173,7 @@ class Watcher:
                 )
                 if ticker_price is None:
                     continue
-                await self.dca.process_ticker_data(ticker_price, self.config)
+                await self._run_dca_job(shard, symbol, ticker_price)
             except asyncio.CancelledError:
                 break
             except (RuntimeError, TypeError, ValueError, OSError) as e:
@@ -940,7 +1181,26 @@ class Watcher:
                 logging.error("Error processing DCA queue: %s", e, exc_info=True)
             finally:
                 if symbol is not None:
-                    self.dca_queue.task_done()
+                    queue.task_done()
+
+    async def _run_dca_job(
+        self, shard: int, symbol: str, ticker_price: dict[str, Any]
+    ) -> None:
+        """Process one symbol's latest tick and record its latency."""
+        wait = self.dca_metrics.start_job(shard, symbol)
+        started = time.perf_counter()
+        failed = True
+        try:
+            await self.dca.process_ticker_data(ticker_price, self.config)
+            failed = False
+        finally:
+            self.dca_metrics.finish_job(
+                shard,
+                symbol,
+                wait,
+                time.perf_counter() - started,
+                failed=failed,
+            )
 
     async def _process_ohlcv_queue(self) -> None:
         buffer = []
@@ -970,11 +1230,12 @@ class Watcher:
         payloads = list(buffer)
         buffer.clear()
         try:
-            rows = [model.Tickers(**payload) for payload in payloads]
-            await run_sqlite_write_with_retry(
-                lambda: model.Tickers.bulk_create(rows),
-                f"bulk write OHLCV batch ({len(rows)} rows)",
+            written = await write_ticker_rows(
+                payloads, "bulk write OHLCV batch", skip_duplicates=True
             )
+            candle_store = self.runtime_state.candle_store
+            if candle_store is not None and written:
+                candle_store.extend(written)
         except (RuntimeError, TypeError, ValueError) as e:
             # Broad catch prevents write failures from crashing the worker.
             logging.error("Error writing OHLCV batch: %s", e, exc_info=True)
@@ -3,9 +3,124 @@
 from __future__ import annotations
 
 import asyncio
+import time
+import zlib
+from dataclasses import dataclass, field
 from typing import Any
 
 
+@dataclass
+class DcaSymbolLatency:
+    """Queue wait and processing time of DCA jobs for one symbol."""
+
+    jobs: int = 0
+    errors: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    processing_seconds_total: float = 0.0
+    processing_seconds_max: float = 0.0
+    last_processing_seconds: float = 0.0
+
+    def record(self, wait: float, processing: float, *, failed: bool) -> None:
+        """Record one finished DCA job."""
+        self.jobs += 1
+        if failed:
+            self.errors += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        self.processing_seconds_total += processing
+        self.processing_seconds_max = max(self.processing_seconds_max, processing)
+        self.last_processing_seconds = processing
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the counters with mean wait and processing latency."""
+        jobs = self.jobs or 1
+        return {
+            "jobs": self.jobs,
+            "errors": self.errors,
+            "wait_seconds_avg": self.wait_seconds_total / jobs,
+            "wait_seconds_max": self.wait_seconds_max,
+            "processing_seconds_avg": self.processing_seconds_total / jobs,
+            "processing_seconds_max": self.processing_seconds_max,
+            "last_processing_seconds": self.last_processing_seconds,
+        }
+
+
+@dataclass
+class DcaQueueMetrics:
+    """Queue depth, coalescing, and per-symbol latency of the DCA worker pool.
+
+    Wait time runs from the first tick queued for a symbol to the moment a
+    worker picks the symbol up, so coalesced ticks do not reset it.
+    """
+
+    queues: list[asyncio.Queue[str]] = field(default_factory=list)
+    queued: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    symbols: dict[str, DcaSymbolLatency] = field(default_factory=dict)
+    in_flight: dict[int, str] = field(default_factory=dict)
+    _queued_at: dict[str, float] = field(default_factory=dict)
+
+    def record_queued(self, symbol: str) -> None:
+        """Record a symbol that entered a shard queue."""
+        self.queued += 1
+        self._queued_at[symbol] = time.perf_counter()
+
+    def record_coalesced(self) -> None:
+        """Record a tick that replaced an already queued payload."""
+        self.coalesced += 1
+
+    def record_dropped(self) -> None:
+        """Record a tick dropped because its shard queue was full."""
+        self.dropped += 1
+
+    def start_job(self, shard: int, symbol: str) -> float:
+        """Mark ``symbol`` as processing on ``shard`` and return its wait."""
+        self.in_flight[shard] = symbol
+        queued_at = self._queued_at.pop(symbol, None)
+        if queued_at is None:
+            return 0.0
+        return time.perf_counter() - queued_at
+
+    def finish_job(
+        self, shard: int, symbol: str, wait: float, processing: float, *, failed: bool
+    ) -> None:
+        """Record a finished job for ``symbol``."""
+        self.in_flight.pop(shard, None)
+        self.symbols.setdefault(symbol, DcaSymbolLatency()).record(
+            wait, processing, failed=failed
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return pool-wide counters, per-shard depth, and per-symbol latency."""
+        return {
+            "workers": len(self.queues),
+            "queued": self.queued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "shards": [
+                {
+                    "shard": index,
+                    "depth": queue.qsize(),
+                    "processing": self.in_flight.get(index),
+                }
+                for index, queue in enumerate(self.queues)
+            ],
+            "symbols": {
+                symbol: latency.to_dict()
+                for symbol, latency in sorted(self.symbols.items())
+            },
+        }
+
+
+def dca_shard_for_symbol(symbol: str, shard_count: int) -> int:
+    """Return the stable shard index that owns ``symbol``'s DCA jobs."""
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(symbol.encode("utf-8")) % shard_count
+
+
 def summarize_worker_tasks(worker_tasks: list[asyncio.Task]) -> str:
     """Return a compact summary of worker liveness for overflow logs."""
     return ", ".join(
@@ -17,13 +132,18 @@ def summarize_worker_tasks(worker_tasks: list[asyncio.Task]) -> str:
 def queue_dca_payload(
     payload: dict[str, Any],
     *,
-    queue: asyncio.Queue[str],
+    queues: list[asyncio.Queue[str]],
     pending_payloads: dict[str, dict[str, Any]],
     queued_symbols: set[str],
     worker_tasks: list[asyncio.Task],
     logger: Any,
+    metrics: DcaQueueMetrics | None = None,
 ) -> None:
-    """Keep only the newest queued DCA payload per symbol."""
+    """Keep only the newest queued DCA payload per symbol.
+
+    Each symbol always lands on the same shard queue, so one worker handles
+    its jobs in order while other shards keep processing other symbols.
+    """
     ticker = payload.get("ticker")
     symbol = ticker.get("symbol") if isinstance(ticker, dict) else None
     if not isinstance(symbol, str) or not symbol:
@@ -32,13 +152,20 @@ def queue_dca_payload(
 
     pending_payloads[symbol] = payload
     if symbol in queued_symbols:
+        if metrics is not None:
+            metrics.record_coalesced()
         return
 
+    queue = queues[dca_shard_for_symbol(symbol, len(queues))]
     try:
         queue.put_nowait(symbol)
         queued_symbols.add(symbol)
+        if metrics is not None:
+            metrics.record_queued(symbol)
     except asyncio.QueueFull:
         pending_payloads.pop(symbol, None)
+        if metrics is not None:
+            metrics.record_dropped()
         logger.warning(
             "dca queue full; dropping event for %s. qsize=%s workers=[%s]",
             symbol,
@@ -4,6 +4,9 @@ import asyncio
 from dataclasses import dataclass, field
 from typing import Any
 
+from service.candle_store import CandleStore
+from service.watcher_queue import DcaQueueMetrics
+
 
 @dataclass
 class WatcherRuntimeState:
@@ -16,6 +19,8 @@ class WatcherRuntimeState:
     timeframe: str = "1m"
     symbol_update_event: asyncio.Event = field(default_factory=asyncio.Event)
     exchange_watcher_ohlcv: bool = True
+    candle_store: CandleStore | None = None
+    dca_metrics: DcaQueueMetrics | None = None
 
     def get_live_candle(self, symbol: str) -> list[Any] | None:
         """Return a copy of the current in-memory candle for a symbol."""
@@ -55,6 +60,11 @@ def get_live_candle_snapshot(symbol: str) -> list[Any] | None:
     return get_active_runtime_state().get_live_candle(symbol)
 
 
+def get_active_candle_store() -> CandleStore | None:
+    """Return the watcher-fed candle store when a watcher owns the runtime."""
+    return get_active_runtime_state().candle_store
+
+
 def get_mandatory_symbols(config: dict[str, Any]) -> set[str]:
     """Return symbols that must always be watched regardless of plugin queues."""
     if not config.get("btc_pulse", False):
@@ -0,0 +1,175 @@
+"""Versioned snapshot/patch encoding for JSON WebSocket streams.
+
+Clients opt in with ``?protocol=delta``. Each connection first receives a
+snapshot and afterwards only the differences to what it was last sent:
+
+* ``{"type": "snapshot", "protocol": 1, "version": n, "data": ...}``, plus
+  ``keys`` with the row identifiers when ``data`` is a keyed list.
+* ``{"type": "patch", "version": n, "base_version": n - 1, ...}`` where list
+  payloads carry ``upsert``/``update``/``unset``/``remove``/``order`` keyed by a
+  row identifier and object payloads carry top-level ``update``/``unset``.
+* ``{"type": "heartbeat", "version": n}`` when nothing changed.
+
+A client whose version does not match ``base_version`` sends
+``{"type": "resync"}`` and receives a fresh snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+DELTA_PROTOCOL = "delta"
+DELTA_PROTOCOL_VERSION = 1
+RESYNC_REQUEST_TYPE = "resync"
+
+
+def is_resync_request(message: str | None) -> bool:
+    """Return whether a client message asks for a fresh snapshot."""
+    if not message:
+        return False
+    try:
+        decoded = json.loads(message)
+    except ValueError:
+        return message.strip() == RESYNC_REQUEST_TYPE
+    return isinstance(decoded, dict) and decoded.get("type") == RESYNC_REQUEST_TYPE
+
+
+class DeltaSession:
+    """Encode one connection's stream as snapshots and patches.
+
+    ``key_fields`` name the row fields tried in order to identify list rows.
+    Lists whose rows cannot be keyed uniquely are always sent as snapshots.
+    """
+
+    def __init__(self, key_fields: tuple[str, ...] = ()) -> None:
+        self._key_fields = key_fields
+        self._version = 0
+        self._state: Any = None
+        self._synced = False
+
+    @property
+    def version(self) -> int:
+        """Return the version of the last encoded message."""
+        return self._version
+
+    def request_resync(self) -> None:
+        """Send a full snapshot with the next encoded payload."""
+        self._synced = False
+
+    def encode(self, payload: str) -> str:
+        """Return the message bringing the client from its state to ``payload``."""
+        data = json.loads(payload)
+        message: dict[str, Any] | None = None
+        if self._synced:
+            if isinstance(data, list) and isinstance(self._state, list):
+                message = self._list_patch(self._state, data)
+            elif isinstance(data, dict) and isinstance(self._state, dict):
+                message = _object_patch(self._state, data)
+
+        if message is None:
+            return self._snapshot(data, payload)
+        if not message:
+            return json.dumps({"type": "heartbeat", "version": self._version})
+
+        self._version += 1
+        encoded = json.dumps(
+            {
+                "type": "patch",
+                "version": self._version,
+                "base_version": self._version - 1,
+                **message,
+            },
+            default=str,
+        )
+        if len(encoded) >= len(payload):
+            # Patches larger than the payload are not worth applying.
+            self._version -= 1
+            return self._snapshot(data, payload)
+        self._state = data
+        return encoded
+
+    def _snapshot(self, data: Any, payload: str) -> str:
+        self._version += 1
+        self._state = data
+        self._synced = True
+        keys = ""
+        if isinstance(data, list):
+            keyed_rows = self._keyed_rows(data)
+            if keyed_rows is not None:
+                keys = f', "keys": {json.dumps(list(keyed_rows))}'
+        # Embed the already serialized payload instead of encoding it again.
+        return (
+            f'{{"type": "snapshot", "protocol": {DELTA_PROTOCOL_VERSION}, '
+            f'"version": {self._version}{keys}, "data": {payload}}}'
+        )
+
+    def _row_key(self, row: Any) -> str | None:
+        if not isinstance(row, dict):
+            return None
+        for field in self._key_fields:
+            value = row.get(field)
+            if value is not None and value != "":
+                return str(value)
+        return None
+
+    def _keyed_rows(self, rows: list[Any]) -> dict[str, dict[str, Any]] | None:
+        keyed: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            key = self._row_key(row)
+            if key is None or key in keyed:
+                return None
+            keyed[key] = row
+        return keyed
+
+    def _list_patch(
+        self, previous: list[Any], current: list[Any]
+    ) -> dict[str, Any] | None:
+        previous_rows = self._keyed_rows(previous)
+        current_rows = self._keyed_rows(current)
+        if previous_rows is None or current_rows is None:
+            return None
+
+        patch: dict[str, Any] = {}
+        upsert: dict[str, Any] = {}
+        update: dict[str, Any] = {}
+        unset: dict[str, list[str]] = {}
+        for key, row in current_rows.items():
+            old_row = previous_rows.get(key)
+            if old_row is None:
+                upsert[key] = row
+                continue
+            row_patch = _object_patch(old_row, row)
+            if "update" in row_patch:
+                update[key] = row_patch["update"]
+            if "unset" in row_patch:
+                unset[key] = row_patch["unset"]
+        remove = [key for key in previous_rows if key not in current_rows]
+
+        for name, section in (
+            ("upsert", upsert),
+            ("update", update),
+            ("unset", unset),
+            ("remove", remove),
+        ):
+            if section:
+                patch[name] = section
+        if list(previous_rows) != list(current_rows):
+            patch["order"] = list(current_rows)
+        return patch
+
+
+def _object_patch(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """Return top-level field changes between two JSON objects."""
+    patch: dict[str, Any] = {}
+    update = {
+        field: value
+        for field, value in current.items()
+        if field not in previous or previous[field] != value
+    }
+    unset = [field for field in previous if field not in current]
+    if update:
+        patch["update"] = update
+    if unset:
+        patch["unset"] = unset
+    return patch
@@ -1,6 +1,7 @@
 """Shared fan-out helper for periodic WebSocket payload streaming."""
 
 import asyncio
+import hashlib
 from collections.abc import AsyncGenerator, Awaitable, Callable
 from typing import Any, cast
 
@@ -12,7 +13,10 @@ class WebSocketFanout:
 
     The producer is executed once per interval and the latest payload is fanned out
     to all active subscribers. New subscribers receive the latest payload
-    immediately when available.
+    immediately when available. ``notify()`` wakes the producer early so
+    change-driven streams can use a long safety interval. Payloads produced for
+    a notification are skipped when identical to the previous broadcast; the
+    interval broadcast is always sent and doubles as a client keepalive.
     """
 
     def __init__(
@@ -22,15 +26,19 @@ class WebSocketFanout:
         interval_seconds: float,
         producer: Callable[[], Awaitable[str]],
         logger: Any,
+        min_interval_seconds: float = 0.0,
     ) -> None:
         self._name = name
         self._interval_seconds = interval_seconds
+        self._min_interval_seconds = min_interval_seconds
         self._producer = producer
         self._logger = logger
         self._task: asyncio.Task[None] | None = None
         self._subscribers: set[asyncio.Queue[str | object]] = set()
         self._latest_payload: str | None = None
+        self._latest_digest: bytes | None = None
         self._has_subscribers = asyncio.Event()
+        self._wake = asyncio.Event()
         self._lock = asyncio.Lock()
 
     async def start(self) -> None:
@@ -40,6 +48,7 @@ class WebSocketFanout:
             if self._task is not None and self._task.get_loop() is not running_loop:
                 self._task = None
             if self._task is None or self._task.done():
+                self._wake = asyncio.Event()
                 self._task = asyncio.create_task(
                     self._run(), name=f"ws-fanout:{self._name}"
                 )
@@ -55,6 +64,7 @@ class WebSocketFanout:
             subscribers = tuple(self._subscribers)
             self._subscribers.clear()
             self._latest_payload = None
+            self._latest_digest = None
             self._has_subscribers.clear()
 
         for subscriber in subscribers:
@@ -77,6 +87,8 @@ class WebSocketFanout:
 
         if latest_payload is not None:
             self._queue_signal(queue, latest_payload)
+        else:
+            self.notify()
 
         try:
             while True:
@@ -89,16 +101,23 @@ class WebSocketFanout:
                 self._subscribers.discard(queue)
                 if not self._subscribers:
                     self._latest_payload = None
+                    self._latest_digest = None
                     self._has_subscribers.clear()
 
+    def notify(self) -> None:
+        """Request a fresh payload before the polling interval elapses."""
+        self._wake.set()
+
     async def _run(self) -> None:
         """Run producer loop and broadcast payloads while service is active."""
+        notified = False
         while True:
             try:
                 await self._has_subscribers.wait()
+                self._wake.clear()
                 payload = await self._producer()
-                await self._broadcast(payload)
-                await asyncio.sleep(self._interval_seconds)
+                await self._broadcast(payload, skip_unchanged=notified)
+                notified = await self._wait_for_next_cycle()
             except asyncio.CancelledError:
                 return
             except Exception as exc:  # noqa: BLE001 - Keep broadcaster resilient.
@@ -110,11 +129,33 @@ class WebSocketFanout:
                 )
                 await asyncio.sleep(self._interval_seconds)
 
-    async def _broadcast(self, payload: str) -> None:
+    async def _wait_for_next_cycle(self) -> bool:
+        """Sleep until the interval elapses or a change notification arrives.
+
+        Returns whether the next cycle was triggered by ``notify()``.
+        """
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=self._interval_seconds)
+        except TimeoutError:
+            return False
+        if self._min_interval_seconds > 0:
+            # Coalesce notification bursts into one producer run.
+            await asyncio.sleep(self._min_interval_seconds)
+        return True
+
+    async def _broadcast(self, payload: str, *, skip_unchanged: bool = False) -> None:
         """Broadcast payload to current subscribers."""
         subscribers: tuple[asyncio.Queue[str | object], ...]
+        digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
         async with self._lock:
+            if (
+                skip_unchanged
+                and digest == self._latest_digest
+                and self._latest_payload is not None
+            ):
+                return
             self._latest_payload = payload
+            self._latest_digest = digest
             subscribers = tuple(self._subscribers)
 
         for subscriber in subscribers:
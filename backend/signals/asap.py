@@ -1,6 +1,7 @@
 """ASAP signal plugin implementation."""
 
 import asyncio
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
@@ -10,6 +11,10 @@ from service.autopilot import Autopilot
 from service.config import resolve_history_lookback_days
 from service.data import Data
 from service.filter import Filter
+from service.history_backfill import (
+    BACKFILL_PRIORITY_SIGNAL,
+    get_history_backfill_scheduler,
+)
 from service.indicators import Indicators
 from service.orders import Orders
 from service.signal_runtime import (
@@ -21,6 +26,7 @@ from service.signal_runtime import (
     resolve_max_bots_log_interval,
     resolve_signal_admission_batch,
     resolve_signal_entry_orders,
+    resolve_signal_scan_concurrency,
     update_waiting_log_state,
 )
 from service.spot_sidestep_campaign import SpotSidestepCampaignService
@@ -78,6 +84,8 @@ class SignalPlugin:
         self._signal_strategy_plugin: Any | None = None
         self._required_history_days = 0
         self._required_history_candles = 0
+        self._scan_concurrency = 1
+        self._scan_btc_pulse: bool | None = None
 
     async def __prepare_runtime_settings(self) -> None:
         """Cache parsed runtime settings and strategy instance for hot loops."""
@@ -87,6 +95,7 @@ class SignalPlugin:
         self._volume = runtime.volume
         self._strategy_timeframe = runtime.strategy_timeframe
         self._signal_strategy_plugin = None
+        self._scan_concurrency = resolve_signal_scan_concurrency(self.config)
         configured_history_days = resolve_history_lookback_days(
             self.config,
             timeframe=self._strategy_timeframe,
@@ -204,6 +213,35 @@ class SignalPlugin:
             )
         return pairs
 
+    async def __ensure_symbol_history(
+        self,
+        symbol: str,
+        strategy_timeframe: str,
+        required_history_days: int,
+        required_candles: int,
+    ) -> bool:
+        """Backfill one symbol if needed; return True when its history is ready."""
+        if await self.data.has_sufficient_resampled_history(
+            symbol,
+            strategy_timeframe,
+            required_candles,
+        ):
+            return True
+        if not await get_history_backfill_scheduler().submit(
+            symbol,
+            required_history_days,
+            self.config,
+            priority=BACKFILL_PRIORITY_SIGNAL,
+            success_timeframe=strategy_timeframe,
+            success_minimum_candles=required_candles,
+        ):
+            logging.error(
+                "Not trading %s because history add failed. Please check data.log.",
+                symbol,
+            )
+            return False
+        return await self.__has_sufficient_strategy_history(symbol)
+
     @helper.async_ttl_cache(maxsize=1024, ttl=900)
     async def __get_new_symbol_list(
         self,
@@ -261,36 +299,30 @@ class SignalPlugin:
         history_blocked_symbols: list[str] = []
         required_candles = max(1, required_history_candles)
 
-        # Add history data for indicators
+        # Add history data for indicators; the backfill scheduler pages
+        # several symbols at once.
+        candidate_symbols: list[str] = []
         for symbol in symbol_list:
             if symbol in running_symbols:
                 already_running_symbols.append(symbol)
-                continue
-
-            if not await self.data.has_sufficient_resampled_history(
-                symbol,
-                strategy_timeframe,
-                required_candles,
-            ):
-                if not await self.data.add_history_data_for_symbol(
+            else:
+                candidate_symbols.append(symbol)
+        history_ready = await asyncio.gather(
+            *(
+                self.__ensure_symbol_history(
                     symbol,
+                    strategy_timeframe,
                     required_history_days,
-                    self.config,
-                    success_timeframe=strategy_timeframe,
-                    success_minimum_candles=required_candles,
-                ):
-                    logging.error(
-                        "Not trading %s because history add failed. Please check "
-                        "data.log.",
-                        symbol,
-                    )
-                    history_blocked_symbols.append(symbol)
-                    continue
-                if not await self.__has_sufficient_strategy_history(symbol):
-                    history_blocked_symbols.append(symbol)
-                    continue
-
-            eligible_symbols.append(symbol)
+                    required_candles,
+                )
+                for symbol in candidate_symbols
+            )
+        )
+        for symbol, ready in zip(candidate_symbols, history_ready):
+            if ready:
+                eligible_symbols.append(symbol)
+            else:
+                history_blocked_symbols.append(symbol)
 
         logging.debug("Running symbols: %s", running_symbols)
         logging.debug("New symbols: %s", eligible_symbols)
@@ -364,10 +396,13 @@ class SignalPlugin:
         try:
             # btc pulse check
             if self.config.get("btc_pulse", False):
-                if not await self.indicators.calculate_btc_pulse(
-                    self.config.get("currency", "USDC"),
-                    self._strategy_timeframe,
-                ):
+                btc_pulse = self._scan_btc_pulse
+                if btc_pulse is None:
+                    btc_pulse = await self.indicators.calculate_btc_pulse(
+                        self.config.get("currency", "USDC"),
+                        self._strategy_timeframe,
+                    )
+                if not btc_pulse:
                     logging.debug(
                         "Not starting trade for %s, because BTC-Pulse indicates "
                         "downtrend",
@@ -450,6 +485,54 @@ class SignalPlugin:
             )
             return False
 
+    async def __record_long_signal(self, symbol: str) -> None:
+        """Record a passing entry check for sidestep re-entry gating."""
+        sidestep_campaigns = await SpotSidestepCampaignService.instance()
+        await sidestep_campaigns.record_long_signal(
+            symbol,
+            signal_name="asap",
+            strategy_name=(str(self.config.get("signal_strategy") or "") or None),
+            timeframe=self._strategy_timeframe,
+            metadata_json=None,
+            source="asap",
+        )
+
+    async def __scan_entry_points(self, symbols: Sequence[str]) -> list[str]:
+        """Check symbols concurrently and return the passing ones in list order.
+
+        The BTC pulse is the same for every symbol, so it is evaluated once per
+        scan. The semaphore bounds concurrent candle reads and strategy runs,
+        and exchange calls stay under the ccxt client's own rate limiter.
+        """
+        if self.config.get("btc_pulse", False):
+            self._scan_btc_pulse = await self.indicators.calculate_btc_pulse(
+                self.config.get("currency", "USDC"),
+                self._strategy_timeframe,
+            )
+            if not self._scan_btc_pulse:
+                self._scan_btc_pulse = None
+                logging.debug(
+                    "Not starting trades for %s symbol(s), because BTC-Pulse "
+                    "indicates downtrend",
+                    len(symbols),
+                )
+                return []
+
+        semaphore = asyncio.Semaphore(self._scan_concurrency)
+
+        async def check(symbol: str) -> bool:
+            async with semaphore:
+                signal = await self.__check_entry_point(symbol)
+            if signal:
+                await self.__record_long_signal(symbol)
+            return bool(signal)
+
+        try:
+            results = await asyncio.gather(*(check(symbol) for symbol in symbols))
+        finally:
+            self._scan_btc_pulse = None
+        return [symbol for symbol, signal in zip(symbols, results) if signal]
+
     async def run(self, config: dict[str, Any]) -> None:
         """Main execution loop for the ASAP signal plugin.
 
@@ -479,27 +562,9 @@ class SignalPlugin:
                     self._required_history_candles,
                 )
                 if symbol_selection.symbols:
-                    candidate_symbols: list[str] = []
-                    for symbol in symbol_selection.symbols:
-                        signal = await self.__check_entry_point(symbol)
-                        # Slow down on many symbols at once
-                        await asyncio.sleep(1)
-                        if signal:
-                            sidestep_campaigns = (
-                                await SpotSidestepCampaignService.instance()
-                            )
-                            await sidestep_campaigns.record_long_signal(
-                                symbol,
-                                signal_name="asap",
-                                strategy_name=(
-                                    str(self.config.get("signal_strategy") or "")
-                                    or None
-                                ),
-                                timeframe=self._strategy_timeframe,
-                                metadata_json=None,
-                                source="asap",
-                            )
-                            candidate_symbols.append(symbol)
+                    candidate_symbols = await self.__scan_entry_points(
+                        symbol_selection.symbols
+                    )
 
                     admission_batch = await resolve_signal_admission_batch(
                         self.config,
@@ -514,6 +579,7 @@ class SignalPlugin:
                         and not admission_batch.admitted_symbols
                     ):
                         self.__log_max_bots_waiting()
+                        await asyncio.sleep(5)
                         continue
 
                     if admission_batch.admitted_symbols:
@@ -560,7 +626,6 @@ class SignalPlugin:
                                 await self.orders.receive_buy_order(order, self.config)
                             finally:
                                 await admission_batch.release_symbol(symbol)
-                            await asyncio.sleep(1)
                     finally:
                         await admission_batch.release()
             else:
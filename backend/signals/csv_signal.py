@@ -9,7 +9,10 @@ import helper
 import model
 from service.config import resolve_history_lookback_days, resolve_timeframe
 from service.csv_signal_import import CSVSignalImportService
-from service.data import Data
+from service.history_backfill import (
+    BACKFILL_PRIORITY_SIGNAL,
+    get_history_backfill_scheduler,
+)
 from service.signal_runtime import parse_signal_settings
 
 logging = helper.LoggerFactory.get_logger("logs/signal.log", "csv_signal")
@@ -26,7 +29,6 @@ class SignalPlugin:
         self.status = True
         self.watcher_queue = watcher_queue
         self.import_service = CSVSignalImportService()
-        self.data = Data(persist_exchange=True)
         self._import_finished = False
 
     async def _load_csv_content(self, source: str) -> str:
@@ -127,10 +129,11 @@ class SignalPlugin:
                 first_timestamp,
                 resolve_timeframe(self.config),
             )
-            success = await self.data.add_history_data_for_symbol(
-                symbol=symbol,
-                history_data=history_data,
-                config=self.config,
+            success = await get_history_backfill_scheduler().submit(
+                symbol,
+                history_data,
+                self.config,
+                priority=BACKFILL_PRIORITY_SIGNAL,
                 since_ms=since_ms,
             )
             if not success:
@@ -175,4 +178,3 @@ class SignalPlugin:
     async def shutdown(self) -> None:
         """Signal plugin loop to stop."""
         self.status = False
-        await self.data.close()
@@ -9,6 +9,10 @@ from service.autopilot import Autopilot
 from service.config import resolve_history_lookback_days
 from service.data import Data
 from service.filter import Filter
+from service.history_backfill import (
+    BACKFILL_PRIORITY_SIGNAL,
+    get_history_backfill_scheduler,
+)
 from service.indicators import Indicators
 from service.orders import Orders
 from service.signal_runtime import (
@@ -439,10 +443,11 @@ class SignalPlugin:
                 self.config.get("trade_mode") == "dynamic_dca"
                 or self._required_history_candles > 0
             ):
-                success = await self.data.add_history_data_for_symbol(
+                success = await get_history_backfill_scheduler().submit(
                     symbol_full,
                     history_data,
                     self.config,
+                    priority=BACKFILL_PRIORITY_SIGNAL,
                     success_timeframe=self._strategy_timeframe,
                     success_minimum_candles=self._required_history_candles,
                 )
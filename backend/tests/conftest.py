@@ -1,8 +1,26 @@
 import os
 import sys
 
+import pytest
+
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
 os.makedirs(os.path.join(os.getcwd(), "logs"), exist_ok=True)
+
+from service.analytics import get_analytics_state  # noqa: E402
+from service.exchange_client_manager import reset_exchange_client_pool  # noqa: E402
+from service.history_backfill import reset_history_backfill_scheduler  # noqa: E402
+from service.open_positions import get_open_position_cache  # noqa: E402
+from service.profit_ledger import get_closed_profit_ledger  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_trade_state_caches() -> None:
+    """Keep cached trade state from leaking between test databases."""
+    get_open_position_cache().invalidate()
+    get_closed_profit_ledger().invalidate()
+    get_analytics_state().invalidate()
+    reset_exchange_client_pool()
+    reset_history_backfill_scheduler()
@@ -1,11 +1,18 @@
 """Test coverage for Analytics.get_overview() (T7)."""
 
 import os
+import time
 from datetime import UTC, datetime, timedelta
 
 import model
 import pytest
-from service.analytics import Analytics
+from service.analytics import (
+    ANALYTICS_TRADE_FIELDS,
+    Analytics,
+    AnalyticsAccumulator,
+    compute_stats_from_trades,
+)
+from service.order_persistence import persist_closed_trade_summary
 from tortoise import Tortoise
 
 
@@ -356,3 +363,87 @@ async def test_oversview_empty_returns_safe_defaults(analytics) -> None:
     assert result["summary"]["total_trades"] == 0
     assert result["heatmap_daily"] == []
     assert result["duration_extremes"] == {"longest": [], "shortest": []}
+
+
+@pytest.mark.asyncio
+async def test_overview_folds_new_closes_without_requery(
+    tmp_path, monkeypatch, analytics
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+
+    now = datetime.now(UTC)
+    rows = [
+        {
+            "symbol": symbol,
+            "deal_id": f"deal-{index}",
+            "profit": profit,
+            "profit_percent": profit * 2,
+            "cost": 50.0,
+            "open_date": (now - timedelta(hours=hours + 1)).isoformat(),
+            "close_date": (now - timedelta(hours=hours)).isoformat(),
+            "duration": None,
+        }
+        for index, (symbol, profit, hours) in enumerate(
+            [
+                ("BTC/USDT", 5.0, 30),
+                ("ETH/USDT", -4.0, 20),
+                ("BTC/USDT", 0.0, 10),
+                # Closed out of order: the drawdown path must be replayed.
+                ("SOL/USDT", -3.0, 25),
+            ]
+        )
+    ]
+    await model.ClosedTrades.create(**rows[0])
+    assert (await analytics.get_overview())["summary"]["total_trades"] == 1
+
+    def fail_requery(**_kwargs):
+        raise AssertionError("overview should not re-read closed trades")
+
+    monkeypatch.setattr(model.ClosedTrades, "filter", fail_requery)
+    for row in rows[1:]:
+        await persist_closed_trade_summary(dict(row))
+    result = await analytics.get_overview()
+    monkeypatch.undo()
+
+    assert result == compute_stats_from_trades(rows)
+    assert result["drawdown"]["max_drawdown"] == pytest.approx(7.0)
+    assert result == await analytics.get_overview(rebuild=True)
+
+    await Tortoise.close_connections()
+
+
+def test_columnar_rebuild_handles_100k_trades_quickly() -> None:
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    rows = []
+    for index in range(100_000):
+        opened = base + timedelta(minutes=7 * index)
+        # Close dates are out of id order, which used to force a replay per row.
+        closed = opened + timedelta(minutes=5 + (index * 7919) % 5000)
+        profit = ((index * 37) % 101 - 50) / 10
+        rows.append(
+            (
+                f"S{index % 300}/USDT",
+                str(index),
+                profit,
+                profit / 2,
+                100.0,
+                opened.isoformat(sep=" "),
+                closed.isoformat(sep=" "),
+                None,
+            )
+        )
+    columns = dict(zip(ANALYTICS_TRADE_FIELDS, zip(*rows)))
+
+    started = time.perf_counter()
+    result = AnalyticsAccumulator.from_columns(columns).snapshot()
+    elapsed = time.perf_counter() - started
+
+    assert result["summary"]["total_trades"] == 100_000
+    assert len(result["per_symbol"]) == 300
+    assert result["drawdown"]["max_drawdown"] > 0
+    assert sum(entry["value"] for entry in result["heatmap_daily"]) == 100_000
+    # Generous bound for slow CI hosts; typical runs take a fraction of this.
+    assert elapsed < 3.0
@@ -2,6 +2,7 @@ import asyncio
 
 import app as app_module
 import pytest
+from service.startup_report import get_startup_report
 
 
 class _FakeConfig:
@@ -23,6 +24,9 @@ class _FakeDatabase:
     async def backfill_trade_replay_candles_if_needed(self) -> None:
         await asyncio.sleep(3600)
 
+    async def backfill_ticker_epoch_timestamps_if_needed(self) -> None:
+        await asyncio.sleep(3600)
+
     async def shutdown(self) -> None:
         return None
 
@@ -109,10 +113,7 @@ async def _noop_async(*_args, **_kwargs) -> None:
     return None
 
 
-@pytest.mark.asyncio
-async def test_startup_schedules_replay_backfill_as_background_task(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
+def _patch_runtime(monkeypatch: pytest.MonkeyPatch) -> _FakeDatabase:
     fake_database = _FakeDatabase()
     monkeypatch.setattr(app_module, "runtime_state", app_module.RuntimeState())
     monkeypatch.setattr(app_module, "start_redis", lambda: object())
@@ -154,12 +155,61 @@ async def test_startup_schedules_replay_backfill_as_background_task(
         "stop_websocket_fanout",
         _noop_async,
     )
+    return fake_database
+
+
+@pytest.mark.asyncio
+async def test_startup_schedules_replay_backfill_as_background_task(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_database = _patch_runtime(monkeypatch)
 
     await app_module.startup()
     await asyncio.sleep(0)
 
-    assert len(app_module.runtime_state.background_tasks) == 4
+    assert len(app_module.runtime_state.background_tasks) == 6
     assert "backfill_trade_replay_candles_if_needed" in fake_database.run_calls
+    assert "backfill_ticker_epoch_timestamps_if_needed" in fake_database.run_calls
     assert not hasattr(app_module.runtime_state, "sidestep_campaign_service")
 
     await app_module.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_startup_serves_before_background_warmup_finishes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _patch_runtime(monkeypatch)
+    release = asyncio.Event()
+
+    class _SlowAutopilotMemoryFactory:
+        @staticmethod
+        async def instance() -> _FakeAutopilotMemoryService:
+            await release.wait()
+            return _FakeAutopilotMemoryService()
+
+    monkeypatch.setattr(
+        app_module, "AutopilotMemoryService", _SlowAutopilotMemoryFactory
+    )
+
+    await app_module.startup()
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    report = get_startup_report().to_dict()
+    phases = {phase["name"]: phase for phase in report["phases"]}
+    assert report["serving_after_seconds"] is not None
+    assert report["warm_after_seconds"] is None
+    assert phases["database"]["status"] == "completed"
+    assert phases["autopilot_memory"]["status"] == "running"
+    assert phases["autopilot_memory"]["background"] is True
+
+    release.set()
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    report = get_startup_report().to_dict()
+    assert report["warm_after_seconds"] is not None
+    assert app_module.runtime_state.autopilot_memory_service is not None
+
+    await app_module.shutdown()
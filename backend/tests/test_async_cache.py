@@ -0,0 +1,99 @@
+import asyncio
+
+import helper
+import pytest
+from helper.async_cache import async_cache_stats
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call() -> None:
+    calls: list[int] = []
+    release = asyncio.Event()
+
+    @helper.async_ttl_cache(maxsize=4, ttl=60)
+    async def produce(value: int) -> int:
+        calls.append(value)
+        await release.wait()
+        return value * 2
+
+    waiters = [asyncio.create_task(produce(3)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [6] * 5
+    assert await produce(3) == 6
+    assert calls == [3]
+    stats = produce.cache_stats()  # type: ignore[attr-defined]
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+    assert stats["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_during_one_refresh(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(helper.async_cache.time, "monotonic", lambda: now[0])
+    counter = [0]
+    release = asyncio.Event()
+
+    @helper.async_ttl_cache(maxsize=1, ttl=2, stale_ttl=10)
+    async def produce() -> int:
+        counter[0] += 1
+        if counter[0] > 1:
+            await release.wait()
+        return counter[0]
+
+    assert await produce() == 1
+    now[0] += 3
+
+    assert [await produce() for _ in range(3)] == [1, 1, 1]
+    await asyncio.sleep(0)
+    assert counter[0] == 2
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert await produce() == 2
+    assert produce.cache_stats()["stale_hits"] == 3  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter_and_are_not_cached() -> None:
+    calls = [0]
+
+    @helper.async_ttl_cache(maxsize=1, ttl=60)
+    async def produce() -> int:
+        calls[0] += 1
+        await asyncio.sleep(0)
+        if calls[0] == 1:
+            raise RuntimeError("boom")
+        return 7
+
+    results = await asyncio.gather(produce(), produce(), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await produce() == 7
+    assert produce.cache_stats()["refresh_errors"] == 1  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_cache_clear_discards_inflight_result() -> None:
+    values = iter([1, 2])
+    release = asyncio.Event()
+
+    @helper.async_ttl_cache(maxsize=1, ttl=60)
+    async def produce() -> int:
+        value = next(values)
+        if value == 1:
+            await release.wait()
+        return value
+
+    pending = asyncio.create_task(produce())
+    await asyncio.sleep(0)
+    await produce.cache_clear()  # type: ignore[attr-defined]
+    release.set()
+
+    assert await pending == 1
+    assert await produce() == 2
+    assert any(name.endswith("produce") for name in async_cache_stats())
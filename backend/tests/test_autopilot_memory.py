@@ -182,6 +182,61 @@ async def test_autopilot_memory_fresh_snapshot_applies_adaptive_tp(
     await Tortoise.close_connections()
 
 
+@pytest.mark.asyncio
+async def test_autopilot_memory_refresh_only_rewrites_symbols_with_new_closes(
+    tmp_path,
+    monkeypatch,
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+
+    now = datetime.now(timezone.utc)
+
+    async def close_trade(symbol: str, hours_ago: int, profit: float):
+        return await model.ClosedTrades.create(
+            symbol=symbol,
+            profit=profit,
+            profit_percent=profit,
+            open_date=_utc_iso(now - timedelta(hours=hours_ago + 2)),
+            close_date=_utc_iso(now - timedelta(hours=hours_ago)),
+            duration="2:00:00",
+        )
+
+    first_btc = await close_trade("BTC/USDT", 5, 1.0)
+    await close_trade("BTC/USDT", 3, 1.2)
+    await close_trade("SOL/USDT", 4, 0.8)
+
+    service = AutopilotMemoryService()
+    service.on_config_change(_config())
+    await service.refresh_state()
+    row_ids = dict(await model.AutopilotSymbolMemory.all().values_list("symbol", "id"))
+
+    await service.refresh_state()
+    await close_trade("ETH/USDT", 1, -0.5)
+    await service.refresh_state()
+
+    rows = dict(await model.AutopilotSymbolMemory.all().values_list("symbol", "id"))
+    assert rows["BTC/USDT"] == row_ids["BTC/USDT"]
+    assert rows["SOL/USDT"] == row_ids["SOL/USDT"]
+    assert "ETH/USDT" in rows
+    assert service.get_state()["current_closes"] == 4
+
+    full_reload = AutopilotMemoryService()
+    full_reload.on_config_change(_config())
+    await full_reload.refresh_state()
+    assert full_reload._snapshots == service._snapshots
+
+    await first_btc.delete()
+    await service.refresh_state()
+
+    assert service._snapshot_map["BTC/USDT"].sample_size == 1
+    assert service.get_state()["current_closes"] == 3
+
+    await Tortoise.close_connections()
+
+
 def test_autopilot_memory_entry_sizing_stays_on_baseline_when_disabled() -> None:
     service = AutopilotMemoryService()
     service._state = {
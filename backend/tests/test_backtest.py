@@ -7,6 +7,7 @@ from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import pytest
 from controller import backtest as backtest_controller
@@ -18,6 +19,7 @@ from service.analytics import compute_stats_from_trades
 from service.backtest import (
     TRADE_MODE_SIDESTEP,
     Backtest,
+    BacktestData,
     BacktestValidationError,
     DcaSimulator,
     OhlcvCandle,
@@ -27,6 +29,7 @@ from service.backtest import (
 )
 from service.dca_math import BacktestTradeState
 from service.exchange import Exchange
+from service.indicators import Indicators
 from service.strategy_builder import BUILTIN_STRATEGY_BY_SLUG, build_builtin_ir
 from service.strategy_runtime import EvaluationContext
 
@@ -163,6 +166,27 @@ class _BollingerGraphIndicators:
         }
 
 
+def _random_walk_candles(count: int) -> list[OhlcvCandle]:
+    closes = 100.0 + np.cumsum(np.random.default_rng(3).normal(0.0, 0.3, count))
+    return [
+        OhlcvCandle(
+            1_700_000_000_000 + index * 60_000,
+            float(close),
+            float(close) + 0.5,
+            float(close) - 0.5,
+            float(close),
+            10.0,
+        )
+        for index, close in enumerate(closes)
+    ]
+
+
+async def _builtin_snapshot(slug: str) -> Any:
+    return SimpleNamespace(
+        ir=build_builtin_ir(BUILTIN_STRATEGY_BY_SLUG[slug]), version=1
+    )
+
+
 def _json(response: Any) -> dict[str, Any]:
     return json.loads(response.content)
 
@@ -930,3 +954,77 @@ async def test_batched_history_paces_pages_and_dedupes(
 
     assert [int(c[0]) for c in candles] == [0, 60_000, 120_000]
     assert sleeps == [0.25]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("slug", ["ema_down", "ema_low", "bollinger_buy"])
+async def test_compiled_signal_mask_matches_per_candle_evaluation(
+    monkeypatch: pytest.MonkeyPatch,
+    slug: str,
+) -> None:
+    candles = _random_walk_candles(300)
+    indicators = Indicators(data=BacktestData(candles_to_dataframe(candles), "1m"))
+    monkeypatch.setattr(strategy_runtime, "_load_strategy_snapshot", _builtin_snapshot)
+
+    mask = await strategy_runtime.compile_strategy_signal_mask(
+        slug, "1m", "BTC/USDT", "buy", indicators, len(candles)
+    )
+
+    assert mask is not None
+    for index in range(len(candles)):
+        result = await strategy_runtime.evaluate_strategy_graph(
+            slug, "1m", "BTC/USDT", "buy", indicators, candle_index=index
+        )
+        assert result.matched == mask[index], index
+
+
+@pytest.mark.asyncio
+async def test_stateful_graph_is_not_compiled_into_signal_mask(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(strategy_runtime, "_load_strategy_snapshot", _builtin_snapshot)
+
+    mask = await strategy_runtime.compile_strategy_signal_mask(
+        "ema20_swing", "1m", "BTC/USDT", "buy", _FakeIndicators(), 5
+    )
+
+    assert mask is None
+
+
+@pytest.mark.asyncio
+async def test_vectorized_backtest_matches_candle_by_candle_replay(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    candles = _random_walk_candles(1_500)
+    monkeypatch.setattr(strategy_runtime, "_load_strategy_snapshot", _builtin_snapshot)
+    evaluated_indices: list[int] = []
+    evaluate = backtest_service.evaluate_strategy_graph
+
+    async def counting_evaluate(*args: Any, **kwargs: Any) -> Any:
+        evaluated_indices.append(kwargs["candle_index"])
+        return await evaluate(*args, **kwargs)
+
+    monkeypatch.setattr(backtest_service, "evaluate_strategy_graph", counting_evaluate)
+
+    results = []
+    for vectorized in (True, False):
+        engine = Backtest(
+            config={},
+            symbol="BTC/USDT",
+            strategy_slug="bollinger_buy",
+            timeframe="1m",
+            start_date=datetime.fromtimestamp(candles[0].timestamp / 1000, tz=UTC),
+            end_date=datetime.fromtimestamp(candles[-1].timestamp / 1000, tz=UTC),
+            take_profit_pct=1.0,
+            vectorized=vectorized,
+        )
+        engine._candles = candles
+        results.append(await engine.run())
+        if vectorized:
+            assert evaluated_indices == []
+
+    vectorized_result, replay_result = results
+    assert vectorized_result["trades"]
+    assert vectorized_result["trades"] == replay_result["trades"]
+    assert vectorized_result["chart"]["markers"] == replay_result["chart"]["markers"]
+    assert vectorized_result["stats"] == replay_result["stats"]
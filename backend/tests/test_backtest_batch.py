@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+import pytest
+from controller import backtest as backtest_controller
+from service import backtest_batch, strategy_runtime
+from service.backtest import Backtest, BacktestValidationError, OhlcvCandle
+from service.backtest_batch import (
+    BacktestBatchEntry,
+    build_backtest_batch_runs,
+    start_backtest_batch,
+)
+from service.strategy_builder import BUILTIN_STRATEGY_BY_SLUG, build_builtin_ir
+from service.strategy_runtime import StrategySnapshot
+
+_START = datetime(2024, 1, 1, tzinfo=UTC)
+_END = datetime(2024, 1, 1, 20, tzinfo=UTC)
+
+
+def _candles(count: int = 1_200) -> list[OhlcvCandle]:
+    start_ms = int(_START.timestamp() * 1000)
+    closes = 100.0 + np.cumsum(np.random.default_rng(7).normal(0.0, 0.3, count))
+    return [
+        OhlcvCandle(
+            start_ms + index * 60_000,
+            float(close),
+            float(close) + 0.5,
+            float(close) - 0.5,
+            float(close),
+            10.0,
+        )
+        for index, close in enumerate(closes)
+    ]
+
+
+async def _snapshot(slug: str) -> StrategySnapshot:
+    return StrategySnapshot(
+        slug=slug,
+        version=1,
+        ir=build_builtin_ir(BUILTIN_STRATEGY_BY_SLUG[slug]),
+        validation={},
+        explanation="",
+    )
+
+
+def _thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+@pytest.fixture
+def batch_env(monkeypatch: pytest.MonkeyPatch) -> list[tuple[Any, ...]]:
+    candles = _candles()
+    fetches: list[tuple[Any, ...]] = []
+
+    async def fake_fetch(
+        config: dict[str, Any],
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+        max_candles: int = 0,
+    ) -> list[OhlcvCandle]:
+        fetches.append((symbol, timeframe, start_ms, end_ms, max_candles))
+        return [candle for candle in candles if candle.timestamp >= start_ms][
+            :max_candles
+        ]
+
+    monkeypatch.setattr(backtest_batch, "fetch_ohlcv", fake_fetch)
+    monkeypatch.setattr(strategy_runtime, "_load_strategy_snapshot", _snapshot)
+    monkeypatch.setattr(strategy_runtime, "_SNAPSHOT_CACHE", {})
+    monkeypatch.setattr(backtest_batch, "_batches", backtest_batch.OrderedDict())
+    return fetches
+
+
+def test_batch_request_expands_symbols_strategies_and_sweeps() -> None:
+    runs = build_backtest_batch_runs(
+        {
+            "symbols": ["BTC/USDT", "ETH/USDT", "BTC/USDT"],
+            "strategy_slug": "ema_down",
+            "timeframe": "1m",
+            "take_profit_pct": [1.0, 2.0, 3.0],
+            "safety_order_step_pct": [2.0, 4.0],
+            "fee": 0.002,
+        },
+        _START,
+        _END,
+    )
+
+    assert len(runs) == 12
+    assert {run["symbol"] for run in runs} == {"BTC/USDT", "ETH/USDT"}
+    assert {(run["take_profit_pct"], run["safety_order_step_pct"]) for run in runs} == {
+        (tp, step) for tp in (1.0, 2.0, 3.0) for step in (2.0, 4.0)
+    }
+    assert all(run["fee"] == 0.002 for run in runs)
+
+
+def test_batch_request_rejects_oversized_or_incomplete_sweeps(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(backtest_batch, "MAX_BATCH_RUNS", 4)
+    request = {"symbol": "BTC/USDT", "strategy_slug": "ema_down", "timeframe": "1m"}
+
+    with pytest.raises(BacktestValidationError, match="limit is 4"):
+        build_backtest_batch_runs(
+            {**request, "take_profit_pct": [1, 2, 3, 4, 5]}, _START, _END
+        )
+    with pytest.raises(BacktestValidationError, match="symbols"):
+        build_backtest_batch_runs({**request, "symbol": None}, _START, _END)
+    with pytest.raises(BacktestValidationError, match="rank_by"):
+        start_backtest_batch({}, build_backtest_batch_runs(request, _START, _END), "x")
+
+
+def test_batch_entry_is_picklable_for_process_workers() -> None:
+    entry = BacktestBatchEntry(
+        index=0,
+        kwargs={"symbol": "BTC/USDT", "start_date": _START},
+        candles=np.zeros((2, 6)),
+        snapshots={"ema_down": StrategySnapshot("ema_down", 1, {}, {}, "")},
+    )
+
+    restored = pickle.loads(pickle.dumps(entry))
+
+    assert restored.kwargs == entry.kwargs
+    assert restored.snapshots["ema_down"].slug == "ema_down"
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_fetched_ohlcv_and_ranks_results(
+    batch_env: list[tuple[Any, ...]],
+) -> None:
+    runs = build_backtest_batch_runs(
+        {
+            "symbol": "BTC/USDT",
+            "strategy_slugs": ["ema_down", "bollinger_buy"],
+            "timeframe": "1m",
+            "take_profit_pct": [0.5, 1.0, 3.0],
+        },
+        _START,
+        _END,
+    )
+
+    batch = start_backtest_batch({}, runs, executor_factory=_thread_pool)
+    progress = [state["completed"] async for state in batch.updates()]
+    result = batch.to_dict()
+
+    assert len(batch_env) == 1
+    assert result["status"] == "completed"
+    assert progress[-1] == result["completed"] == len(runs)
+    assert [row["rank"] for row in result["results"]] == list(range(1, 7))
+    profits = [row["metrics"]["total_profit"] for row in result["results"]]
+    assert profits == sorted(profits, reverse=True)
+
+    best = result["results"][0]
+    engine = Backtest(
+        config={},
+        symbol="BTC/USDT",
+        strategy_slug=best["strategy"],
+        timeframe="1m",
+        start_date=_START,
+        end_date=_END,
+        take_profit_pct=best["params"]["take_profit_pct"],
+    )
+    _, _, start_ms, _, max_candles = engine.fetch_window()
+    engine._candles = [candle for candle in _candles() if candle.timestamp >= start_ms][
+        :max_candles
+    ]
+    direct = await engine.run()
+    assert best["metrics"]["total_profit"] == direct["stats"]["summary"]["total_profit"]
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_reported_without_ending_the_batch(
+    batch_env: list[tuple[Any, ...]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    run_entry = backtest_batch.run_backtest_batch_entry
+
+    def flaky_entry(entry: BacktestBatchEntry) -> dict[str, Any]:
+        if entry.kwargs["take_profit_pct"] == 2.0:
+            raise RuntimeError("worker crashed")
+        return run_entry(entry)
+
+    monkeypatch.setattr(backtest_batch, "run_backtest_batch_entry", flaky_entry)
+    runs = build_backtest_batch_runs(
+        {
+            "symbol": "BTC/USDT",
+            "strategy_slug": "ema_down",
+            "timeframe": "1m",
+            "take_profit_pct": [1.0, 2.0],
+        },
+        _START,
+        _END,
+    )
+
+    batch = start_backtest_batch({}, runs, executor_factory=_thread_pool)
+    [_ async for _ in batch.updates()]
+    result = batch.to_dict()
+
+    assert result["status"] == "completed"
+    assert result["failed"] == 1
+    assert result["results"][0]["rank"] == 1
+    assert result["results"][1]["rank"] is None
+    assert result["results"][1]["error"] == "worker crashed"
+
+
+@pytest.mark.asyncio
+async def test_batch_controller_queues_and_reports_status(
+    batch_env: list[tuple[Any, ...]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class FakeConfigService:
+        def snapshot(self) -> dict[str, Any]:
+            return {"exchange": "binance"}
+
+    class FakeConfig:
+        @classmethod
+        async def instance(cls) -> FakeConfigService:
+            return FakeConfigService()
+
+    started: list[Any] = []
+
+    def fake_start(config: dict[str, Any], runs: list[dict[str, Any]], rank_by: Any):
+        batch = start_backtest_batch(
+            config, runs, rank_by, executor_factory=_thread_pool
+        )
+        started.append(batch)
+        return batch
+
+    monkeypatch.setattr(backtest_controller, "Config", FakeConfig)
+    monkeypatch.setattr(backtest_controller, "start_backtest_batch", fake_start)
+
+    invalid = await backtest_controller._run_backtest_batch(
+        {"symbol": "BTC/USDT", "timeframe": "1m", "start_date": "2024-01-01"}
+    )
+    assert invalid.status_code == 400
+
+    response = await backtest_controller._run_backtest_batch(
+        {
+            "symbol": "BTC/USDT",
+            "strategy_slug": "ema_down",
+            "timeframe": "1m",
+            "start_date": "2024-01-01T00:00:00Z",
+            "end_date": "2024-01-01T20:00:00Z",
+            "rank_by": "win_rate",
+        }
+    )
+    assert response.status_code == 202
+    queued = json.loads(response.content)
+    assert queued["total"] == 1
+    assert queued["rank_by"] == "win_rate"
+
+    [_ async for _ in started[0].updates()]
+    status = await backtest_controller.backtest_batch_status.fn(queued["batch_id"])
+    assert json.loads(status.content)["status"] == "completed"
+    missing = await backtest_controller.backtest_batch_status.fn("unknown")
+    assert missing.status_code == 404
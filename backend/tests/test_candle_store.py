@@ -0,0 +1,116 @@
+import os
+
+import pytest
+import service.watcher_runtime as watcher_runtime
+from service.candle_store import CandleStore, SymbolCandleBuffer
+from service.data import Data
+from tortoise import Tortoise
+
+
+def _row(timestamp: int, close: float) -> dict[str, object]:
+    return {
+        "timestamp": str(timestamp),
+        "symbol": "BTC/USDC",
+        "open": close - 1.0,
+        "high": close + 1.0,
+        "low": close - 2.0,
+        "close": close,
+        "volume": 5.0,
+    }
+
+
+def test_buffer_slices_exclusive_start_and_inclusive_end() -> None:
+    store = CandleStore()
+    rows = [_row(timestamp, 10.0 + idx) for idx, timestamp in enumerate((60, 120))]
+    buffer = store.build_buffer("BTC/USDC", 0, rows)
+    assert buffer is not None
+    assert store.install(buffer, store.get_write_version("BTC/USDC"))
+
+    frame = store.read("BTC/USDC", 60, 120)
+
+    assert frame is not None
+    assert frame["timestamp"].tolist() == [120]
+    assert frame["close"].tolist() == [11.0]
+    assert store.read("BTC/USDC", 120) is None
+
+
+def test_buffer_compaction_advances_coverage_boundary() -> None:
+    buffer = SymbolCandleBuffer("BTC/USDC", covered_since=0, capacity=4)
+    for timestamp in (1, 2, 3, 4, 5):
+        assert buffer.append(timestamp, (1.0, 1.0, 1.0, 1.0, 1.0))
+
+    assert len(buffer) == 4
+    assert buffer.covered_since == 1
+    assert buffer.covers(1)
+    assert not buffer.covers(0)
+    frame = buffer.slice_frame(1)
+    assert frame is not None
+    assert frame["timestamp"].tolist() == [2, 3, 4, 5]
+
+
+def test_extend_appends_only_to_warmed_symbols_and_drops_out_of_order() -> None:
+    store = CandleStore()
+    buffer = store.build_buffer("BTC/USDC", 0, [_row(60, 10.0)])
+    assert buffer is not None
+    store.install(buffer, store.get_write_version("BTC/USDC"))
+
+    store.extend([_row(120, 11.0), {**_row(60, 9.0), "symbol": "ETH/USDC"}])
+
+    assert store.get_latest_timestamp("BTC/USDC") == 120
+    assert store.get_latest_timestamp("ETH/USDC") is None
+
+    store.extend([_row(30, 8.0)])
+
+    assert store.get_latest_timestamp("BTC/USDC") is None
+
+
+def test_install_rejects_buffer_when_symbol_was_written_during_warmup() -> None:
+    store = CandleStore()
+    version = store.get_write_version("BTC/USDC")
+    buffer = store.build_buffer("BTC/USDC", 0, [_row(60, 10.0)])
+    assert buffer is not None
+
+    store.extend([_row(120, 11.0)])
+
+    assert store.install(buffer, version) is False
+    assert store.can_serve("BTC/USDC", 0) is False
+
+
+@pytest.mark.asyncio
+async def test_data_reads_are_served_from_store_after_warmup(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    await Tortoise.init(
+        db_url=f"sqlite://{tmp_path / 'test.sqlite'}",
+        modules={"models": ["model"]},
+    )
+    await Tortoise.generate_schemas()
+    import model
+
+    store = CandleStore()
+    monkeypatch.setattr(
+        watcher_runtime,
+        "_active_runtime_state",
+        watcher_runtime.WatcherRuntimeState(candle_store=store),
+    )
+    try:
+        for timestamp in (60_000, 120_000, 180_000):
+            await model.Tickers.create(**_row(timestamp, 10.0))
+
+        data = Data()
+        warm = await data._Data__get_dataframe_for_symbol_since("BTC/USDC", 0)
+        assert warm is not None
+        assert len(warm.index) == 3
+        assert store.can_serve("BTC/USDC", 0)
+
+        await model.Tickers.all().delete()
+        store.extend([_row(240_000, 12.0)])
+
+        cached = await data._Data__get_dataframe_for_symbol_since("BTC/USDC", 60_000)
+        assert cached is not None
+        assert cached["timestamp"].tolist() == [120_000, 180_000, 240_000]
+        assert await data.get_latest_timestamp_for_pair("BTC/USDC") == 240_000.0
+    finally:
+        await Tortoise.close_connections()
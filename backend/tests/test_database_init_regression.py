@@ -11,6 +11,11 @@ from service.database import (
     _integrity_check_is_clean,
     _plan_additive_column_statements,
 )
+from service.sqlite_health import (
+    FULL_INTEGRITY_CHECK_INTERVAL_SECONDS,
+    SqliteHealthMarker,
+    needs_full_integrity_check,
+)
 from service.sqlite_timestamps import coerce_timestamp_like_to_ms
 from tortoise import Tortoise
 
@@ -239,6 +244,7 @@ async def test_database_init_surfaces_actionable_sqlite_corruption(
     monkeypatch.setattr(Database, "_ensure_spot_campaign_columns", _noop)
     monkeypatch.setattr(Database, "_ensure_trade_ledger_columns", _noop)
     monkeypatch.setattr(Database, "_ensure_upnl_history_columns", _noop)
+    monkeypatch.setattr(Database, "_ensure_ticker_epoch_column", _noop)
     monkeypatch.setattr(Database, "_ensure_indexes", _noop)
     monkeypatch.setattr(Database, "_repair_index_only_corruption_if_needed", _noop)
     monkeypatch.setattr(Database, "_backfill_trade_ledger_rows", raise_malformed)
@@ -271,6 +277,7 @@ async def test_database_init_reraises_non_corruption_failures(
     monkeypatch.setattr(Database, "_ensure_spot_campaign_columns", _noop)
     monkeypatch.setattr(Database, "_ensure_trade_ledger_columns", _noop)
     monkeypatch.setattr(Database, "_ensure_upnl_history_columns", _noop)
+    monkeypatch.setattr(Database, "_ensure_ticker_epoch_column", _noop)
     monkeypatch.setattr(Database, "_ensure_indexes", _noop)
     monkeypatch.setattr(Database, "_repair_index_only_corruption_if_needed", _noop)
     monkeypatch.setattr(Database, "_backfill_trade_ledger_rows", raise_generic)
@@ -306,6 +313,7 @@ async def test_database_init_surfaces_index_rebuild_guidance_for_index_only_corr
     monkeypatch.setattr(Database, "_ensure_spot_campaign_columns", _noop)
     monkeypatch.setattr(Database, "_ensure_trade_ledger_columns", _noop)
     monkeypatch.setattr(Database, "_ensure_upnl_history_columns", _noop)
+    monkeypatch.setattr(Database, "_ensure_ticker_epoch_column", _noop)
     monkeypatch.setattr(Database, "_ensure_indexes", _noop)
     monkeypatch.setattr(Database, "_repair_index_only_corruption_if_needed", _noop)
     monkeypatch.setattr(Database, "_backfill_trade_ledger_rows", raise_malformed)
@@ -366,6 +374,9 @@ async def test_database_init_runs_schema_steps_before_trade_ledger_backfill(
     monkeypatch.setattr(
         Database, "_ensure_upnl_history_columns", _record("ensure_upnl_history_columns")
     )
+    monkeypatch.setattr(
+        Database, "_ensure_ticker_epoch_column", _record("ensure_ticker_epoch_column")
+    )
     monkeypatch.setattr(Database, "_ensure_indexes", _record("ensure_indexes"))
     monkeypatch.setattr(
         Database,
@@ -385,6 +396,7 @@ async def test_database_init_runs_schema_steps_before_trade_ledger_backfill(
         "ensure_spot_campaign_columns",
         "ensure_trade_ledger_columns",
         "ensure_upnl_history_columns",
+        "ensure_ticker_epoch_column",
         "ensure_indexes",
         "repair_index_only_corruption_if_needed",
         "backfill_trade_ledger_rows",
@@ -542,3 +554,301 @@ async def test_background_replay_backfill_does_not_raise_on_failure(
     monkeypatch.setattr(Database, "_backfill_trade_replay_candles", raise_failure)
 
     await database.backfill_trade_replay_candles_if_needed()
+
+
+@pytest.mark.asyncio
+async def test_trade_ledger_backfill_bulk_creates_missing_executions_once(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+
+    import model
+
+    await model.OpenTrades.create(symbol="ABC/USDT")
+    for index, baseorder in enumerate((True, False)):
+        await model.Trades.create(
+            timestamp=str(1_000 + index),
+            ordersize=10.0,
+            fee=0.0,
+            amount=1.0,
+            amount_fee=0.0,
+            price=10.0,
+            symbol="ABC/USDT",
+            orderid=f"order-{index}",
+            bot="test",
+            ordertype="market",
+            baseorder=baseorder,
+            safetyorder=not baseorder,
+            direction="long",
+            side="buy",
+        )
+
+    database = Database()
+    database.db_url = f"sqlite://{db_path}"
+    await database._backfill_trade_ledger_rows()
+    await database._backfill_trade_ledger_rows()
+
+    open_trade = await model.OpenTrades.get(symbol="ABC/USDT")
+    executions = await model.TradeExecutions.filter(
+        deal_id=open_trade.deal_id
+    ).order_by("timestamp")
+    assert open_trade.deal_id
+    assert set(
+        await model.Trades.filter(symbol="ABC/USDT").values_list("deal_id", flat=True)
+    ) == {open_trade.deal_id}
+    assert [execution.role for execution in executions] == [
+        "base_order",
+        "safety_order",
+    ]
+
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_background_replay_backfill_resumes_from_checkpoint(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+
+    import model
+    import service.database as database_module
+    from service.backfill_jobs import backfill_progress
+
+    archived: list[str] = []
+    fail_on: set[str] = {"deal-3"}
+
+    async def fake_archive_replay_candles_for_deal(deal_id: str, *_args, **_kwargs):
+        if deal_id in fail_on:
+            raise RuntimeError("exchange unavailable")
+        archived.append(deal_id)
+        return 1
+
+    monkeypatch.setattr(
+        database_module,
+        "archive_replay_candles_for_deal",
+        fake_archive_replay_candles_for_deal,
+    )
+    monkeypatch.setattr(database_module, "REPLAY_BACKFILL_CHUNK_SIZE", 2)
+    for index in range(1, 6):
+        await model.ClosedTrades.create(symbol="ABC/USDT", deal_id=f"deal-{index}")
+
+    database = Database()
+    database.db_url = f"sqlite://{db_path}"
+    await database.backfill_trade_replay_candles_if_needed()
+
+    (progress,) = [
+        job for job in backfill_progress() if job["name"] == "trade_replay_candles"
+    ]
+    assert archived == ["deal-1", "deal-2"]
+    assert progress["status"] == "failed"
+    assert (progress["processed"], progress["total"]) == (2, 5)
+
+    fail_on.clear()
+    await database.backfill_trade_replay_candles_if_needed()
+
+    (progress,) = [
+        job for job in backfill_progress() if job["name"] == "trade_replay_candles"
+    ]
+    assert archived == ["deal-1", "deal-2", "deal-3", "deal-4", "deal-5"]
+    assert progress["status"] == "completed"
+    assert (progress["processed"], progress["total"]) == (3, 3)
+
+    await database.backfill_trade_replay_candles_if_needed()
+    assert len(archived) == 5
+
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_background_replay_backfill_retries_deals_without_candles(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+
+    import model
+    import service.database as database_module
+    from service.backfill_jobs import load_backfill_checkpoint
+
+    archived: list[str] = []
+    unrepairable: set[str] = {"deal-2"}
+
+    async def fake_archive_replay_candles_for_deal(deal_id: str, *_args, **_kwargs):
+        archived.append(deal_id)
+        if deal_id in unrepairable:
+            return 0
+        if deal_id == "deal-4":
+            # Already archived on an earlier run; nothing to copy.
+            return 0
+        return 1
+
+    async def fake_resolve_window(_deal_id: str, **_kwargs):
+        return 0, 60_000
+
+    monkeypatch.setattr(
+        database_module,
+        "archive_replay_candles_for_deal",
+        fake_archive_replay_candles_for_deal,
+    )
+    monkeypatch.setattr(
+        database_module, "resolve_replay_archive_window_ms", fake_resolve_window
+    )
+    monkeypatch.setattr(database_module, "REPLAY_BACKFILL_CHUNK_SIZE", 2)
+    closed = [
+        await model.ClosedTrades.create(symbol="ABC/USDT", deal_id=f"deal-{index}")
+        for index in range(1, 5)
+    ]
+    await model.TradeReplayCandles.create(
+        deal_id="deal-4",
+        symbol="ABC/USDT",
+        timestamp="0",
+        open=1.0,
+        high=1.0,
+        low=1.0,
+        close=1.0,
+        volume=1.0,
+    )
+
+    database = Database()
+    database.db_url = f"sqlite://{db_path}"
+    await database._backfill_trade_replay_candles()
+
+    assert archived == ["deal-1", "deal-2", "deal-3", "deal-4"]
+    assert await load_backfill_checkpoint("trade_replay_candles") == closed[-1].id
+    assert await model.BackfillRetry.all().values_list("source_id", "attempts") == [
+        (closed[1].id, 1)
+    ]
+
+    # Only the failed deal is retried, until the attempt limit is reached.
+    archived.clear()
+    for _ in range(3):
+        await database._backfill_trade_replay_candles()
+    assert archived == ["deal-2", "deal-2"]
+
+    unrepairable.clear()
+    await model.BackfillRetry.filter(source_id=closed[1].id).update(attempts=1)
+    archived.clear()
+    await database._backfill_trade_replay_candles()
+
+    assert archived == ["deal-2"]
+    assert await model.BackfillRetry.all().count() == 0
+
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_background_replay_backfill_skips_deals_without_a_window(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+
+    import model
+    import service.database as database_module
+    from service.backfill_jobs import load_backfill_checkpoint
+
+    archived: list[str] = []
+
+    async def fake_archive_replay_candles_for_deal(deal_id: str, *_args, **_kwargs):
+        archived.append(deal_id)
+        return 0 if deal_id == "no-window" else 1
+
+    monkeypatch.setattr(
+        database_module,
+        "archive_replay_candles_for_deal",
+        fake_archive_replay_candles_for_deal,
+    )
+    # Neither trade dates nor executions give "no-window" a replay window.
+    await model.ClosedTrades.create(symbol="ABC/USDT", deal_id="no-window")
+    closed = [
+        await model.ClosedTrades.create(
+            symbol="ABC/USDT",
+            deal_id=f"deal-{index}",
+            open_date="0",
+            close_date="43200000",
+        )
+        for index in range(1, 3)
+    ]
+
+    database = Database()
+    database.db_url = f"sqlite://{db_path}"
+    await database._backfill_trade_replay_candles()
+
+    assert archived == ["no-window", "deal-1", "deal-2"]
+    assert await load_backfill_checkpoint("trade_replay_candles") == closed[-1].id
+    assert await model.BackfillRetry.all().count() == 0
+
+    archived.clear()
+    await database._backfill_trade_replay_candles()
+    assert archived == []
+
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_clean_restart_uses_quick_check_until_file_changes(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "trades.sqlite"
+    monkeypatch.setenv("MOONWALKER_DB_URL", f"sqlite://{db_path}")
+    checks: list[str] = []
+    original_check = Database._run_sqlite_check_pragma
+
+    async def spy_check(self: Database, pragma: str) -> list[str]:
+        checks.append(pragma)
+        return await original_check(self, pragma)
+
+    monkeypatch.setattr(Database, "_run_sqlite_check_pragma", spy_check)
+
+    async def boot(*, clean_shutdown: bool = True) -> list[str]:
+        checks.clear()
+        database = Database()
+        await database.init()
+        if clean_shutdown:
+            await database.shutdown()
+        else:
+            await Tortoise.close_connections()
+        return list(checks)
+
+    assert await boot() == ["integrity_check"]
+    assert await boot() == ["quick_check"]
+    # A crash leaves the marker unclean, so the next boot checks everything.
+    assert await boot(clean_shutdown=False) == ["quick_check"]
+    assert await boot() == ["integrity_check"]
+
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE external_edit (id INTEGER)")
+    connection.commit()
+    connection.close()
+    assert await boot() == ["integrity_check"]
+    assert await boot() == ["quick_check"]
+
+
+def test_full_integrity_check_is_scheduled_after_interval() -> None:
+    marker = SqliteHealthMarker(
+        clean_shutdown=True, size=10, mtime_ns=20, wal_size=0, last_full_check=100.0
+    )
+
+    assert needs_full_integrity_check(marker, (10, 20, 0), 200.0) is False
+    assert needs_full_integrity_check(marker, (10, 21, 0), 200.0) is True
+    assert (
+        needs_full_integrity_check(
+            marker, (10, 20, 0), 100.0 + FULL_INTEGRITY_CHECK_INTERVAL_SECONDS
+        )
+        is True
+    )
@@ -65,8 +65,8 @@ async def test_process_ticker_data_uses_bearish_sidestep_exit_before_dca(
             "is_unsellable": False,
         }
 
-    async def fake_get_profit():
-        return {"funds_locked": 100.0}
+    async def fake_get_funds_locked():
+        return 100.0
 
     async def fake_resolve_trading_policy(_symbol, _funds_locked, _config):
         return type(
@@ -104,7 +104,7 @@ async def test_process_ticker_data_uses_bearish_sidestep_exit_before_dca(
         "get_trades_for_orders",
         fake_get_trades_for_orders,
     )
-    monkeypatch.setattr(dca.statistic, "get_profit", fake_get_profit)
+    monkeypatch.setattr(dca.statistic, "get_funds_locked", fake_get_funds_locked)
     monkeypatch.setattr(
         dca.autopilot,
         "resolve_trading_policy",
@@ -465,8 +465,8 @@ async def test_process_ticker_data_logs_exit_tp_gate_before_bearish_strategy(
             "is_unsellable": False,
         }
 
-    async def fake_get_profit():
-        return {"funds_locked": 100.0}
+    async def fake_get_funds_locked():
+        return 100.0
 
     async def fake_resolve_trading_policy(_symbol, _funds_locked, _config):
         return type(
@@ -498,7 +498,7 @@ async def test_process_ticker_data_logs_exit_tp_gate_before_bearish_strategy(
         "get_trades_for_orders",
         fake_get_trades_for_orders,
     )
-    monkeypatch.setattr(dca.statistic, "get_profit", fake_get_profit)
+    monkeypatch.setattr(dca.statistic, "get_funds_locked", fake_get_funds_locked)
     monkeypatch.setattr(
         dca.autopilot,
         "resolve_trading_policy",
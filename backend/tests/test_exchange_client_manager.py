@@ -1,7 +1,14 @@
 """Tests for exchange client manager."""
 
+import asyncio
+
 import pytest
-from service.exchange_client_manager import ExchangeClientManager
+from service.exchange_client_manager import (
+    MARKETS_FORCE_REFRESH_MIN_SECONDS,
+    ExchangeClientManager,
+    TokenBucket,
+    get_exchange_client_pool,
+)
 
 
 class _DummyLogger:
@@ -16,12 +23,14 @@ class _DummyExchange:
     def __init__(self) -> None:
         self.close_calls = 0
         self.load_markets_calls = 0
+        self.reload_calls = 0
 
     async def close(self) -> None:
         self.close_calls += 1
 
-    async def load_markets(self) -> None:
+    async def load_markets(self, reload: bool = False) -> None:
         self.load_markets_calls += 1
+        self.reload_calls += int(reload)
 
 
 class _ConfigurableExchange(_DummyExchange):
@@ -93,14 +102,15 @@ async def test_ensure_markets_loaded_refreshes_after_ttl(
     await manager.ensure_exchange({"exchange": "binance"})
 
     await manager.ensure_markets_loaded()
-    manager._markets_loaded_ts -= manager.MARKETS_REFRESH_TTL_SECONDS + 1
+    manager._shared.markets_loaded_ts -= manager.MARKETS_REFRESH_TTL_SECONDS + 1
     await manager.ensure_markets_loaded()
 
     assert exchange.load_markets_calls == 2
+    assert exchange.reload_calls == 1
 
 
 @pytest.mark.asyncio
-async def test_close_resets_client_state(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_close_releases_pooled_client(monkeypatch: pytest.MonkeyPatch) -> None:
     manager = ExchangeClientManager(_DummyLogger())
     exchange = _DummyExchange()
 
@@ -113,9 +123,12 @@ async def test_close_resets_client_state(monkeypatch: pytest.MonkeyPatch) -> Non
 
     await manager.close()
 
-    assert exchange.close_calls == 1
+    assert exchange.close_calls == 0
     assert manager.exchange is None
 
+    await get_exchange_client_pool().close_all()
+    assert exchange.close_calls == 1
+
 
 @pytest.mark.asyncio
 async def test_ensure_exchange_rebuilds_when_sandbox_changes(
@@ -206,3 +219,84 @@ async def test_init_exchange_uses_sandbox_only_when_not_dry_run(
 
     assert exchange.demo_enabled is False
     assert exchange.sandbox_enabled is True
+
+
+@pytest.mark.asyncio
+async def test_managers_share_one_client_and_market_load(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    created: list[_DummyExchange] = []
+
+    async def fake_init_exchange(_config: dict[str, object]) -> _DummyExchange:
+        exchange = _DummyExchange()
+        created.append(exchange)
+        return exchange
+
+    managers = [ExchangeClientManager(_DummyLogger()) for _ in range(3)]
+    for manager in managers:
+        monkeypatch.setattr(manager, "_init_exchange", fake_init_exchange)
+        await manager.ensure_exchange({"exchange": "binance"})
+    await asyncio.gather(*(manager.ensure_markets_loaded() for manager in managers))
+
+    assert len(created) == 1
+    assert created[0].load_markets_calls == 1
+
+    await managers[0].close()
+    await managers[0].ensure_exchange({"exchange": "binance"})
+    await managers[0].ensure_markets_loaded()
+
+    assert len(created) == 1
+    assert created[0].load_markets_calls == 1
+    assert created[0].close_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_forced_market_refresh_is_throttled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager = ExchangeClientManager(_DummyLogger())
+    exchange = _DummyExchange()
+
+    async def fake_init_exchange(_config: dict[str, object]) -> _DummyExchange:
+        return exchange
+
+    monkeypatch.setattr(manager, "_init_exchange", fake_init_exchange)
+    await manager.ensure_exchange({"exchange": "binance"})
+
+    await manager.ensure_markets_loaded()
+    await manager.ensure_markets_loaded(force_refresh=True)
+    assert exchange.load_markets_calls == 1
+
+    manager._shared.markets_loaded_ts -= MARKETS_FORCE_REFRESH_MIN_SECONDS + 1
+    await manager.ensure_markets_loaded(force_refresh=True)
+    assert exchange.load_markets_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_history_pages_follow_the_client_rate_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    manager = ExchangeClientManager(_DummyLogger())
+    exchange = _DummyExchange()
+    exchange.rateLimit = 50
+
+    async def fake_init_exchange(_config: dict[str, object]) -> _DummyExchange:
+        return exchange
+
+    monkeypatch.setattr(manager, "_init_exchange", fake_init_exchange)
+    await manager.ensure_exchange({"exchange": "binance"})
+
+    bucket = manager._shared.history_pages()
+    assert bucket.rate == pytest.approx(15.0)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_calls_after_the_burst() -> None:
+    bucket = TokenBucket(rate=100.0, capacity=2)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    for _ in range(4):
+        await bucket.acquire()
+
+    assert loop.time() - started >= 0.015
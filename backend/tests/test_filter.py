@@ -38,3 +38,58 @@ async def test_get_cmc_marketcap_rank_returns_none_for_malformed_payload(
     monkeypatch.setattr(filt, "_Filter__request_api_endpoint", fake_request)
 
     assert await filt.get_cmc_marketcap_rank("api-key", "BTC") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_cmc_rank_lookup_is_not_cached(monkeypatch) -> None:
+    filt = Filter()
+    payloads: list[dict[str, object]] = [
+        {"status": {"error_code": 1008}},
+        {"status": {"error_code": 0}, "data": [{"symbol": "BTC", "rank": 1}]},
+    ]
+
+    class _Response:
+        def __init__(self, payload: dict[str, object]) -> None:
+            self._payload = payload
+
+        def json(self) -> dict[str, object]:
+            return self._payload
+
+    async def fake_request(_request: str, headers=None) -> _Response:
+        return _Response(payloads.pop(0))
+
+    monkeypatch.setattr(filt, "_Filter__request_api_endpoint", fake_request)
+
+    assert await filt.get_cmc_marketcap_rank("api-key", "BTC") is None
+    assert await filt.get_cmc_marketcap_rank("api-key", "BTC") == 1
+    assert payloads == []
+
+
+@pytest.mark.asyncio
+async def test_cmc_marketcap_ranks_are_fetched_once_for_all_symbols(
+    monkeypatch,
+) -> None:
+    filt = Filter()
+    requests: list[str] = []
+
+    class _Response:
+        def json(self) -> dict[str, object]:
+            return {
+                "status": {"error_code": 0},
+                "data": [
+                    {"symbol": "BTC", "rank": 1},
+                    {"symbol": "ETH", "rank": 2},
+                    {"symbol": "BTC", "rank": 900},
+                ],
+            }
+
+    async def fake_request(request: str, headers=None) -> _Response:
+        requests.append(request)
+        return _Response()
+
+    monkeypatch.setattr(filt, "_Filter__request_api_endpoint", fake_request)
+
+    assert await filt.get_cmc_marketcap_rank("api-key", "BTC") == 1
+    assert await filt.get_cmc_marketcap_rank("api-key", "ETH") == 2
+    assert await filt.get_cmc_marketcap_rank("api-key", "XRP") is None
+    assert len(requests) == 1
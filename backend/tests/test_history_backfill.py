@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+from service.history_backfill import (
+    BACKFILL_PRIORITY_ACTIVE_TRADE,
+    BACKFILL_PRIORITY_BTC_PULSE,
+    BACKFILL_PRIORITY_SIGNAL,
+    HistoryBackfillScheduler,
+    resolve_history_backfill_concurrency,
+)
+
+
+class _RecordingData:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, int, int | None]] = []
+        self.release = asyncio.Event()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def add_history_data_for_symbol(
+        self,
+        *,
+        symbol: str,
+        history_data: int,
+        config: dict,
+        since_ms: int | None = None,
+        success_timeframe: str | None = None,
+        success_minimum_candles: int = 0,
+    ) -> bool:
+        self.calls.append((symbol, history_data, since_ms))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await self.release.wait()
+        finally:
+            self.in_flight -= 1
+        return symbol != "FAIL/USDT"
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_resolve_history_backfill_concurrency_clamps() -> None:
+    assert resolve_history_backfill_concurrency({}) == 4
+    assert (
+        resolve_history_backfill_concurrency({"history_backfill_concurrency": 0}) == 1
+    )
+    assert (
+        resolve_history_backfill_concurrency({"history_backfill_concurrency": 99}) == 16
+    )
+    assert (
+        resolve_history_backfill_concurrency({"history_backfill_concurrency": "x"}) == 4
+    )
+
+
+@pytest.mark.asyncio
+async def test_backfills_run_by_priority_within_the_worker_limit() -> None:
+    data = _RecordingData()
+    scheduler = HistoryBackfillScheduler(data_factory=lambda: data)
+    config = {"timeframe": "1m", "history_backfill_concurrency": 1}
+
+    blocker = asyncio.create_task(scheduler.submit("BLOCK/USDT", 1, config, priority=0))
+    await _settle()
+    requests = [
+        ("SIG/USDT", BACKFILL_PRIORITY_SIGNAL),
+        ("BTC/USDT", BACKFILL_PRIORITY_BTC_PULSE),
+        ("ETH/USDT", BACKFILL_PRIORITY_ACTIVE_TRADE),
+    ]
+    tasks = [
+        asyncio.create_task(scheduler.submit(symbol, 1, config, priority=rank))
+        for symbol, rank in requests
+    ]
+    await _settle()
+    data.release.set()
+
+    assert await blocker is True
+    assert await asyncio.gather(*tasks) == [True, True, True]
+    assert [call[0] for call in data.calls] == [
+        "BLOCK/USDT",
+        "ETH/USDT",
+        "BTC/USDT",
+        "SIG/USDT",
+    ]
+    assert data.max_in_flight == 1
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_overlapping_requests_share_one_backfill() -> None:
+    data = _RecordingData()
+    scheduler = HistoryBackfillScheduler(data_factory=lambda: data)
+    config = {"timeframe": "1m", "history_backfill_concurrency": 1}
+
+    blocker = asyncio.create_task(scheduler.submit("BLOCK/USDT", 1, config, priority=0))
+    await _settle()
+    narrow = asyncio.create_task(scheduler.submit("BTC/USDT", 5, config, priority=2))
+    wide = asyncio.create_task(scheduler.submit("BTC/USDT", 30, config, priority=1))
+    await _settle()
+    data.release.set()
+    await blocker
+
+    assert await narrow is True
+    assert await wide is True
+    assert data.calls[1:] == [("BTC/USDT", 30, None)]
+
+    # Finished backfills are not cached; a later request syncs again.
+    assert await scheduler.submit("BTC/USDT", 10, config, priority=2)
+    assert data.calls[-1] == ("BTC/USDT", 10, None)
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_running_backfill_serves_covered_requests() -> None:
+    data = _RecordingData()
+    scheduler = HistoryBackfillScheduler(data_factory=lambda: data)
+    config = {"timeframe": "1m"}
+
+    first = asyncio.create_task(scheduler.submit("FAIL/USDT", 30, config, priority=0))
+    await _settle()
+    second = asyncio.create_task(scheduler.submit("FAIL/USDT", 7, config, priority=2))
+    await _settle()
+    data.release.set()
+
+    assert await first is False
+    assert await second is False
+    assert data.calls == [("FAIL/USDT", 30, None)]
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_merged_backfill_survives_first_submitter_cancellation() -> None:
+    data = _RecordingData()
+    scheduler = HistoryBackfillScheduler(data_factory=lambda: data)
+    config = {"timeframe": "1m"}
+
+    first = asyncio.create_task(scheduler.submit("BTC/USDT", 30, config, priority=0))
+    await _settle()
+    second = asyncio.create_task(scheduler.submit("BTC/USDT", 7, config, priority=2))
+    await _settle()
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    data.release.set()
+
+    assert await second is True
+    assert data.calls == [("BTC/USDT", 30, None)]
+    assert data.closed is False
+    await scheduler.shutdown()
+    assert data.closed is True
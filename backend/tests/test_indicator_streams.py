@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+from service.indicator_streams import (
+    BollingerStream,
+    EmaStream,
+    IndicatorStream,
+    MacdStream,
+    RsiStream,
+    frame_timestamps,
+)
+from service.indicators import Indicators
+
+
+def _closes(count: int) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    return 100.0 + np.cumsum(rng.normal(0.0, 1.0, count))
+
+
+def _timestamps(count: int) -> np.ndarray:
+    return (
+        pd.date_range("2026-01-01", periods=count, freq="4h", tz="UTC")
+        .to_numpy(dtype="datetime64[ns]")
+        .copy()
+    )
+
+
+STREAM_CASES = [
+    (EmaStream, {"length": 20}, lambda closes: {"ema": talib.EMA(closes, 20)}),
+    (RsiStream, {"length": 14}, lambda closes: {"rsi": talib.RSI(closes, 14)}),
+    (
+        MacdStream,
+        {"fast_period": 12, "slow_period": 26, "signal_period": 9},
+        lambda closes: dict(
+            zip(("macd", "signal", "histogram"), talib.MACD(closes, 12, 26, 9))
+        ),
+    ),
+    (
+        BollingerStream,
+        {"length": 20, "standard_deviations": 2.0},
+        lambda closes: dict(
+            zip(
+                ("upper", "middle", "lower"),
+                talib.BBANDS(closes, 20, 2.0, 2.0, 0),
+            )
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize(("stream_class", "params", "reference"), STREAM_CASES)
+def test_stream_extension_matches_full_talib_recompute(
+    stream_class, params, reference
+) -> None:
+    closes = _closes(160)
+    timestamps = _timestamps(160)
+    stream, _outputs = stream_class.build(timestamps[:100], closes[:100], **params)
+
+    for end in range(101, 161):
+        assert stream.can_extend(timestamps[:end], closes[:end])
+        outputs = stream.extend(timestamps[:end], closes[:end])
+
+    expected = reference(closes)
+    for component, values in expected.items():
+        np.testing.assert_allclose(
+            outputs[component][-40:], values[-40:], rtol=1e-9, atol=1e-9
+        )
+
+
+def test_stream_extension_handles_sliding_window_and_revised_provisional() -> None:
+    closes = _closes(120)
+    timestamps = _timestamps(120)
+    stream, _outputs = EmaStream.build(timestamps[:100], closes[:100], length=10)
+
+    revised = closes[5:101].copy()
+    revised[-1] += 3.0
+    outputs = stream.extend(timestamps[5:101], revised)
+
+    assert len(outputs["ema"]) == len(revised)
+    expected = talib.EMA(np.append(closes[:100], revised[-1]), 10)[-1]
+    assert outputs["ema"][-1] == pytest.approx(expected)
+
+
+def test_stream_rejects_gaps_and_revised_closed_candles() -> None:
+    closes = _closes(60)
+    timestamps = _timestamps(60)
+    stream, _outputs = RsiStream.build(timestamps[:40], closes[:40], length=14)
+
+    gapped = np.delete(timestamps[:50], 38)
+    assert not stream.can_extend(gapped, np.delete(closes[:50], 38))
+
+    revised = closes[:50].copy()
+    revised[38] += 1.0
+    assert not stream.can_extend(timestamps[:50], revised)
+    assert not stream.can_extend(None, closes[:50])
+
+
+class _GrowingData:
+    def __init__(self) -> None:
+        self.closes = _closes(220)
+        self.timestamps = pd.date_range("2026-01-01", periods=220, freq="4h", tz="UTC")
+        self.end = 200
+
+    async def get_latest_timestamp_for_pair(self, symbol: str) -> float:
+        return float(self.end)
+
+    async def get_data_for_pair_by_days(self, symbol: str, days: int):
+        return pd.DataFrame(
+            {
+                "timestamp": self.timestamps[: self.end],
+                "close": self.closes[: self.end],
+            }
+        )
+
+    async def get_data_for_pair(self, symbol: str, timerange: str, length: int):
+        return await self.get_data_for_pair_by_days(symbol, 0)
+
+    def resample_data(self, frame, timerange: str):
+        return frame
+
+
+@pytest.mark.asyncio
+async def test_indicator_series_are_advanced_incrementally(monkeypatch) -> None:
+    data = _GrowingData()
+    indicators = Indicators(data=data)
+    builds: list[type] = []
+    original_build = EmaStream.build.__func__
+
+    def tracking_build(cls, *args, **kwargs):
+        builds.append(cls)
+        return original_build(cls, *args, **kwargs)
+
+    monkeypatch.setattr(EmaStream, "build", classmethod(tracking_build))
+
+    await indicators.calculate_ema_series("BTC/USDC", "4h", 20)
+    for end in range(201, 221):
+        data.end = end
+        series = await indicators.calculate_ema_series("BTC/USDC", "4h", 20)
+
+    assert builds == [EmaStream]
+    assert float(series.iloc[-1]) == pytest.approx(
+        float(talib.EMA(data.closes, 20)[-1])
+    )
+    assert frame_timestamps(pd.DataFrame({"close": [1.0]})) is None
+
+
+def test_incomplete_stream_subclass_cannot_be_created() -> None:
+    class _PartialStream(IndicatorStream):
+        def _full_outputs(self, closes: np.ndarray) -> dict[str, np.ndarray]:
+            return {}
+
+    with pytest.raises(TypeError):
+        _PartialStream()  # type: ignore[abstract]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+from service import backtest as backtest_service
+from service import ohlcv_disk_cache
+from service.backtest import fetch_ohlcv
+from service.ohlcv_disk_cache import OhlcvCacheKey, OhlcvDiskCache
+
+_MINUTE = 60_000
+_NOW = 1_000 * _MINUTE + 30_000
+_CONFIG = {"exchange": "binance", "market": "spot"}
+
+
+class _FakeExchange:
+    calls: list[tuple[int, int | None, int]] = []
+    available_from = 0
+
+    async def get_history_for_symbol_batched(
+        self,
+        config: dict[str, Any],
+        symbol: str,
+        timeframe: str,
+        since: int = 0,
+        until: int | None = None,
+        max_candles: int = 20_000,
+        **_kwargs: Any,
+    ) -> list[list[float]]:
+        self.calls.append((since, until, max_candles))
+        upper = _NOW if until is None else min(_NOW, until)
+        first = max(since, self.available_from)
+        first += -first % _MINUTE
+        return [
+            [float(ts), ts / _MINUTE, ts / _MINUTE + 1, ts / _MINUTE - 1, 1.0, 2.0]
+            for ts in range(first, upper + 1, _MINUTE)
+        ][:max_candles]
+
+    async def close(self) -> None:
+        return None
+
+
+@pytest.fixture
+def exchange_calls(tmp_path, monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    _FakeExchange.calls = []
+    _FakeExchange.available_from = 0
+    monkeypatch.setattr(backtest_service, "Exchange", _FakeExchange)
+    monkeypatch.setattr(backtest_service, "_now_ms", lambda: _NOW)
+    monkeypatch.setattr(ohlcv_disk_cache, "_disk_cache", OhlcvDiskCache(tmp_path))
+    return _FakeExchange.calls
+
+
+def _timestamps(candles: list[Any]) -> list[int]:
+    return [candle.timestamp for candle in candles]
+
+
+@pytest.mark.asyncio
+async def test_repeated_range_is_served_from_disk(exchange_calls: list[Any]) -> None:
+    first = await fetch_ohlcv(_CONFIG, "BTC/USDT", "1m", 100 * _MINUTE, 400 * _MINUTE)
+    exchange_calls.clear()
+    second = await fetch_ohlcv(_CONFIG, "BTC/USDT", "1m", 100 * _MINUTE, 400 * _MINUTE)
+
+    assert exchange_calls == []
+    assert _timestamps(second) == _timestamps(first)
+    assert _timestamps(first) == list(range(100 * _MINUTE, 401 * _MINUTE, _MINUTE))
+    assert second[5].close == 1.0 and second[5].high == 106.0
+
+
+@pytest.mark.asyncio
+async def test_only_missing_spans_are_fetched(exchange_calls: list[Any]) -> None:
+    await fetch_ohlcv(_CONFIG, "BTC/USDT", "1m", 200 * _MINUTE, 300 * _MINUTE)
+    exchange_calls.clear()
+
+    candles = await fetch_ohlcv(_CONFIG, "BTC/USDT", "1m", 150 * _MINUTE, 350 * _MINUTE)
+
+    assert [(since, until) for since, until, _ in exchange_calls] == [
+        (150 * _MINUTE, 200 * _MINUTE - 1),
+        (300 * _MINUTE + 1, 350 * _MINUTE),
+    ]
+    assert _timestamps(candles) == list(range(150 * _MINUTE, 351 * _MINUTE, _MINUTE))
+
+
+@pytest.mark.asyncio
+async def test_forming_candle_is_returned_but_not_cached(
+    exchange_calls: list[Any],
+) -> None:
+    candles = await fetch_ohlcv(_CONFIG, "BTC/USDT", "1m", 990 * _MINUTE)
+
+    assert candles[-1].timestamp == 1_000 * _MINUTE
+    cache = ohlcv_disk_cache.get_ohlcv_disk_cache()
+    key = OhlcvCacheKey.from_config(_CONFIG, "BTC/USDT", "1m")
+    assert cache.coverage(key) == [(990 * _MINUTE, _NOW - _MINUTE)]
+    cached = cache.read(key, 0, _NOW, 1_000)
+    assert int(cached[-1, 0]) == 999 * _MINUTE
+
+
+@pytest.mark.asyncio
+async def test_max_candles_limits_fetch_and_coverage(exchange_calls: list[Any]) -> None:
+    candles = await fetch_ohlcv(
+        _CONFIG, "BTC/USDT", "1m", 0, 500 * _MINUTE, max_candles=50
+    )
+    exchange_calls.clear()
+    again = await fetch_ohlcv(
+        _CONFIG, "BTC/USDT", "1m", 0, 500 * _MINUTE, max_candles=50
+    )
+
+    assert len(candles) == 50
+    assert _timestamps(again) == _timestamps(candles)
+    assert exchange_calls == []
+
+
+@pytest.mark.asyncio
+async def test_empty_exchange_answer_is_not_cached_as_coverage(
+    exchange_calls: list[Any],
+) -> None:
+    _FakeExchange.available_from = 10_000 * _MINUTE
+
+    assert await fetch_ohlcv(_CONFIG, "BTC/USDT", "1m", 0, 10 * _MINUTE) == []
+    assert await fetch_ohlcv(_CONFIG, "BTC/USDT", "1m", 0, 10 * _MINUTE) == []
+    assert len(exchange_calls) == 2
+
+
+def test_unreadable_cache_files_are_ignored(tmp_path) -> None:
+    cache = OhlcvDiskCache(tmp_path)
+    key = OhlcvCacheKey("binance", "spot", "BTC/USDT", "1m")
+    cache.store(key, np.array([[0.0, 1, 1, 1, 1, 1]]), (0, 59_999))
+    cache._data_path(key).write_bytes(b"not numpy")
+    cache._coverage_path(key).write_text("{broken", encoding="utf-8")
+
+    assert cache.coverage(key) == []
+    assert cache.read(key, 0, 10**12, 10).shape == (0, 6)
+    assert cache.missing_spans(key, 0, 100) == [(0, 100)]
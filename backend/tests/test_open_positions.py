@@ -0,0 +1,138 @@
+import asyncio
+import os
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from service.open_positions import OpenPosition, OpenPositionCache
+from service.order_persistence import persist_buy_trade
+from service.statistic import Statistic
+from service.trades import Trades
+from tortoise import Tortoise
+
+
+def _buy_payload(symbol: str, orderid: str, *, baseorder: bool) -> dict[str, Any]:
+    return {
+        "timestamp": "1700000000000",
+        "ordersize": 100.0,
+        "fee": 0.1,
+        "precision": 4,
+        "amount": 1.0,
+        "amount_fee": 0.0,
+        "price": 100.0,
+        "symbol": symbol,
+        "orderid": orderid,
+        "bot": f"asap_{symbol}",
+        "ordertype": "market",
+        "baseorder": baseorder,
+        "safetyorder": not baseorder,
+        "order_count": 0 if baseorder else 1,
+        "so_percentage": None if baseorder else 2.0,
+        "direction": "long",
+        "side": "buy",
+    }
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.fixture
+def load_count(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    loaded: list[str] = []
+    original = Trades._load_open_position
+
+    async def counting_load(symbol: str) -> OpenPosition:
+        loaded.append(symbol)
+        return await original(symbol)
+
+    monkeypatch.setattr(Trades, "_load_open_position", staticmethod(counting_load))
+    return loaded
+
+
+@pytest.mark.asyncio
+async def test_ticks_reuse_position_until_order_write(
+    database: None, load_count: list[str]
+) -> None:
+    trades = Trades()
+    assert await trades.get_trades_for_orders("BTC/USDT") is None
+    assert await trades.get_trades_for_orders("BTC/USDT") is None
+    assert load_count == ["BTC/USDT"]
+
+    await persist_buy_trade(
+        "BTC/USDT",
+        _buy_payload("BTC/USDT", "bo-1", baseorder=True),
+        create_open_trade=True,
+    )
+    first = await trades.get_trades_for_orders("BTC/USDT")
+    second = await trades.get_trades_for_orders("BTC/USDT")
+
+    assert load_count == ["BTC/USDT", "BTC/USDT"]
+    assert first == second
+    assert first is not None and first["total_amount"] == 1.0
+
+    await persist_buy_trade(
+        "BTC/USDT",
+        _buy_payload("BTC/USDT", "so-1", baseorder=False),
+        create_open_trade=False,
+    )
+    after_safety_order = await trades.get_trades_for_orders("BTC/USDT")
+
+    assert len(load_count) == 3
+    assert after_safety_order is not None
+    assert after_safety_order["total_amount"] == 2.0
+    assert after_safety_order["safetyorders_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_open_trade_updates_patch_cached_position(
+    database: None, load_count: list[str]
+) -> None:
+    trades = Trades()
+    statistic = Statistic()
+    await persist_buy_trade(
+        "ETH/USDT",
+        _buy_payload("ETH/USDT", "bo-1", baseorder=True),
+        create_open_trade=True,
+    )
+    await trades.get_trades_for_orders("ETH/USDT")
+    assert await statistic.get_funds_locked() == pytest.approx(100.0)
+
+    await trades.update_open_trades(
+        {"current_price": 105.0, "profit": 5.0, "cost": 100.0}, "ETH/USDT"
+    )
+    trade_data = await trades.get_trades_for_orders("ETH/USDT")
+
+    assert load_count == ["ETH/USDT"]
+    assert trade_data is not None and trade_data["current_price"] == 105.0
+    assert (await trades.get_open_trades_by_symbol("ETH/USDT"))[0][
+        "current_price"
+    ] == 105.0
+
+    await trades.update_open_trades({"cost": 80.0}, "ETH/USDT")
+
+    assert await statistic.get_funds_locked() == pytest.approx(80.0)
+
+
+@pytest.mark.asyncio
+async def test_load_racing_with_write_is_not_cached() -> None:
+    cache = OpenPositionCache()
+    release = asyncio.Event()
+
+    async def slow_loader(symbol: str) -> OpenPosition:
+        await release.wait()
+        return OpenPosition(symbol=symbol)
+
+    load = asyncio.create_task(cache.get_position("BTC/USDT", slow_loader))
+    await asyncio.sleep(0)
+    cache.invalidate("BTC/USDT")
+    release.set()
+    await load
+
+    assert cache.peek("BTC/USDT") is None
@@ -0,0 +1,87 @@
+import os
+from datetime import date
+
+import model
+import pytest
+import pytest_asyncio
+from service.order_persistence import persist_closed_trade_summary
+from service.profit_ledger import ClosedProfitLedger, get_closed_profit_ledger
+from service.trades import Trades
+from tortoise import Tortoise
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_closed_trades_are_rolled_up_without_rescanning(
+    database: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await model.ClosedTrades.create(
+        symbol="BTC/USDT", profit=5.0, close_date="2026-03-09 10:00:00"
+    )
+    await model.ClosedTrades.create(
+        symbol="ETH/USDT", profit=-2.0, close_date="2026-03-10T11:00:00.000Z"
+    )
+    ledger = get_closed_profit_ledger()
+    assert await ledger.total_profit() == pytest.approx(3.0)
+
+    def fail_scan():
+        raise AssertionError("ledger should not rescan closed trades")
+
+    monkeypatch.setattr(model.ClosedTrades, "all", fail_scan)
+    await persist_closed_trade_summary(
+        {"symbol": "SOL/USDT", "profit": 4.0, "close_date": "2026-03-10 12:00:00"}
+    )
+
+    assert await ledger.total_profit() == pytest.approx(7.0)
+    assert await ledger.daily_profit_since(date(2026, 3, 10)) == {
+        "2026-03-10": pytest.approx(2.0)
+    }
+
+
+@pytest.mark.asyncio
+async def test_deleting_closed_trade_rebuilds_rollups(database: None) -> None:
+    closed = await model.ClosedTrades.create(
+        symbol="BTC/USDT", profit=5.0, close_date="2026-03-09 10:00:00"
+    )
+    ledger = get_closed_profit_ledger()
+    assert await ledger.total_profit() == pytest.approx(5.0)
+
+    assert await Trades().delete_closed_trade(closed.id)
+
+    assert await ledger.total_profit() == 0.0
+    assert await ledger.daily_profit_since(date(2026, 1, 1)) == {}
+
+
+@pytest.mark.asyncio
+async def test_write_during_initial_scan_forces_rescan(
+    database: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await model.ClosedTrades.create(
+        symbol="BTC/USDT", profit=5.0, close_date="2026-03-09 10:00:00"
+    )
+    ledger = ClosedProfitLedger()
+    original_all = model.ClosedTrades.all
+
+    class _ScanWithConcurrentWrite:
+        async def values_list(self, *fields):
+            rows = await original_all().values_list(*fields)
+            ledger.record_closed_trade({"profit": 1.0, "close_date": "2026-03-09"})
+            return rows
+
+    monkeypatch.setattr(model.ClosedTrades, "all", _ScanWithConcurrentWrite)
+    assert await ledger.total_profit() == pytest.approx(5.0)
+    monkeypatch.setattr(model.ClosedTrades, "all", original_all)
+
+    await model.ClosedTrades.create(
+        symbol="ETH/USDT", profit=1.0, close_date="2026-03-09 11:00:00"
+    )
+    assert await ledger.total_profit() == pytest.approx(6.0)
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+import service.resample_cache as resample_cache_module
+import service.watcher_runtime as watcher_runtime
+from service.candle_store import CandleStore
+from service.data import Data
+from service.data_ohlcv import resample_ohlcv_data
+from service.resample_cache import ResampleCache
+
+_START_MS = 1_700_000_000_000
+
+
+def _minute_frame(count: int, *, skip: tuple[int, ...] = ()) -> pd.DataFrame:
+    minutes = [minute for minute in range(count) if minute not in skip]
+    closes = np.array([100.0 + np.sin(minute / 7) * 5 for minute in minutes])
+    return pd.DataFrame(
+        {
+            "timestamp": [float(_START_MS + minute * 60_000) for minute in minutes],
+            "symbol": "BTC/USDC",
+            "open": closes - 0.5,
+            "high": closes + 1.0,
+            "low": closes - 1.0,
+            "close": closes,
+            "volume": np.array(minutes, dtype=float) + 1.0,
+        }
+    )
+
+
+def _assert_matches_reference(
+    result: pd.DataFrame | None, frame: pd.DataFrame, timerange: str
+) -> None:
+    expected = resample_ohlcv_data(frame, timerange)
+    assert result is not None and expected is not None
+    pd.testing.assert_frame_equal(
+        result, expected.reset_index(drop=True), check_exact=False, rtol=1e-12
+    )
+
+
+def _count_aggregated_buckets(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    counts: list[int] = []
+    aggregate = resample_cache_module._aggregate_buckets
+
+    def counting_aggregate(values, starts, ends):
+        counts.append(len(starts))
+        return aggregate(values, starts, ends)
+
+    monkeypatch.setattr(resample_cache_module, "_aggregate_buckets", counting_aggregate)
+    return counts
+
+
+@pytest.mark.parametrize("timerange", ["15m", "1h", "4h", "1d", "1w"])
+def test_cached_resample_matches_pandas_for_sliding_windows(timerange: str) -> None:
+    cache = ResampleCache()
+    frame = _minute_frame(3_000, skip=(5, 400, 401, 2_000))
+
+    for start, end in ((0, 2_500), (37, 2_600), (120, len(frame))):
+        window = frame.iloc[start:end].reset_index(drop=True)
+        _assert_matches_reference(
+            cache.resample("BTC/USDC", window, timerange), window, timerange
+        )
+
+
+def test_new_minute_candles_only_reaggregate_edge_buckets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = ResampleCache()
+    counts = _count_aggregated_buckets(monkeypatch)
+    frame = _minute_frame(1_000)
+
+    cache.resample("BTC/USDC", frame.iloc[:900], "15m")
+    window = frame.iloc[1:905].reset_index(drop=True)
+    result = cache.resample("BTC/USDC", window, "15m")
+
+    assert counts == [61, 3]
+    _assert_matches_reference(result, window, "15m")
+
+
+def test_backfilled_rows_inside_cached_bucket_are_reaggregated(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = ResampleCache()
+    counts = _count_aggregated_buckets(monkeypatch)
+    gapped = _minute_frame(600, skip=(100,))
+
+    cache.resample("BTC/USDC", gapped, "1h")
+    filled = _minute_frame(600)
+    result = cache.resample("BTC/USDC", filled, "1h")
+
+    assert counts == [11, 3]
+    _assert_matches_reference(result, filled, "1h")
+
+
+def test_unsorted_or_unsupported_input_is_not_cached() -> None:
+    cache = ResampleCache()
+    frame = _minute_frame(120)
+
+    assert cache.resample("BTC/USDC", frame.iloc[::-1], "15m") is None
+    assert cache.resample("BTC/USDC", frame, "3mo") is None
+    assert cache.entries == {}
+
+
+def test_candle_store_invalidation_drops_resampled_entries() -> None:
+    store = CandleStore()
+    store.resampled.resample("BTC/USDC", _minute_frame(120), "15m")
+    store.resampled.resample("ETH/USDC", _minute_frame(120), "15m")
+
+    store.invalidate("BTC/USDC")
+
+    assert list(store.resampled.entries) == [("ETH/USDC", "15m")]
+    store.clear()
+    assert store.resampled.entries == {}
+
+
+def test_data_resample_uses_shared_cache_of_active_store(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    store = CandleStore()
+    monkeypatch.setattr(
+        watcher_runtime,
+        "_active_runtime_state",
+        watcher_runtime.WatcherRuntimeState(candle_store=store),
+    )
+    frame = _minute_frame(240)
+
+    result = Data().resample_data(frame, "1h")
+
+    _assert_matches_reference(result, frame, "1h")
+    assert ("BTC/USDC", "1h") in store.resampled.entries
@@ -308,3 +308,67 @@ async def test_asap_run_does_not_log_stale_config_ini_message(monkeypatch) -> No
     await plugin.run({"bo": 10})
 
     assert captured == []
+
+
+@pytest.mark.asyncio
+async def test_asap_scan_checks_symbols_concurrently_within_limit(monkeypatch) -> None:
+    plugin = SignalPlugin(asyncio.Queue())
+    plugin.config = {"btc_pulse": True, "currency": "USDT"}
+    plugin._scan_concurrency = 3
+    symbols = [f"S{index}/USDT" for index in range(10)]
+    active = 0
+    peak = 0
+    pulse_calls: list[str] = []
+    recorded: list[str] = []
+
+    async def fake_btc_pulse(currency: str, _timeframe: str) -> bool:
+        pulse_calls.append(currency)
+        return True
+
+    async def fake_strategy_run(symbol: str, _side: str) -> bool:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return symbol.startswith(("S1", "S4", "S7"))
+
+    async def fake_record_long_signal(symbol: str, **_kwargs) -> None:
+        recorded.append(symbol)
+
+    plugin.indicators = types.SimpleNamespace(calculate_btc_pulse=fake_btc_pulse)
+    plugin._signal_strategy_plugin = types.SimpleNamespace(run=fake_strategy_run)
+    monkeypatch.setattr(
+        asap_module,
+        "SpotSidestepCampaignService",
+        types.SimpleNamespace(
+            instance=_async_value(
+                types.SimpleNamespace(record_long_signal=fake_record_long_signal)
+            )
+        ),
+    )
+
+    passing = await plugin._SignalPlugin__scan_entry_points(symbols)
+
+    assert passing == ["S1/USDT", "S4/USDT", "S7/USDT"]
+    assert sorted(recorded) == passing
+    assert pulse_calls == ["USDT"]
+    assert peak == 3
+    assert plugin._scan_btc_pulse is None
+
+
+@pytest.mark.asyncio
+async def test_asap_scan_skips_symbol_checks_when_btc_pulse_is_bearish() -> None:
+    plugin = SignalPlugin(asyncio.Queue())
+    plugin.config = {"btc_pulse": True}
+
+    async def fake_btc_pulse(*_args) -> bool:
+        return False
+
+    async def fail_check_entry_point(_symbol: str) -> bool:
+        raise AssertionError("symbols should not be checked in a downtrend")
+
+    plugin.indicators = types.SimpleNamespace(calculate_btc_pulse=fake_btc_pulse)
+    plugin._SignalPlugin__check_entry_point = fail_check_entry_point
+
+    assert await plugin._SignalPlugin__scan_entry_points(["BTC/USDT"]) == []
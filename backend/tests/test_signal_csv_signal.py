@@ -3,6 +3,7 @@ import os
 import types
 
 import pytest
+import service.history_backfill as history_backfill_module
 import signals.csv_signal as csv_signal_module
 from signals.csv_signal import SignalPlugin
 from tortoise import Tortoise
@@ -75,9 +76,10 @@ async def test_csv_signal_imports_and_pushes_symbols(monkeypatch) -> None:
         history_calls.append(kwargs)
         return True
 
-    plugin.data = types.SimpleNamespace(
+    backfill_data = types.SimpleNamespace(
         add_history_data_for_symbol=fake_add_history_data_for_symbol
     )
+    monkeypatch.setattr(history_backfill_module, "Data", lambda **_: backfill_data)
 
     async def fake_sleep(_seconds: float) -> None:
         plugin.status = False
@@ -143,9 +145,10 @@ async def test_csv_signal_prefills_history_from_parsed_first_row(monkeypatch) ->
         history_calls.append(kwargs)
         return True
 
-    plugin.data = types.SimpleNamespace(
+    backfill_data = types.SimpleNamespace(
         add_history_data_for_symbol=fake_add_history_data_for_symbol
     )
+    monkeypatch.setattr(history_backfill_module, "Data", lambda **_: backfill_data)
 
     async def fake_sleep(_seconds: float) -> None:
         plugin.status = False
@@ -223,13 +226,10 @@ async def test_csv_signal_blocks_import_when_history_prefill_fails(
         events.append("prefill")
         return False
 
-    async def fake_close() -> None:
-        return None
-
-    plugin.data = types.SimpleNamespace(
-        add_history_data_for_symbol=fake_add_history_data_for_symbol,
-        close=fake_close,
+    backfill_data = types.SimpleNamespace(
+        add_history_data_for_symbol=fake_add_history_data_for_symbol
     )
+    monkeypatch.setattr(history_backfill_module, "Data", lambda **_: backfill_data)
 
     original_import_from_csv = plugin.import_service.import_from_csv
 
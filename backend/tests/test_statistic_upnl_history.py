@@ -6,6 +6,7 @@ import model
 import pytest
 from service.config import Config
 from service.statistic import Statistic
+from service.upnl_history import record_upnl_snapshot
 from tortoise import Tortoise
 from tortoise.exceptions import BaseORMException
 
@@ -21,32 +22,24 @@ async def test_get_upnl_history_all_returns_ordered_rows(tmp_path, monkeypatch)
     await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
     await Tortoise.generate_schemas()
 
-    first = datetime(2026, 2, 10, 10, 0, 0)
+    first = datetime(2026, 2, 10, 10, 0, 0, tzinfo=UTC)
     second = first + timedelta(minutes=1)
+    recent = datetime.now(UTC).replace(microsecond=0) - timedelta(minutes=5)
 
-    await model.UpnlHistory.create(
-        timestamp=second,
-        upnl=2.0,
-        profit_overall=2.5,
-        funds_locked=6.0,
-    )
-    await model.UpnlHistory.create(
-        timestamp=first,
-        upnl=1.0,
-        profit_overall=1.5,
-        funds_locked=5.0,
-    )
+    await record_upnl_snapshot(first, upnl=1.0, profit_overall=1.5, funds_locked=5.0)
+    await record_upnl_snapshot(second, upnl=2.0, profit_overall=2.5, funds_locked=6.0)
+    await record_upnl_snapshot(recent, upnl=3.0, profit_overall=3.5, funds_locked=7.0)
 
     statistic = Statistic()
     data = await statistic.get_upnl_history_all()
 
+    # The two old snapshots share a day, so only the later one survives.
     assert len(data) == 2
-    assert data[0]["timestamp"] == "2026-02-10 10:00:00"
-    assert data[0]["profit_overall"] == 1.5
-    assert data[0]["funds_locked"] == 5.0
-    assert data[1]["timestamp"] == "2026-02-10 10:01:00"
-    assert data[1]["profit_overall"] == 2.5
-    assert data[1]["funds_locked"] == 6.0
+    assert data[0]["timestamp"] == "2026-02-10 10:01:00"
+    assert data[0]["profit_overall"] == 2.5
+    assert data[0]["funds_locked"] == 6.0
+    assert data[1]["timestamp"] == recent.strftime("%Y-%m-%d %H:%M:%S")
+    assert data[1]["profit_overall"] == 3.5
 
     await Tortoise.close_connections()
 
@@ -358,46 +351,13 @@ async def test_profit_overall_timeline_returns_data(tmp_path, monkeypatch) -> No
 
 
 @pytest.mark.asyncio
-async def test_get_sum_value_logs_traceback_and_returns_zero_on_orm_error(
+async def test_closed_profit_rollups_log_traceback_and_return_empty_on_orm_error(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     statistic = Statistic()
     captured: dict[str, object] = {}
 
     class _FailingQuery:
-        def annotate(self, **_kwargs):
-            return self
-
-        async def values_list(self, *_args, **_kwargs):
-            raise _FakeOrmError("boom")
-
-    import service.statistic as statistic_module
-
-    def fake_error(message: str, *args, **kwargs) -> None:
-        captured["message"] = message % args if args else message
-        captured["exc_info"] = kwargs.get("exc_info")
-
-    monkeypatch.setattr(statistic_module.logging, "error", fake_error)
-
-    result = await statistic._get_sum_value(
-        _FailingQuery(),
-        "profit",
-        "Error summing profits.",
-    )
-
-    assert result == 0.0
-    assert captured["message"] == "Error summing profits."
-    assert captured["exc_info"] is True
-
-
-@pytest.mark.asyncio
-async def test_get_profit_rows_since_logs_traceback_and_returns_empty_on_orm_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    statistic = Statistic()
-    captured: dict[str, object] = {}
-
-    class _FailingFilter:
         async def values_list(self, *_args, **_kwargs):
             raise _FakeOrmError("boom")
 
@@ -407,20 +367,16 @@ async def test_get_profit_rows_since_logs_traceback_and_returns_empty_on_orm_err
         captured["message"] = message % args if args else message
         captured["exc_info"] = kwargs.get("exc_info")
 
-    monkeypatch.setattr(
-        model.ClosedTrades,
-        "filter",
-        lambda **_kwargs: _FailingFilter(),
-    )
+    monkeypatch.setattr(model.ClosedTrades, "all", lambda: _FailingQuery())
     monkeypatch.setattr(statistic_module.logging, "error", fake_error)
 
-    rows = await statistic._get_profit_rows_since(
-        datetime.now(UTC),
-        "Error fetching profit rows.",
+    rollups = await statistic._get_closed_profit_rollups(
+        datetime.now(UTC).date(),
+        "Error fetching profit rollups.",
     )
 
-    assert rows == []
-    assert captured["message"] == "Error fetching profit rows."
+    assert rollups == (0.0, {})
+    assert captured["message"] == "Error fetching profit rollups."
     assert captured["exc_info"] is True
 
 
@@ -0,0 +1,163 @@
+import os
+import sqlite3
+
+import pytest
+import service.database as database_module
+import service.watcher_runtime as watcher_runtime
+from service.backfill_jobs import load_backfill_checkpoint
+from service.data import Data
+from service.database import Database
+from service.sqlite_timestamps import build_epoch_range_clause, ticker_epoch_ms
+from tortoise import Tortoise
+
+
+def _create_legacy_tickers_table(db_path: str) -> None:
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "CREATE TABLE tickers ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, "
+        "timestamp TEXT NOT NULL, symbol TEXT NOT NULL, "
+        "open REAL NOT NULL, high REAL NOT NULL, low REAL NOT NULL, "
+        "close REAL NOT NULL, volume REAL NOT NULL)"
+    )
+    connection.executemany(
+        "INSERT INTO tickers (timestamp, symbol, open, high, low, close, volume) "
+        "VALUES (?, 'BTC/USDC', 1, 1, 1, ?, 1)",
+        [
+            ("1700000060", 2.0),
+            ("1700000000000", 1.0),
+            ("1700000120000", 3.0),
+            ("1700000180", 4.0),
+            ("1700000240000", 5.0),
+        ],
+    )
+    connection.commit()
+    connection.close()
+
+
+async def _init_legacy_database(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = str(tmp_path / "legacy.sqlite")
+    _create_legacy_tickers_table(db_path)
+    database = Database()
+    database.db_url = f"sqlite://{db_path}"
+    await Tortoise.init(db_url=database.db_url, modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+    await database._run_schema_init_steps()
+    return database
+
+
+def test_ticker_epoch_ms_normalizes_seconds_and_rejects_garbage() -> None:
+    assert ticker_epoch_ms("1700000060") == 1_700_000_060_000
+    assert ticker_epoch_ms(1_700_000_060_000) == 1_700_000_060_000
+    assert ticker_epoch_ms("not-a-timestamp") is None
+
+
+def test_epoch_range_clause_falls_back_to_text_for_unmigrated_rows() -> None:
+    clause, params = build_epoch_range_clause(10, 20, start_operator=">")
+
+    assert clause.startswith("((ts > ? AND ts <= ?) OR (ts IS NULL AND ")
+    assert params == [10, 20, 10, 20]
+    assert build_epoch_range_clause() == ("", [])
+
+
+@pytest.mark.asyncio
+async def test_background_backfill_migrates_legacy_rows_in_chunks(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(database_module, "TICKER_EPOCH_BACKFILL_CHUNK_SIZE", 2)
+    database = await _init_legacy_database(tmp_path, monkeypatch)
+    try:
+        connection = Tortoise.get_connection("default")
+        await connection.execute_query(
+            "INSERT INTO tickers (timestamp, symbol, open, high, low, close, volume) "
+            "VALUES ('1700000300', 'BTC/USDC', 1, 1, 1, 6, 1)"
+        )
+        inserted = await connection.execute_query_dict(
+            "SELECT ts FROM tickers WHERE timestamp = '1700000300'"
+        )
+        assert inserted[0]["ts"] == 1_700_000_300_000
+
+        assert await database._backfill_ticker_epoch_timestamps() == 5
+        assert await database._backfill_ticker_epoch_timestamps() == 0
+
+        rows = await connection.execute_query_dict(
+            "SELECT timestamp, ts FROM tickers ORDER BY id"
+        )
+        assert [row["ts"] for row in rows] == [
+            1_700_000_060_000,
+            1_700_000_000_000,
+            1_700_000_120_000,
+            1_700_000_180_000,
+            1_700_000_240_000,
+            1_700_000_300_000,
+        ]
+    finally:
+        await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_finished_backfill_only_checks_rows_added_since(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    database = await _init_legacy_database(tmp_path, monkeypatch)
+    try:
+        connection = Tortoise.get_connection("default")
+        assert await database._backfill_ticker_epoch_timestamps() == 5
+        # Rows behind the checkpoint are not scanned again.
+        await connection.execute_query("UPDATE tickers SET ts = NULL WHERE id = 1")
+        await connection.execute_query(
+            "INSERT INTO tickers (timestamp, symbol, open, high, low, close, volume) "
+            "VALUES ('1700000300', 'BTC/USDC', 1, 1, 1, 6, 1)"
+        )
+        assert await database._backfill_ticker_epoch_timestamps() == 0
+        assert await load_backfill_checkpoint("ticker_epoch_timestamps") == 6
+
+        await connection.execute_query(
+            "INSERT INTO tickers (timestamp, symbol, open, high, low, close, volume) "
+            "VALUES ('1700000360', 'BTC/USDC', 1, 1, 1, 7, 1)"
+        )
+        await connection.execute_query("UPDATE tickers SET ts = NULL WHERE id >= 6")
+        assert await database._backfill_ticker_epoch_timestamps() == 1
+        assert await load_backfill_checkpoint("ticker_epoch_timestamps") == 7
+    finally:
+        await Tortoise.close_connections()
+
+
+@pytest.mark.asyncio
+async def test_reads_merge_migrated_and_unmigrated_rows(
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(watcher_runtime, "_active_runtime_state", None)
+    database = await _init_legacy_database(tmp_path, monkeypatch)
+    try:
+        connection = Tortoise.get_connection("default")
+        await database._backfill_ticker_epoch_timestamps()
+        await connection.execute_query(
+            "UPDATE tickers SET ts = NULL WHERE close IN (2.0, 5.0)"
+        )
+
+        data = Data()
+        rows = await data._Data__query_rows_with_numeric_timestamp(
+            table_name="tickers",
+            identity_value="BTC/USDC",
+            start_timestamp=1_700_000_000_000,
+            end_timestamp=1_700_000_180_000,
+            fields=("timestamp", "close"),
+            start_operator=">",
+        )
+        assert [row["close"] for row in rows] == [2.0, 3.0, 4.0]
+        assert await data.get_latest_timestamp_for_pair("BTC/USDC") == 1_700_000_240_000
+
+        clause, params = build_epoch_range_clause(1_700_000_000_000, None)
+        plan = await connection.execute_query_dict(
+            "EXPLAIN QUERY PLAN SELECT close FROM tickers "
+            f"WHERE symbol = ? AND {clause}",
+            ["BTC/USDC", *params],
+        )
+        assert any("idx_tickers_symbol_ts" in row["detail"] for row in plan)
+    finally:
+        await Tortoise.close_connections()
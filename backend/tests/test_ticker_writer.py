@@ -0,0 +1,117 @@
+import os
+
+import model
+import pytest
+import pytest_asyncio
+from service.ticker_writer import ticker_row, write_ticker_rows
+from tortoise import Tortoise
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+def _payload(timestamp: int, close: float, symbol: str = "BTC/USDC") -> dict:
+    return {
+        "timestamp": timestamp,
+        "symbol": symbol,
+        "open": 1,
+        "high": 2.5,
+        "low": 0.5,
+        "close": close,
+        "volume": 10,
+    }
+
+
+def test_ticker_row_matches_column_order_and_epoch() -> None:
+    assert ticker_row(_payload(1_700_000_060, 2.0)) == (
+        "1700000060",
+        "BTC/USDC",
+        1.0,
+        2.5,
+        0.5,
+        2.0,
+        10.0,
+        1_700_000_060_000,
+    )
+
+
+@pytest.mark.asyncio
+async def test_write_ticker_rows_stores_the_same_rows_as_the_orm(
+    database: None,
+) -> None:
+    await model.Tickers.bulk_create(
+        [model.Tickers(**_payload(1_700_000_000_000, 1.0), ts=1_700_000_000_000)]
+    )
+
+    written = await write_ticker_rows(
+        [_payload(1_700_000_060_000, 2.0), _payload(1_700_000_120_000, 3.0)],
+        "test write",
+    )
+
+    assert [payload["close"] for payload in written] == [2.0, 3.0]
+    rows = (
+        await model.Tickers.filter(symbol="BTC/USDC")
+        .order_by("ts")
+        .values_list("timestamp", "open", "close", "ts")
+    )
+    assert rows == [
+        ("1700000000000", 1.0, 1.0, 1_700_000_000_000),
+        ("1700000060000", 1.0, 2.0, 1_700_000_060_000),
+        ("1700000120000", 1.0, 3.0, 1_700_000_120_000),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_write_ticker_rows_can_skip_stored_candles(database: None) -> None:
+    await write_ticker_rows([_payload(1_700_000_000_000, 1.0)], "seed")
+
+    written = await write_ticker_rows(
+        [
+            _payload(1_700_000_000_000, 9.0),
+            _payload(1_700_000_000_000, 9.0, symbol="ETH/USDC"),
+            _payload(1_700_000_060_000, 2.0),
+            _payload(1_700_000_060_000, 8.0),
+        ],
+        "test write",
+        skip_duplicates=True,
+    )
+
+    assert [(payload["symbol"], payload["close"]) for payload in written] == [
+        ("ETH/USDC", 9.0),
+        ("BTC/USDC", 2.0),
+    ]
+    rows = (
+        await model.Tickers.all()
+        .order_by("symbol", "ts")
+        .values_list("symbol", "ts", "close")
+    )
+    assert rows == [
+        ("BTC/USDC", 1_700_000_000_000, 1.0),
+        ("BTC/USDC", 1_700_000_060_000, 2.0),
+        ("ETH/USDC", 1_700_000_000_000, 9.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_write_ticker_rows_ignores_empty_batches(database: None) -> None:
+    assert await write_ticker_rows([], "test write") == []
+    assert await model.Tickers.all().count() == 0
+
+
+@pytest.mark.asyncio
+async def test_write_ticker_rows_drops_unparsable_timestamps(database: None) -> None:
+    written = await write_ticker_rows(
+        [_payload(1_700_000_000_000, 1.0), {**_payload(0, 2.0), "timestamp": "n/a"}],
+        "test write",
+        skip_duplicates=True,
+    )
+
+    assert [payload["close"] for payload in written] == [1.0]
+    assert await model.Tickers.all().values_list("ts", flat=True) == [1_700_000_000_000]
@@ -0,0 +1,89 @@
+import os
+from datetime import UTC, datetime, timedelta
+
+import model
+import pytest
+import pytest_asyncio
+from service.statistic import Statistic
+from service.upnl_history import (
+    compact_upnl_history,
+    record_upnl_snapshot,
+    upnl_bucket_start,
+)
+from tortoise import Tortoise
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.join(os.path.dirname(__file__), ".."))
+    db_path = tmp_path / "test.sqlite"
+    await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+def test_bucket_start_aligns_to_utc_boundaries() -> None:
+    timestamp = datetime(2026, 3, 10, 13, 47, 12, tzinfo=UTC)
+
+    assert upnl_bucket_start(timestamp, "15m") == datetime(
+        2026, 3, 10, 13, 45, tzinfo=UTC
+    )
+    assert upnl_bucket_start(timestamp, "4h") == datetime(2026, 3, 10, 12, tzinfo=UTC)
+    assert upnl_bucket_start(timestamp, "1d") == datetime(2026, 3, 10, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_snapshots_keep_last_value_per_bucket(database: None) -> None:
+    base = datetime(2026, 3, 10, 12, 0, tzinfo=UTC)
+    for minute, profit in ((1, 1.0), (20, 2.0), (5, 9.0)):
+        await record_upnl_snapshot(
+            base + timedelta(minutes=minute),
+            upnl=0.0,
+            profit_overall=profit,
+            funds_locked=10.0,
+        )
+
+    rollups = {
+        (row.resolution, row.bucket_start.strftime("%H:%M")): row.profit_overall
+        for row in await model.UpnlHistoryRollup.all()
+    }
+
+    assert await model.UpnlHistory.all().count() == 3
+    # The out-of-order snapshot at 12:05 must not replace the 12:20 value.
+    assert rollups == {
+        ("15m", "12:00"): 9.0,
+        ("15m", "12:15"): 2.0,
+        ("4h", "12:00"): 2.0,
+        ("1d", "00:00"): 2.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_timeline_and_rolls_up_legacy_rows(
+    database: None,
+) -> None:
+    now = datetime.now(UTC)
+    # Legacy raw rows written before rollups existed.
+    for days_ago in (40, 20, 3):
+        await model.UpnlHistory.create(
+            timestamp=now - timedelta(days=days_ago),
+            upnl=0.0,
+            profit_overall=float(days_ago),
+            funds_locked=1.0,
+        )
+    await record_upnl_snapshot(
+        now - timedelta(minutes=1), upnl=0.0, profit_overall=1.0, funds_locked=1.0
+    )
+
+    deleted = await compact_upnl_history(now, retention_days=0)
+
+    assert deleted["raw"] == 3
+    assert await model.UpnlHistory.all().count() == 1
+    assert await model.UpnlHistoryRollup.filter(resolution="1d").count() == 4
+    timeline = await Statistic().get_profit_overall_timeline()
+    assert [point["profit_overall"] for point in timeline] == [40.0, 20.0, 3.0, 1.0]
+
+    await compact_upnl_history(now, retention_days=30)
+
+    assert await model.UpnlHistoryRollup.filter(resolution="1d").count() == 3
@@ -84,7 +84,7 @@ async def test_dca_worker_survives_recoverable_processing_exception() -> None:
     await asyncio.wait_for(worker, timeout=2)
 
     assert calls == [1.0, 2.0]
-    assert watcher.dca_queue.qsize() == 0
+    assert watcher.dca_queues[0].qsize() == 0
 
 
 @pytest.mark.asyncio
@@ -103,7 +103,7 @@ async def test_dca_worker_crashes_on_unexpected_processing_exception_and_restart
 
     watcher.dca.process_ticker_data = fake_process_ticker_data
     worker = asyncio.create_task(
-        watcher._process_dca_queue(), name=watcher.DCA_WORKER_TASK_NAME
+        watcher._process_dca_queue(), name=watcher._dca_worker_task_name(0)
     )
     watcher._worker_tasks = [worker]
 
@@ -124,7 +124,7 @@ async def test_dca_worker_crashes_on_unexpected_processing_exception_and_restart
     await asyncio.wait_for(replacement, timeout=2)
 
     assert calls == [1.0, 2.0]
-    assert watcher.dca_queue.qsize() == 0
+    assert watcher.dca_queues[0].qsize() == 0
 
 
 @pytest.mark.asyncio
@@ -157,13 +157,13 @@ async def test_dca_queue_coalesces_pending_updates_per_symbol() -> None:
         {"type": "ticker_price", "ticker": {"symbol": "BTC/USDC", "price": 3.0}}
     )
 
-    assert watcher.dca_queue.qsize() == 1
+    assert watcher.dca_queues[0].qsize() == 1
 
     release_processing.set()
     await asyncio.wait_for(worker, timeout=2)
 
     assert processed == [1.0, 3.0]
-    assert watcher.dca_queue.qsize() == 0
+    assert watcher.dca_queues[0].qsize() == 0
 
 
 @pytest.mark.asyncio
@@ -199,13 +199,74 @@ async def test_dca_queue_handoff_delivers_latest_payload_and_config() -> None:
             watcher.config,
         )
     ]
-    assert watcher.dca_queue.qsize() == 0
+    assert watcher.dca_queues[0].qsize() == 0
+
+
+@pytest.mark.asyncio
+async def test_dca_worker_pool_keeps_other_symbols_moving_past_slow_symbol() -> None:
+    watcher = Watcher()
+    watcher.config = {"dca_workers": 4}
+    watcher._configure_dca_shards()
+    slow_symbol = "BTC/USDC"
+    fast_symbol = next(
+        symbol
+        for symbol in ("ETH/USDC", "SOL/USDC", "XRP/USDC", "ADA/USDC")
+        if watcher_module.dca_shard_for_symbol(symbol, 4)
+        != watcher_module.dca_shard_for_symbol(slow_symbol, 4)
+    )
+    release_slow = asyncio.Event()
+    fast_done = asyncio.Event()
+    processed: list[tuple[str, float]] = []
+
+    async def fake_process_ticker_data(ticker_price: dict, config: dict) -> None:
+        symbol = ticker_price["ticker"]["symbol"]
+        if symbol == slow_symbol:
+            await release_slow.wait()
+        processed.append((symbol, float(ticker_price["ticker"]["price"])))
+        if symbol == fast_symbol:
+            fast_done.set()
+
+    watcher.dca.process_ticker_data = fake_process_ticker_data
+    watcher._start_worker_tasks()
+
+    watcher._queue_dca_payload(
+        {"type": "ticker_price", "ticker": {"symbol": slow_symbol, "price": 1.0}}
+    )
+    await asyncio.sleep(0)
+    watcher._queue_dca_payload(
+        {"type": "ticker_price", "ticker": {"symbol": slow_symbol, "price": 2.0}}
+    )
+    watcher._queue_dca_payload(
+        {"type": "ticker_price", "ticker": {"symbol": fast_symbol, "price": 3.0}}
+    )
+    await asyncio.wait_for(fast_done.wait(), timeout=1)
+
+    assert processed == [(fast_symbol, 3.0)]
+    slow_shard = watcher_module.dca_shard_for_symbol(slow_symbol, 4)
+    metrics = watcher.runtime_state.dca_metrics.snapshot()
+    assert metrics["workers"] == 4
+    assert metrics["shards"][slow_shard] == {
+        "shard": slow_shard,
+        "depth": 1,
+        "processing": slow_symbol,
+    }
+
+    release_slow.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert processed == [(fast_symbol, 3.0), (slow_symbol, 1.0), (slow_symbol, 2.0)]
+    metrics = watcher.dca_metrics.snapshot()
+    assert metrics["queued"] == 3
+    assert metrics["symbols"][slow_symbol]["jobs"] == 2
+    assert metrics["symbols"][fast_symbol]["jobs"] == 1
+    await watcher._cancel_worker_tasks()
 
 
 @pytest.mark.asyncio
 async def test_dca_queue_overflow_drops_new_payload_with_warning(monkeypatch) -> None:
     watcher = Watcher()
-    watcher.dca_queue = asyncio.Queue(maxsize=1)
+    watcher.dca_queues = [asyncio.Queue(maxsize=1)]
     warnings: list[tuple[object, ...]] = []
 
     monkeypatch.setattr(
@@ -221,7 +282,7 @@ async def test_dca_queue_overflow_drops_new_payload_with_warning(monkeypatch) ->
         {"type": "ticker_price", "ticker": {"symbol": "ETH/USDC", "price": 2.0}}
     )
 
-    assert watcher.dca_queue.qsize() == 1
+    assert watcher.dca_queues[0].qsize() == 1
     assert "BTC/USDC" in watcher._pending_dca_payloads
     assert "ETH/USDC" not in watcher._pending_dca_payloads
     assert warnings == [
@@ -243,7 +304,7 @@ async def test_ensure_worker_tasks_restarts_crashed_dca_worker() -> None:
 
     crashed_task = asyncio.create_task(
         crash(),
-        name=watcher.DCA_WORKER_TASK_NAME,
+        name=watcher._dca_worker_task_name(0),
     )
     await asyncio.sleep(0)
     assert crashed_task.done()
@@ -253,7 +314,7 @@ async def test_ensure_worker_tasks_restarts_crashed_dca_worker() -> None:
 
     replacement = watcher._worker_tasks[0]
     assert replacement is not crashed_task
-    assert replacement.get_name() == watcher.DCA_WORKER_TASK_NAME
+    assert replacement.get_name() == watcher._dca_worker_task_name(0)
     assert not replacement.done()
 
     watcher.status = False
@@ -3,6 +3,7 @@ import types
 
 import helper
 import pytest
+import service.history_backfill as history_backfill_module
 import service.watcher as watcher_module
 import service.watcher_runtime as watcher_runtime
 from service.watcher import Watcher
@@ -133,6 +134,9 @@ async def test_warmup_active_trade_strategy_history_backfills_insufficient_symbo
         return ["BTC/USDC", "ETH/USDC"]
 
     class FakeData:
+        def __init__(self, persist_exchange: bool = False) -> None:
+            assert persist_exchange is True
+
         async def has_sufficient_resampled_history(
             self,
             symbol: str,
@@ -162,6 +166,7 @@ async def test_warmup_active_trade_strategy_history_backfills_insufficient_symbo
 
     watcher.trades.get_symbols = fake_get_symbols
     monkeypatch.setattr(watcher_module, "Data", FakeData)
+    monkeypatch.setattr(history_backfill_module, "Data", FakeData)
 
     await watcher._warmup_active_trade_strategy_history(
         watcher.config,
@@ -170,8 +175,8 @@ async def test_warmup_active_trade_strategy_history_backfills_insufficient_symbo
         required_history_days=67,
     )
 
-    assert history_adds == [("BTC/USDC", 67), ("ETH/USDC", 67)]
-    assert history_checks == ["BTC/USDC", "BTC/USDC", "ETH/USDC", "ETH/USDC"]
+    assert sorted(history_adds) == [("BTC/USDC", 67), ("ETH/USDC", 67)]
+    assert sorted(history_checks) == ["BTC/USDC", "BTC/USDC", "ETH/USDC", "ETH/USDC"]
     assert close_calls == ["closed"]
 
 
@@ -524,3 +529,131 @@ async def test_watch_symbol_with_reconnect_logs_recovery(monkeypatch) -> None:
     assert attempts == ["BTC/USDC", "BTC/USDC", "BTC/USDC"]
     assert sleep_calls == [watcher.RECONNECT_DELAY]
     assert ("Recovered websocket stream for %s", ("BTC/USDC",)) in info_messages
+
+
+@pytest.mark.asyncio
+async def test_watch_symbol_batch_demultiplexes_ohlcv_into_events() -> None:
+    watcher = Watcher()
+    watcher.runtime_state.exchange_watcher_ohlcv = True
+    watcher.runtime_state.timeframe = "1m"
+    watcher._assign_symbol_batches(["BTC/USDC", "ETH/USDC"])
+
+    class FakeExchange:
+        async def watch_ohlcv_for_symbols(self, symbols_and_timeframes):
+            assert symbols_and_timeframes == [["BTC/USDC", "1m"], ["ETH/USDC", "1m"]]
+            return {
+                "ETH/USDC": {"1m": [[1_000, 2.0, 2.5, 1.5, 2.2, 3.0]]},
+                "DOGE/USDC": {"1m": [[1_000, 1.0, 1.0, 1.0, 1.0, 1.0]]},
+            }
+
+    watcher.exchange = FakeExchange()
+
+    await watcher.watch_symbol_batch(0)
+
+    assert watcher.event_queue.qsize() == 1
+    event = watcher.event_queue.get_nowait()
+    assert event["symbol"] == "ETH/USDC"
+    assert event["price"] == 2.2
+
+
+@pytest.mark.asyncio
+async def test_watch_symbol_batch_pushes_latest_trade_per_symbol() -> None:
+    watcher = Watcher()
+    watcher.runtime_state.exchange_watcher_ohlcv = False
+    watcher._assign_symbol_batches(["BTC/USDC", "ETH/USDC"])
+
+    class FakeExchange:
+        async def watch_trades_for_symbols(self, symbols):
+            assert symbols == ["BTC/USDC", "ETH/USDC"]
+            return [
+                {"symbol": "BTC/USDC", "price": 100.0},
+                {"symbol": "ETH/USDC", "price": 10.0},
+                {"symbol": "BTC/USDC", "price": 101.0},
+            ]
+
+        def build_ohlcvc(self, trades, _timeframe):
+            price = trades[-1]["price"]
+            return [[1_000, price, price, price, price, 1.0]]
+
+    watcher.exchange = FakeExchange()
+
+    await watcher.watch_symbol_batch(0)
+
+    events = [watcher.event_queue.get_nowait() for _ in range(2)]
+    assert [(event["symbol"], event["price"]) for event in events] == [
+        ("BTC/USDC", 101.0),
+        ("ETH/USDC", 10.0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_symbol_batches_stay_stable_and_unwatch_removed_symbols(
+    monkeypatch,
+) -> None:
+    watcher = Watcher()
+    monkeypatch.setattr(Watcher, "WATCH_BATCH_SIZE", 2)
+    watcher.runtime_state.exchange_watcher_ohlcv = True
+    watcher.runtime_state.timeframe = "1m"
+    unwatched: list[list[list[str]]] = []
+
+    class FakeExchange:
+        has = {"watchOHLCVForSymbols": True}
+
+        async def watch_ohlcv_for_symbols(self, _symbols_and_timeframes):
+            await asyncio.sleep(3600)
+
+        async def un_watch_ohlcv_for_symbols(self, symbols_and_timeframes):
+            unwatched.append(symbols_and_timeframes)
+
+    watcher.exchange = FakeExchange()
+    watcher.runtime_state.ticker_symbols = ["A/USDC", "B/USDC", "C/USDC", "D/USDC"]
+    await watcher._Watcher__sync_symbol_tasks()
+    assert [watcher._symbol_batch(index) for index in (0, 1)] == [
+        ["A/USDC", "B/USDC"],
+        ["C/USDC", "D/USDC"],
+    ]
+
+    watcher.runtime_state.ticker_symbols = ["B/USDC", "C/USDC", "D/USDC", "E/USDC"]
+    await watcher._Watcher__sync_symbol_tasks()
+
+    assert [watcher._symbol_batch(index) for index in (0, 1)] == [
+        ["B/USDC", "E/USDC"],
+        ["C/USDC", "D/USDC"],
+    ]
+    assert unwatched == [[["A/USDC", "1m"]]]
+    assert set(watcher.symbol_tasks) == {"batch:0", "batch:1"}
+
+    await watcher._cancel_symbol_tasks()
+
+
+@pytest.mark.asyncio
+async def test_sync_symbol_tasks_multiplexes_and_falls_back_when_unsupported(
+    monkeypatch,
+) -> None:
+    watcher = Watcher()
+    monkeypatch.setattr(Watcher, "WATCH_BATCH_SIZE", 2)
+    watcher.runtime_state.exchange_watcher_ohlcv = False
+    watcher.runtime_state.ticker_symbols = ["A/USDC", "B/USDC", "C/USDC"]
+
+    class FakeExchange:
+        has = {"watchTradesForSymbols": True}
+
+        async def watch_trades_for_symbols(self, _symbols):
+            raise watcher_module.ccxtpro.NotSupported("no multiplexing")
+
+        async def watch_trades(self, _symbol):
+            await asyncio.sleep(3600)
+
+    watcher.exchange = FakeExchange()
+
+    await watcher._Watcher__sync_symbol_tasks()
+    assert set(watcher.symbol_tasks) == {"batch:0", "batch:1"}
+
+    await asyncio.gather(*watcher.symbol_tasks.values())
+    assert watcher._batched_watch_unsupported is True
+    assert watcher.runtime_state.symbol_update_event.is_set()
+
+    await watcher._Watcher__sync_symbol_tasks()
+    assert set(watcher.symbol_tasks) == {"A/USDC", "B/USDC", "C/USDC"}
+
+    await watcher._cancel_symbol_tasks()
@@ -0,0 +1,129 @@
+"""Tests for delta-encoded websocket streams."""
+
+import json
+from typing import Any
+
+from controller import statistics as statistics_controller
+from controller import trades as trades_controller
+from litestar import Litestar
+from litestar.testing import TestClient
+from service.websocket_delta import DeltaSession, is_resync_request
+
+
+def _encode(session: DeltaSession, payload: Any) -> dict[str, Any]:
+    return json.loads(session.encode(json.dumps(payload)))
+
+
+def _apply(state: list[dict[str, Any]], patch: dict[str, Any]) -> list[dict[str, Any]]:
+    """Reference client-side patch application for keyed list payloads."""
+    rows = {str(row["symbol"]): dict(row) for row in state}
+    for key in patch.get("remove", []):
+        rows.pop(key, None)
+    rows.update(patch.get("upsert", {}))
+    for key, fields in patch.get("update", {}).items():
+        rows[key].update(fields)
+    for key, fields in patch.get("unset", {}).items():
+        for field in fields:
+            rows[key].pop(field, None)
+    order = patch.get("order", [str(row["symbol"]) for row in state])
+    return [rows[key] for key in order]
+
+
+def _trade(symbol: str, profit: float, **extra: Any) -> dict[str, Any]:
+    return {
+        "symbol": symbol,
+        "profit": profit,
+        "safetyorders": [{"price": 1.0, "amount": 2.0}] * 20,
+        **extra,
+    }
+
+
+def test_list_payload_sends_snapshot_then_keyed_patches() -> None:
+    session = DeltaSession(("symbol",))
+    first = [_trade("BTC/USDC", 1.0), _trade("ETH/USDC", 2.0, note="x")]
+    second = [_trade("ETH/USDC", 2.5), _trade("SOL/USDC", 0.0)]
+
+    snapshot = _encode(session, first)
+    patch = _encode(session, second)
+
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["data"] == first
+    assert snapshot["keys"] == ["BTC/USDC", "ETH/USDC"]
+    assert patch["type"] == "patch"
+    assert (patch["base_version"], patch["version"]) == (1, 2)
+    assert patch["update"] == {"ETH/USDC": {"profit": 2.5}}
+    assert patch["unset"] == {"ETH/USDC": ["note"]}
+    assert patch["remove"] == ["BTC/USDC"]
+    assert list(patch["upsert"]) == ["SOL/USDC"]
+    assert _apply(first, patch) == second
+
+
+def test_unchanged_payload_sends_heartbeat_and_resync_sends_snapshot() -> None:
+    session = DeltaSession(("symbol",))
+    rows = [_trade("BTC/USDC", 1.0)]
+    _encode(session, rows)
+
+    assert _encode(session, rows) == {"type": "heartbeat", "version": 1}
+
+    session.request_resync()
+    resent = _encode(session, rows)
+    assert resent["type"] == "snapshot"
+    assert resent["version"] == 2
+
+
+def test_object_payload_patches_top_level_fields() -> None:
+    session = DeltaSession()
+    _encode(session, {"upnl": 1.0, "funds_locked": 50.0, "history": [1] * 50})
+
+    patch = _encode(session, {"upnl": 2.0, "funds_locked": 50.0, "history": [1] * 50})
+
+    assert patch["update"] == {"upnl": 2.0}
+    assert "unset" not in patch
+
+
+def test_unkeyed_or_oversized_changes_fall_back_to_snapshots() -> None:
+    session = DeltaSession(("symbol",))
+    _encode(session, [{"symbol": "BTC/USDC"}])
+
+    assert _encode(session, [{"symbol": "A"}, {"symbol": "A"}])["type"] == "snapshot"
+    assert _encode(session, [{"symbol": "B"}])["type"] == "snapshot"
+
+
+def test_resync_request_accepts_json_and_plain_text() -> None:
+    assert is_resync_request('{"type": "resync"}')
+    assert is_resync_request("resync")
+    assert not is_resync_request('{"type": "ping"}')
+    assert not is_resync_request("")
+
+
+def test_open_trades_delta_stream_supports_resync(monkeypatch) -> None:
+    rows = [_trade("BTC/USDC", 1.0)]
+
+    async def _fake_open_trades() -> list[dict[str, Any]]:
+        return rows
+
+    monkeypatch.setattr(trades_controller, "_get_open_trades_cached", _fake_open_trades)
+
+    app = Litestar(route_handlers=[trades_controller.open_trades])
+    with TestClient(app=app) as client:
+        with client.websocket_connect("/trades/open?protocol=delta") as socket:
+            first = json.loads(socket.receive_text())
+            assert first["type"] == "snapshot"
+            assert first["data"] == rows
+
+            socket.send_text(json.dumps({"type": "resync"}))
+            resync = json.loads(socket.receive_text())
+            assert resync["type"] == "snapshot"
+            assert resync["version"] == first["version"] + 1
+
+
+def test_profit_stream_keeps_plain_payload_without_protocol(monkeypatch) -> None:
+    async def _fake_profit() -> dict[str, Any]:
+        return {"upnl": 1.0}
+
+    monkeypatch.setattr(statistics_controller, "_get_profit_cached", _fake_profit)
+
+    app = Litestar(route_handlers=[statistics_controller.profit])
+    with TestClient(app=app) as client:
+        with client.websocket_connect("/statistic/profit") as socket:
+            assert json.loads(socket.receive_text()) == {"upnl": 1.0}
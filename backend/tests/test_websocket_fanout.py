@@ -3,6 +3,8 @@
 import asyncio
 
 import pytest
+from controller import trades as trades_controller
+from service import trade_events
 from service.websocket_fanout import WebSocketFanout
 
 
@@ -71,3 +73,179 @@ async def test_websocket_fanout_stops_polling_without_subscribers() -> None:
         assert call_count == calls_after_disconnect
     finally:
         await fanout.stop()
+
+
+@pytest.mark.asyncio
+async def test_websocket_fanout_notify_refreshes_before_interval() -> None:
+    """A change notification should produce a payload without waiting."""
+    call_count = 0
+
+    async def _producer() -> str:
+        nonlocal call_count
+        call_count += 1
+        return str(call_count)
+
+    fanout = WebSocketFanout(
+        name="test",
+        interval_seconds=60,
+        producer=_producer,
+        logger=_DummyLogger(),
+    )
+
+    stream = fanout.subscribe()
+    try:
+        assert await anext(stream) == "1"
+        fanout.notify()
+        assert await asyncio.wait_for(anext(stream), timeout=1) == "2"
+    finally:
+        await stream.aclose()
+        await fanout.stop()
+
+
+@pytest.mark.asyncio
+async def test_websocket_fanout_skips_identical_payloads_on_notify() -> None:
+    """Unchanged output after a notification should not be broadcast again."""
+    payloads = iter(["same", "same", "changed"])
+    call_count = 0
+    produced = asyncio.Event()
+
+    async def _producer() -> str:
+        nonlocal call_count
+        call_count += 1
+        produced.set()
+        return next(payloads, "changed")
+
+    fanout = WebSocketFanout(
+        name="test",
+        interval_seconds=60,
+        producer=_producer,
+        logger=_DummyLogger(),
+    )
+
+    stream = fanout.subscribe()
+    try:
+        assert await anext(stream) == "same"
+        produced.clear()
+        fanout.notify()
+        await asyncio.wait_for(produced.wait(), timeout=1)
+        fanout.notify()
+        assert await asyncio.wait_for(anext(stream), timeout=1) == "changed"
+        assert call_count == 3
+    finally:
+        await stream.aclose()
+        await fanout.stop()
+
+
+@pytest.mark.asyncio
+async def test_websocket_fanout_interval_resends_unchanged_payload() -> None:
+    """Interval broadcasts should keep quiet streams alive for client watchdogs."""
+
+    async def _producer() -> str:
+        return "same"
+
+    fanout = WebSocketFanout(
+        name="test",
+        interval_seconds=0.01,
+        producer=_producer,
+        logger=_DummyLogger(),
+    )
+
+    stream = fanout.subscribe()
+    try:
+        assert await anext(stream) == "same"
+        assert await asyncio.wait_for(anext(stream), timeout=1) == "same"
+    finally:
+        await stream.aclose()
+        await fanout.stop()
+
+
+@pytest.mark.asyncio
+async def test_trade_state_change_wakes_trade_streams(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Publishing a trade change should refresh the open-trades stream."""
+    rows: list[dict[str, str]] = [{"symbol": "BTC/USDC"}]
+
+    async def _fake_open_trades() -> list[dict[str, str]]:
+        return list(rows)
+
+    monkeypatch.setattr(trade_events, "_listeners", [])
+    monkeypatch.setattr(trades_controller, "_get_open_trades_cached", _fake_open_trades)
+    await trades_controller.start_websocket_fanout()
+    stream = trades_controller._open_trades_fanout.subscribe()
+    try:
+        assert await anext(stream) == '[{"symbol": "BTC/USDC"}]'
+        rows.append({"symbol": "ETH/USDC"})
+        await trade_events.publish_trade_state_changed()
+        refreshed = await asyncio.wait_for(anext(stream), timeout=2)
+        assert "ETH/USDC" in refreshed
+    finally:
+        await stream.aclose()
+        await trades_controller.stop_websocket_fanout()
+
+
+class _RecordingFanout:
+    def __init__(self) -> None:
+        self.notified = 0
+
+    def notify(self) -> None:
+        self.notified += 1
+
+
+@pytest.mark.asyncio
+async def test_trade_state_change_refreshes_only_changed_streams(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A scoped trade change should leave the other trade lists untouched."""
+    cleared: list[str] = []
+    fanouts: dict[str, _RecordingFanout] = {}
+    streams = {}
+    for name in trade_events.ALL_TRADE_STREAMS:
+
+        async def _getter() -> list[dict[str, str]]:
+            return []
+
+        async def _cache_clear(name: str = name) -> None:
+            cleared.append(name)
+
+        _getter.cache_clear = _cache_clear  # type: ignore[attr-defined]
+        fanouts[name] = _RecordingFanout()
+        streams[name] = (_getter, fanouts[name])
+    monkeypatch.setattr(trades_controller, "_trade_streams", streams)
+
+    await trades_controller._on_trade_state_changed(
+        frozenset({trade_events.TRADE_STREAM_OPEN})
+    )
+
+    assert cleared == [trade_events.TRADE_STREAM_OPEN]
+    assert {name: fanout.notified for name, fanout in fanouts.items()} == {
+        trade_events.TRADE_STREAM_OPEN: 1,
+        trade_events.TRADE_STREAM_CLOSED: 0,
+        trade_events.TRADE_STREAM_UNSELLABLE: 0,
+        trade_events.TRADE_STREAM_WAITING: 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_open_trade_price_updates_are_coalesced(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Price ticks should not block and should publish one open-stream refresh."""
+    published: list[frozenset[str]] = []
+
+    async def _listener(streams: frozenset[str]) -> None:
+        published.append(streams)
+
+    monkeypatch.setattr(trade_events, "_listeners", [_listener])
+    monkeypatch.setattr(trade_events, "OPEN_TRADE_PRICE_NOTIFY_INTERVAL_SECONDS", 60)
+    for _ in range(10):
+        trade_events.notify_open_trade_prices_changed()
+    task = trade_events._price_update_task
+    assert task is not None
+    try:
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert published == [frozenset({trade_events.TRADE_STREAM_OPEN})]
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,149 @@
+export const WS_DELTA_PROTOCOL = 'delta'
+export const WS_RESYNC_REQUEST = JSON.stringify({ type: 'resync' })
+
+type JsonObject = Record<string, unknown>
+
+export type DeltaStreamState = {
+    data: unknown
+    version: number | null
+    keys: string[] | null
+}
+
+export type DeltaApplyResult = {
+    state: DeltaStreamState
+    changed: boolean
+    resync: boolean
+}
+
+type DeltaMessage = {
+    type: 'snapshot' | 'patch' | 'heartbeat'
+    version?: number
+    base_version?: number
+    keys?: string[]
+    data?: unknown
+    upsert?: Record<string, JsonObject>
+    update?: Record<string, JsonObject> | JsonObject
+    unset?: Record<string, string[]> | string[]
+    remove?: string[]
+    order?: string[]
+}
+
+export const EMPTY_DELTA_STATE: DeltaStreamState = {
+    data: null,
+    version: null,
+    keys: null,
+}
+
+function isObject(value: unknown): value is JsonObject {
+    return typeof value === 'object' && value !== null && !Array.isArray(value)
+}
+
+function isDeltaMessage(value: unknown): value is DeltaMessage {
+    return (
+        isObject(value) &&
+        (value.type === 'snapshot' || value.type === 'patch' || value.type === 'heartbeat') &&
+        typeof value.version === 'number'
+    )
+}
+
+function patchObject(
+    previous: JsonObject,
+    update: JsonObject | undefined,
+    unset: string[] | undefined,
+): JsonObject {
+    const next = { ...previous, ...(update ?? {}) }
+    for (const field of unset ?? []) {
+        delete next[field]
+    }
+    return next
+}
+
+function patchList(
+    state: DeltaStreamState,
+    message: DeltaMessage,
+): Pick<DeltaStreamState, 'data' | 'keys'> | null {
+    const data = state.data
+    if (!Array.isArray(data) || state.keys === null) {
+        return null
+    }
+    const rows = new Map<string, JsonObject>()
+    state.keys.forEach((key, index) => {
+        rows.set(key, data[index] as JsonObject)
+    })
+    for (const key of message.remove ?? []) {
+        rows.delete(key)
+    }
+    for (const [key, row] of Object.entries(message.upsert ?? {})) {
+        rows.set(key, row)
+    }
+    const updates = (message.update ?? {}) as Record<string, JsonObject>
+    const unsets = (isObject(message.unset) ? message.unset : {}) as Record<string, string[]>
+    for (const key of new Set([...Object.keys(updates), ...Object.keys(unsets)])) {
+        const row = rows.get(key)
+        if (row === undefined) {
+            return null
+        }
+        rows.set(key, patchObject(row, updates[key], unsets[key]))
+    }
+    const keys = message.order ?? state.keys
+    if (keys.length !== rows.size || keys.some((key) => !rows.has(key))) {
+        return null
+    }
+    return { data: keys.map((key) => rows.get(key)), keys: [...keys] }
+}
+
+/**
+ * Apply one message from a fan-out websocket to the local stream state.
+ *
+ * Plain JSON payloads (streams opened without `?protocol=delta`) replace the
+ * state. Delta messages are applied in version order; a gap or a patch that
+ * does not fit the local rows asks the caller to send `WS_RESYNC_REQUEST`.
+ */
+export function applyDeltaMessage(
+    state: DeltaStreamState,
+    message: unknown,
+): DeltaApplyResult {
+    if (!isDeltaMessage(message)) {
+        return {
+            state: { data: message, version: null, keys: null },
+            changed: true,
+            resync: false,
+        }
+    }
+    const version = message.version as number
+    if (message.type === 'snapshot') {
+        return {
+            state: {
+                data: message.data ?? null,
+                version,
+                keys: Array.isArray(message.keys) ? message.keys : null,
+            },
+            changed: true,
+            resync: false,
+        }
+    }
+    if (message.type === 'heartbeat') {
+        return { state, changed: false, resync: state.version !== version }
+    }
+    if (state.version === null || message.base_version !== state.version) {
+        return { state, changed: false, resync: true }
+    }
+
+    let patched: Pick<DeltaStreamState, 'data' | 'keys'> | null = null
+    if (Array.isArray(state.data)) {
+        patched = patchList(state, message)
+    } else if (isObject(state.data)) {
+        patched = {
+            data: patchObject(
+                state.data,
+                isObject(message.update) ? message.update : undefined,
+                Array.isArray(message.unset) ? message.unset : undefined,
+            ),
+            keys: null,
+        }
+    }
+    if (patched === null) {
+        return { state, changed: false, resync: true }
+    }
+    return { state: { ...patched, version }, changed: true, resync: false }
+}
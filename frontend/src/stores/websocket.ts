@@ -1,4 +1,5 @@
 import { defineStore } from 'pinia'
+import { applyDeltaMessage } from '../helpers/websocketDelta'
 
 export type WebSocketStatus = 'CONNECTING' | 'OPEN' | 'CLOSED'
 
@@ -7,6 +8,8 @@ export const useWebSocketDataStore = (wsId: string) => defineStore(`${wsId}`, {
     return {
       raw: null as string | null,
       data: null as unknown,
+      version: null as number | null,
+      keys: null as string[] | null,
       status: 'CONNECTING' as WebSocketStatus,
       hasReceivedData: false,
       lastMessageAt: null as number | null,
@@ -15,19 +18,34 @@ export const useWebSocketDataStore = (wsId: string) => defineStore(`${wsId}`, {
     }
   },
   actions: {
-    setRaw(payload: string | null) {
+    /** Store one socket message and return whether a resync is needed. */
+    setRaw(payload: string | null): boolean {
       this.raw = payload
       this.hasReceivedData = true
       this.lastMessageAt = Date.now()
       if (payload === null || payload === undefined) {
         this.data = null
-        return
+        this.version = null
+        this.keys = null
+        return false
       }
+      let message: unknown
       try {
-        this.data = JSON.parse(payload)
+        message = JSON.parse(payload)
       } catch {
         this.data = null
+        return false
       }
+      const result = applyDeltaMessage(
+        { data: this.data, version: this.version, keys: this.keys },
+        message,
+      )
+      if (result.changed) {
+        this.data = result.state.data
+        this.version = result.state.version
+        this.keys = result.state.keys
+      }
+      return result.resync
     },
     setStatus(status: WebSocketStatus) {
       this.status = status
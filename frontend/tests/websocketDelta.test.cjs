@@ -0,0 +1,81 @@
+const assert = require('node:assert/strict')
+const test = require('node:test')
+
+const { loadFrontendModule } = require('./helpers/loadFrontendModule.cjs')
+
+const { applyDeltaMessage, EMPTY_DELTA_STATE } = loadFrontendModule(
+    'src/helpers/websocketDelta.ts',
+)
+
+const snapshot = {
+    type: 'snapshot',
+    protocol: 1,
+    version: 1,
+    keys: ['BTC/USDC', 'ETH/USDC'],
+    data: [
+        { symbol: 'BTC/USDC', profit: 1 },
+        { symbol: 'ETH/USDC', profit: 2, note: 'x' },
+    ],
+}
+
+test('applyDeltaMessage applies keyed list patches in version order', () => {
+    const synced = applyDeltaMessage(EMPTY_DELTA_STATE, snapshot).state
+    const result = applyDeltaMessage(synced, {
+        type: 'patch',
+        version: 2,
+        base_version: 1,
+        upsert: { 'SOL/USDC': { symbol: 'SOL/USDC', profit: 0 } },
+        update: { 'ETH/USDC': { profit: 2.5 } },
+        unset: { 'ETH/USDC': ['note'] },
+        remove: ['BTC/USDC'],
+        order: ['ETH/USDC', 'SOL/USDC'],
+    })
+
+    assert.equal(result.resync, false)
+    assert.equal(result.state.version, 2)
+    assert.deepEqual(result.state.data, [
+        { symbol: 'ETH/USDC', profit: 2.5 },
+        { symbol: 'SOL/USDC', profit: 0 },
+    ])
+    assert.deepEqual(synced.data[1], { symbol: 'ETH/USDC', profit: 2, note: 'x' })
+})
+
+test('applyDeltaMessage patches object payloads field by field', () => {
+    const synced = applyDeltaMessage(EMPTY_DELTA_STATE, {
+        type: 'snapshot',
+        version: 4,
+        data: { upnl: 1, funds_locked: 50 },
+    }).state
+    const result = applyDeltaMessage(synced, {
+        type: 'patch',
+        version: 5,
+        base_version: 4,
+        update: { upnl: 2 },
+    })
+
+    assert.deepEqual(result.state.data, { upnl: 2, funds_locked: 50 })
+})
+
+test('applyDeltaMessage requests a resync on version gaps', () => {
+    const synced = applyDeltaMessage(EMPTY_DELTA_STATE, snapshot).state
+
+    const gap = applyDeltaMessage(synced, {
+        type: 'patch',
+        version: 3,
+        base_version: 2,
+        update: { 'BTC/USDC': { profit: 3 } },
+    })
+    assert.equal(gap.resync, true)
+    assert.equal(gap.state, synced)
+
+    assert.equal(applyDeltaMessage(synced, { type: 'heartbeat', version: 1 }).resync, false)
+    assert.equal(applyDeltaMessage(synced, { type: 'heartbeat', version: 7 }).resync, true)
+})
+
+test('applyDeltaMessage keeps plain payloads for legacy streams', () => {
+    const result = applyDeltaMessage(EMPTY_DELTA_STATE, [{ id: 1 }])
+
+    assert.deepEqual(result.state.data, [{ id: 1 }])
+    assert.equal(result.state.version, null)
+    assert.equal(result.resync, false)
+})
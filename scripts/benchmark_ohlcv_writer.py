@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Compare OHLCV insert throughput of ORM bulk_create and the executemany writer."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import model  # noqa: E402
+from service.sqlite_timestamps import ticker_epoch_ms  # noqa: E402
+from service.ticker_writer import write_ticker_rows  # noqa: E402
+from tortoise import Tortoise  # noqa: E402
+
+START_MS = 1_700_000_000_000
+STEP_MS = 60_000
+
+
+def build_payloads(symbols: int, candles: int) -> list[dict]:
+    return [
+        {
+            "timestamp": START_MS + index * STEP_MS,
+            "symbol": f"SYM{symbol}/USDT",
+            "open": 1.0,
+            "high": 1.5,
+            "low": 0.5,
+            "close": 1.0 + index / 1000,
+            "volume": 100.0,
+        }
+        for index in range(candles)
+        for symbol in range(symbols)
+    ]
+
+
+async def orm_bulk_create(payloads: list[dict]) -> None:
+    rows = [
+        model.Tickers(**payload, ts=ticker_epoch_ms(payload["timestamp"]))
+        for payload in payloads
+    ]
+    await model.Tickers.bulk_create(rows)
+
+
+async def raw_executemany(payloads: list[dict]) -> None:
+    await write_ticker_rows(payloads, "benchmark")
+
+
+async def raw_executemany_skip_duplicates(payloads: list[dict]) -> None:
+    await write_ticker_rows(payloads, "benchmark", skip_duplicates=True)
+
+
+async def measure(
+    label: str,
+    writer: Callable[[list[dict]], Awaitable[None]],
+    batches: list[list[dict]],
+) -> None:
+    await Tortoise.get_connection("default").execute_script("DELETE FROM tickers")
+    total_rows = sum(len(batch) for batch in batches)
+    longest = 0.0
+    started = time.perf_counter()
+    for batch in batches:
+        batch_started = time.perf_counter()
+        await writer(batch)
+        longest = max(longest, time.perf_counter() - batch_started)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<28} {total_rows / elapsed:>12,.0f} rows/s  "
+        f"slowest batch {longest * 1000:8.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=300)
+    parser.add_argument("--batches", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "benchmark.sqlite")
+        await Tortoise.init(db_url=f"sqlite://{db_path}", modules={"models": ["model"]})
+        await Tortoise.generate_schemas()
+        await Tortoise.get_connection("default").execute_script(
+            "CREATE INDEX IF NOT EXISTS idx_tickers_symbol_ts ON tickers (symbol, ts)"
+        )
+        payloads = build_payloads(args.symbols, args.batches)
+        batches = [
+            payloads[index : index + args.symbols]
+            for index in range(0, len(payloads), args.symbols)
+        ]
+        print(f"{len(batches)} batches of {args.symbols} candles")
+        try:
+            await measure("ORM bulk_create", orm_bulk_create, batches)
+            await measure("executemany", raw_executemany, batches)
+            await measure(
+                "executemany, skip duplicates",
+                raw_executemany_skip_duplicates,
+                batches,
+            )
+        finally:
+            await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())